@@ -12,12 +12,14 @@ from .medical_examination import (
     EmployeeMedicalExaminationAdmin,
 )
 from .medical_referral import MedicalReferralAdmin
+from .medical_status_run import MedicalStatusRunAdmin
 from .email_settings import EmailSettingsAdmin
 from .email_template import EmailTemplateTypeAdmin, EmailTemplateAdmin
 from .send_log import InstructionJournalSendLogAdmin
 from .equipment_send_log import EquipmentJournalSendLogAdmin
 from .medical_send_log import MedicalNotificationSendLogAdmin
 from .key_deadline_send_log import KeyDeadlineSendLogAdmin
+from .send_log_summary import SendLogMonthlySummaryAdmin
 
 __all__ = [
     'EquipmentAdmin',
@@ -30,6 +32,7 @@ __all__ = [
     'MedicalExaminationNormAdmin',
     'EmployeeMedicalExaminationAdmin',
     'MedicalReferralAdmin',
+    'MedicalStatusRunAdmin',
     'EmailSettingsAdmin',
     'EmailTemplateTypeAdmin',
     'EmailTemplateAdmin',
@@ -37,4 +40,5 @@ __all__ = [
     'EquipmentJournalSendLogAdmin',
     'MedicalNotificationSendLogAdmin',
     'KeyDeadlineSendLogAdmin',
+    'SendLogMonthlySummaryAdmin',
 ]
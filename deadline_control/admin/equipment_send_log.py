@@ -1,6 +1,7 @@
 # deadline_control/admin/equipment_send_log.py
 
 from django.contrib import admin
+from directory.admin.mixins.date_bounded import DateBoundedChangeListMixin
 from deadline_control.models import EquipmentJournalSendLog, EquipmentJournalSendDetail
 
 
@@ -21,7 +22,7 @@ class EquipmentJournalSendDetailInline(admin.TabularInline):
 
 
 @admin.register(EquipmentJournalSendLog)
-class EquipmentJournalSendLogAdmin(admin.ModelAdmin):
+class EquipmentJournalSendLogAdmin(DateBoundedChangeListMixin, admin.ModelAdmin):
     """Админка логов рассылки журналов осмотра оборудования"""
 
     list_display = [
@@ -37,7 +38,6 @@ class EquipmentJournalSendLogAdmin(admin.ModelAdmin):
 
     list_filter = [
         'status',
-        'created_at',
         'equipment_type',
     ]
 
@@ -50,7 +50,7 @@ class KeyDeadlineCategoryAdmin(admin.ModelAdmin):
 
     def overdue_count(self, obj):
         """Количество просроченных мероприятий"""
-        count = sum(1 for item in obj.items.filter(is_active=True) if item.is_overdue())
+        count = obj.items.filter(is_active=True).overdue().count()
         if count > 0:
             return format_html('<span style="color:red; font-weight:bold;">🚨 {}</span>', count)
         return format_html('<span style="color:green;">✅ 0</span>')
@@ -168,8 +168,7 @@ class OrganizationKeyDeadlineAdmin(admin.ModelAdmin):
 
     def overdue_items_count(self, obj):
         """Количество просроченных мероприятий"""
-        items = obj.key_deadline_items.filter(is_active=True)
-        count = sum(1 for item in items if item.is_overdue())
+        count = obj.key_deadline_items.filter(is_active=True).overdue().count()
         if count > 0:
             return format_html('<span style="color:red; font-weight:bold;">🚨 {}</span>', count)
         return format_html('<span style="color:green;">✅ 0</span>')
@@ -254,8 +253,7 @@ class OrganizationKeyDeadlineAdmin(admin.ModelAdmin):
             orgs_without_overdue = []
 
             for org in queryset:
-                items = org.key_deadline_items.filter(is_active=True)
-                overdue_count = sum(1 for item in items if item.is_overdue())
+                overdue_count = org.key_deadline_items.filter(is_active=True).overdue().count()
 
                 if overdue_count > 0:
                     orgs_with_overdue.append((overdue_count, org))
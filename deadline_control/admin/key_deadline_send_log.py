@@ -3,12 +3,13 @@
 from django.contrib import admin
 from django.utils.html import format_html
 from django.urls import reverse
+from directory.admin.mixins.date_bounded import DateBoundedChangeListMixin
 from deadline_control.models import KeyDeadlineSendLog
 import json
 
 
 @admin.register(KeyDeadlineSendLog)
-class KeyDeadlineSendLogAdmin(admin.ModelAdmin):
+class KeyDeadlineSendLogAdmin(DateBoundedChangeListMixin, admin.ModelAdmin):
     """
     Админка для просмотра логов массовой рассылки уведомлений о ключевых мероприятиях
     """
@@ -29,7 +30,6 @@ class KeyDeadlineSendLogAdmin(admin.ModelAdmin):
         'notification_type',
         'organization',
         'initiated_by',
-        'created_at',
     ]
 
     search_fields = [
@@ -273,13 +273,16 @@ class MedicalSettingsAdmin(admin.ModelAdmin):
             'position__medical_factors__harmful_factor'
         )
 
+        # Эталонные нормы загружаем один раз на всю организацию
+        reference_norms = MedicalExaminationNorm.get_factors_by_position_name()
+
         # Разделяем на категории
         no_date = []
         overdue = []
         upcoming = []
 
         for employee in employees_qs:
-            medical_status = employee.get_medical_status()
+            medical_status = employee.get_medical_status(reference_norms)
 
             if not medical_status:
                 continue
@@ -7,6 +7,7 @@ from django.shortcuts import render, redirect
 from django.contrib import messages
 from django.core.management import call_command
 from io import StringIO
+from directory.admin.mixins.date_bounded import DateBoundedChangeListMixin
 from deadline_control.models import MedicalNotificationSendLog, MedicalNotificationSendDetail
 from directory.models import Organization
 import json
@@ -125,7 +126,7 @@ class MedicalNotificationSendDetailInline(admin.TabularInline):
 
 
 @admin.register(MedicalNotificationSendLog)
-class MedicalNotificationSendLogAdmin(admin.ModelAdmin):
+class MedicalNotificationSendLogAdmin(DateBoundedChangeListMixin, admin.ModelAdmin):
     """
     Админка для просмотра логов массовой рассылки медицинских уведомлений
     """
@@ -147,7 +148,6 @@ class MedicalNotificationSendLogAdmin(admin.ModelAdmin):
         'notification_type',
         'organization',
         'initiated_by',
-        'created_at',
     ]
 
     search_fields = [
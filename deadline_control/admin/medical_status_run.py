@@ -0,0 +1,49 @@
+# deadline_control/admin/medical_status_run.py
+
+from django.contrib import admin
+from deadline_control.models import MedicalStatusRun
+
+
+@admin.register(MedicalStatusRun)
+class MedicalStatusRunAdmin(admin.ModelAdmin):
+    """
+    История пересчётов статусов медосмотров (только просмотр)
+    """
+
+    list_display = [
+        'started_at',
+        'mode',
+        'status',
+        'run_date',
+        'scanned_count',
+        'to_issue_updated',
+        'expired_updated',
+        'duration',
+    ]
+
+    list_filter = [
+        'mode',
+        'status',
+    ]
+
+    date_hierarchy = 'started_at'
+
+    readonly_fields = [
+        'mode',
+        'status',
+        'run_date',
+        'started_at',
+        'finished_at',
+        'previous_run',
+        'scanned_count',
+        'to_issue_updated',
+        'expired_updated',
+        'windows',
+        'error',
+    ]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
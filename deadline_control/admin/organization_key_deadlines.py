@@ -46,8 +46,7 @@ class OrganizationKeyDeadlinesAdmin(admin.ModelAdmin):
 
     def overdue_items_count(self, obj):
         """Количество просроченных мероприятий"""
-        items = obj.key_deadline_items.filter(is_active=True)
-        count = sum(1 for item in items if item.is_overdue())
+        count = obj.key_deadline_items.filter(is_active=True).overdue().count()
         if count > 0:
             return format_html('<span style="color:red; font-weight:bold;">🚨 {}</span>', count)
         return format_html('<span style="color:green;">✅ 0</span>')
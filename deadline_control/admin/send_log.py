@@ -3,6 +3,7 @@
 from django.contrib import admin
 from django.utils.html import format_html
 from django.urls import reverse
+from directory.admin.mixins.date_bounded import DateBoundedChangeListMixin
 from deadline_control.models import InstructionJournalSendLog, InstructionJournalSendDetail
 import json
 
@@ -105,7 +106,7 @@ class InstructionJournalSendDetailInline(admin.TabularInline):
 
 
 @admin.register(InstructionJournalSendLog)
-class InstructionJournalSendLogAdmin(admin.ModelAdmin):
+class InstructionJournalSendLogAdmin(DateBoundedChangeListMixin, admin.ModelAdmin):
     """
     Админка для просмотра логов массовой рассылки образцов журналов инструктажей
     """
@@ -125,7 +126,6 @@ class InstructionJournalSendLogAdmin(admin.ModelAdmin):
         'status',
         'organization',
         'initiated_by',
-        'created_at',
         'briefing_date',
     ]
 
@@ -0,0 +1,64 @@
+# deadline_control/admin/send_log_summary.py
+
+from django.contrib import admin
+from deadline_control.models import SendLogMonthlySummary
+
+
+@admin.register(SendLogMonthlySummary)
+class SendLogMonthlySummaryAdmin(admin.ModelAdmin):
+    """
+    Месячные сводки по логам, удалённым командой purge_send_logs (только просмотр)
+    """
+
+    list_display = [
+        'month_display',
+        'log_type',
+        'organization',
+        'runs_count',
+        'successful_count',
+        'failed_count',
+        'skipped_count',
+        'details_count',
+    ]
+
+    list_filter = [
+        'log_type',
+        'organization',
+    ]
+
+    date_hierarchy = 'month'
+    list_select_related = ['organization']
+
+    readonly_fields = [
+        'log_type',
+        'organization',
+        'month',
+        'runs_count',
+        'successful_count',
+        'failed_count',
+        'skipped_count',
+        'details_count',
+        'status_counts',
+        'extra',
+        'updated_at',
+    ]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def month_display(self, obj):
+        return obj.month.strftime('%m.%Y')
+
+    month_display.short_description = "Месяц"
+    month_display.admin_order_field = 'month'
+
+    def get_queryset(self, request):
+        """Фильтруем по организациям пользователя"""
+        qs = super().get_queryset(request)
+        if not request.user.is_superuser and hasattr(request.user, 'profile'):
+            allowed_orgs = request.user.profile.organizations.all()
+            qs = qs.filter(organization__in=allowed_orgs)
+        return qs
@@ -5,3 +5,9 @@ class DeadlineControlConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'deadline_control'
     verbose_name = '⏰ Контроль сроков'
+
+    def ready(self):
+        """
+        Подключаем сигналы сброса кэша сводки сроков.
+        """
+        import deadline_control.signals  # noqa: F401
@@ -0,0 +1,111 @@
+import time
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand
+
+from deadline_control.management.commands.send_medical_notifications import Command as MedicalCommand
+from deadline_control.models import EmailTemplate
+
+# Тело письма в духе CKEditor: стили со скобками {{ }} и ~30 КБ разметки
+BODY = (
+    '<style>p {{ margin: 0 0 10px; }} td {{ padding: 4px; }}</style>'
+    '<h2>План медосмотров - {organization_name}</h2>'
+    + '<p style="color: #333; font-size: 14px;">Текст письма с оформлением.</p>' * 400
+    + '<p>Без даты: {no_date_count}, просрочено: {overdue_count}, предстоит: {upcoming_count}</p>'
+    '{overdue_section}{overdue_button}{upcoming_section}{upcoming_button}{no_date_section}{no_date_button}'
+    '<a href="{medical_url}">Открыть</a>'
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Замер формирования HTML-письма о медосмотрах для организации: '
+        'f-строки + str.format против компилированных шаблонов'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            default='500,1000,5000',
+            help='Число сотрудников в секции через запятую',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Повторов каждого замера (берётся лучший)',
+        )
+
+    def records(self, size):
+        position = SimpleNamespace(position_name='Слесарь-ремонтник')
+        factors = [{'short_name': '4.2.1'}, {'short_name': '15'}]
+        return [
+            {
+                'employee': SimpleNamespace(full_name_nominative=f'Иванов Иван Иванович {idx}', position=position),
+                'status': {
+                    'factors': factors,
+                    'date_completed': date(2025, 1, 1) + timedelta(days=idx % 365),
+                    'days_until': -idx,
+                },
+            }
+            for idx in range(size)
+        ]
+
+    def legacy_section(self, employees_data):
+        """Прежний способ: HTML строк через f-строки, без экранирования"""
+        employees_html = []
+        for item in employees_data:
+            emp = item['employee']
+            status = item['status']
+            factors = ', '.join([f['short_name'] for f in status['factors']])
+            emp_html = f"""
+            <div style="background-color: white; padding: 15px; margin: 10px 0; border-radius: 5px; border-left: 3px solid #f44336;">
+                <div style="font-weight: 600; font-size: 16px; color: #333; margin-bottom: 8px;">
+                    {emp.full_name_nominative}
+                </div>
+                <div style="color: #666; font-size: 14px; line-height: 1.6;">
+                    <strong>Должность:</strong> {emp.position.position_name}<br>
+                    <strong>Факторы:</strong> {factors}
+                    <br><strong>Дата медосмотра:</strong> {status['date_completed'].strftime('%d.%m.%Y')}
+                    <br><strong style="color: #d32f2f;">⚠️ Просрочено:</strong> <span style="color: #d32f2f; font-weight: 600;">{abs(status['days_until'])} дней</span>
+                </div>
+            </div>
+"""
+            employees_html.append(emp_html)
+        return f"<div>{''.join(employees_html)}</div>"
+
+    def context(self, section):
+        return {
+            'organization_name': 'ООО "Альфа"', 'no_date_count': 0, 'overdue_count': 1, 'upcoming_count': 0,
+            'overdue_section': section, 'upcoming_section': '', 'no_date_section': '',
+            'overdue_button': '', 'upcoming_button': '', 'no_date_button': '', 'medical_url': 'https://pot.by/',
+        }
+
+    def render_legacy(self, records):
+        return BODY.format(**self.context(self.legacy_section(records)))
+
+    def render_compiled(self, records):
+        section = MedicalCommand()._format_html_section(records, 'overdue')
+        return EmailTemplate(body=BODY).get_formatted_body(self.context(section))
+
+    def measure(self, renders, records, repeat):
+        """Лучшее время каждого варианта; варианты чередуются, чтобы фоновая нагрузка делилась поровну"""
+        best = [None] * len(renders)
+        for _ in range(repeat):
+            for index, render in enumerate(renders):
+                started = time.perf_counter()
+                render(records)
+                elapsed = (time.perf_counter() - started) * 1000
+                best[index] = elapsed if best[index] is None else min(best[index], elapsed)
+        return best
+
+    def handle(self, *args, **options):
+        header = f"{'Сотрудников':>12}  {'str.format':>11}  {'компиляция':>11}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for size in (int(value) for value in options['sizes'].split(',') if value.strip()):
+            records = self.records(size)
+            legacy, compiled = self.measure((self.render_legacy, self.render_compiled), records, options['repeat'])
+            self.stdout.write(f"{size:>12}  {legacy:>11.1f}  {compiled:>11.1f}")
+        self.stdout.write('Время - в миллисекундах, лучшее из повторов; компилированный вариант экранирует значения')
@@ -0,0 +1,73 @@
+# deadline_control/management/commands/purge_send_logs.py
+from django.core.management.base import BaseCommand
+
+from deadline_control.services import SendLogRetention
+from deadline_control.services.log_retention import LOG_TYPES
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет логи рассылок и генерации документов старше срока хранения '
+        '(*_TTL_DAYS), предварительно сворачивая их статистику в месячные сводки'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--type',
+            action='append',
+            choices=list(LOG_TYPES),
+            dest='log_types',
+            help='Тип лога (можно указать несколько раз, по умолчанию - все)',
+        )
+        parser.add_argument(
+            '--days',
+            type=int,
+            help='Срок хранения в днях для всех выбранных типов вместо настроек',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            help='Записей в одной транзакции (по умолчанию LOG_PURGE_BATCH_SIZE)',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=0,
+            help='Пауза между пачками в секундах, чтобы не мешать рабочей нагрузке',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только показать, сколько записей будет удалено',
+        )
+
+    def handle(self, *args, **options):
+        retention = SendLogRetention(
+            batch_size=options['batch_size'],
+            sleep=options['sleep'],
+            ttl_days=options['days'],
+        )
+        log_types = options['log_types'] or list(LOG_TYPES)
+
+        total_deleted = 0
+        for log_type in log_types:
+            cutoff = retention.cutoff(log_type)
+            if cutoff is None:
+                self.stdout.write(f'{log_type}: хранится бессрочно, пропускаем')
+                continue
+
+            if options['dry_run']:
+                self.stdout.write(
+                    f'{log_type}: старше {cutoff.strftime("%d.%m.%Y")} - {retention.pending(log_type)} записей'
+                )
+                continue
+
+            result = retention.purge(log_type)
+            total_deleted += result['deleted']
+            self.stdout.write(
+                f'{log_type}: удалено {result["deleted"]} записей '
+                f'({result["details"]} детальных), пачек: {result["batches"]}'
+            )
+
+        if not options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f'Готово! Всего удалено записей: {total_deleted}'))
@@ -14,6 +14,16 @@ from deadline_control.models import (
     KeyDeadlineItem,
     KeyDeadlineSendLog,
 )
+from deadline_control.utils.email_templates import (
+    GROUP_TEMPLATE,
+    accent_line,
+    escape_fields,
+    format_date,
+    line,
+    render_rows,
+    row_template,
+)
+from django.utils.safestring import mark_safe
 from datetime import datetime
 import json
 
@@ -113,15 +123,9 @@ class Command(BaseCommand):
                 total_skipped += 1
                 continue
 
-            # Фильтруем просроченные и предстоящие
-            overdue_items = []
-            upcoming_items = []
-
-            for item in items:
-                if item.is_overdue():
-                    overdue_items.append(item)
-                elif item.is_upcoming(warning_days=warning_days):
-                    upcoming_items.append(item)
+            # Просроченные и предстоящие - диапазонные запросы по индексу (organization, is_active, next_date)
+            overdue_items = list(items.overdue())
+            upcoming_items = list(items.upcoming(warning_days))
 
             # Если нет просроченных и предстоящих - пропускаем
             if not overdue_items and not upcoming_items:
@@ -302,7 +306,11 @@ class Command(BaseCommand):
 
     def _format_html_sections_by_category(self, items, section_type):
         """
-        Формирует HTML секции с группировкой по категориям
+        Формирует HTML секции с группировкой по категориям.
+
+        Карточки мероприятий собираются из общих компилированных подшаблонов
+        (deadline_control/utils/email_templates.py); пользовательские поля
+        карточек экранируются заранее (escape_fields).
         """
         if not items:
             return ''
@@ -318,66 +326,59 @@ class Command(BaseCommand):
                 }
             items_by_category[cat_name]['items'].append(item)
 
-        # Формируем HTML
-        sections_html = []
-
+        # Стили в зависимости от типа
+        if section_type == 'overdue':
+            border_color = '#f44336'
+            title_color = '#d32f2f'
+            days_line = accent_line(title_color, '⚠️ Просрочено', 'days', ' дней')
+        else:  # upcoming
+            border_color = '#ff9800'
+            title_color = '#f57c00'
+            days_line = accent_line(title_color, 'Осталось', 'days', ' дней')
+
+        lines = [
+            line('Периодичность', 'periodicity', ' мес.'),
+            line('Дата проведения', 'current_date'),
+            line('Следующая дата', 'next_date'),
+            days_line,
+        ]
+        item_row = row_template(border_color, lines)
+        responsible_row = row_template(border_color, lines + [line('Ответственный', 'responsible')])
+
+        groups = []
         for cat_name, cat_data in items_by_category.items():
             cat_items = cat_data['items']
-            icon = cat_data['icon']
-
-            # Стили в зависимости от типа
-            if section_type == 'overdue':
-                bg_color = '#ffebee'
-                border_color = '#f44336'
-                title_color = '#d32f2f'
-            else:  # upcoming
-                bg_color = '#fff3e0'
-                border_color = '#ff9800'
-                title_color = '#f57c00'
 
             # Формируем список мероприятий
-            items_html = []
+            rows, templates = [], []
             for item in cat_items:
                 days = item.days_until_next()
-
-                item_html = f"""
-                <div style="background-color: white; padding: 12px; margin: 8px 0; border-radius: 4px; border-left: 3px solid {border_color};">
-                    <div style="font-weight: 600; font-size: 14px; color: #333; margin-bottom: 6px;">
-                        {item.name}
-                    </div>
-                    <div style="color: #666; font-size: 13px; line-height: 1.5;">
-                        <strong>Периодичность:</strong> {item.periodicity_months or item.category.periodicity_months} мес.<br>
-                        <strong>Дата проведения:</strong> {item.current_date.strftime('%d.%m.%Y')}<br>
-                        <strong>Следующая дата:</strong> {item.next_date.strftime('%d.%m.%Y')}<br>
-"""
-
                 if section_type == 'overdue':
-                    days_overdue = abs(days) if days else 0
-                    item_html += f'                        <strong style="color: #d32f2f;">⚠️ Просрочено:</strong> <span style="color: #d32f2f; font-weight: 600;">{days_overdue} дней</span><br>\n'
-                else:
-                    item_html += f'                        <strong>Осталось:</strong> <span style="color: #f57c00; font-weight: 600;">{days} дней</span><br>\n'
-
+                    days = abs(days) if days else 0
+                row = {
+                    'title': item.name,
+                    'periodicity': item.periodicity_months or item.category.periodicity_months,
+                    'current_date': format_date(item.current_date),
+                    'next_date': format_date(item.next_date),
+                    'days': days,
+                }
                 if item.responsible_person:
-                    item_html += f'                        <strong>Ответственный:</strong> {item.responsible_person}<br>\n'
-
-                item_html += """
-                    </div>
-                </div>
-"""
-                items_html.append(item_html)
-
-            # Собираем секцию категории
-            section_html = f"""
-            <div style="margin: 15px 0;">
-                <h4 style="color: {title_color}; margin: 10px 0; font-size: 15px;">
-                    {icon} {cat_name} ({len(cat_items)})
-                </h4>
-                {''.join(items_html)}
-            </div>
-"""
-            sections_html.append(section_html)
-
-        return ''.join(sections_html)
+                    row['responsible'] = item.responsible_person
+                    templates.append(responsible_row)
+                else:
+                    templates.append(item_row)
+                rows.append(row)
+
+            escape_fields(rows, ('title', 'responsible'))
+            groups.append(GROUP_TEMPLATE.render({
+                'title_color': title_color,
+                'icon': cat_data['icon'],
+                'title': cat_name,
+                'count': len(cat_items),
+                'rows': render_rows(templates, rows),
+            }))
+
+        return mark_safe(''.join(groups))
 
     def _format_text_message(self, organization, overdue_items, upcoming_items, warning_days):
         """Форматирует текстовую версию письма"""
@@ -9,14 +9,63 @@ from directory.models import Employee, Organization
 from directory.utils.email_recipients import collect_recipients_for_subdivision
 from deadline_control.models import (
     EmailSettings,
+    MedicalExaminationNorm,
     MedicalNotificationSendLog,
     MedicalNotificationSendDetail
 )
+from deadline_control.utils.email_templates import (
+    BUTTON_TEMPLATE,
+    SECTION_TEMPLATE,
+    accent_line,
+    escape_fields,
+    format_date,
+    line,
+    render_rows,
+    row_template,
+)
 from datetime import datetime
 import json
 
 User = get_user_model()
 
+# Оформление HTML секций письма
+SECTION_STYLES = {
+    'overdue': {
+        'bg_color': '#ffebee', 'border_color': '#f44336', 'title_color': '#d32f2f', 'emoji': '🚨',
+        'title': 'ТРЕБУЕТСЯ СРОЧНОЕ ВНИМАНИЕ: Просроченные медосмотры ({count})',
+    },
+    'upcoming': {
+        'bg_color': '#fff3e0', 'border_color': '#ff9800', 'title_color': '#f57c00', 'emoji': '⏰',
+        'title': 'Предстоящие медосмотры в течение 30 дней ({count})',
+    },
+    'no_date': {
+        'bg_color': '#e3f2fd', 'border_color': '#2196f3', 'title_color': '#1976d2', 'emoji': '📋',
+        'title': 'Требуется внести дату медосмотра ({count})',
+    },
+}
+
+
+def _row_templates(section_type):
+    """(базовая карточка, карточка с датой/периодичностью) для секции"""
+    style = SECTION_STYLES[section_type]
+    base_lines = [line('Должность', 'position'), line('Факторы', 'factors')]
+    if section_type == 'overdue':
+        extra_lines = [
+            line('Дата медосмотра', 'date'),
+            accent_line(style['title_color'], '⚠️ Просрочено', 'days', ' дней'),
+        ]
+    elif section_type == 'upcoming':
+        extra_lines = [
+            line('Следующий медосмотр', 'date'),
+            accent_line(style['title_color'], 'Осталось', 'days', ' дней'),
+        ]
+    else:
+        extra_lines = [line('Минимальная периодичность', 'periodicity', ' мес.')]
+    return (
+        row_template(style['border_color'], base_lines),
+        row_template(style['border_color'], base_lines + extra_lines),
+    )
+
 
 class Command(BaseCommand):
     help = 'Отправляет email уведомления о плане прохождения медицинских осмотров (2 раза в месяц)'
@@ -165,13 +214,16 @@ class Command(BaseCommand):
                 'position__medical_factors__harmful_factor'
             )
 
+            # Эталонные нормы загружаем один раз на всю организацию
+            reference_norms = MedicalExaminationNorm.get_factors_by_position_name()
+
             # Разделяем на категории
             no_date = []
             overdue = []
             upcoming = []
 
             for employee in employees_qs:
-                medical_status = employee.get_medical_status()
+                medical_status = employee.get_medical_status(reference_norms)
 
                 if not medical_status:
                     continue
@@ -257,56 +309,19 @@ class Command(BaseCommand):
                 site_domain = getattr(settings, 'SITE_DOMAIN', 'pot.by')
                 medical_url = f'https://{site_domain}/deadline-control/medical/'
 
-                # Кнопка после просроченных (только если есть просроченные)
-                overdue_button = ''
-                if overdue:
-                    overdue_button = f"""
-        <div style="margin: 20px 0 30px; text-align: center; padding: 20px; background-color: #ffebee; border-radius: 8px;">
-            <p style="margin: 0 0 15px; color: #d32f2f; font-weight: 600; font-size: 15px;">
-                ⚠️ Требуется срочное оформление направлений для {len(overdue)} сотрудников
-            </p>
-            <a href="{medical_url}"
-               style="display: inline-block; background-color: #f44336; color: white; padding: 15px 40px;
-                      text-decoration: none; border-radius: 8px; font-size: 16px; font-weight: 600;
-                      box-shadow: 0 4px 6px rgba(0,0,0,0.15); transition: background-color 0.3s;">
-                🚨 Срочно выдать направления
-            </a>
-        </div>
-"""
-
-                # Кнопка после "без даты" (только если есть сотрудники без даты)
-                no_date_button = ''
-                if no_date:
-                    no_date_button = f"""
-        <div style="margin: 20px 0 30px; text-align: center; padding: 20px; background-color: #e3f2fd; border-radius: 8px;">
-            <p style="margin: 0 0 15px; color: #1976d2; font-weight: 600; font-size: 15px;">
-                📋 Требуется внести даты медосмотров для {len(no_date)} сотрудников
-            </p>
-            <a href="{medical_url}"
-               style="display: inline-block; background-color: #2196f3; color: white; padding: 15px 40px;
-                      text-decoration: none; border-radius: 8px; font-size: 16px; font-weight: 600;
-                      box-shadow: 0 4px 6px rgba(0,0,0,0.15); transition: background-color 0.3s;">
-                📅 Внести дату медосмотра
-            </a>
-        </div>
-"""
-
-                # Кнопка "Выдать направления" (только если есть предстоящие медосмотры)
-                upcoming_button = ''
-                if upcoming:
-                    upcoming_button = f"""
-        <div style="margin: 20px 0 30px; text-align: center; padding: 20px; background-color: #fff3e0; border-radius: 8px;">
-            <p style="margin: 0 0 15px; color: #f57c00; font-weight: 600; font-size: 15px;">
-                ⏰ Запланируйте выдачу направлений для {len(upcoming)} сотрудников
-            </p>
-            <a href="{medical_url}"
-               style="display: inline-block; background-color: #ff9800; color: white; padding: 15px 40px;
-                      text-decoration: none; border-radius: 8px; font-size: 16px; font-weight: 600;
-                      box-shadow: 0 4px 6px rgba(0,0,0,0.15); transition: background-color 0.3s;">
-                📋 Выдать направления
-            </a>
-        </div>
-"""
+                # Кнопки после секций (только если в секции есть сотрудники)
+                overdue_button = self._format_html_button(
+                    'overdue', f'⚠️ Требуется срочное оформление направлений для {len(overdue)} сотрудников',
+                    '🚨 Срочно выдать направления', medical_url,
+                ) if overdue else ''
+                no_date_button = self._format_html_button(
+                    'no_date', f'📋 Требуется внести даты медосмотров для {len(no_date)} сотрудников',
+                    '📅 Внести дату медосмотра', medical_url,
+                ) if no_date else ''
+                upcoming_button = self._format_html_button(
+                    'upcoming', f'⏰ Запланируйте выдачу направлений для {len(upcoming)} сотрудников',
+                    '📋 Выдать направления', medical_url,
+                ) if upcoming else ''
 
                 context = {
                     'organization_name': organization.short_name_ru,
@@ -492,6 +507,10 @@ class Command(BaseCommand):
         """
         Формирует HTML секцию для списка сотрудников.
 
+        Карточки собираются по компилированным подшаблонам
+        (deadline_control/utils/email_templates.py); пользовательские поля
+        карточек экранируются заранее (escape_fields).
+
         Args:
             employees_data: список словарей с данными сотрудников
             section_type: тип секции ('overdue', 'upcoming', 'no_date')
@@ -502,75 +521,54 @@ class Command(BaseCommand):
         if not employees_data:
             return ''
 
-        # Определяем стили и заголовок в зависимости от типа
-        if section_type == 'overdue':
-            bg_color = '#ffebee'
-            border_color = '#f44336'
-            title_color = '#d32f2f'
-            emoji = '🚨'
-            title = f'ТРЕБУЕТСЯ СРОЧНОЕ ВНИМАНИЕ: Просроченные медосмотры ({len(employees_data)})'
-        elif section_type == 'upcoming':
-            bg_color = '#fff3e0'
-            border_color = '#ff9800'
-            title_color = '#f57c00'
-            emoji = '⏰'
-            title = f'Предстоящие медосмотры в течение 30 дней ({len(employees_data)})'
-        else:  # no_date
-            bg_color = '#e3f2fd'
-            border_color = '#2196f3'
-            title_color = '#1976d2'
-            emoji = '📋'
-            title = f'Требуется внести дату медосмотра ({len(employees_data)})'
-
-        # Формируем список сотрудников
-        employees_html = []
+        style = SECTION_STYLES[section_type]
+        base_row, full_row = _row_templates(section_type)
+
+        rows, templates = [], []
         for item in employees_data:
             emp = item['employee']
             status = item['status']
-            factors = ', '.join([f['short_name'] for f in status['factors']])
-
-            # Базовая информация
-            emp_html = f"""
-            <div style="background-color: white; padding: 15px; margin: 10px 0; border-radius: 5px; border-left: 3px solid {border_color};">
-                <div style="font-weight: 600; font-size: 16px; color: #333; margin-bottom: 8px;">
-                    {emp.full_name_nominative}
-                </div>
-                <div style="color: #666; font-size: 14px; line-height: 1.6;">
-                    <strong>Должность:</strong> {emp.position.position_name}<br>
-                    <strong>Факторы:</strong> {factors}
-"""
+            row = {
+                'title': emp.full_name_nominative,
+                'position': emp.position.position_name,
+                'factors': ', '.join([f['short_name'] for f in status['factors']]),
+            }
 
             # Дополнительная информация в зависимости от типа
+            template = full_row
             if section_type == 'overdue' and status.get('date_completed'):
-                days_overdue = abs(status['days_until'])
-                emp_html += f"""
-                    <br><strong>Дата медосмотра:</strong> {status['date_completed'].strftime('%d.%m.%Y')}
-                    <br><strong style="color: #d32f2f;">⚠️ Просрочено:</strong> <span style="color: #d32f2f; font-weight: 600;">{days_overdue} дней</span>
-"""
+                row['date'] = format_date(status['date_completed'])
+                row['days'] = abs(status['days_until'])
             elif section_type == 'upcoming' and status.get('next_date'):
-                emp_html += f"""
-                    <br><strong>Следующий медосмотр:</strong> {status['next_date'].strftime('%d.%m.%Y')}
-                    <br><strong>Осталось:</strong> <span style="color: #f57c00; font-weight: 600;">{status['days_until']} дней</span>
-"""
+                row['date'] = format_date(status['next_date'])
+                row['days'] = status['days_until']
             elif section_type == 'no_date' and status.get('min_periodicity'):
-                emp_html += f"""
-                    <br><strong>Минимальная периодичность:</strong> {status['min_periodicity']} мес.
-"""
-
-            emp_html += """
-                </div>
-            </div>
-"""
-            employees_html.append(emp_html)
-
-        # Собираем секцию
-        section_html = f"""
-        <div style="background-color: {bg_color}; border-left: 4px solid {border_color}; padding: 20px; margin: 20px 0; border-radius: 5px;">
-            <h3 style="color: {title_color}; margin-top: 0;">
-                {emoji} {title}
-            </h3>
-            {''.join(employees_html)}
-        </div>
-"""
-
-        return section_html
+                row['periodicity'] = status['min_periodicity']
+            else:
+                template = base_row
+
+            rows.append(row)
+            templates.append(template)
+
+        escape_fields(rows, ('title', 'position', 'factors'))
+
+        return SECTION_TEMPLATE.render({
+            'bg_color': style['bg_color'],
+            'border_color': style['border_color'],
+            'title_color': style['title_color'],
+            'emoji': style['emoji'],
+            'title': style['title'].format(count=len(employees_data)),
+            'rows': render_rows(templates, rows),
+        })
+
+    def _format_html_button(self, section_type, text, label, url):
+        """Кнопка-ссылка после секции"""
+        style = SECTION_STYLES[section_type]
+        return BUTTON_TEMPLATE.render({
+            'bg_color': style['bg_color'],
+            'title_color': style['title_color'],
+            'button_color': style['border_color'],
+            'text': text,
+            'label': label,
+            'url': url,
+        })
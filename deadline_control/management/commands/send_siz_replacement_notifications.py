@@ -0,0 +1,207 @@
+# deadline_control/management/commands/send_siz_replacement_notifications.py
+from django.core.management.base import BaseCommand
+from django.core.mail import send_mail
+from django.contrib.auth import get_user_model
+
+from directory.models import Organization, SIZIssued
+from directory.services import SIZReplacementSchedule
+from directory.utils.email_recipients import collect_recipients_for_subdivision
+from deadline_control.models import EmailSettings
+from datetime import datetime
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Отправляет email уведомления о замене выданных СИЗ (просроченной и предстоящей)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--emails',
+            type=str,
+            help='Список email адресов через запятую (по умолчанию - получатели из настроек email)',
+        )
+        parser.add_argument(
+            '--organization',
+            type=int,
+            help='ID организации для фильтрации (по умолчанию - все)',
+        )
+        parser.add_argument(
+            '--warning-days',
+            type=int,
+            default=30,
+            help='За сколько дней предупреждать о предстоящей замене (по умолчанию 30)',
+        )
+        parser.add_argument(
+            '--sync',
+            action='store_true',
+            help='Перед рассылкой пересчитать плановые даты замены (после массовых изменений в обход save())',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS('Начинаем формирование уведомлений о замене СИЗ...'))
+
+        if options['sync']:
+            updated = SIZIssued.objects.sync_due_dates()
+            self.stdout.write(f'Пересчитано плановых дат замены: {updated}')
+
+        # Определяем организации для обработки
+        if options['organization']:
+            organizations = Organization.objects.filter(id=options['organization'])
+        else:
+            organizations = Organization.objects.all()
+        organizations = list(organizations)
+
+        # Все просроченные и предстоящие замены - одним запросом по индексу next_due_date
+        schedule = SIZReplacementSchedule(days=options['warning_days'])
+        due_by_org = schedule.by_organization([organization.pk for organization in organizations])
+
+        total_sent = 0
+        total_failed = 0
+        total_skipped = 0
+
+        for organization in organizations:
+            self.stdout.write(f'\n--- Обработка организации: {organization.short_name_ru} ---')
+
+            due = due_by_org.get(organization.pk)
+            if not due:
+                self.stdout.write(self.style.WARNING(
+                    f'Нет СИЗ, подлежащих замене, для {organization.short_name_ru}'
+                ))
+                total_skipped += 1
+                continue
+            overdue, upcoming = due['overdue'], due['upcoming']
+
+            # Получаем настройки email для организации
+            try:
+                email_settings = EmailSettings.get_settings(organization)
+            except Exception as e:
+                self.stdout.write(self.style.WARNING(
+                    f'Не удалось получить настройки email для {organization.short_name_ru}: {e}'
+                ))
+                total_skipped += 1
+                continue
+
+            if not email_settings.is_active:
+                self.stdout.write(self.style.WARNING(
+                    f'Email уведомления отключены для {organization.short_name_ru}'
+                ))
+                total_skipped += 1
+                continue
+
+            if not email_settings.email_host:
+                self.stdout.write(self.style.WARNING(
+                    f'SMTP сервер не настроен для {organization.short_name_ru}'
+                ))
+                total_skipped += 1
+                continue
+
+            # Определяем получателей
+            if options['emails']:
+                recipient_list = [email.strip() for email in options['emails'].split(',')]
+                self.stdout.write(f'   Используются email из параметра: {", ".join(recipient_list)}')
+            else:
+                recipient_list = collect_recipients_for_subdivision(
+                    subdivision=None,
+                    organization=organization
+                )
+
+                if not recipient_list:
+                    self.stdout.write(self.style.WARNING(
+                        'Получатели не найдены через EmailSettings. Используем администраторов.'
+                    ))
+                    recipient_list = list(
+                        User.objects.filter(is_staff=True, email__isnull=False)
+                        .exclude(email='')
+                        .values_list('email', flat=True)
+                    )
+
+            if not recipient_list:
+                self.stdout.write(self.style.WARNING(
+                    f'❌ Нет получателей для {organization.short_name_ru}. '
+                    f'Настройте EmailSettings или укажите --emails параметр.'
+                ))
+                total_skipped += 1
+                continue
+
+            subject = f'🛡️ Замена СИЗ - {organization.short_name_ru} - {datetime.now().strftime("%d.%m.%Y")}'
+            message = self._format_email_message(organization, overdue, upcoming, schedule)
+
+            connection = email_settings.get_connection()
+            from_email = email_settings.default_from_email or email_settings.email_host_user
+
+            try:
+                send_mail(
+                    subject=subject,
+                    message=message,
+                    from_email=from_email,
+                    recipient_list=recipient_list,
+                    connection=connection,
+                    fail_silently=False,
+                )
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f'✅ Уведомление отправлено для {organization.short_name_ru}!\n'
+                        f'   Получатели: {", ".join(recipient_list)}\n'
+                        f'   Просроченные: {len(overdue)}, Предстоящие: {len(upcoming)}'
+                    )
+                )
+                total_sent += 1
+            except Exception as e:
+                self.stdout.write(
+                    self.style.ERROR(f'❌ Ошибка при отправке email для {organization.short_name_ru}: {str(e)}')
+                )
+                total_failed += 1
+
+        # Итоговая статистика
+        self.stdout.write('\n' + '=' * 60)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Завершено! Отправлено: {total_sent}, Ошибок: {total_failed}, Пропущено: {total_skipped}'
+            )
+        )
+
+    def _format_email_message(self, organization, overdue, upcoming, schedule):
+        """Форматирует текст email сообщения"""
+        lines = []
+        lines.append('🛡️ ГРАФИК ЗАМЕНЫ СРЕДСТВ ИНДИВИДУАЛЬНОЙ ЗАЩИТЫ')
+        lines.append('=' * 60)
+        lines.append(f'Организация: {organization.full_name_ru}')
+        lines.append(f'Дата отчета: {datetime.now().strftime("%d.%m.%Y %H:%M")}')
+        lines.append('')
+
+        if overdue:
+            lines.append(f'🚨 ПРОСРОЧЕНА ЗАМЕНА ({len(overdue)} выдач):')
+            lines.append('-' * 60)
+            for item in overdue:
+                lines.append(self._format_item(item, f'Просрочено: {(schedule.today - item.next_due_date).days} дней'))
+            lines.append('')
+
+        if upcoming:
+            lines.append(f'⚠️ ЗАМЕНА В БЛИЖАЙШИЕ {schedule.days} ДНЕЙ ({len(upcoming)} выдач):')
+            lines.append('-' * 60)
+            for item in upcoming:
+                lines.append(self._format_item(item, f'Осталось: {(item.next_due_date - schedule.today).days} дней'))
+            lines.append('')
+
+        lines.append('=' * 60)
+        lines.append(f'ИТОГО: Просроченные: {len(overdue)}, Предстоящие: {len(upcoming)}')
+        lines.append('')
+        lines.append('---')
+        lines.append('Это автоматическое уведомление из системы управления охраной труда OT_online')
+
+        return '\n'.join(lines)
+
+    def _format_item(self, item, days_text):
+        emp = item.employee
+        position = emp.position.position_name if emp.position else '-'
+        subdivision = emp.subdivision.name if emp.subdivision else '-'
+        return (
+            f'  • {emp.full_name_nominative}\n'
+            f'    Должность: {position}\n'
+            f'    Подразделение: {subdivision}\n'
+            f'    СИЗ: {item.siz.name} ({item.quantity} шт.)\n'
+            f'    Выдано: {item.issue_date.strftime("%d.%m.%Y")}, '
+            f'плановая замена: {item.next_due_date.strftime("%d.%m.%Y")}\n'
+            f'    {days_text}\n'
+        )
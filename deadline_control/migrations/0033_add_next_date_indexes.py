@@ -0,0 +1,37 @@
+# Generated by Django 5.0.14 on 2026-10-18 21:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('deadline_control', '0032_add_equipment_load_capacity'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='employeemedicalexamination',
+            index=models.Index(fields=['next_date'], name='med_exam_next_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employeemedicalexamination',
+            index=models.Index(fields=['employee', 'next_date'], name='med_exam_emp_next_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipment',
+            index=models.Index(fields=['organization', 'next_maintenance_date'], name='equip_org_next_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipment',
+            index=models.Index(fields=['next_maintenance_date'], name='equip_next_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='keydeadlineitem',
+            index=models.Index(fields=['organization', 'is_active', 'next_date'], name='kd_item_org_next_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='keydeadlineitem',
+            index=models.Index(fields=['next_date'], name='kd_item_next_date_idx'),
+        ),
+    ]
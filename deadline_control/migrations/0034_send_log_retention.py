@@ -0,0 +1,59 @@
+# Generated by Django 5.0.14 on 2026-10-18 23:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('deadline_control', '0033_add_next_date_indexes'),
+        ('directory', '0060_siz_issued_next_due_date'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SendLogMonthlySummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('log_type', models.CharField(choices=[('instruction_journal', '📧 Журналы инструктажей'), ('equipment_journal', '📧 Журналы оборудования'), ('medical', '🏥 Медосмотры'), ('key_deadline', '⚙️ Ключевые события'), ('document_generation', '📋 Генерация документов')], max_length=30, verbose_name='Тип лога')),
+                ('month', models.DateField(help_text='Первое число месяца', verbose_name='Месяц')),
+                ('runs_count', models.IntegerField(default=0, verbose_name='Запусков')),
+                ('successful_count', models.IntegerField(default=0, verbose_name='Успешно')),
+                ('failed_count', models.IntegerField(default=0, verbose_name='Ошибок')),
+                ('skipped_count', models.IntegerField(default=0, verbose_name='Пропущено')),
+                ('details_count', models.IntegerField(default=0, verbose_name='Детальных записей')),
+                ('status_counts', models.JSONField(blank=True, default=dict, help_text='Например {"completed": 10, "partial": 2}', verbose_name='Запуски по статусам')),
+                ('extra', models.JSONField(blank=True, default=dict, help_text='Суммы счётчиков конкретного типа лога (просроченные МО, подразделения и т.п.)', verbose_name='Дополнительная статистика')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Дата обновления')),
+                ('organization', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='send_log_summaries', to='directory.organization', verbose_name='Организация')),
+            ],
+            options={
+                'verbose_name': '🗄️ Сводка логов за месяц',
+                'verbose_name_plural': '🗄️ Сводки логов по месяцам',
+                'ordering': ['-month', 'log_type'],
+                'indexes': [models.Index(fields=['organization', '-month'], name='send_log_summary_org_idx')],
+                'constraints': [models.UniqueConstraint(fields=('log_type', 'organization', 'month'), name='send_log_summary_unique_month')],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='equipmentjournalsendlog',
+            index=models.Index(fields=['organization', '-created_at'], name='equip_send_log_org_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipmentjournalsendlog',
+            index=models.Index(fields=['-created_at'], name='equip_send_log_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='instructionjournalsendlog',
+            index=models.Index(fields=['-created_at'], name='instr_send_log_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='keydeadlinesendlog',
+            index=models.Index(fields=['-created_at'], name='kd_send_log_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='medicalnotificationsendlog',
+            index=models.Index(fields=['-created_at'], name='med_send_log_created_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.0.14 on 2026-10-18 12:40
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('deadline_control', '0034_send_log_retention'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MedicalStatusRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('mode', models.CharField(choices=[('full', 'Полный'), ('incremental', 'Инкрементальный')], max_length=20, verbose_name='Режим')),
+                ('status', models.CharField(choices=[('running', '⏳ Выполняется'), ('success', '✅ Успешно'), ('failed', '❌ Ошибка')], default='running', max_length=20, verbose_name='Статус')),
+                ('run_date', models.DateField(help_text='Дата, на которую рассчитаны статусы', verbose_name='Дата пересчёта')),
+                ('started_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Начало')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Окончание')),
+                ('scanned_count', models.IntegerField(default=0, verbose_name='Проверено записей')),
+                ('to_issue_updated', models.IntegerField(default=0, verbose_name='Переведено в «к выдаче»')),
+                ('expired_updated', models.IntegerField(default=0, verbose_name='Переведено в «просрочен»')),
+                ('windows', models.JSONField(blank=True, default=dict, help_text='Дней до отметки к выдаче по организациям, например {"3": 30}', verbose_name='Сроки «к выдаче»')),
+                ('error', models.TextField(blank=True, verbose_name='Ошибка')),
+                ('previous_run', models.ForeignKey(blank=True, help_text='Водяной знак инкрементального режима', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='deadline_control.medicalstatusrun', verbose_name='Предыдущий запуск')),
+            ],
+            options={
+                'verbose_name': '🔄 Пересчёт статусов медосмотров',
+                'verbose_name_plural': '🔄 Пересчёты статусов медосмотров',
+                'ordering': ['-started_at'],
+                'indexes': [models.Index(fields=['status', '-started_at'], name='med_status_run_idx')],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='employeemedicalexamination',
+            index=models.Index(fields=['updated_at'], name='med_exam_updated_idx'),
+        ),
+    ]
@@ -7,12 +7,14 @@ from .key_deadline import KeyDeadlineCategory, KeyDeadlineItem, OrganizationKeyD
 from .medical_examination import HarmfulFactor, MedicalExaminationType, MedicalSettings
 from .medical_norm import MedicalExaminationNorm, PositionMedicalFactor, EmployeeMedicalExamination
 from .medical_referral import MedicalReferral
+from .medical_status_run import MedicalStatusRun
 from .email_settings import EmailSettings
 from .email_template import EmailTemplateType, EmailTemplate
 from .send_log import InstructionJournalSendLog, InstructionJournalSendDetail
 from .equipment_send_log import EquipmentJournalSendLog, EquipmentJournalSendDetail
 from .medical_send_log import MedicalNotificationSendLog, MedicalNotificationSendDetail
 from .key_deadline_send_log import KeyDeadlineSendLog
+from .send_log_summary import SendLogMonthlySummary
 
 __all__ = [
     'Equipment',
@@ -27,6 +29,7 @@ __all__ = [
     'PositionMedicalFactor',
     'EmployeeMedicalExamination',
     'MedicalReferral',
+    'MedicalStatusRun',
     'EmailSettings',
     'EmailTemplateType',
     'EmailTemplate',
@@ -37,4 +40,5 @@ __all__ = [
     'MedicalNotificationSendLog',
     'MedicalNotificationSendDetail',
     'KeyDeadlineSendLog',
+    'SendLogMonthlySummary',
 ]
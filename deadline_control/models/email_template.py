@@ -3,6 +3,7 @@
 from django.db import models
 from django_ckeditor_5.fields import CKEditor5Field
 from directory.models import Organization
+from deadline_control.utils.email_templates import MissingTemplateVariable, find_variables, render_email_template
 
 
 class EmailTemplateType(models.Model):
@@ -168,6 +169,20 @@ class EmailTemplate(models.Model):
                 'is_default': 'Эталонный шаблон не может быть привязан к организации'
             })
 
+        # Переменные проверяются при сохранении, а не при отправке
+        available = set((self.template_type.available_variables or {}) if self.template_type_id else ())
+        if available:
+            errors = {}
+            for field in ('subject', 'body'):
+                unknown = sorted(find_variables(getattr(self, field)) - available)
+                if unknown:
+                    errors[field] = (
+                        f"Неизвестные переменные: {', '.join('{' + name + '}' for name in unknown)}. "
+                        f"Доступные: {', '.join(sorted(available))}"
+                    )
+            if errors:
+                raise ValidationError(errors)
+
     def save(self, *args, **kwargs):
         """При установке is_default=True снимаем флаг с других шаблонов"""
         if self.is_default:
@@ -193,13 +208,13 @@ class EmailTemplate(models.Model):
     def get_formatted_subject(self, context):
         """Форматирует тему письма с подстановкой переменных"""
         try:
-            return self.subject.format(**context)
-        except KeyError as e:
+            return render_email_template(self.subject, context)
+        except MissingTemplateVariable as e:
             return f"Ошибка в шаблоне темы: отсутствует переменная {e}"
 
     def get_formatted_body(self, context):
-        """Форматирует текст письма с подстановкой переменных"""
+        """Форматирует текст письма с подстановкой переменных (шаблон компилируется один раз)"""
         try:
-            return self.body.format(**context)
-        except KeyError as e:
+            return render_email_template(self.body, context)
+        except MissingTemplateVariable as e:
             return f"Ошибка в шаблоне текста: отсутствует переменная {e}"
@@ -1,9 +1,12 @@
 # deadline_control/models/equipment.py
-import calendar
 from datetime import timedelta
 from django.db import models
 from django.utils import timezone
 
+from deadline_control.utils.dates import add_months
+
+from .querysets import EquipmentQuerySet
+
 
 class Equipment(models.Model):
     """
@@ -78,6 +81,8 @@ class Equipment(models.Model):
         default='operational'
     )
 
+    objects = EquipmentQuerySet.as_manager()
+
     def __str__(self):
         return f"{self.equipment_name} (инв.№ {self.inventory_number})"
 
@@ -86,21 +91,17 @@ class Equipment(models.Model):
         """
         Прибавляет к дате заданное число месяцев, корректно обрабатывая конец месяца.
         """
-        month = source_date.month - 1 + months
-        year = source_date.year + month // 12
-        month = month % 12 + 1
-        day = min(source_date.day, calendar.monthrange(year, month)[1])
-        return source_date.replace(year=year, month=month, day=day)
+        return add_months(source_date, months)
 
-    def update_maintenance(self, new_date=None, comment=''):
+    def apply_maintenance(self, maintenance_date, comment=''):
         """
-        Обновляет информацию о ТО оборудования:
+        Записывает проведённое ТО в объект без сохранения:
         - сохраняет предыдущую дату + комментарий в history,
         - записывает новую last_maintenance_date,
         - вычисляет next_maintenance_date, прибавляя months.
-        """
-        maintenance_date = new_date or timezone.now().date()
 
+        Используется update_maintenance() и массовым EquipmentQuerySet.perform_maintenance().
+        """
         if self.last_maintenance_date:
             history = self.maintenance_history if isinstance(self.maintenance_history, list) else []
             history.append({
@@ -114,8 +115,23 @@ class Equipment(models.Model):
             maintenance_date, self.maintenance_period_months
         )
         self.maintenance_status = 'operational'
+
+    def update_maintenance(self, new_date=None, comment=''):
+        """Проводит ТО (по умолчанию сегодняшней датой) и сохраняет оборудование"""
+        self.apply_maintenance(new_date or timezone.now().date(), comment)
         self.save()
 
+    def calculate_next_maintenance_date(self):
+        """
+        Дата следующего ТО по last_maintenance_date и maintenance_period_months.
+        Без даты последнего ТО - None; без периода - текущее значение.
+        """
+        if self.last_maintenance_date and self.maintenance_period_months:
+            return self._add_months(self.last_maintenance_date, self.maintenance_period_months)
+        if not self.last_maintenance_date:
+            return None
+        return self.next_maintenance_date
+
     def is_maintenance_required(self):
         """Проверяет, требуется ли ТО (за 7 дней до)"""
         today = timezone.now().date()
@@ -143,15 +159,7 @@ class Equipment(models.Model):
         Если указаны last_maintenance_date и maintenance_period_months,
         то next_maintenance_date вычисляется автоматически.
         """
-        if self.last_maintenance_date and self.maintenance_period_months:
-            self.next_maintenance_date = self._add_months(
-                self.last_maintenance_date,
-                self.maintenance_period_months
-            )
-        elif not self.last_maintenance_date:
-            # Если нет даты последнего ТО, обнуляем дату следующего ТО
-            self.next_maintenance_date = None
-
+        self.next_maintenance_date = self.calculate_next_maintenance_date()
         super().save(*args, **kwargs)
 
     class Meta:
@@ -159,3 +167,8 @@ class Equipment(models.Model):
         verbose_name_plural = "⚙️ ТО оборудования"
         app_label = 'deadline_control'
         ordering = ['equipment_name']
+        indexes = [
+            # Выборки "просрочено / скоро ТО" по организации
+            models.Index(fields=['organization', 'next_maintenance_date'], name='equip_org_next_date_idx'),
+            models.Index(fields=['next_maintenance_date'], name='equip_next_date_idx'),
+        ]
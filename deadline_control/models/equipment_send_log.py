@@ -97,6 +97,10 @@ class EquipmentJournalSendLog(models.Model):
         verbose_name_plural = "📧 Журналы оборудования (рассылки)"
         ordering = ['-created_at']
         db_table = 'deadline_control_equipment_journal_send_log'
+        indexes = [
+            models.Index(fields=['organization', '-created_at'], name='equip_send_log_org_idx'),
+            models.Index(fields=['-created_at'], name='equip_send_log_created_idx'),
+        ]
 
     def __str__(self):
         return f"Рассылка журналов {self.equipment_type.name} от {self.created_at.strftime('%d.%m.%Y %H:%M')}"
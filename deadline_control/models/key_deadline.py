@@ -1,10 +1,13 @@
 # deadline_control/models/key_deadline.py
-import calendar
 from django.db import models
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 from directory.models import Organization
 
+from deadline_control.utils.dates import add_months
+
+from .querysets import KeyDeadlineItemQuerySet
+
 
 class KeyDeadlineCategory(models.Model):
     """
@@ -105,6 +108,8 @@ class KeyDeadlineItem(models.Model):
     )
     notes = models.TextField("Примечания", blank=True)
 
+    objects = KeyDeadlineItemQuerySet.as_manager()
+
     def __str__(self):
         return f"{self.name} ({self.category.name})"
 
@@ -113,11 +118,7 @@ class KeyDeadlineItem(models.Model):
         """
         Прибавляет к дате заданное число месяцев, корректно обрабатывая конец месяца.
         """
-        month = source_date.month - 1 + months
-        year = source_date.year + month // 12
-        month = month % 12 + 1
-        day = min(source_date.day, calendar.monthrange(year, month)[1])
-        return source_date.replace(year=year, month=month, day=day)
+        return add_months(source_date, months)
 
     def calculate_next_date(self):
         """
@@ -131,6 +132,14 @@ class KeyDeadlineItem(models.Model):
                 return self._add_months(self.current_date, periodicity)
         return None
 
+    def apply_completion(self, completed_date):
+        """
+        Отмечает мероприятие проведённым без сохранения: новая current_date
+        и пересчитанная next_date (используется KeyDeadlineItemQuerySet.mark_completed())
+        """
+        self.current_date = completed_date
+        self.next_date = self.calculate_next_date()
+
     def days_until_next(self):
         """
         Возвращает количество дней до следующего проведения.
@@ -167,6 +176,11 @@ class KeyDeadlineItem(models.Model):
         verbose_name_plural = "📅 Ключевые сроки"
         app_label = 'deadline_control'
         ordering = ['next_date', 'name']
+        indexes = [
+            # Выборки "просрочено / скоро срок" по организации
+            models.Index(fields=['organization', 'is_active', 'next_date'], name='kd_item_org_next_date_idx'),
+            models.Index(fields=['next_date'], name='kd_item_next_date_idx'),
+        ]
 
 
 class OrganizationKeyDeadline(Organization):
@@ -160,6 +160,7 @@ class KeyDeadlineSendLog(models.Model):
         indexes = [
             models.Index(fields=['organization', '-created_at']),
             models.Index(fields=['initiated_by', '-created_at']),
+            models.Index(fields=['-created_at'], name='kd_send_log_created_idx'),
             models.Index(fields=['status']),
             models.Index(fields=['notification_type']),
         ]
@@ -1,8 +1,11 @@
-import calendar
 from django.db import models
 from django.core.validators import MinValueValidator, FileExtensionValidator
 from django.utils import timezone
+
+from deadline_control.utils.dates import add_months
+
 from .medical_examination import MedicalExaminationType, HarmfulFactor
+from .querysets import EmployeeMedicalExaminationQuerySet
 
 
 class MedicalExaminationNorm(models.Model):
@@ -59,6 +62,24 @@ class MedicalExaminationNorm(models.Model):
             return self.periodicity_override
         return self.harmful_factor.periodicity
 
+    @classmethod
+    def get_factors_by_position_name(cls, position_names=None):
+        """
+        Возвращает эталонные вредные факторы, сгруппированные по названию должности,
+        одним запросом: {position_name: [HarmfulFactor, ...]}.
+
+        Используется списками сотрудников вместе с Employee.get_medical_status(),
+        чтобы не запрашивать нормы отдельно для каждого сотрудника.
+        """
+        norms = cls.objects.select_related('harmful_factor')
+        if position_names is not None:
+            norms = norms.filter(position_name__in=set(position_names))
+
+        factors_by_position = {}
+        for norm in norms:
+            factors_by_position.setdefault(norm.position_name, []).append(norm.harmful_factor)
+        return factors_by_position
+
 
 class PositionMedicalFactor(models.Model):
     """
@@ -202,10 +223,19 @@ class EmployeeMedicalExamination(models.Model):
         verbose_name="Дата обновления записи"
     )
 
+    objects = EmployeeMedicalExaminationQuerySet.as_manager()
+
     class Meta:
         verbose_name = "🏥 Медосмотр сотрудника"
         verbose_name_plural = "🏥 Медосмотры сотрудников"
         ordering = ['-date_completed', 'employee']
+        indexes = [
+            # Выборки "просрочено / скоро медосмотр"
+            models.Index(fields=['next_date'], name='med_exam_next_date_idx'),
+            models.Index(fields=['employee', 'next_date'], name='med_exam_emp_next_date_idx'),
+            # Изменённые записи для инкрементального пересчёта статусов
+            models.Index(fields=['updated_at'], name='med_exam_updated_idx'),
+        ]
 
     def __str__(self):
         return f"{self.employee} - {self.harmful_factor} ({self.date_completed})"
@@ -247,25 +277,16 @@ class EmployeeMedicalExamination(models.Model):
     def _add_months(source_date, months):
         """
         Прибавляет к дате заданное число месяцев, корректно обрабатывая конец месяца.
-        Аналогично Equipment._add_months()
         """
-        month = source_date.month - 1 + months
-        year = source_date.year + month // 12
-        month = month % 12 + 1
-        day = min(source_date.day, calendar.monthrange(year, month)[1])
-        return source_date.replace(year=year, month=month, day=day)
+        return add_months(source_date, months)
 
-    def perform_examination(self, examination_date=None):
+    def apply_examination(self, exam_date):
         """
-        Проводит медицинский осмотр:
-        - записывает дату прохождения (date_completed)
-        - автоматически вычисляет next_date на основе периодичности вредного фактора
-        - обновляет статус на 'completed'
-
-        Аналогично Equipment.update_maintenance()
+        Записывает пройденный медосмотр без сохранения: date_completed и
+        next_date по периодичности вредного фактора, статус 'completed'.
+        Используется perform_examination() и массовым
+        EmployeeMedicalExaminationQuerySet.perform_examination().
         """
-        exam_date = examination_date or timezone.now().date()
-
         self.date_completed = exam_date
 
         # Получаем периодичность из вредного фактора (или переопределения)
@@ -274,21 +295,32 @@ class EmployeeMedicalExamination(models.Model):
         # Рассчитываем следующую дату
         self.next_date = self._add_months(exam_date, periodicity)
         self.status = 'completed'
-        self.save()
 
-    def save(self, *args, **kwargs):
-        """Переопределяем save для автоматического обновления статуса"""
-        today = timezone.now().date()
+    def perform_examination(self, examination_date=None):
+        """
+        Проводит медицинский осмотр:
+        - записывает дату прохождения (date_completed)
+        - автоматически вычисляет next_date на основе периодичности вредного фактора
+        - обновляет статус на 'completed'
+
+        Аналогично Equipment.update_maintenance()
+        """
+        self.apply_examination(examination_date or timezone.now().date())
+        self.save()
 
-        # Обновляем статус в зависимости от даты
-        if not self.date_completed or not self.next_date:
+    @staticmethod
+    def status_for(date_completed, next_date, today):
+        """Статус медосмотра по датам (тот же расчёт, что и в save())"""
+        if not date_completed or not next_date:
             # Если даты не указаны - нужно выдать направление
-            self.status = 'to_issue'
-        elif self.next_date < today:
+            return 'to_issue'
+        if next_date < today:
             # Если срок истек
-            self.status = 'expired'
-        else:
-            # Если дата есть и срок не истек
-            self.status = 'completed'
+            return 'expired'
+        # Если дата есть и срок не истек
+        return 'completed'
 
+    def save(self, *args, **kwargs):
+        """Переопределяем save для автоматического обновления статуса"""
+        self.status = self.status_for(self.date_completed, self.next_date, timezone.now().date())
         super().save(*args, **kwargs)
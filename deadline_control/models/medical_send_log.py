@@ -127,6 +127,7 @@ class MedicalNotificationSendLog(models.Model):
         indexes = [
             models.Index(fields=['organization', '-created_at']),
             models.Index(fields=['initiated_by', '-created_at']),
+            models.Index(fields=['-created_at'], name='med_send_log_created_idx'),
             models.Index(fields=['status']),
             models.Index(fields=['notification_type']),
         ]
@@ -0,0 +1,112 @@
+# deadline_control/models/medical_status_run.py
+
+from django.db import models
+from django.utils import timezone
+
+
+class MedicalStatusRun(models.Model):
+    """
+    🔄 Запуск пересчёта статусов медосмотров (команда update_medical_statuses).
+
+    Последний успешный запуск - водяной знак для инкрементального режима:
+    следующий запуск проверяет только записи, у которых дата следующего
+    медосмотра пересекла границу статуса после run_date, и записи,
+    изменённые после started_at. В windows сохраняются сроки "к выдаче"
+    организаций: если срок в настройках изменился, организация
+    пересчитывается полностью.
+    """
+
+    MODE_CHOICES = [
+        ('full', 'Полный'),
+        ('incremental', 'Инкрементальный'),
+    ]
+
+    STATUS_CHOICES = [
+        ('running', '⏳ Выполняется'),
+        ('success', '✅ Успешно'),
+        ('failed', '❌ Ошибка'),
+    ]
+
+    mode = models.CharField(
+        max_length=20,
+        choices=MODE_CHOICES,
+        verbose_name="Режим"
+    )
+
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='running',
+        verbose_name="Статус"
+    )
+
+    run_date = models.DateField(
+        verbose_name="Дата пересчёта",
+        help_text="Дата, на которую рассчитаны статусы"
+    )
+
+    started_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name="Начало"
+    )
+
+    finished_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Окончание"
+    )
+
+    previous_run = models.ForeignKey(
+        'self',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name="Предыдущий запуск",
+        help_text="Водяной знак инкрементального режима"
+    )
+
+    scanned_count = models.IntegerField(
+        default=0,
+        verbose_name="Проверено записей"
+    )
+
+    to_issue_updated = models.IntegerField(
+        default=0,
+        verbose_name="Переведено в «к выдаче»"
+    )
+
+    expired_updated = models.IntegerField(
+        default=0,
+        verbose_name="Переведено в «просрочен»"
+    )
+
+    windows = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name="Сроки «к выдаче»",
+        help_text='Дней до отметки к выдаче по организациям, например {"3": 30}'
+    )
+
+    error = models.TextField(
+        blank=True,
+        verbose_name="Ошибка"
+    )
+
+    class Meta:
+        verbose_name = "🔄 Пересчёт статусов медосмотров"
+        verbose_name_plural = "🔄 Пересчёты статусов медосмотров"
+        ordering = ['-started_at']
+        indexes = [
+            models.Index(fields=['status', '-started_at'], name='med_status_run_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_mode_display()} - {self.run_date.strftime('%d.%m.%Y')} ({self.get_status_display()})"
+
+    @property
+    def duration(self):
+        """Длительность запуска (timedelta) или None, если запуск не завершён"""
+        if not self.finished_at:
+            return None
+        return self.finished_at - self.started_at
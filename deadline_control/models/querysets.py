@@ -0,0 +1,172 @@
+import json
+from datetime import timedelta
+
+from django.db import models, transaction
+from django.db.models import Count, F, Q
+from django.dispatch import Signal
+from django.utils import timezone
+
+# Одно событие на массовое обновление дат вместо post_save на каждую запись.
+# Аргументы: sender - модель, organization_ids - множество затронутых организаций.
+deadlines_bulk_updated = Signal()
+
+BULK_UPDATE_BATCH_SIZE = 500
+
+
+class DeadlineQuerySet(models.QuerySet):
+    """
+    📅 Выборки "просрочено / скоро срок" по индексированному полю даты.
+
+    Все фильтры - диапазонные условия по date_field, поэтому БД использует
+    индекс (organization, <дата>) и возвращает только подходящие строки.
+    """
+    date_field = None
+    # Путь к организации записи - для события массового обновления
+    organization_field = 'organization_id'
+
+    def _today(self, today):
+        return today or timezone.now().date()
+
+    def with_date(self):
+        """Записи, у которых заполнена дата следующего срока"""
+        return self.filter(**{f'{self.date_field}__isnull': False})
+
+    def overdue(self, today=None):
+        """Срок уже прошёл (дата < сегодня)"""
+        return self.filter(**{f'{self.date_field}__lt': self._today(today)})
+
+    def upcoming(self, days, today=None):
+        """Срок наступает в ближайшие days дней (сегодня <= дата <= сегодня + days)"""
+        today = self._today(today)
+        return self.filter(**{f'{self.date_field}__range': (today, today + timedelta(days=days))})
+
+    def due_within(self, days, today=None):
+        """Просроченные и предстоящие вместе (дата <= сегодня + days)"""
+        today = self._today(today)
+        return self.filter(**{f'{self.date_field}__lte': today + timedelta(days=days)})
+
+    def deadline_counts(self, days, today=None):
+        """
+        Считает просроченные и предстоящие записи одним запросом.
+
+        Returns:
+            dict: {'overdue': int, 'upcoming': int}
+        """
+        today = self._today(today)
+        return self.due_within(days, today).aggregate(
+            overdue=Count('pk', filter=Q(**{f'{self.date_field}__lt': today})),
+            upcoming=Count('pk', filter=Q(**{f'{self.date_field}__gte': today})),
+        )
+
+    # ------------------------------------------------------------------
+    # Массовое обновление дат
+    # ------------------------------------------------------------------
+
+    def _bulk_apply(self, apply, fields):
+        """
+        Применяет apply(obj) ко всем записям выборки за один проход и пишет
+        изменённые поля в одной транзакции. Записи читаются в той же транзакции
+        с блокировкой (select_for_update), поэтому параллельное изменение не
+        перезаписывается значениями, прочитанными до него. Вместо post_save на
+        каждую запись отправляется одно событие deadlines_bulk_updated.
+
+        Returns:
+            int: число обновлённых записей
+        """
+        has_updated_at = any(field.name == 'updated_at' for field in self.model._meta.concrete_fields)
+        if has_updated_at:
+            fields = [*fields, 'updated_at']
+
+        with transaction.atomic():
+            # of=('self',) - блокируются только записи выборки, не связанные таблицы
+            objects = list(
+                self.select_for_update(of=('self',))
+                .annotate(bulk_organization_id=F(self.organization_field))
+            )
+            if not objects:
+                return 0
+
+            now = timezone.now()
+            for obj in objects:
+                apply(obj)
+                if has_updated_at:
+                    obj.updated_at = now
+            self._write_grouped(objects, fields)
+
+        deadlines_bulk_updated.send(
+            sender=self.model,
+            organization_ids={obj.bulk_organization_id for obj in objects} - {None},
+        )
+        return len(objects)
+
+    def _write_grouped(self, objects, fields):
+        """
+        Пишет записи группами с одинаковыми новыми значениями: UPDATE ... WHERE id IN (...)
+        на группу. При массовом проведении одной датой групп столько, сколько разных
+        периодичностей, а bulk_update строил бы CASE WHEN на каждую запись и поле.
+        """
+        groups = {}
+        for obj in objects:
+            values = {field: getattr(obj, field) for field in fields}
+            key = json.dumps(values, sort_keys=True, default=str)
+            groups.setdefault(key, (values, []))[1].append(obj.pk)
+
+        for values, pks in groups.values():
+            for start in range(0, len(pks), BULK_UPDATE_BATCH_SIZE):
+                self.model.objects.filter(pk__in=pks[start:start + BULK_UPDATE_BATCH_SIZE]).update(**values)
+
+
+class EquipmentQuerySet(DeadlineQuerySet):
+    date_field = 'next_maintenance_date'
+
+    def perform_maintenance(self, maintenance_date=None, comment=''):
+        """Проводит ТО всему оборудованию выборки одной датой (Equipment.apply_maintenance)"""
+        maintenance_date = maintenance_date or timezone.now().date()
+        return self._bulk_apply(
+            lambda equipment: equipment.apply_maintenance(maintenance_date, comment),
+            ['maintenance_history', 'last_maintenance_date', 'next_maintenance_date', 'maintenance_status'],
+        )
+
+    def recalculate_next_dates(self):
+        """Пересчитывает next_maintenance_date от даты последнего ТО (как Equipment.save)"""
+        def apply(equipment):
+            equipment.next_maintenance_date = equipment.calculate_next_maintenance_date()
+        return self._bulk_apply(apply, ['next_maintenance_date'])
+
+
+class KeyDeadlineItemQuerySet(DeadlineQuerySet):
+    date_field = 'next_date'
+
+    def mark_completed(self, completed_date=None):
+        """Отмечает мероприятия выборки проведёнными одной датой (KeyDeadlineItem.apply_completion)"""
+        completed_date = completed_date or timezone.now().date()
+        return self.select_related('category')._bulk_apply(
+            lambda item: item.apply_completion(completed_date),
+            ['current_date', 'next_date'],
+        )
+
+    def recalculate_next_dates(self):
+        """Пересчитывает next_date от current_date (как KeyDeadlineItem.save)"""
+        def apply(item):
+            item.next_date = item.calculate_next_date()
+        return self.select_related('category')._bulk_apply(apply, ['next_date'])
+
+
+class EmployeeMedicalExaminationQuerySet(DeadlineQuerySet):
+    date_field = 'next_date'
+    organization_field = 'employee__organization_id'
+
+    def perform_examination(self, examination_date=None):
+        """
+        Проводит медосмотры выборки одной датой (EmployeeMedicalExamination.apply_examination);
+        статус считается так же, как в save()
+        """
+        examination_date = examination_date or timezone.now().date()
+        today = timezone.now().date()
+
+        def apply(exam):
+            exam.apply_examination(examination_date)
+            exam.status = exam.status_for(exam.date_completed, exam.next_date, today)
+        return self.select_related('harmful_factor')._bulk_apply(
+            apply, ['date_completed', 'next_date', 'status'],
+        )
@@ -108,6 +108,7 @@ class InstructionJournalSendLog(models.Model):
         indexes = [
             models.Index(fields=['organization', '-created_at']),
             models.Index(fields=['initiated_by', '-created_at']),
+            models.Index(fields=['-created_at'], name='instr_send_log_created_idx'),
             models.Index(fields=['status']),
         ]
 
@@ -0,0 +1,104 @@
+# deadline_control/models/send_log_summary.py
+
+from django.db import models
+
+
+class SendLogMonthlySummary(models.Model):
+    """
+    🗄️ Месячная сводка по удалённым логам рассылок и генерации документов.
+
+    Перед удалением старых записей (команда purge_send_logs) их статистика
+    суммируется сюда по ключу (тип лога, организация, месяц), поэтому
+    отчёты за прошлые периоды не теряются после очистки.
+    """
+
+    LOG_TYPE_CHOICES = [
+        ('instruction_journal', '📧 Журналы инструктажей'),
+        ('equipment_journal', '📧 Журналы оборудования'),
+        ('medical', '🏥 Медосмотры'),
+        ('key_deadline', '⚙️ Ключевые события'),
+        ('document_generation', '📋 Генерация документов'),
+    ]
+
+    log_type = models.CharField(
+        max_length=30,
+        choices=LOG_TYPE_CHOICES,
+        verbose_name="Тип лога"
+    )
+
+    organization = models.ForeignKey(
+        'directory.Organization',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='send_log_summaries',
+        verbose_name="Организация"
+    )
+
+    month = models.DateField(
+        verbose_name="Месяц",
+        help_text="Первое число месяца"
+    )
+
+    # Статистика
+    runs_count = models.IntegerField(
+        default=0,
+        verbose_name="Запусков"
+    )
+
+    successful_count = models.IntegerField(
+        default=0,
+        verbose_name="Успешно"
+    )
+
+    failed_count = models.IntegerField(
+        default=0,
+        verbose_name="Ошибок"
+    )
+
+    skipped_count = models.IntegerField(
+        default=0,
+        verbose_name="Пропущено"
+    )
+
+    details_count = models.IntegerField(
+        default=0,
+        verbose_name="Детальных записей"
+    )
+
+    status_counts = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name="Запуски по статусам",
+        help_text='Например {"completed": 10, "partial": 2}'
+    )
+
+    extra = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name="Дополнительная статистика",
+        help_text="Суммы счётчиков конкретного типа лога (просроченные МО, подразделения и т.п.)"
+    )
+
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name="Дата обновления"
+    )
+
+    class Meta:
+        verbose_name = "🗄️ Сводка логов за месяц"
+        verbose_name_plural = "🗄️ Сводки логов по месяцам"
+        ordering = ['-month', 'log_type']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['log_type', 'organization', 'month'],
+                name='send_log_summary_unique_month',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['organization', '-month'], name='send_log_summary_org_idx'),
+        ]
+
+    def __str__(self):
+        organization = self.organization.short_name_ru if self.organization_id else '—'
+        return f"{self.get_log_type_display()} - {organization} - {self.month.strftime('%m.%Y')}"
@@ -4,7 +4,7 @@
 from import_export import resources, fields
 from import_export.widgets import CharWidget, DateWidget
 from deadline_control.models import Equipment
-from directory.models import Organization, StructuralSubdivision, Department
+from directory.resources.bulk import BulkImportMixin, chunked, dataset_column_values
 from django.core.exceptions import ValidationError
 from datetime import datetime
 
@@ -30,7 +30,7 @@ class RussianDateWidget(DateWidget):
         return None
 
 
-class EquipmentResource(resources.ModelResource):
+class EquipmentResource(BulkImportMixin, resources.ModelResource):
     """
     ⚙️ Ресурс для импорта/экспорта оборудования.
 
@@ -40,6 +40,9 @@ class EquipmentResource(resources.ModelResource):
     - Рассчитывает next_maintenance_date
     - Обновляет существующее оборудование по inventory_number
 
+    Оргструктура и оборудование из файла загружаются один раз в before_import,
+    EquipmentResource(bulk=True) сохраняет пачками.
+
     Структура файла (7 столбцов):
     1. org_short_name_ru - краткое наименование организации (обязательное)
     2. subdivision_name - структурное подразделение (опционально)
@@ -93,6 +96,18 @@ class EquipmentResource(resources.ModelResource):
         widget=RussianDateWidget(format='%d.%m.%Y')
     )
 
+    bulk_update_fields = (
+        'organization',
+        'subdivision',
+        'department',
+        'equipment_name',
+        'inventory_number',
+        'maintenance_period_months',
+        'last_maintenance_date',
+        'next_maintenance_date',
+        'maintenance_status',
+    )
+
     class Meta:
         model = Equipment
         fields = (
@@ -133,162 +148,113 @@ class EquipmentResource(resources.ModelResource):
         if errors:
             raise ValidationError('; '.join(errors))
 
-    def _generate_inventory_number(self):
-        """Генерирует уникальный инвентарный номер из 8 цифр"""
-        last_equipment = Equipment.objects.filter(
+    def before_import(self, dataset, **kwargs):
+        """
+        Загружаем оргструктуру и оборудование из файла одним набором запросов
+        и резервируем диапазон инвентарных номеров для строк без номера.
+        """
+        super().before_import(dataset, **kwargs)
+
+        numbers = {str(number).strip() for number in dataset_column_values(dataset, 'inventory_number')}
+        numbers.discard('')
+        self._equipment_by_number = {}
+        for numbers_chunk in chunked(numbers):
+            for equipment in Equipment.objects.filter(inventory_number__in=numbers_chunk):
+                self._equipment_by_number[equipment.inventory_number] = equipment
+
+        self._next_inventory_number = self._reserve_inventory_numbers(numbers)
+
+    @staticmethod
+    def _reserve_inventory_numbers(file_numbers):
+        """
+        Первый свободный 8-значный инвентарный номер: после максимального
+        в БД и в самом файле. Дальше номера выдаются подряд без запросов.
+        """
+        last_number = Equipment.objects.filter(
             inventory_number__regex=r'^\d{8}$'
-        ).order_by('inventory_number').last()
+        ).order_by('-inventory_number').values_list('inventory_number', flat=True).first()
 
-        if last_equipment:
-            try:
-                last_number = int(last_equipment.inventory_number)
-                new_number = last_number + 1
-            except (ValueError, TypeError):
-                new_number = 1
-        else:
-            new_number = 1
+        candidates = [int(number) for number in file_numbers if len(number) == 8 and number.isdigit()]
+        if last_number:
+            candidates.append(int(last_number))
+        return max(candidates, default=0) + 1
 
-        return f"{new_number:08d}"
+    def _generate_inventory_number(self):
+        """Следующий номер из зарезервированного диапазона (8 цифр)"""
+        number = self._next_inventory_number
+        self._next_inventory_number += 1
+        return f"{number:08d}"
+
+    def get_instance(self, instance_loader, row):
+        """Существующее оборудование по инвентарному номеру (из загруженных в before_import)"""
+        inventory_number = str(row.get('inventory_number') or '').strip()
+        if inventory_number:
+            return self._equipment_by_number.get(inventory_number)
+        return None
 
-    def import_obj(self, obj, data, dry_run, **kwargs):
+    def import_instance(self, instance, row, **kwargs):
         """
         Переопределяем метод импорта для:
         1. Каскадного создания Organization → Subdivision → Department
         2. Автогенерации инвентарного номера
         3. Расчета next_maintenance_date
-        4. Обновления существующего оборудования
+        4. Обновления существующего оборудования (найдено в get_instance)
         """
+        # 1. Организация (предпросмотр идет в транзакции с откатом, создавать можно)
+        org_short_name = str(row.get('org_short_name_ru') or '').strip()
+        organization = self.lookups.organization(org_short_name)
+        instance.organization = organization
 
-        # 1. Создаем или получаем Organization
-        org_short_name = data.get('org_short_name_ru', '').strip()
-
-        if not dry_run:
-            organization, created = Organization.objects.get_or_create(
-                short_name_ru=org_short_name,
-                defaults={
-                    'short_name_ru': org_short_name,
-                    'full_name_ru': org_short_name,
-                    'short_name_by': org_short_name,
-                    'full_name_by': org_short_name,
-                    'location': 'г. Минск'
-                }
-            )
-        else:
-            try:
-                organization = Organization.objects.get(short_name_ru=org_short_name)
-            except Organization.DoesNotExist:
-                organization = Organization(short_name_ru=org_short_name, full_name_ru=org_short_name)
-
-        obj.organization = organization
-
-        # 2. Создаем или получаем StructuralSubdivision (если указано)
-        subdivision_name = data.get('subdivision_name', '').strip()
+        # 2. Структурное подразделение (если указано)
+        subdivision_name = str(row.get('subdivision_name') or '').strip()
         if subdivision_name:
-            subdivision_data = {
-                'name': subdivision_name,
-                'short_name': subdivision_name,
-                'organization': organization
-            }
-
-            if not dry_run:
-                subdivision, created = StructuralSubdivision.objects.get_or_create(
-                    name=subdivision_name,
-                    organization=organization,
-                    defaults=subdivision_data
-                )
-            else:
-                try:
-                    subdivision = StructuralSubdivision.objects.get(
-                        name=subdivision_name,
-                        organization=organization
-                    )
-                except StructuralSubdivision.DoesNotExist:
-                    subdivision = StructuralSubdivision(**subdivision_data)
-
-            obj.subdivision = subdivision
+            instance.subdivision = self.lookups.subdivision(organization, subdivision_name)
         else:
-            obj.subdivision = None
+            instance.subdivision = None
 
-        # 3. Создаем или получаем Department (если указано)
-        department_name = data.get('department_name', '').strip()
+        # 3. Отдел (если указан)
+        department_name = str(row.get('department_name') or '').strip()
         if department_name:
-            department_data = {
-                'name': department_name,
-                'short_name': department_name,
-                'organization': organization,
-                'subdivision': obj.subdivision
-            }
-
-            if not dry_run:
-                department, created = Department.objects.get_or_create(
-                    name=department_name,
-                    organization=organization,
-                    subdivision=obj.subdivision,
-                    defaults=department_data
-                )
-            else:
-                try:
-                    department = Department.objects.get(
-                        name=department_name,
-                        organization=organization,
-                        subdivision=obj.subdivision
-                    )
-                except Department.DoesNotExist:
-                    department = Department(**department_data)
-
-            obj.department = department
+            instance.department = self.lookups.department(organization, instance.subdivision, department_name)
         else:
-            obj.department = None
+            instance.department = None
 
         # 4. Заполняем поля оборудования
-        obj.equipment_name = data.get('equipment_name', '').strip()
+        instance.equipment_name = str(row.get('equipment_name') or '').strip()
 
         # Инвентарный номер - автогенерация если пустой
-        inventory_number = data.get('inventory_number', '').strip()
+        inventory_number = str(row.get('inventory_number') or '').strip()
         if not inventory_number:
-            if not dry_run:
-                inventory_number = self._generate_inventory_number()
-            else:
-                inventory_number = "00000000"  # Заглушка для предпросмотра
-
-        obj.inventory_number = inventory_number
+            inventory_number = self._generate_inventory_number()
+        instance.inventory_number = inventory_number
 
         # Периодичность ТО - если пустое, остается NULL
-        maintenance_period = data.get('maintenance_period_months', '')
+        maintenance_period = row.get('maintenance_period_months', '')
         if maintenance_period:
             try:
-                obj.maintenance_period_months = int(maintenance_period)
+                instance.maintenance_period_months = int(maintenance_period)
             except (ValueError, TypeError):
-                obj.maintenance_period_months = None
+                instance.maintenance_period_months = None
         else:
-            obj.maintenance_period_months = None
+            instance.maintenance_period_months = None
 
-        # Дата последнего ТО
-        obj.last_maintenance_date = data.get('last_maintenance_date')
+        # Дата последнего ТО (строки DD.MM.YYYY разбирает RussianDateWidget)
+        instance.last_maintenance_date = self.fields['last_maintenance_date'].clean(row)
 
         # Рассчитываем дату следующего ТО только если указаны оба поля
-        if obj.last_maintenance_date and obj.maintenance_period_months:
-            obj.next_maintenance_date = Equipment._add_months(
-                obj.last_maintenance_date,
-                obj.maintenance_period_months
+        if instance.last_maintenance_date and instance.maintenance_period_months:
+            instance.next_maintenance_date = Equipment._add_months(
+                instance.last_maintenance_date,
+                instance.maintenance_period_months
             )
         else:
-            obj.next_maintenance_date = None
+            instance.next_maintenance_date = None
 
         # Статус по умолчанию - исправно
-        obj.maintenance_status = 'operational'
-
-        # 5. Проверяем, существует ли оборудование с таким инвентарным номером
-        if not dry_run:
-            existing_equipment = Equipment.objects.filter(
-                inventory_number=obj.inventory_number
-            ).first()
-
-            if existing_equipment:
-                # Обновляем существующее оборудование
-                obj.id = existing_equipment.id
+        instance.maintenance_status = 'operational'
 
-        return obj
+        # Повторная строка с тем же номером обновит этот же объект
+        self._equipment_by_number[inventory_number] = instance
 
     def skip_row(self, instance, original, row, import_validation_errors=None):
         """Не пропускаем строки - всегда создаем или обновляем"""
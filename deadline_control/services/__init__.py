@@ -0,0 +1,17 @@
+"""
+📦 Сервисный слой приложения 'Контроль сроков'
+"""
+from .deadline_summary import DeadlineSummaryService
+from .harmful_factors import HarmfulFactorResolver, ensure_medical_examinations
+from .log_retention import SendLogRetention
+from .medical_referrals import MedicalReferralBatch
+from .medical_statuses import MedicalStatusRecalculator
+
+__all__ = [
+    'DeadlineSummaryService',
+    'HarmfulFactorResolver',
+    'MedicalReferralBatch',
+    'MedicalStatusRecalculator',
+    'SendLogRetention',
+    'ensure_medical_examinations',
+]
@@ -0,0 +1,269 @@
+"""
+📊 Сводка истекающих сроков для дашборда "Контроль сроков".
+
+DeadlineSummaryService считает по организации:
+- оборудование с просроченным / ближайшим ТО,
+- просроченные / ближайшие ключевые сроки,
+- сотрудников с просроченным / ближайшим медосмотром,
+- выданные СИЗ с просроченной / ближайшей плановой заменой.
+
+Оборудование и мероприятия выбираются диапазонными запросами по индексам
+next-date, медосмотры - одним prefetch-запросом с эталонными нормами,
+загруженными один раз. СИЗ считаются одним агрегирующим запросом по
+индексу next_due_date, в сводку попадают только SIZ_LIST_LIMIT ближайших
+выдач каждого вида (их может быть десятки тысяч).
+
+Сводка по организации кэшируется (DEADLINE_SUMMARY_CACHE_TIMEOUT секунд)
+и сбрасывается сигналами при изменении оборудования, мероприятий,
+медосмотров, выдач СИЗ и сотрудников (deadline_control/signals.py).
+
+Кэш используется только для организаций, к которым у пользователя полный
+доступ (суперпользователь или организация в profile.organizations).
+Для доступа на уровне подразделений/отделов сводка считается без кэша
+по отфильтрованным AccessControlHelper queryset.
+"""
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from deadline_control.models import Equipment, KeyDeadlineItem, MedicalExaminationNorm
+from directory.models import Employee, SIZIssued
+from directory.utils.permissions import AccessControlHelper
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_KEY = 'deadline_summary:org:%s:v%s:%s:%s'
+ORG_VERSION_KEY = 'deadline_summary:version:org:%s'
+GLOBAL_VERSION_KEY = 'deadline_summary:version:global'
+
+SUMMARY_SECTIONS = ('equipment', 'deadlines', 'medical', 'siz')
+
+# Сколько ближайших выдач СИЗ (просроченных и предстоящих) показывать в сводке
+SIZ_LIST_LIMIT = 50
+
+
+def _empty_summary():
+    summary = {
+        section: {'total': 0, 'overdue': [], 'upcoming': []}
+        for section in SUMMARY_SECTIONS
+    }
+    summary['siz'].update(overdue_count=0, upcoming_count=0)
+    return summary
+
+
+class DeadlineSummaryService:
+    """
+    Сводка просроченных и предстоящих сроков по организациям.
+
+    Использование:
+        service = DeadlineSummaryService(warning_days=14)
+        summary = service.get_summary(request.user, request, organization=selected_org)
+        summary['equipment']['overdue']  # список Equipment
+    """
+
+    def __init__(self, warning_days=14, today=None):
+        self.warning_days = warning_days
+        self.today = today or timezone.now().date()
+
+    # ------------------------------------------------------------------
+    # Инвалидация
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def invalidate(organization_id):
+        """Сбрасывает кэш сводки организации (новая версия ключа)"""
+        if organization_id:
+            cache.set(ORG_VERSION_KEY % organization_id, time.time_ns(), None)
+
+    @staticmethod
+    def invalidate_all():
+        """Сбрасывает кэш сводок всех организаций (например, после изменения эталонных норм)"""
+        cache.set(GLOBAL_VERSION_KEY, time.time_ns(), None)
+
+    @staticmethod
+    def _version(key):
+        return cache.get_or_set(key, time.time_ns(), None)
+
+    def _cache_key(self, organization_id):
+        version = '%s.%s' % (
+            self._version(GLOBAL_VERSION_KEY),
+            self._version(ORG_VERSION_KEY % organization_id),
+        )
+        return SUMMARY_KEY % (organization_id, version, self.today.isoformat(), self.warning_days)
+
+    # ------------------------------------------------------------------
+    # Расчёт
+    # ------------------------------------------------------------------
+
+    def build_summary(self, equipment_qs, items_qs, employees_qs):
+        """
+        Считает сводку по переданным queryset (уже отфильтрованным по организации/правам).
+        """
+        today = self.today
+        summary = _empty_summary()
+        # Сотрудники для выборки СИЗ - до фильтров медосмотров ниже
+        siz_employees = employees_qs.order_by().values('pk')
+
+        # ОБОРУДОВАНИЕ: только строки со сроком ТО не позже today + warning_days
+        equipment_qs = equipment_qs.select_related('organization', 'subdivision', 'department')
+        due_equipment = list(equipment_qs.due_within(self.warning_days, today).order_by('next_maintenance_date'))
+        summary['equipment'] = {
+            'total': equipment_qs.count(),
+            'overdue': [eq for eq in due_equipment if eq.next_maintenance_date < today],
+            'upcoming': [eq for eq in due_equipment if eq.next_maintenance_date >= today],
+        }
+
+        # КЛЮЧЕВЫЕ СРОКИ
+        items_qs = items_qs.filter(is_active=True).select_related('category', 'organization')
+        due_items = list(items_qs.due_within(self.warning_days, today).order_by('next_date', 'name'))
+        summary['deadlines'] = {
+            'total': items_qs.count(),
+            'overdue': [item for item in due_items if item.next_date < today],
+            'upcoming': [item for item in due_items if item.next_date >= today],
+        }
+
+        # МЕДИЦИНСКИЕ ОСМОТРЫ: статус считается из даты прохождения и минимальной
+        # периодичности факторов, поэтому по next_date не фильтруется
+        position_names_with_norms = MedicalExaminationNorm.objects.values_list(
+            'position_name', flat=True
+        ).distinct()
+        employees_qs = employees_qs.exclude(
+            status__in=['candidate', 'fired']
+        ).filter(
+            Q(position__medical_factors__isnull=False) |  # Есть переопределения
+            Q(position__position_name__in=position_names_with_norms)  # Есть в эталонах
+        ).select_related(
+            'organization',
+            'position'
+        ).prefetch_related(
+            'medical_examinations__harmful_factor',
+            'position__medical_factors__harmful_factor'
+        ).distinct()  # ВАЖНО: distinct() в конце, после всех JOIN-ов
+
+        reference_norms = MedicalExaminationNorm.get_factors_by_position_name()
+        medical_total = 0
+        overdue_medical = []
+        upcoming_medical = []
+        for employee in employees_qs:
+            medical_total += 1
+            medical_status = employee.get_medical_status(reference_norms)
+            if not medical_status or medical_status['status'] not in ('expired', 'upcoming'):
+                continue
+
+            employee.medical_status_info = medical_status
+            # Prefetch-данные в кэше не нужны - шаблону хватает medical_status_info
+            employee._prefetched_objects_cache = {}
+            employee.position._prefetched_objects_cache = {}
+            if medical_status['status'] == 'expired':
+                overdue_medical.append(employee)
+            else:
+                upcoming_medical.append(employee)
+
+        summary['medical'] = {
+            'total': medical_total,
+            'overdue': overdue_medical,
+            'upcoming': upcoming_medical,
+        }
+
+        # СИЗ: выдачи сотрудников из employees_qs (подзапрос), счётчики - одним
+        # агрегатом, списки - только ближайшие SIZ_LIST_LIMIT по индексу next_due_date
+        siz_qs = SIZIssued.objects.filter(employee__in=siz_employees).in_use()
+        siz_counts = siz_qs.aggregate(
+            total=Count('pk', filter=Q(next_due_date__isnull=False)),
+            overdue=Count('pk', filter=Q(next_due_date__lt=today)),
+            upcoming=Count('pk', filter=Q(next_due_date__range=(today, today + timedelta(days=self.warning_days)))),
+        )
+        due_siz = siz_qs.due_within(self.warning_days, today).select_related(
+            'siz', 'employee__organization'
+        ).order_by('next_due_date', 'pk')
+        summary['siz'] = {
+            'total': siz_counts['total'],
+            'overdue': list(due_siz.overdue(today)[:SIZ_LIST_LIMIT]) if siz_counts['overdue'] else [],
+            'upcoming': list(due_siz.filter(next_due_date__gte=today)[:SIZ_LIST_LIMIT])
+            if siz_counts['upcoming'] else [],
+            'overdue_count': siz_counts['overdue'],
+            'upcoming_count': siz_counts['upcoming'],
+        }
+        return summary
+
+    def get_org_summary(self, organization_id):
+        """Сводка по организации целиком (из кэша или с расчётом)"""
+        key = self._cache_key(organization_id)
+        summary = cache.get(key)
+        if summary is None:
+            started = time.perf_counter()
+            summary = self.build_summary(
+                Equipment.objects.filter(organization_id=organization_id),
+                KeyDeadlineItem.objects.filter(organization_id=organization_id),
+                Employee.objects.filter(organization_id=organization_id),
+            )
+            cache.set(key, summary, getattr(settings, 'DEADLINE_SUMMARY_CACHE_TIMEOUT', 300))
+            logger.debug(
+                "Сводка сроков для организации %s рассчитана за %.0f мс",
+                organization_id, (time.perf_counter() - started) * 1000
+            )
+        return summary
+
+    def get_summary(self, user, request=None, organization=None):
+        """
+        Сводка по всем доступным пользователю организациям (или по одной выбранной).
+
+        Организации с полным доступом берутся из кэша, остальные
+        (доступ к отдельным подразделениям/отделам) считаются без кэша.
+        """
+        accessible_orgs = AccessControlHelper.get_accessible_organizations(user, request)
+        if organization is not None:
+            org_ids = [organization.pk]
+        else:
+            org_ids = list(accessible_orgs.values_list('pk', flat=True))
+
+        if user.is_superuser:
+            full_access_ids = set(org_ids)
+        elif hasattr(user, 'profile'):
+            full_access_ids = set(user.profile.organizations.values_list('pk', flat=True))
+        else:
+            full_access_ids = set()
+
+        summaries = [self.get_org_summary(org_id) for org_id in org_ids if org_id in full_access_ids]
+
+        partial_ids = [org_id for org_id in org_ids if org_id not in full_access_ids]
+        if partial_ids:
+            summaries.append(self.build_summary(
+                AccessControlHelper.filter_queryset(
+                    Equipment.objects.filter(organization_id__in=partial_ids), user, request
+                ),
+                AccessControlHelper.filter_queryset(
+                    KeyDeadlineItem.objects.filter(organization_id__in=partial_ids), user, request
+                ),
+                AccessControlHelper.filter_queryset(
+                    Employee.objects.filter(organization_id__in=partial_ids), user, request
+                ),
+            ))
+
+        return self.merge(summaries)
+
+    @staticmethod
+    def merge(summaries):
+        """Объединяет сводки нескольких организаций"""
+        merged = _empty_summary()
+        for summary in summaries:
+            for section in SUMMARY_SECTIONS:
+                for key, value in summary[section].items():
+                    if isinstance(value, list):
+                        merged[section][key].extend(value)
+                    else:
+                        merged[section][key] += value
+
+        if len(summaries) > 1:
+            for key in ('overdue', 'upcoming'):
+                merged['equipment'][key].sort(key=lambda eq: eq.next_maintenance_date)
+                merged['deadlines'][key].sort(key=lambda item: (item.next_date, item.name))
+                merged['medical'][key].sort(key=lambda emp: emp.medical_status_info['next_date'])
+                merged['siz'][key].sort(key=lambda item: (item.next_due_date, item.pk))
+                del merged['siz'][key][SIZ_LIST_LIMIT:]
+        return merged
@@ -0,0 +1,71 @@
+"""
+☢️ Вредные факторы сотрудников пачкой
+
+Факторы сотрудника - переопределения его должности (PositionMedicalFactor,
+не отключённые), а если их нет - эталонные нормы по названию должности.
+Для пачки сотрудников это префетч переопределений и один запрос эталонных
+норм, вместо двух запросов на каждого сотрудника.
+"""
+from deadline_control.models import EmployeeMedicalExamination, MedicalExaminationNorm
+
+EMPLOYEE_PREFETCH = 'position__medical_factors__harmful_factor'
+
+
+class HarmfulFactorResolver:
+    """
+    Вредные факторы для пачки сотрудников: переопределения должности
+    (PositionMedicalFactor, не отключённые), а если их нет - эталонные нормы
+    по названию должности.
+
+    Использование:
+        employees = employees.prefetch_related(EMPLOYEE_PREFETCH)
+        resolver = HarmfulFactorResolver.for_employees(employees)
+        factors = resolver.factors_for(employee)
+    """
+
+    def __init__(self, reference_norms):
+        self.reference_norms = reference_norms
+
+    @classmethod
+    def for_employees(cls, employees):
+        position_names = {employee.position.position_name for employee in employees}
+        return cls(MedicalExaminationNorm.get_factors_by_position_name(position_names))
+
+    def factors_for(self, employee):
+        position = employee.position
+        overridden = [
+            pf.harmful_factor for pf in position.medical_factors.all() if not pf.is_disabled
+        ]
+        if overridden:
+            return overridden
+        return list(self.reference_norms.get(position.position_name, []))
+
+
+def ensure_medical_examinations(employees):
+    """
+    Создаёт недостающие записи EmployeeMedicalExamination (статус 'to_issue')
+    для вредных факторов сотрудников одним bulk_create.
+
+    Args:
+        employees: сотрудники с select_related('position') и префетчем EMPLOYEE_PREFETCH
+
+    Returns:
+        int: число созданных записей
+    """
+    employees = list(employees)
+    resolver = HarmfulFactorResolver.for_employees(employees)
+    existing = set(
+        EmployeeMedicalExamination.objects.filter(employee__in=employees)
+        .values_list('employee_id', 'harmful_factor_id')
+    )
+
+    missing = []
+    for employee in employees:
+        for factor in resolver.factors_for(employee):
+            if (employee.pk, factor.pk) not in existing:
+                existing.add((employee.pk, factor.pk))
+                missing.append(EmployeeMedicalExamination(
+                    employee=employee, harmful_factor=factor, status='to_issue', is_disabled=False,
+                ))
+    EmployeeMedicalExamination.objects.bulk_create(missing)
+    return len(missing)
@@ -0,0 +1,199 @@
+"""
+🧹 Хранение и очистка логов рассылок и генерации документов.
+
+У каждого типа лога свой срок хранения (настройки *_TTL_DAYS, 0 - хранить
+бессрочно). Записи старше срока удаляются пачками по LOG_PURGE_BATCH_SIZE:
+каждая пачка - отдельная короткая транзакция, в которой статистика пачки
+сначала прибавляется к месячной сводке SendLogMonthlySummary (тип лога,
+организация, месяц), а затем сами записи удаляются вместе с деталями.
+Поэтому блокировки держатся миллисекунды, а прерванная очистка просто
+продолжается со следующего запуска без двойного учёта.
+
+Вместо секционирования таблиц (на SQLite недоступно) старые данные
+"сжимаются" в месячные сводки, а свежие выбираются по индексу created_at.
+"""
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from deadline_control.models import (
+    EquipmentJournalSendDetail,
+    EquipmentJournalSendLog,
+    InstructionJournalSendDetail,
+    InstructionJournalSendLog,
+    KeyDeadlineSendLog,
+    MedicalNotificationSendDetail,
+    MedicalNotificationSendLog,
+    SendLogMonthlySummary,
+)
+from directory.models import DocumentGenerationLog
+
+logger = logging.getLogger(__name__)
+
+SEND_COUNTERS = ('successful_count', 'failed_count', 'skipped_count')
+
+# Описание типов логов: модель, детали, путь к организации, срок хранения и
+# дополнительные счётчики, которые суммируются в SendLogMonthlySummary.extra
+LOG_TYPES = {
+    'instruction_journal': {
+        'model': InstructionJournalSendLog,
+        'detail_model': InstructionJournalSendDetail,
+        'organization': 'organization_id',
+        'ttl_setting': 'INSTRUCTION_SEND_LOG_TTL_DAYS',
+        'extra': ('total_subdivisions',),
+    },
+    'equipment_journal': {
+        'model': EquipmentJournalSendLog,
+        'detail_model': EquipmentJournalSendDetail,
+        'organization': 'organization_id',
+        'ttl_setting': 'EQUIPMENT_SEND_LOG_TTL_DAYS',
+        'extra': ('total_subdivisions',),
+    },
+    'medical': {
+        'model': MedicalNotificationSendLog,
+        'detail_model': MedicalNotificationSendDetail,
+        'organization': 'organization_id',
+        'ttl_setting': 'MEDICAL_SEND_LOG_TTL_DAYS',
+        'extra': ('no_date_count', 'expired_count', 'upcoming_count'),
+    },
+    'key_deadline': {
+        'model': KeyDeadlineSendLog,
+        'detail_model': None,
+        'organization': 'organization_id',
+        'ttl_setting': 'KEY_DEADLINE_SEND_LOG_TTL_DAYS',
+        'extra': ('overdue_items_count', 'upcoming_items_count', 'recipients_count'),
+    },
+    'document_generation': {
+        'model': DocumentGenerationLog,
+        'detail_model': None,
+        'organization': 'employee__organization_id',
+        'ttl_setting': 'DOCUMENT_GENERATION_LOG_TTL_DAYS',
+        'extra': (),
+    },
+}
+
+
+class SendLogRetention:
+    """
+    Использование:
+        retention = SendLogRetention()
+        retention.pending('medical')         # сколько записей старше срока
+        retention.purge('medical')           # {'deleted': N, 'details': M, 'batches': K}
+        retention.purge_all()                # по всем типам
+    """
+
+    def __init__(self, batch_size=None, sleep=0, now=None, ttl_days=None):
+        self.batch_size = batch_size or getattr(settings, 'LOG_PURGE_BATCH_SIZE', 500)
+        self.sleep = sleep
+        self.now = now or timezone.now()
+        # Общий срок для всех типов вместо настроек (--days команды)
+        self.ttl_days = ttl_days
+
+    def get_ttl_days(self, log_type):
+        if self.ttl_days is not None:
+            return self.ttl_days
+        return getattr(settings, LOG_TYPES[log_type]['ttl_setting'], 0)
+
+    def cutoff(self, log_type):
+        """Граница удаления или None, если тип хранится бессрочно"""
+        days = self.get_ttl_days(log_type)
+        if not days or days <= 0:
+            return None
+        return self.now - timedelta(days=days)
+
+    def expired_queryset(self, log_type):
+        cutoff = self.cutoff(log_type)
+        model = LOG_TYPES[log_type]['model']
+        if cutoff is None:
+            return model.objects.none()
+        return model.objects.filter(created_at__lt=cutoff)
+
+    def pending(self, log_type):
+        return self.expired_queryset(log_type).count()
+
+    def purge(self, log_type):
+        """Сворачивает в месячные сводки и удаляет просроченные записи пачками"""
+        result = {'deleted': 0, 'details': 0, 'batches': 0}
+        expired = self.expired_queryset(log_type)
+
+        while True:
+            with transaction.atomic():
+                pks = list(expired.order_by('created_at').values_list('pk', flat=True)[:self.batch_size])
+                if not pks:
+                    break
+                result['details'] += self._rollup(log_type, pks)
+                LOG_TYPES[log_type]['model'].objects.filter(pk__in=pks).delete()
+            result['deleted'] += len(pks)
+            result['batches'] += 1
+            if len(pks) < self.batch_size:
+                break
+            if self.sleep:
+                time.sleep(self.sleep)
+
+        if result['deleted']:
+            logger.info(
+                "Очистка логов %s: удалено %s записей (%s детальных) за %s пачек",
+                log_type, result['deleted'], result['details'], result['batches'],
+            )
+        return result
+
+    def purge_all(self, log_types=None):
+        return {log_type: self.purge(log_type) for log_type in (log_types or LOG_TYPES)}
+
+    def _rollup(self, log_type, pks):
+        """Прибавляет статистику пачки к SendLogMonthlySummary; возвращает число деталей"""
+        config = LOG_TYPES[log_type]
+        model = config['model']
+        is_send_log = log_type != 'document_generation'
+
+        fields = ['pk', 'created_at', config['organization'], *config['extra']]
+        if is_send_log:
+            fields += ['status', *SEND_COUNTERS]
+        else:
+            fields.append('document_types')
+
+        details_by_log = {}
+        if config['detail_model'] is not None:
+            details_by_log = dict(
+                config['detail_model'].objects.filter(send_log_id__in=pks)
+                .values('send_log_id').annotate(total=Count('pk')).values_list('send_log_id', 'total')
+            )
+
+        buckets = {}
+        for row in model.objects.filter(pk__in=pks).values(*fields):
+            month = timezone.localtime(row['created_at']).date().replace(day=1)
+            bucket = buckets.setdefault((row[config['organization']], month), {
+                'runs_count': 0, 'details_count': 0, 'status_counts': {}, 'extra': {},
+                **{counter: 0 for counter in SEND_COUNTERS},
+            })
+            bucket['runs_count'] += 1
+            bucket['details_count'] += details_by_log.get(row['pk'], 0)
+            if is_send_log:
+                for counter in SEND_COUNTERS:
+                    bucket[counter] += row[counter] or 0
+                bucket['status_counts'][row['status']] = bucket['status_counts'].get(row['status'], 0) + 1
+            else:
+                bucket['extra']['documents'] = bucket['extra'].get('documents', 0) + len(row['document_types'] or [])
+            for name in config['extra']:
+                bucket['extra'][name] = bucket['extra'].get(name, 0) + (row[name] or 0)
+
+        for (organization_id, month), bucket in buckets.items():
+            summary = SendLogMonthlySummary.objects.select_for_update().filter(
+                log_type=log_type, organization_id=organization_id, month=month,
+            ).first() or SendLogMonthlySummary(log_type=log_type, organization_id=organization_id, month=month)
+
+            for name in ('runs_count', 'details_count', *SEND_COUNTERS):
+                setattr(summary, name, getattr(summary, name) + bucket[name])
+            for key in ('status_counts', 'extra'):
+                merged = dict(getattr(summary, key) or {})
+                for name, value in bucket[key].items():
+                    merged[name] = merged.get(name, 0) + value
+                setattr(summary, key, merged)
+            summary.save()
+
+        return sum(details_by_log.values())
@@ -0,0 +1,222 @@
+"""
+📋 Пакетная выдача направлений на медосмотр
+
+Выбранным в списке медосмотров сотрудникам направления выдаются одним
+запросом. Вредные факторы определяются для всех сотрудников сразу
+(префетч переопределений должностей + эталонные нормы одним запросом),
+записи MedicalReferral и их факторы создаются через bulk_create, а шаблон
+направления читается с диска один раз на организацию. Результат -
+ZIP-архив с отдельными файлами или один DOCX (docxcompose), где каждое
+направление начинается с новой страницы.
+"""
+import io
+import os
+import zipfile
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from deadline_control.models import MedicalReferral, MedicalSettings
+from directory.models import Employee
+
+from .harmful_factors import EMPLOYEE_PREFETCH, HarmfulFactorResolver
+
+try:
+    from docxtpl import DocxTemplate
+    from docxcompose.composer import Composer
+    DOCXTPL_AVAILABLE = True
+except ImportError:
+    DOCXTPL_AVAILABLE = False
+
+# Эталонные шаблоны в порядке предпочтения (исправленный, затем исходный)
+ETALON_TEMPLATE_NAMES = ('napravlenie_blank_fixed.docx', 'napravlenie_blank.docx')
+
+OUTPUT_FORMATS = ('zip', 'docx')
+
+
+def resolve_referral_template_path(organization):
+    """Шаблон направления из настроек организации или эталонный"""
+    medical_settings = MedicalSettings.get_settings(organization)
+    if medical_settings and medical_settings.referral_template:
+        return medical_settings.referral_template.path
+
+    etalon_dir = os.path.join(settings.MEDIA_ROOT, 'document_templates', 'etalon')
+    for name in ETALON_TEMPLATE_NAMES:
+        template_path = os.path.join(etalon_dir, name)
+        if os.path.exists(template_path):
+            return template_path
+    return os.path.join(etalon_dir, ETALON_TEMPLATE_NAMES[-1])
+
+
+def build_referral_context(organization, full_name, birth_date, address, position_name,
+                           harmful_factors, issue_date):
+    """Контекст шаблона направления"""
+    name_parts = full_name.split()
+    factors_list = [factor.full_name for factor in harmful_factors]
+    return {
+        'organization_name': organization.full_name_ru,
+        'organization_name_by': getattr(organization, 'full_name_by', organization.full_name_ru),
+        'requisites_ru': getattr(organization, 'requisites_ru', ''),
+        'requisites_by': getattr(organization, 'requisites_by', ''),
+        'last_name': name_parts[0] if len(name_parts) > 0 else '',
+        'first_name': ' '.join(name_parts[1:]) if len(name_parts) > 1 else '',
+        'full_name': full_name,
+        'date_of_birth': birth_date.strftime('%d.%m.%Y'),
+        'address': address,
+        'position_name': position_name,
+        'harmful_factors': '\n'.join(factors_list) if factors_list else 'Не определены',
+        'issue_date': issue_date.strftime('%d.%m.%Y'),
+    }
+
+
+def referral_save_dir(*parts):
+    """Каталог MEDIA_ROOT/medical_referrals/[...]/ГГГГ/ММ, создаётся при необходимости"""
+    now = timezone.now()
+    save_dir = os.path.join(
+        settings.MEDIA_ROOT, 'medical_referrals', *parts, str(now.year), str(now.month).zfill(2)
+    )
+    os.makedirs(save_dir, exist_ok=True)
+    return save_dir
+
+
+class MedicalReferralBatch:
+    """
+    Использование:
+        batch = MedicalReferralBatch(request.user, output='zip')
+        result = batch.generate(employee_ids)
+        # {'content': bytes, 'filename': str, 'content_type': str,
+        #  'referrals': [MedicalReferral], 'skipped': [(employee, причина)]}
+    """
+
+    CONTENT_TYPES = {
+        'zip': 'application/zip',
+        'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    }
+
+    def __init__(self, user, output='zip', issue_date=None):
+        if output not in OUTPUT_FORMATS:
+            raise ValueError(f"Неизвестный формат: {output}")
+        self.user = user
+        self.output = output
+        self.issue_date = issue_date or timezone.now().date()
+
+    def get_employees(self, employee_ids):
+        return list(
+            Employee.objects.filter(pk__in=employee_ids)
+            .select_related('organization', 'position')
+            .prefetch_related(EMPLOYEE_PREFETCH)
+            .order_by('organization_id', 'full_name_nominative')
+        )
+
+    @staticmethod
+    def skip_reason(employee):
+        """Причина, по которой направление нельзя заполнить автоматически"""
+        if not employee.date_of_birth:
+            return 'не указана дата рождения'
+        if not (employee.place_of_residence or '').strip():
+            return 'не указано место проживания'
+        return None
+
+    def generate(self, employee_ids):
+        if not DOCXTPL_AVAILABLE:
+            raise RuntimeError('Библиотеки docxtpl/docxcompose не установлены')
+
+        employees, skipped = [], []
+        for employee in self.get_employees(employee_ids):
+            reason = self.skip_reason(employee)
+            if reason:
+                skipped.append((employee, reason))
+            else:
+                employees.append(employee)
+
+        # Шаблоны читаются до записи в БД: нет шаблона - нет и направлений
+        templates = {}
+        for employee in employees:
+            if employee.organization_id not in templates:
+                template_path = resolve_referral_template_path(employee.organization)
+                if not os.path.exists(template_path):
+                    raise FileNotFoundError(f"Шаблон направления не найден: {template_path}")
+                with open(template_path, 'rb') as template_file:
+                    templates[employee.organization_id] = DocxTemplate(io.BytesIO(template_file.read()))
+
+        resolver = HarmfulFactorResolver.for_employees(employees)
+        factors = {employee.pk: resolver.factors_for(employee) for employee in employees}
+
+        with transaction.atomic():
+            referrals = MedicalReferral.objects.bulk_create([
+                MedicalReferral(
+                    employee=employee,
+                    employee_birth_date=employee.date_of_birth,
+                    employee_address=employee.place_of_residence.strip(),
+                    issue_date=self.issue_date,
+                    issued_by=self.user,
+                )
+                for employee in employees
+            ])
+            Through = MedicalReferral.harmful_factors.through
+            Through.objects.bulk_create([
+                Through(medicalreferral_id=referral.pk, harmfulfactor_id=factor.pk)
+                for referral in referrals
+                for factor in factors[referral.employee_id]
+            ])
+
+            documents = self._render(referrals, templates, factors)
+            MedicalReferral.objects.bulk_update(referrals, ['document'])
+
+        return {
+            'content': self._pack(documents),
+            'filename': self._filename(),
+            'content_type': self.CONTENT_TYPES[self.output],
+            'referrals': referrals,
+            'skipped': skipped,
+        }
+
+    def _render(self, referrals, templates, factors):
+        """Заполняет шаблон для каждого направления; возвращает [(имя в архиве, байты, docx)]"""
+        save_dir = referral_save_dir()
+        documents = []
+        for referral in referrals:
+            employee = referral.employee
+            template = templates[employee.organization_id]
+            template.render(build_referral_context(
+                employee.organization,
+                employee.full_name_nominative,
+                referral.employee_birth_date,
+                referral.employee_address,
+                employee.position.position_name,
+                factors[employee.pk],
+                referral.issue_date,
+            ))
+
+            content = io.BytesIO()
+            template.save(content)
+            safe_name = employee.full_name_nominative.replace(' ', '_')
+            filepath = os.path.join(save_dir, f"referral_{referral.pk}_{safe_name}.docx")
+            with open(filepath, 'wb') as document_file:
+                document_file.write(content.getvalue())
+            referral.document.name = os.path.relpath(filepath, settings.MEDIA_ROOT)
+
+            # Следующий render() перечитывает шаблон из памяти в новый объект,
+            # поэтому docx этого направления можно дописать в общий файл
+            documents.append((
+                f"Направление_на_МО_{safe_name}_{referral.pk}.docx", content.getvalue(), template.docx,
+            ))
+        return documents
+
+    def _pack(self, documents):
+        buffer = io.BytesIO()
+        if self.output == 'zip':
+            with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+                for name, content, _ in documents:
+                    zip_file.writestr(name, content)
+        elif documents:
+            composer = Composer(documents[0][2])
+            for _, _, document in documents[1:]:
+                composer.doc.add_page_break()
+                composer.append(document)
+            composer.save(buffer)
+        return buffer.getvalue()
+
+    def _filename(self):
+        return f"Направления_на_МО_{self.issue_date.strftime('%d.%m.%Y')}.{self.output}"
@@ -0,0 +1,183 @@
+"""
+🔄 Пересчёт статусов медосмотров сотрудников.
+
+Правила:
+- "Пройден" с датой следующего медосмотра в ближайшие N дней (N -
+  days_before_issue из настроек организации) → "Нужно выдать направление";
+- "Пройден" / "к выдаче" с прошедшей датой → "Просрочен".
+
+Полный режим проверяет всю таблицу. Инкрементальный берёт за водяной знак
+последний успешный запуск (MedicalStatusRun) и выбирает только:
+- записи, дата которых с тех пор пересекла границу статуса: next_date в
+  [дата прошлого запуска, сегодня) - стали просроченными, next_date в
+  (дата прошлого запуска + N, сегодня + N] - вошли в окно "к выдаче";
+- записи, изменённые после начала прошлого запуска (индекс updated_at);
+- все записи организаций, у которых изменился срок N или которых не было
+  в прошлом запуске.
+Выборки - диапазоны по индексу next_date, организации с одинаковым N
+объединяются в один запрос. Статус меняется пачками UPDATE ... WHERE id IN
+с повторной проверкой исходного статуса, поэтому правка записи во время
+пересчёта не затирается.
+"""
+import logging
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from deadline_control.models import EmployeeMedicalExamination, MedicalSettings, MedicalStatusRun
+from deadline_control.models.querysets import BULK_UPDATE_BATCH_SIZE, deadlines_bulk_updated
+from directory.models import Organization
+
+logger = logging.getLogger(__name__)
+
+# Из каких статусов возможен переход
+EXPIRE_FROM = ('completed', 'to_issue')
+ISSUE_FROM = ('completed',)
+
+
+class MedicalStatusRecalculator:
+    """
+    Использование:
+        run = MedicalStatusRecalculator().run()             # инкрементально, с записью в историю
+        run = MedicalStatusRecalculator().run(full=True)    # полный пересчёт, с записью в историю
+        result = MedicalStatusRecalculator().recalculate()  # полный пересчёт без истории
+    """
+
+    def __init__(self, today=None, chunk_size=None):
+        self.today = today or timezone.now().date()
+        self.chunk_size = chunk_size or getattr(settings, 'MEDICAL_STATUS_CHUNK_SIZE', BULK_UPDATE_BATCH_SIZE)
+
+    @staticmethod
+    def last_run():
+        """Последний успешный запуск - водяной знак инкрементального режима"""
+        return MedicalStatusRun.objects.filter(status='success').order_by('-started_at').first()
+
+    @staticmethod
+    def load_windows():
+        """{id организации: дней до отметки к выдаче}; без настроек - значение по умолчанию"""
+        default = MedicalSettings._meta.get_field('days_before_issue').default
+        windows = dict.fromkeys(Organization.objects.values_list('pk', flat=True), default)
+        windows.update(
+            MedicalSettings.objects.filter(organization__isnull=False)
+            .values_list('organization_id', 'days_before_issue')
+        )
+        return windows
+
+    def target_status(self, status, next_date, days):
+        """Статус записи на сегодня по правилам пересчёта"""
+        if next_date < self.today and status in EXPIRE_FROM:
+            return 'expired'
+        if self.today < next_date <= self.today + timedelta(days=days) and status in ISSUE_FROM:
+            return 'to_issue'
+        return status
+
+    def run(self, full=False):
+        """Пересчёт с записью в историю; без full - инкрементально от последнего успешного запуска"""
+        previous = None if full else self.last_run()
+        # started_at фиксируется до чтения записей: всё, что изменится позже,
+        # следующий запуск увидит по updated_at
+        run = MedicalStatusRun.objects.create(mode='full', run_date=self.today, previous_run=previous)
+        try:
+            result = self.recalculate(previous)
+        except Exception as exc:
+            run.status = 'failed'
+            run.error = str(exc)
+            run.finished_at = timezone.now()
+            run.save(update_fields=['status', 'error', 'finished_at'])
+            raise
+
+        run.mode = result['mode']
+        run.scanned_count = result['scanned_count']
+        run.to_issue_updated = result['to_issue_updated']
+        run.expired_updated = result['expired_updated']
+        run.windows = {str(organization_id): days for organization_id, days in result['windows'].items()}
+        run.status = 'success'
+        run.finished_at = timezone.now()
+        run.save()
+        logger.info(
+            "Пересчёт статусов медосмотров (%s): проверено %s, к выдаче %s, просрочено %s",
+            run.mode, run.scanned_count, run.to_issue_updated, run.expired_updated,
+        )
+        return run
+
+    def recalculate(self, previous=None):
+        """
+        Пересчитывает статусы; previous - запуск-водяной знак (None - полный пересчёт).
+
+        Returns:
+            dict: mode, scanned_count, to_issue_updated, expired_updated, windows
+        """
+        windows = self.load_windows()
+        # Запуск "из будущего" (пересчёт на прошедшую дату) водяным знаком не считается
+        if previous is not None and previous.run_date > self.today:
+            previous = None
+        previous_windows = previous.windows if previous is not None else {}
+
+        groups = defaultdict(list)
+        for organization_id, days in windows.items():
+            incremental = previous_windows.get(str(organization_id)) == days
+            groups[(days, incremental)].append(organization_id)
+
+        expire, issue = {}, {}  # id записи -> id организации
+        for (days, incremental), organization_ids in groups.items():
+            exams = EmployeeMedicalExamination.objects.filter(employee__organization_id__in=organization_ids)
+            expired_range = Q(next_date__lt=self.today)
+            issue_range = Q(next_date__gt=self.today, next_date__lte=self.today + timedelta(days=days))
+            if incremental:
+                expired_range &= Q(next_date__gte=previous.run_date)
+                issue_range &= Q(next_date__gt=previous.run_date + timedelta(days=days))
+            expire.update(self._select(exams.filter(expired_range, status__in=EXPIRE_FROM)))
+            issue.update(self._select(exams.filter(issue_range, status__in=ISSUE_FROM)))
+        scanned = len(expire) + len(issue)
+
+        if previous is not None:
+            changed = (
+                EmployeeMedicalExamination.objects
+                .filter(updated_at__gte=previous.started_at, next_date__isnull=False, status__in=EXPIRE_FROM)
+                .order_by()
+                .values_list('pk', 'employee__organization_id', 'next_date', 'status')
+            )
+            for pk, organization_id, next_date, status in changed:
+                scanned += 1
+                days = windows.get(organization_id)
+                if days is None:
+                    continue
+                target = self.target_status(status, next_date, days)
+                if target == 'expired':
+                    expire[pk] = organization_id
+                elif target == 'to_issue':
+                    issue[pk] = organization_id
+
+        expired_updated = self._write(expire, 'expired', EXPIRE_FROM)
+        to_issue_updated = self._write(issue, 'to_issue', ISSUE_FROM)
+        if expired_updated or to_issue_updated:
+            deadlines_bulk_updated.send(
+                sender=EmployeeMedicalExamination,
+                organization_ids=set(expire.values()) | set(issue.values()),
+            )
+
+        return {
+            'mode': 'incremental' if previous is not None else 'full',
+            'scanned_count': scanned,
+            'to_issue_updated': to_issue_updated,
+            'expired_updated': expired_updated,
+            'windows': windows,
+        }
+
+    @staticmethod
+    def _select(queryset):
+        return dict(queryset.order_by().values_list('pk', 'employee__organization_id'))
+
+    def _write(self, targets, status, from_statuses):
+        """Меняет статус пачками по chunk_size; каждая пачка - отдельный короткий UPDATE"""
+        pks = sorted(targets)
+        updated = 0
+        for start in range(0, len(pks), self.chunk_size):
+            updated += EmployeeMedicalExamination.objects.filter(
+                pk__in=pks[start:start + self.chunk_size],
+                status__in=from_statuses,
+            ).update(status=status)
+        return updated
@@ -0,0 +1,58 @@
+# deadline_control/signals.py
+"""
+Сброс кэша сводки сроков (DeadlineSummaryService) при изменении данных,
+из которых она строится, и кэша получателей рассылок организации.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from deadline_control.models import (
+    EmailSettings,
+    EmployeeMedicalExamination,
+    Equipment,
+    KeyDeadlineItem,
+    MedicalExaminationNorm,
+    PositionMedicalFactor,
+)
+from deadline_control.models.querysets import deadlines_bulk_updated
+from deadline_control.services import DeadlineSummaryService
+from directory.models import Employee, SIZIssued
+from directory.utils.email_recipients import invalidate_organization_recipients
+
+
+@receiver([post_save, post_delete], sender=Equipment)
+@receiver([post_save, post_delete], sender=KeyDeadlineItem)
+@receiver([post_save, post_delete], sender=Employee)
+def invalidate_org_deadline_summary(sender, instance, **kwargs):
+    """ТО оборудования, ключевой срок или сотрудник изменились - сбрасываем сводку организации"""
+    DeadlineSummaryService.invalidate(instance.organization_id)
+
+
+@receiver(deadlines_bulk_updated)
+def invalidate_bulk_deadline_summaries(sender, organization_ids, **kwargs):
+    """Массовое обновление дат (bulk_update без post_save) - сбрасываем сводки затронутых организаций"""
+    for organization_id in organization_ids:
+        DeadlineSummaryService.invalidate(organization_id)
+
+
+@receiver([post_save, post_delete], sender=EmployeeMedicalExamination)
+@receiver([post_save, post_delete], sender=SIZIssued)
+def invalidate_employee_deadline_summary(sender, instance, **kwargs):
+    """Изменились даты медосмотра или выдача СИЗ - сбрасываем сводку организации сотрудника"""
+    organization_id = (
+        Employee.objects.filter(pk=instance.employee_id).values_list('organization_id', flat=True).first()
+    )
+    DeadlineSummaryService.invalidate(organization_id)
+
+
+@receiver([post_save, post_delete], sender=MedicalExaminationNorm)
+@receiver([post_save, post_delete], sender=PositionMedicalFactor)
+def invalidate_all_deadline_summaries(sender, instance, **kwargs):
+    """Нормы медосмотров влияют на статусы во всех организациях"""
+    DeadlineSummaryService.invalidate_all()
+
+
+@receiver([post_save, post_delete], sender=EmailSettings)
+def invalidate_email_recipients(sender, instance, **kwargs):
+    """Изменились получатели в настройках email - сбрасываем кэшированные списки организации"""
+    invalidate_organization_recipients(instance.organization_id)
@@ -0,0 +1,21 @@
+"""
+📅 Расчёт дат следующих сроков.
+
+Одна реализация "прибавить N месяцев" для ТО оборудования, ключевых сроков
+и медосмотров. Результат кэшируется: при массовом проведении (500 медосмотров
+одной датой) различных пар (дата, периодичность) всего несколько.
+"""
+import calendar
+from functools import lru_cache
+
+
+@lru_cache(maxsize=4096)
+def add_months(source_date, months):
+    """
+    Прибавляет к дате заданное число месяцев, корректно обрабатывая конец месяца.
+    """
+    month = source_date.month - 1 + months
+    year = source_date.year + month // 12
+    month = month % 12 + 1
+    day = min(source_date.day, calendar.monthrange(year, month)[1])
+    return source_date.replace(year=year, month=month, day=day)
@@ -0,0 +1,230 @@
+"""
+📨 Компилированные шаблоны писем.
+
+Тема и текст EmailTemplate используют переменные в фигурных скобках
+({organization_name}); раньше они подставлялись через str.format при каждой
+отправке, и любая одиночная скобка в HTML из CKEditor (CSS, JSON) роняла
+рассылку. Здесь шаблон один раз разбирается в список "текст / переменная"
+и кэшируется по исходному тексту (то есть до следующей правки шаблона):
+
+- {name}  - переменная (name - латиница, цифры, подчёркивание);
+- {{ и }} - литеральные скобки, как в str.format;
+- любые другие скобки остаются в тексте как есть.
+
+Django-шаблоны на секциях в 5000 строк оказались в десятки раз медленнее
+f-строк, поэтому секции уведомлений собираются из таких же компилированных
+подшаблонов (SECTION_TEMPLATE, GROUP_TEMPLATE, карточка row_template()).
+Значения экранируются, уже готовый HTML передаётся как SafeString.
+Строки секций (render_rows, render_into) не проверяют каждое значение:
+пользовательские поля экранируются заранее (escape_fields), а куски всех
+строк склеиваются уже при сборке секции (HtmlChunks).
+"""
+import html
+import re
+from functools import lru_cache
+from itertools import repeat
+
+from django.utils.safestring import SafeData
+
+TOKEN_RE = re.compile(r'\{\{|\}\}|\{([A-Za-z_][A-Za-z0-9_]*)\}')
+
+
+class MissingTemplateVariable(KeyError):
+    """В контексте нет переменной, используемой шаблоном (KeyError - как у str.format)"""
+
+
+class HtmlChunks(SafeData, list):
+    """
+    Готовый HTML строк секции, не склеенный в одну строку (render_rows):
+    render() вставляет куски как есть, и мегабайтная секция не копируется
+    лишний раз перед сборкой письма.
+    """
+
+    __slots__ = ()
+
+    def __str__(self):
+        return ''.join(self)
+
+    __html__ = __str__
+
+
+class CompiledTemplate:
+    """
+    Шаблон, разобранный на пары (текст перед переменной, имя переменной) и
+    хвост: render() только склеивает строки, исходный текст не разбирается.
+    """
+
+    __slots__ = ('pairs', 'tail', 'variables', 'escape')
+
+    def __init__(self, source, escape=False):
+        pairs, literal = [], []
+        position = 0
+        for match in TOKEN_RE.finditer(source):
+            literal.append(source[position:match.start()])
+            name = match.group(1)
+            if name is None:
+                literal.append(match.group(0)[0])  # {{ / }} - литеральная скобка
+            else:
+                pairs.append((''.join(literal), name))
+                literal = []
+            position = match.end()
+        literal.append(source[position:])
+
+        self.pairs = tuple(pairs)
+        self.tail = ''.join(literal)
+        self.variables = frozenset(name for _, name in pairs)
+        self.escape = escape
+
+    def render(self, context):
+        chunks = []
+        append = chunks.append
+        for literal, name in self.pairs:
+            append(literal)
+            try:
+                value = context[name]
+            except KeyError:
+                raise MissingTemplateVariable(name) from None
+            if isinstance(value, HtmlChunks):
+                chunks.extend(value)
+            elif isinstance(value, SafeData):
+                append(value)  # join принимает SafeString без копии (секции - мегабайты)
+            elif not self.escape or isinstance(value, int):
+                append(str(value))
+            else:
+                append(html.escape(str(value)))
+        append(self.tail)
+        return ''.join(chunks)
+
+    def render_into(self, chunks, context):
+        """
+        Дописывает строку секции в общий список chunks (склейка - одна на
+        секцию) без проверок значений: context уже экранирован
+        (escape_fields для пользовательских полей; даты, числа и SafeString -
+        как есть).
+        """
+        append = chunks.append
+        try:
+            for literal, name in self.pairs:
+                append(literal)
+                append(str(context[name]))
+        except KeyError as exc:
+            raise MissingTemplateVariable(exc.args[0]) from None
+        append(self.tail)
+
+
+def escape_fields(rows, names):
+    """Экранирует пользовательские поля names во всех строках секции (на месте)"""
+    escape = html.escape
+    for row in rows:
+        for name in names:
+            if name in row:
+                row[name] = escape(str(row[name]))
+    return rows
+
+
+@lru_cache(maxsize=4096)
+def format_date(value):
+    """Дата для карточки (дд.мм.гггг); в секции даты повторяются, strftime - один раз на дату"""
+    return value.strftime('%d.%m.%Y')
+
+
+@lru_cache(maxsize=256)
+def compile_template(source, escape=False):
+    """Компилирует шаблон один раз на каждую версию текста"""
+    return CompiledTemplate(source or '', escape=escape)
+
+
+def render_email_template(source, context):
+    """
+    Подставляет переменные в тему/текст письма.
+
+    Raises:
+        MissingTemplateVariable: в context нет переменной из шаблона
+    """
+    return compile_template(source).render(context)
+
+
+def find_variables(source):
+    """Имена переменных, используемых в шаблоне"""
+    return compile_template(source).variables
+
+
+def render_rows(template, rows):
+    """
+    Собирает строки секции по подшаблону (или списку подшаблонов - по одному
+    на строку); значения строк уже экранированы (escape_fields), результат
+    безопасен для вставки в другой подшаблон.
+    """
+    templates = template if isinstance(template, list) else repeat(template)
+    chunks = HtmlChunks()
+    for compiled, row in zip(templates, rows):
+        compiled.render_into(chunks, row)
+    return chunks
+
+
+def line(label, variable, suffix=''):
+    """Исходник строки карточки: "<strong>Метка:</strong> {переменная}" """
+    return f'<strong>{label}:</strong> {{{variable}}}{suffix}'
+
+
+def accent_line(color, label, variable, suffix=''):
+    """Исходник выделенной цветом строки карточки"""
+    return (
+        f'<strong style="color: {color};">{label}:</strong> '
+        f'<span style="color: {color}; font-weight: 600;">{{{variable}}}{suffix}</span>'
+    )
+
+
+def row_template(border_color, lines):
+    """
+    Подшаблон карточки (ROW_SOURCE) с цветом и строками, подставленными при
+    компиляции: на каждую строку секции остаётся один render_into().
+    """
+    source = ROW_SOURCE.replace('[border_color]', border_color).replace('[lines]', '<br>'.join(lines))
+    return compile_template(source, escape=True)
+
+
+# Общие подшаблоны HTML-секций уведомлений (медосмотры, ключевые мероприятия)
+SECTION_TEMPLATE = compile_template("""
+        <div style="background-color: {bg_color}; border-left: 4px solid {border_color}; padding: 20px; margin: 20px 0; border-radius: 5px;">
+            <h3 style="color: {title_color}; margin-top: 0;">
+                {emoji} {title}
+            </h3>
+            {rows}
+        </div>
+""", escape=True)
+
+GROUP_TEMPLATE = compile_template("""
+            <div style="margin: 15px 0;">
+                <h4 style="color: {title_color}; margin: 10px 0; font-size: 15px;">
+                    {icon} {title} ({count})
+                </h4>
+                {rows}
+            </div>
+""", escape=True)
+
+# Карточка строки секции; [border_color] и [lines] подставляет row_template()
+ROW_SOURCE = """
+            <div style="background-color: white; padding: 15px; margin: 10px 0; border-radius: 5px; border-left: 3px solid [border_color];">
+                <div style="font-weight: 600; font-size: 16px; color: #333; margin-bottom: 8px;">
+                    {title}
+                </div>
+                <div style="color: #666; font-size: 14px; line-height: 1.6;">
+                    [lines]
+                </div>
+            </div>
+"""
+
+BUTTON_TEMPLATE = compile_template("""
+        <div style="margin: 20px 0 30px; text-align: center; padding: 20px; background-color: {bg_color}; border-radius: 8px;">
+            <p style="margin: 0 0 15px; color: {title_color}; font-weight: 600; font-size: 15px;">
+                {text}
+            </p>
+            <a href="{url}"
+               style="display: inline-block; background-color: {button_color}; color: white; padding: 15px 40px;
+                      text-decoration: none; border-radius: 8px; font-size: 16px; font-weight: 600;
+                      box-shadow: 0 4px 6px rgba(0,0,0,0.15); transition: background-color 0.3s;">
+                {label}
+            </a>
+        </div>
+""", escape=True)
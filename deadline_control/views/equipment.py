@@ -13,6 +13,7 @@ from datetime import date
 
 from deadline_control.models import Equipment
 from deadline_control.forms import EquipmentForm
+from deadline_control.utils.email_templates import render_email_template
 from directory.mixins import AccessControlMixin, AccessControlObjectMixin
 from directory.utils.permissions import AccessControlHelper
 from directory.models import Organization
@@ -668,8 +669,8 @@ def send_equipment_journal_sample(request, subdivision_id):
         messages.error(request, "Шаблон письма не настроен")
         return redirect('deadline_control:equipment:journal')
 
-    subject = template_data[0].format(**template_vars)
-    html_message = template_data[1].format(**template_vars)
+    subject = render_email_template(template_data[0], template_vars)
+    html_message = render_email_template(template_data[1], template_vars)
 
     from django.utils.html import strip_tags
     text_message = strip_tags(html_message)
@@ -741,7 +742,7 @@ def send_equipment_journals_for_organization(request, organization_id):
     from django.urls import reverse
     from deadline_control.models import EquipmentType, EmailSettings, EquipmentJournalSendLog, EquipmentJournalSendDetail
     from directory.models import Organization, StructuralSubdivision
-    from directory.utils.email_recipients import collect_recipients_for_subdivision
+    from directory.utils.email_recipients import collect_recipients_for_organization
     from directory.document_generators.equipment_journal_generator import (
         generate_equipment_journal_for_subdivision
     )
@@ -799,6 +800,7 @@ def send_equipment_journals_for_organization(request, organization_id):
     failed_sent = 0
     skipped_count = 0
     total_recipients = set()
+    recipients_map = collect_recipients_for_organization(organization, subdivisions, notification_type='general')
 
     for subdivision in subdivisions:
         equipment_list = Equipment.objects.filter(
@@ -821,11 +823,7 @@ def send_equipment_journals_for_organization(request, organization_id):
             skipped_count += 1
             continue
 
-        recipients = collect_recipients_for_subdivision(
-            subdivision=subdivision,
-            organization=organization,
-            notification_type='general'
-        )
+        recipients = recipients_map.get(subdivision.pk, [])
 
         if not recipients:
             EquipmentJournalSendDetail.objects.create(
@@ -899,8 +897,8 @@ def send_equipment_journals_for_organization(request, organization_id):
             failed_sent += 1
             continue
 
-        subject = template_data[0].format(**template_vars)
-        html_message = template_data[1].format(**template_vars)
+        subject = render_email_template(template_data[0], template_vars)
+        html_message = render_email_template(template_data[1], template_vars)
 
         from django.utils.html import strip_tags
         text_message = strip_tags(html_message)
@@ -994,7 +992,7 @@ def preview_mass_send_equipment_journals(request, organization_id):
     """
     from directory.models import Organization, StructuralSubdivision
     from deadline_control.models import EquipmentType, EmailSettings
-    from directory.utils.email_recipients import collect_recipients_for_subdivision
+    from directory.utils.email_recipients import collect_recipients_for_organization
 
     try:
         organization = Organization.objects.get(id=organization_id)
@@ -1042,6 +1040,7 @@ def preview_mass_send_equipment_journals(request, organization_id):
     tree_data = []
     total_recipients = set()
     has_any_recipients = False
+    recipients_map = collect_recipients_for_organization(organization, subdivisions, notification_type='general')
 
     for subdivision in subdivisions:
         equipment_list = Equipment.objects.filter(
@@ -1053,11 +1052,7 @@ def preview_mass_send_equipment_journals(request, organization_id):
         if not equipment_list.exists():
             continue
 
-        recipients = collect_recipients_for_subdivision(
-            subdivision,
-            organization,
-            notification_type='general'
-        )
+        recipients = recipients_map.get(subdivision.pk, [])
 
         departments = {eq.department.name for eq in equipment_list if eq.department}
         if len(departments) == 0:
@@ -1083,7 +1078,7 @@ def preview_mass_send_equipment_journals(request, organization_id):
 
         template_data = email_settings.get_email_template('equipment_journal')
         if template_data:
-            subject = template_data[0].format(**template_vars)
+            subject = render_email_template(template_data[0], template_vars)
         else:
             subject = "Шаблон не настроен"
 
@@ -1106,7 +1101,7 @@ def preview_mass_send_equipment_journals(request, organization_id):
             'equipment_type': equipment_type.name,
             'equipment_count': tree_data[0]['equipment_count'],
         }
-        email_body_preview = template_data[1].format(**example_vars)
+        email_body_preview = render_email_template(template_data[1], example_vars)
     elif template_data:
         email_body_preview = template_data[1]
     else:
@@ -12,6 +12,8 @@ from django.contrib.auth.decorators import login_required
 from datetime import timedelta
 
 from deadline_control.models.medical_norm import EmployeeMedicalExamination
+from deadline_control.services import ensure_medical_examinations
+from deadline_control.services.harmful_factors import EMPLOYEE_PREFETCH
 from directory.models import Employee
 from directory.utils.permissions import AccessControlHelper
 
@@ -70,8 +72,13 @@ class MedicalExaminationListView(LoginRequiredMixin, ListView):
         return qs
 
     def get_context_data(self, **kwargs):
+        from deadline_control.models import MedicalExaminationNorm
+
         context = super().get_context_data(**kwargs)
 
+        # Эталонные нормы загружаем одним запросом для всего списка
+        reference_norms = MedicalExaminationNorm.get_factors_by_position_name()
+
         # Разделяем сотрудников на категории на основе get_medical_status()
         no_date = []
         overdue = []
@@ -79,7 +86,7 @@ class MedicalExaminationListView(LoginRequiredMixin, ListView):
         normal = []
 
         for employee in context['employees_with_medical']:
-            medical_status = employee.get_medical_status()
+            medical_status = employee.get_medical_status(reference_norms)
 
             if not medical_status:
                 # Нет медосмотров - пропускаем
@@ -154,7 +161,10 @@ def update_employee_medical_examinations(request, employee_id):
     """
     from directory.models import Employee
 
-    employee = get_object_or_404(Employee, pk=employee_id)
+    employee = get_object_or_404(
+        Employee.objects.select_related('organization', 'position').prefetch_related(EMPLOYEE_PREFETCH),
+        pk=employee_id,
+    )
 
     # Проверка прав доступа
     if not request.user.is_superuser and hasattr(request.user, 'profile'):
@@ -168,43 +178,10 @@ def update_employee_medical_examinations(request, employee_id):
     examination_date = parse_date(date_str) if date_str else timezone.now().date()
 
     # ВАЖНО: Сначала убеждаемся, что записи медосмотров созданы для всех вредных факторов
-    from deadline_control.models import MedicalExaminationNorm, HarmfulFactor
-
-    # Получаем список вредных факторов для должности сотрудника
-    if employee.position:
-        # 1. Проверяем переопределения для конкретной должности (PositionMedicalFactor)
-        position_factors = employee.position.medical_factors.filter(is_disabled=False).select_related('harmful_factor')
-
-        harmful_factors = []
-        if position_factors.exists():
-            # Используем переопределённые факторы
-            harmful_factors = [pf.harmful_factor for pf in position_factors]
-        else:
-            # 2. Если переопределений нет - берём эталонные нормы по названию должности
-            reference_norms = MedicalExaminationNorm.objects.filter(
-                position_name=employee.position.position_name
-            ).select_related('harmful_factor')
-            harmful_factors = [norm.harmful_factor for norm in reference_norms]
-
-        # Создаём записи медосмотров для вредных факторов, если их ещё нет
-        for harmful_factor in harmful_factors:
-            EmployeeMedicalExamination.objects.get_or_create(
-                employee=employee,
-                harmful_factor=harmful_factor,
-                defaults={
-                    'status': 'to_issue',
-                    'is_disabled': False,
-                }
-            )
-
-    # Получаем все медосмотры сотрудника
-    examinations = employee.medical_examinations.filter(is_disabled=False)
-
-    # Применяем дату ко всем медосмотрам
-    updated_count = 0
-    for exam in examinations:
-        exam.perform_examination(examination_date)
-        updated_count += 1
+    ensure_medical_examinations([employee])
+
+    # Применяем дату ко всем медосмотрам сотрудника одним bulk_update
+    updated_count = employee.medical_examinations.filter(is_disabled=False).perform_examination(examination_date)
 
     # Получаем обновленный статус
     medical_status = employee.get_medical_status()
@@ -306,44 +283,14 @@ def update_multiple_medical_examinations(request):
         if qs.exclude(organization__in=allowed_orgs).exists():
             return JsonResponse({'success': False, 'error': 'You do not have permission to update one or more of the selected employees.'}, status=403)
 
-    updated_employee_count = 0
-    from deadline_control.models import MedicalExaminationNorm
-
-    for employee in qs:
-        # ВАЖНО: Сначала убеждаемся, что записи медосмотров созданы для всех вредных факторов
-        if employee.position:
-            # 1. Проверяем переопределения для конкретной должности (PositionMedicalFactor)
-            position_factors = employee.position.medical_factors.filter(is_disabled=False).select_related('harmful_factor')
+    # ВАЖНО: Сначала убеждаемся, что записи медосмотров созданы для всех вредных факторов
+    employees = list(qs.select_related('position').prefetch_related(EMPLOYEE_PREFETCH))
+    ensure_medical_examinations(employees)
 
-            harmful_factors = []
-            if position_factors.exists():
-                # Используем переопределённые факторы
-                harmful_factors = [pf.harmful_factor for pf in position_factors]
-            else:
-                # 2. Если переопределений нет - берём эталонные нормы по названию должности
-                reference_norms = MedicalExaminationNorm.objects.filter(
-                    position_name=employee.position.position_name
-                ).select_related('harmful_factor')
-                harmful_factors = [norm.harmful_factor for norm in reference_norms]
-
-            # Создаём записи медосмотров для вредных факторов, если их ещё нет
-            for harmful_factor in harmful_factors:
-                EmployeeMedicalExamination.objects.get_or_create(
-                    employee=employee,
-                    harmful_factor=harmful_factor,
-                    defaults={
-                        'status': 'to_issue',
-                        'is_disabled': False,
-                    }
-                )
-
-        # Получаем все медосмотры сотрудника (не отключенные)
-        examinations_to_update = employee.medical_examinations.filter(is_disabled=False)
-
-        if examinations_to_update.exists():
-            updated_employee_count += 1
-            for exam in examinations_to_update:
-                exam.perform_examination(examination_date)
+    # Все медосмотры выбранных сотрудников (не отключенные) - один проход и bulk_update
+    examinations = EmployeeMedicalExamination.objects.filter(employee__in=employees, is_disabled=False)
+    updated_employee_count = examinations.order_by().values('employee_id').distinct().count()
+    examinations.perform_examination(examination_date)
 
     if updated_employee_count > 0:
         messages.success(
@@ -4,7 +4,7 @@ Views для системы выдачи направлений на медиц
 import json
 import os
 from datetime import datetime
-from django.http import JsonResponse, FileResponse
+from django.http import JsonResponse, FileResponse, HttpResponse
 from django.views import View
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
@@ -23,7 +23,12 @@ from deadline_control.models import (
     PositionMedicalFactor,
     MedicalExaminationNorm,
     HarmfulFactor,
-    MedicalSettings
+)
+from deadline_control.services.medical_referrals import (
+    MedicalReferralBatch,
+    build_referral_context,
+    referral_save_dir,
+    resolve_referral_template_path,
 )
 
 try:
@@ -69,81 +74,29 @@ def generate_referral_document(referral):
     if not DOCXTPL_AVAILABLE:
         return None
 
-    # Получаем путь к шаблону из настроек организации или используем эталонный
-    medical_settings = MedicalSettings.get_settings(employee.organization)
-
-    if medical_settings and medical_settings.referral_template:
-        # Используем шаблон из настроек
-        template_path = medical_settings.referral_template.path
-    else:
-        # Используем эталонный шаблон (исправленная версия)
-        template_path = os.path.join(
-            settings.MEDIA_ROOT,
-            'document_templates',
-            'etalon',
-            'napravlenie_blank_fixed.docx'
-        )
-        # Если исправленный шаблон не найден, пробуем оригинальный
-        if not os.path.exists(template_path):
-            template_path = os.path.join(
-                settings.MEDIA_ROOT,
-                'document_templates',
-                'etalon',
-                'napravlenie_blank.docx'
-            )
+    employee = referral.employee
+    organization = employee.organization
 
+    # Шаблон из настроек организации или эталонный
+    template_path = resolve_referral_template_path(organization)
     if not os.path.exists(template_path):
         raise FileNotFoundError(f"Шаблон направления не найден: {template_path}")
 
-    # Загружаем шаблон
+    # Загружаем и заполняем шаблон
     doc = DocxTemplate(template_path)
-
-    # Подготавливаем данные для заполнения
-    employee = referral.employee
-    organization = employee.organization
-
-    # Разбиваем ФИО на части
-    name_parts = employee.full_name_nominative.split()
-    last_name = name_parts[0] if len(name_parts) > 0 else ''
-    first_name = ' '.join(name_parts[1:]) if len(name_parts) > 1 else ''
-
-    # Формируем список вредных факторов (только полное наименование)
-    factors_list = []
-    for factor in referral.harmful_factors.all():
-        factors_list.append(factor.full_name)
-    harmful_factors_text = '\n'.join(factors_list) if factors_list else 'Не определены'
-
-    # Контекст для шаблона
-    context = {
-        'organization_name': organization.full_name_ru,
-        'organization_name_by': getattr(organization, 'full_name_by', organization.full_name_ru),
-        'requisites_ru': getattr(organization, 'requisites_ru', ''),
-        'requisites_by': getattr(organization, 'requisites_by', ''),
-        'last_name': last_name,
-        'first_name': first_name,
-        'full_name': employee.full_name_nominative,
-        'date_of_birth': referral.employee_birth_date.strftime('%d.%m.%Y'),
-        'address': referral.employee_address,
-        'position_name': employee.position.position_name,
-        'harmful_factors': harmful_factors_text,
-        'issue_date': referral.issue_date.strftime('%d.%m.%Y'),
-    }
-
-    # Заполняем шаблон
-    doc.render(context)
-
-    # Создаём директорию для сохранения
-    save_dir = os.path.join(
-        settings.MEDIA_ROOT,
-        'medical_referrals',
-        str(timezone.now().year),
-        str(timezone.now().month).zfill(2)
-    )
-    os.makedirs(save_dir, exist_ok=True)
+    doc.render(build_referral_context(
+        organization,
+        employee.full_name_nominative,
+        referral.employee_birth_date,
+        referral.employee_address,
+        employee.position.position_name,
+        referral.harmful_factors.all(),
+        referral.issue_date,
+    ))
 
     # Имя файла
     filename = f"referral_{referral.id}_{employee.full_name_nominative.replace(' ', '_')}.docx"
-    filepath = os.path.join(save_dir, filename)
+    filepath = os.path.join(referral_save_dir(), filename)
 
     # Сохраняем документ
     doc.save(filepath)
@@ -280,6 +233,62 @@ class GenerateReferralView(LoginRequiredMixin, View):
             }, status=500)
 
 
+class BulkReferralView(LoginRequiredMixin, View):
+    """
+    API endpoint для пакетной выдачи направлений выбранным сотрудникам.
+    POST /deadline-control/medical/referral/bulk/
+    JSON: {"employee_ids": [...], "format": "zip" | "docx"}
+
+    Возвращает ZIP-архив или один DOCX со всеми направлениями. Сотрудники без
+    даты рождения или места проживания пропускаются (число - в заголовке
+    X-Referrals-Skipped).
+    """
+
+    def post(self, request):
+        try:
+            data = json.loads(request.body)
+        except json.JSONDecodeError:
+            return JsonResponse({'success': False, 'error': 'Неверный формат данных'}, status=400)
+
+        employee_ids = [pk for pk in data.get('employee_ids', []) if str(pk).isdigit()]
+        output = data.get('format', 'zip')
+        if not employee_ids:
+            return JsonResponse({'success': False, 'error': 'Не выбраны сотрудники'}, status=400)
+        if output not in ('zip', 'docx'):
+            return JsonResponse({'success': False, 'error': 'Неизвестный формат'}, status=400)
+
+        # Все выбранные сотрудники должны быть доступны пользователю
+        selected = Employee.objects.filter(pk__in=employee_ids)
+        accessible = AccessControlHelper.filter_queryset(selected, request.user, request)
+        if accessible.count() != selected.count():
+            return JsonResponse({
+                'success': False,
+                'error': 'У вас нет доступа к одному или нескольким выбранным сотрудникам'
+            }, status=403)
+
+        try:
+            result = MedicalReferralBatch(request.user, output=output).generate(employee_ids)
+        except FileNotFoundError as e:
+            return JsonResponse({'success': False, 'error': str(e)}, status=500)
+
+        if not result['referrals']:
+            return JsonResponse({
+                'success': False,
+                'error': 'Ни одно направление не сформировано',
+                'skipped': [
+                    {'full_name': employee.full_name_nominative, 'reason': reason}
+                    for employee, reason in result['skipped']
+                ],
+            }, status=400)
+
+        from urllib.parse import quote
+        response = HttpResponse(result['content'], content_type=result['content_type'])
+        response['Content-Disposition'] = f"attachment; filename*=UTF-8''{quote(result['filename'])}"
+        response['X-Referrals-Created'] = len(result['referrals'])
+        response['X-Referrals-Skipped'] = len(result['skipped'])
+        return response
+
+
 class ExistingEmployeeReferralView(LoginRequiredMixin, View):
     """
     Форма для выдачи направления на медосмотр существующему сотруднику.
@@ -450,24 +459,7 @@ class NewEmployeeReferralView(LoginRequiredMixin, View):
                 return render(request, 'deadline_control/new_employee_referral.html', context)
 
             # Получаем шаблон для организации
-            medical_settings = MedicalSettings.get_settings(organization)
-
-            if medical_settings and medical_settings.referral_template:
-                template_path = medical_settings.referral_template.path
-            else:
-                template_path = os.path.join(
-                    settings.MEDIA_ROOT,
-                    'document_templates',
-                    'etalon',
-                    'napravlenie_blank_fixed.docx'
-                )
-                if not os.path.exists(template_path):
-                    template_path = os.path.join(
-                        settings.MEDIA_ROOT,
-                        'document_templates',
-                        'etalon',
-                        'napravlenie_blank.docx'
-                    )
+            template_path = resolve_referral_template_path(organization)
 
             if not os.path.exists(template_path):
                 errors.append(f'Шаблон направления не найден')
@@ -481,43 +473,17 @@ class NewEmployeeReferralView(LoginRequiredMixin, View):
             # Загружаем шаблон
             doc = DocxTemplate(template_path)
 
-            # Разбиваем ФИО на части
-            name_parts = full_name.split()
-            last_name = name_parts[0] if len(name_parts) > 0 else ''
-            first_name = ' '.join(name_parts[1:]) if len(name_parts) > 1 else ''
-
-            # Формируем список вредных факторов
-            factors_list = [factor.full_name for factor in harmful_factors]
-            harmful_factors_text = '\n'.join(factors_list) if factors_list else 'Не определены'
-
             # Контекст для шаблона
-            context_doc = {
-                'organization_name': organization.full_name_ru,
-                'organization_name_by': getattr(organization, 'full_name_by', organization.full_name_ru),
-                'requisites_ru': getattr(organization, 'requisites_ru', ''),
-                'requisites_by': getattr(organization, 'requisites_by', ''),
-                'last_name': last_name,
-                'first_name': first_name,
-                'full_name': full_name,
-                'date_of_birth': birth_date.strftime('%d.%m.%Y'),
-                'address': address,
-                'position_name': position_name,
-                'harmful_factors': harmful_factors_text,
-                'issue_date': timezone.now().date().strftime('%d.%m.%Y'),
-            }
+            context_doc = build_referral_context(
+                organization, full_name, birth_date, address, position_name,
+                harmful_factors, timezone.now().date(),
+            )
 
             # Заполняем шаблон
             doc.render(context_doc)
 
-            # Создаём директорию для сохранения
-            save_dir = os.path.join(
-                settings.MEDIA_ROOT,
-                'medical_referrals',
-                'new_employees',
-                str(timezone.now().year),
-                str(timezone.now().month).zfill(2)
-            )
-            os.makedirs(save_dir, exist_ok=True)
+            # Директория для сохранения
+            save_dir = referral_save_dir('new_employees')
 
             # Имя файла
             safe_name = full_name.replace(' ', '_').replace('"', '').replace("'", '')
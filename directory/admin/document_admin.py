@@ -9,6 +9,7 @@ from django.contrib import admin
 from django.utils.translation import gettext_lazy as _
 from django.contrib import messages
 
+from directory.admin.mixins.date_bounded import DateBoundedChangeListMixin
 from directory.models.document_template import (
     DocumentTemplateType,
     DocumentTemplate,
@@ -93,12 +94,13 @@ class GeneratedDocumentAdmin(admin.ModelAdmin):
 
 
 @admin.register(DocumentGenerationLog)
-class DocumentGenerationLogAdmin(admin.ModelAdmin):
+class DocumentGenerationLogAdmin(DateBoundedChangeListMixin, admin.ModelAdmin):
     """
     Административный интерфейс для логов генерации документов
     """
     list_display = ('employee', 'get_document_types', 'created_at', 'created_by')
-    list_filter = ('created_at', 'created_by')
+    list_filter = ('created_by',)
+    list_select_related = ('employee', 'created_by')
     search_fields = ('employee__full_name_nominative',)
     readonly_fields = ('employee', 'document_types', 'created_at', 'created_by')
     date_hierarchy = 'created_at'
@@ -5,22 +5,30 @@
 - Структура (Position)
 - Сотрудники (Employee)
 - Оборудование (Equipment)
+
+Импорт выполняется фоновым заданием ImportJob (directory/services/import_jobs.py):
+запрос только сохраняет файл, страница задания показывает прогресс,
+предпросмотр и кнопку подтверждения.
 """
 from django.contrib import admin
-from django.shortcuts import render, redirect
+from django.core.exceptions import ValidationError
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404, render, redirect
 from django.urls import path
-from django.http import HttpResponse
 from django.contrib import messages
 from django.utils.html import format_html
 
-from directory.models import Organization
+from directory.models import ImportJob, Organization
 from directory.forms.global_import_forms import GlobalImportForm, GlobalExportForm
-from directory.services.global_import import (
-    parse_workbook,
-    dry_run_import,
-    commit_import,
-    export_all_to_workbook
+from directory.services.global_import import export_all_to_file
+from directory.services.import_jobs import (
+    create_import_job,
+    start_import_job,
+    confirm_import_job,
+    cancel_import_job,
+    resume_import_job,
 )
+from directory.services.xlsx_export import xlsx_file_response
 
 
 class GlobalImportExportAdmin:
@@ -41,6 +49,16 @@ class GlobalImportExportAdmin:
                 self.admin_site.admin_view(self.import_view),
                 name='global_import'
             ),
+            path(
+                'import/job/<int:job_id>/',
+                self.admin_site.admin_view(self.job_view),
+                name='global_import_job'
+            ),
+            path(
+                'import/job/<int:job_id>/status/',
+                self.admin_site.admin_view(self.job_status_view),
+                name='global_import_job_status'
+            ),
             path(
                 'export/',
                 self.admin_site.admin_view(self.export_view),
@@ -50,125 +68,100 @@ class GlobalImportExportAdmin:
         return urls
 
     def import_view(self, request):
-        """📥 Единый импорт справочников"""
+        """📥 Единый импорт справочников: загрузка файла и запуск задания"""
         context = self.admin_site.each_context(request)
 
         if request.method == 'POST':
-            if 'confirm' in request.POST:
-                # Финальное подтверждение импорта
-                datasets_json = request.session.get('global_import_datasets')
-                organization_id = request.session.get('global_import_organization_id')
-
-                if not datasets_json:
-                    messages.error(request, 'Данные для импорта не найдены. Загрузите файл заново.')
-                    return redirect('admin:global_import')
-
-                # Восстанавливаем datasets из JSON
-                from tablib import Dataset
-                import json
-
-                datasets = {}
-                datasets_dict = json.loads(datasets_json)
-                for sheet_name, dataset_json in datasets_dict.items():
-                    dataset = Dataset().load(dataset_json)
-                    datasets[sheet_name] = dataset
-
-                # Получаем организацию
-                organization = None
-                if organization_id:
-                    try:
-                        organization = Organization.objects.get(id=organization_id)
-                    except Organization.DoesNotExist:
-                        pass
-
-                # Выполняем импорт
-                try:
-                    result = commit_import(datasets, organization=organization)
-
-                    del request.session['global_import_datasets']
-                    if 'global_import_organization_id' in request.session:
-                        del request.session['global_import_organization_id']
-
-                    if result.get('success'):
-                        org_info = f' для организации "{organization.short_name_ru}"' if organization else ''
-                        messages.success(
-                            request,
-                            format_html(
-                                '✅ Импорт успешно завершен{}!<br>'
-                                'Создано: <b>{}</b>, обновлено: <b>{}</b>, ошибок: <b>{}</b>',
-                                org_info,
-                                result['total_created'],
-                                result['total_updated'],
-                                result['total_errors']
-                            )
-                        )
-                    else:
-                        error_msg = result.get('error_message', 'Неизвестная ошибка')
-                        messages.error(
-                            request,
-                            format_html(
-                                '❌ Импорт завершен с ошибками:<br>{}',
-                                error_msg
-                            )
-                        )
-
-                except Exception as e:
-                    messages.error(request, f'Критическая ошибка при импорте: {str(e)}')
-
-                return redirect('admin:index')
-
-            else:
-                # Предпросмотр импорта
-                form = GlobalImportForm(request.POST, request.FILES)
-
-                if not form.is_valid():
-                    context.update({
-                        'title': 'Единый импорт справочников',
-                        'subtitle': 'Импорт организационной структуры, сотрудников и оборудования из одного Excel-файла',
-                        'form': form,
-                    })
-                    return render(request, 'admin/directory/global_import/import.html', context)
-
-                import_file = form.cleaned_data['import_file']
-                organization = form.cleaned_data['organization']
-
-                try:
-                    # Парсим файл
-                    datasets = parse_workbook(import_file)
+            form = GlobalImportForm(request.POST, request.FILES)
 
-                    # Выполняем dry_run
-                    preview_result = dry_run_import(datasets, organization=organization)
+            if form.is_valid():
+                # Файл сохраняется, разбор и проверка выполняются в фоне
+                job = create_import_job(
+                    form.cleaned_data['import_file'],
+                    organization=form.cleaned_data['organization'],
+                    user=request.user,
+                )
+                start_import_job(job)
+                return redirect('admin:global_import_job', job_id=job.pk)
+        else:
+            form = GlobalImportForm()
 
-                    # Сохраняем данные в сессии для финального импорта
-                    import json
-                    datasets_dict = {}
-                    for sheet_name, dataset in datasets.items():
-                        datasets_dict[sheet_name] = dataset.export('json')
+        context.update({
+            'title': 'Единый импорт справочников',
+            'subtitle': 'Импорт организационной структуры, сотрудников и оборудования из одного Excel-файла',
+            'form': form,
+            'recent_jobs': self._user_jobs(request)[:10],
+        })
+        return render(request, 'admin/directory/global_import/import.html', context)
 
-                    request.session['global_import_datasets'] = json.dumps(datasets_dict)
-                    if organization:
-                        request.session['global_import_organization_id'] = organization.id
+    @staticmethod
+    def _user_jobs(request):
+        """Задания импорта, доступные пользователю"""
+        jobs = ImportJob.objects.select_related('organization', 'created_by')
+        if not request.user.is_superuser:
+            jobs = jobs.filter(created_by=request.user)
+        return jobs
 
-                    context.update({
-                        'title': 'Предпросмотр импорта справочников',
-                        'preview_result': preview_result,
-                        'datasets': datasets,
-                        'organization': organization,
-                    })
-                    return render(request, 'admin/directory/global_import/import_preview.html', context)
+    def job_view(self, request, job_id):
+        """⏳ Прогресс задания, предпросмотр, подтверждение, отмена и продолжение после сбоя"""
+        job = get_object_or_404(self._user_jobs(request), pk=job_id)
 
-                except Exception as e:
-                    messages.error(request, f'Ошибка при обработке файла: {str(e)}')
+        if request.method == 'POST':
+            try:
+                if 'confirm' in request.POST:
+                    confirm_import_job(job)
+                    messages.info(request, 'Импорт запущен. Страница обновляется автоматически.')
+                elif 'resume' in request.POST:
+                    resume_import_job(job)
+                    messages.info(request, 'Задание продолжено с места остановки.')
+                elif 'cancel' in request.POST:
+                    cancel_import_job(job)
+                    messages.info(request, 'Импорт отменён, загруженный файл удалён.')
                     return redirect('admin:global_import')
+            except ValidationError as e:
+                messages.error(request, '; '.join(e.messages))
+            return redirect('admin:global_import_job', job_id=job.pk)
+
+        if job.status == ImportJob.STATUS_DONE and job.result.get('success'):
+            org_info = f' для организации "{job.organization.short_name_ru}"' if job.organization else ''
+            messages.success(
+                request,
+                format_html(
+                    '✅ Импорт успешно завершен{}!<br>'
+                    'Создано: <b>{}</b>, обновлено: <b>{}</b>, ошибок: <b>{}</b>',
+                    org_info,
+                    job.result['total_created'],
+                    job.result['total_updated'],
+                    job.result['total_errors']
+                )
+            )
 
-        # GET запрос - показываем форму
-        form = GlobalImportForm()
+        context = self.admin_site.each_context(request)
         context.update({
-            'title': 'Единый импорт справочников',
-            'subtitle': 'Импорт организационной структуры, сотрудников и оборудования из одного Excel-файла',
-            'form': form,
+            'title': 'Предпросмотр импорта справочников' if job.status == ImportJob.STATUS_VALIDATED
+            else 'Импорт справочников',
+            'job': job,
+            'preview_result': job.preview,
+            'organization': job.organization,
+            # Пока задание выполняется, страница обновляется сама
+            'refresh_seconds': 2 if job.is_active else None,
+        })
+        return render(request, 'admin/directory/global_import/import_job.html', context)
+
+    def job_status_view(self, request, job_id):
+        """JSON со статусом и прогрессом задания (для опроса со страницы)"""
+        job = get_object_or_404(self._user_jobs(request), pk=job_id)
+        return JsonResponse({
+            'id': job.pk,
+            'status': job.status,
+            'status_display': job.get_status_display(),
+            'total_rows': job.total_rows,
+            'processed_rows': job.processed_rows,
+            'progress_percent': job.progress_percent,
+            'error_message': job.error_message,
+            'ready_for_import': bool(job.preview.get('ready_for_import')),
+            'result': job.result,
         })
-        return render(request, 'admin/directory/global_import/import.html', context)
 
     def export_view(self, request):
         """📤 Единый экспорт справочников"""
@@ -188,8 +181,8 @@ class GlobalImportExportAdmin:
                         return redirect('admin:global_export')
 
                 try:
-                    # Экспортируем данные
-                    file_content = export_all_to_workbook(organization=organization)
+                    # Экспортируем данные во временный файл (write_only, без сборки в памяти)
+                    output = export_all_to_file(organization=organization)
 
                     # Формируем имя файла
                     if organization:
@@ -202,16 +195,8 @@ class GlobalImportExportAdmin:
                         else:
                             filename = 'export_all.xlsx'
 
-                    # Отдаём файл
-                    response = HttpResponse(
-                        file_content,
-                        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-                    )
-                    response['Content-Disposition'] = f'attachment; filename="{filename}"'
-                    response['X-Content-Type-Options'] = 'nosniff'
-                    response['Content-Length'] = len(file_content)
-
-                    return response
+                    # Отдаём файл блоками, FileResponse закроет (и удалит) временный файл
+                    return xlsx_file_response(output, filename)
 
                 except Exception as e:
                     messages.error(request, f'Ошибка при экспорте: {str(e)}')
@@ -0,0 +1,64 @@
+"""
+🗓️ Ограничение списков логов в админке периодом по умолчанию.
+
+Таблицы логов рассылок растут без ограничений, поэтому список по умолчанию
+показывает только записи за последние LOG_ADMIN_DEFAULT_DAYS дней - запрос
+идёт по индексу created_at, а не по всей таблице. "За всё время" остаётся
+доступно явным выбором в фильтре "Период".
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib import admin
+from django.utils import timezone
+
+
+class RecentPeriodFilter(admin.SimpleListFilter):
+    """Период по created_at; без параметра в URL - последние LOG_ADMIN_DEFAULT_DAYS дней."""
+    title = "Период"
+    parameter_name = "period"
+    date_field = "created_at"
+    periods = (7, 30, 90, 365)
+    all_value = "all"
+
+    @staticmethod
+    def default_days():
+        return getattr(settings, 'LOG_ADMIN_DEFAULT_DAYS', 90)
+
+    def lookups(self, request, model_admin):
+        periods = sorted({*self.periods, self.default_days()})
+        return [(str(days), f"За {days} дн.") for days in periods] + [(self.all_value, "За всё время")]
+
+    def value(self):
+        return super().value() or str(self.default_days())
+
+    def choices(self, changelist):
+        # Пункта "Все" нет: без параметра действует период по умолчанию
+        value = self.value()
+        for lookup, title in self.lookup_choices:
+            yield {
+                'selected': value == lookup,
+                'query_string': changelist.get_query_string({self.parameter_name: lookup}),
+                'display': title,
+            }
+
+    def queryset(self, request, queryset):
+        value = self.value()
+        if value == self.all_value:
+            return queryset
+        try:
+            days = int(value)
+        except ValueError:
+            days = self.default_days()
+        return queryset.filter(**{f'{self.date_field}__gte': timezone.now() - timedelta(days=days)})
+
+
+class DateBoundedChangeListMixin:
+    """
+    Миксин для админок логов: фильтр "Период" первым в списке фильтров
+    и без COUNT(*) по всей таблице под пагинатором.
+    """
+    show_full_result_count = False
+
+    def get_list_filter(self, request):
+        return [RecentPeriodFilter, *super().get_list_filter(request)]
@@ -14,10 +14,10 @@ from directory.models import Position
 from directory.forms.position import PositionForm
 from directory.admin.mixins.tree_view import TreeViewMixin
 from directory.models.siz import SIZNorm, SIZ
-from deadline_control.models.medical_norm import PositionMedicalFactor, MedicalExaminationNorm
+from deadline_control.models.medical_norm import PositionMedicalFactor
 from deadline_control.models.medical_examination import HarmfulFactor
-from directory.models.commission import CommissionMember
 from directory.utils.profession_icons import get_profession_icon
+from directory.services.position_requirements import ensure_requirement_profiles, get_requirement_profile
 from directory.resources.organization_structure import OrganizationStructureResource
 
 
@@ -419,34 +419,28 @@ class PositionAdmin(TreeViewMixin, admin.ModelAdmin):
 
         return PositionFormWithUser
 
+    def _optimize_queryset(self, queryset):
+        """🌳 Профиль требований загружается тем же запросом, что и должности"""
+        queryset = super()._optimize_queryset(queryset)
+        ensure_requirement_profiles(queryset)
+        return queryset.select_related('requirement_profile')
+
     def get_node_additional_data(self, obj):
         """
         Дополнительные данные для каждого узла в древовидном представлении.
 
-        Проверяет наличие:
+        Берутся из профиля требований должности (PositionRequirementProfile):
         1. Индикаторы СИЗ и медосмотров (сначала переопределения, затем эталонные)
         2. Роли в комиссиях (из таблицы CommissionMember)
         3. Прочие атрибуты должности
         4. Инструкции по охране труда
         """
-        # Базовая информация
-        profession_icon = get_profession_icon(obj.position_name)
-
-        # Проверяем наличие хотя бы одной инструкции
-        instruction_parts = []
-        if obj.safety_instructions_numbers and obj.safety_instructions_numbers.strip():
-            instruction_parts.append(obj.safety_instructions_numbers.strip())
-        if obj.contract_safety_instructions and obj.contract_safety_instructions.strip():
-            instruction_parts.append(obj.contract_safety_instructions.strip())
-        if obj.drives_company_vehicle and obj.company_vehicle_instructions and obj.company_vehicle_instructions.strip():
-            instruction_parts.append(obj.company_vehicle_instructions.strip())
-
-        has_any_instruction = bool(instruction_parts)
-        instruction_numbers = ", ".join(instruction_parts)
+        requirements = get_requirement_profile(obj)
+        instruction_numbers = requirements.instruction_numbers
 
         additional_data = {
             # Иконка профессии
-            'profession_icon': profession_icon,
+            'profession_icon': get_profession_icon(obj.position_name),
 
             # Основные атрибуты безопасности
             'is_responsible_for_safety': obj.is_responsible_for_safety,
@@ -458,24 +452,15 @@ class PositionAdmin(TreeViewMixin, admin.ModelAdmin):
 
             # Инструкции по охране труда
             'instruction_numbers': instruction_numbers,
-            'has_instructions': has_any_instruction,
+            'has_instructions': bool(instruction_numbers),
         }
 
         # ===== СИЗ =====
-        # 1. Проверяем переопределенные нормы СИЗ
-        has_custom_siz_norms = obj.siz_norms.exists()
-
-        # 2. Если переопределений нет, проверяем эталонные нормы
-        has_reference_siz_norms = False
-        if not has_custom_siz_norms:
-            has_reference_siz_norms = Position.find_reference_norms(obj.position_name).exists()
-
-        # 3. Заполняем информацию о СИЗ
-        additional_data['has_siz_norms'] = has_custom_siz_norms or has_reference_siz_norms
-        if has_custom_siz_norms:
+        additional_data['has_siz_norms'] = requirements.needs_siz
+        if requirements.has_custom_siz:
             additional_data['siz_norms_type'] = 'custom'
             additional_data['siz_norms_title'] = 'Переопределенные нормы СИЗ для данной должности'
-        elif has_reference_siz_norms:
+        elif requirements.has_reference_siz:
             additional_data['siz_norms_type'] = 'reference'
             additional_data['siz_norms_title'] = 'Используются стандартные нормы СИЗ'
         else:
@@ -483,23 +468,11 @@ class PositionAdmin(TreeViewMixin, admin.ModelAdmin):
             additional_data['siz_norms_title'] = 'Нет норм СИЗ'
 
         # ===== МЕДОСМОТРЫ =====
-        # 1. Проверяем переопределенные нормы медосмотров
-        has_custom_medical_norms = obj.medical_factors.exists()
-
-        # 2. Если переопределений нет, проверяем эталонные нормы
-        has_reference_medical_norms = False
-        if not has_custom_medical_norms:
-            # Проверяем наличие эталонных норм медосмотров для этого типа должности
-            has_reference_medical_norms = MedicalExaminationNorm.objects.filter(
-                position_name=obj.position_name
-            ).exists()
-
-        # 3. Заполняем информацию о медосмотрах
-        additional_data['has_medical_norms'] = has_custom_medical_norms or has_reference_medical_norms
-        if has_custom_medical_norms:
+        additional_data['has_medical_norms'] = requirements.needs_medical
+        if requirements.has_custom_medical:
             additional_data['medical_norms_type'] = 'custom'
             additional_data['medical_norms_title'] = 'Переопределенные нормы медосмотров для данной должности'
-        elif has_reference_medical_norms:
+        elif requirements.has_reference_medical:
             additional_data['medical_norms_type'] = 'reference'
             additional_data['medical_norms_title'] = 'Используются стандартные нормы медосмотров'
         else:
@@ -507,26 +480,8 @@ class PositionAdmin(TreeViewMixin, admin.ModelAdmin):
             additional_data['medical_norms_title'] = 'Нет норм медосмотров'
 
         # ===== РОЛИ В КОМИССИЯХ =====
-        # Получаем роли в комиссиях через CommissionMember
-        # Находим всех сотрудников с этой должностью
-        from directory.models import Employee
-        employees_with_position = Employee.objects.filter(position=obj)
-
-        # Находим все роли в комиссиях для этих сотрудников
-        commission_roles = CommissionMember.objects.filter(
-            employee__in=employees_with_position,
-            is_active=True
-        ).select_related('commission')
-
-        # Группируем роли для отображения
-        additional_data['commission_roles'] = []
-        for role in commission_roles:
-            additional_data['commission_roles'].append({
-                'commission_name': role.commission.name,
-                'role': role.role,
-                'role_display': role.get_role_display(),
-                'employee_name': role.employee.full_name_nominative
-            })
+        # Активные роли сотрудников этой должности (CommissionMember)
+        additional_data['commission_roles'] = requirements.commission_roles
 
         return additional_data
 
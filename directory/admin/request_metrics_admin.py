@@ -0,0 +1,72 @@
+"""
+📈 Страница метрик производительности в админке.
+
+Показывает p50/p95/p99 времени ответа, число SQL-запросов и время в БД
+по каждому view. Данные собирает RequestMetricsMiddleware.
+Доступна только персоналу (is_staff), сброс метрик - только суперпользователям.
+"""
+import logging
+from datetime import datetime
+
+from django.contrib import admin, messages
+from django.shortcuts import redirect, render
+from django.urls import path
+
+from directory.utils.request_metrics import get_metrics_setting, metrics_store
+
+logger = logging.getLogger(__name__)
+
+
+class RequestMetricsAdmin:
+    """Псевдо-админка для просмотра метрик запросов."""
+
+    def __init__(self, admin_site: admin.AdminSite):
+        self.admin_site = admin_site
+
+    def get_urls(self):
+        return [
+            path(
+                'system/request-metrics/',
+                self.admin_site.admin_view(self.metrics_view),
+                name='request_metrics',
+            ),
+        ]
+
+    def metrics_view(self, request):
+        if request.method == 'POST' and request.POST.get('action') == 'reset':
+            if not request.user.is_superuser:
+                messages.error(request, 'Сброс метрик доступен только суперпользователям.')
+            else:
+                metrics_store.reset()
+                logger.info('Request metrics reset by %s', request.user.username)
+                messages.success(request, 'Метрики сброшены.')
+            return redirect('admin:request_metrics')
+
+        rows = metrics_store.summarize()
+        for row in rows:
+            row['last_seen'] = datetime.fromtimestamp(row['last_seen'])
+
+        context = self.admin_site.each_context(request)
+        context.update({
+            'title': 'Метрики производительности',
+            'rows': rows,
+            'slow_ms': get_metrics_setting('SLOW_MS', 1000),
+            'ring_size': get_metrics_setting('RING_SIZE', 500),
+            'enabled': get_metrics_setting('ENABLED', True),
+        })
+        return render(request, 'admin/system/request_metrics.html', context)
+
+
+def register_request_metrics(admin_site):
+    """
+    Регистрирует страницу метрик в админке.
+    Вызывается до объявления urlpatterns, чтобы примешать кастомные URL.
+    """
+    metrics_admin = RequestMetricsAdmin(admin_site)
+    original_get_urls = admin_site.get_urls
+
+    def get_urls_with_request_metrics():
+        urls = original_get_urls()
+        return metrics_admin.get_urls() + urls
+
+    admin_site.get_urls = get_urls_with_request_metrics
@@ -9,7 +9,7 @@ class SIZIssuedAdmin(admin.ModelAdmin):
     """
     🛡️ Административный интерфейс для выданных СИЗ
     """
-    list_display = ('employee', 'siz', 'issue_date', 'quantity', 'status_color', 'is_returned', 'return_date')
+    list_display = ('employee', 'siz', 'issue_date', 'quantity', 'status_color', 'next_due_date', 'is_returned', 'return_date')
     list_filter = ('issue_date', 'is_returned', 'employee__organization', 'employee__subdivision')
     search_fields = ('employee__full_name_nominative', 'siz__name', 'notes', 'condition')
     date_hierarchy = 'issue_date'
@@ -11,6 +11,7 @@ from directory.models import (
     Commission
 )
 from deadline_control.models import Equipment
+from directory.utils.search import search_queryset
 
 
 class OrganizationAutocomplete(autocomplete.Select2QuerySetView):
@@ -161,14 +162,14 @@ class PositionAutocomplete(autocomplete.Select2QuerySetView):
         else:
             qs = qs.filter(subdivision__isnull=True)
 
-        if self.q:
-            qs = qs.filter(position_name__icontains=self.q)
+        # Поиск по нормализованному названию, лучшие совпадения - первыми
+        qs = search_queryset(qs, self.q)
 
         return qs.select_related(
             'organization',
             'subdivision',
             'department'
-        ).order_by('position_name')
+        ).order_by('search_rank', 'position_name')
 
     def get_result_label(self, item):
         parts = [item.position_name]
@@ -352,12 +353,11 @@ class EmployeeByCommissionAutocomplete(autocomplete.Select2QuerySetView):
             except Commission.DoesNotExist:
                 pass
 
-        if self.q:
-            qs = qs.filter(
-                Q(full_name_nominative__icontains=self.q)
-            )
+        qs = search_queryset(qs, self.q)
 
-        return qs.select_related('position', 'organization', 'subdivision', 'department').order_by('full_name_nominative')
+        return qs.select_related(
+            'position', 'organization', 'subdivision', 'department'
+        ).order_by('search_rank', 'full_name_nominative')
 
     def get_result_label(self, result):
         position = result.position.position_name if result.position else "Без должности"
@@ -412,18 +412,15 @@ class EmployeeForCommissionAutocomplete(autocomplete.Select2QuerySetView):
             qs = qs.filter(organization_id=organization_id)
         # Иначе показываем всех сотрудников из доступных организаций
 
-        # Поиск по ФИО
-        if self.q:
-            qs = qs.filter(
-                Q(full_name_nominative__icontains=self.q)
-            )
+        # Поиск по ФИО (нормализованное поле search_text)
+        qs = search_queryset(qs, self.q)
 
         return qs.select_related(
             'position',
             'organization',
             'position__department',
             'position__department__subdivision'
-        ).order_by('full_name_nominative')
+        ).order_by('search_rank', 'full_name_nominative')
 
     def get_result_label(self, item):
         # Форматируем результат для отображения
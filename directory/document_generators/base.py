@@ -15,6 +15,7 @@ from django.conf import settings
 from django.core.files.base import ContentFile
 
 from directory.models.document_template import DocumentTemplate, GeneratedDocument
+from directory.document_generators.document_cache import document_cache
 from directory.utils.declension import decline_full_name, decline_phrase, get_initials_from_name, format_days
 
 # Настройка логирования
@@ -102,16 +103,16 @@ def get_document_template(document_type, employee=None) -> Optional[DocumentTemp
     if employee and employee.organization:
         org_template = templates.filter(organization=employee.organization).first()
         if org_template:
-            logger.info(f"Найден шаблон для организации {employee.organization.short_name_ru}: {org_template.name}")
+            logger.info("Найден шаблон для организации %s: %s", employee.organization.short_name_ru, org_template.name)
             return org_template
 
     # Если не найден шаблон для организации, ищем эталонный шаблон
     default_template = templates.filter(is_default=True).first()
     if default_template:
-        logger.info(f"Найден эталонный шаблон: {default_template.name}")
+        logger.info("Найден эталонный шаблон: %s", default_template.name)
         return default_template
 
-    logger.error(f"Шаблон документа типа '{document_type}' не найден")
+    logger.error("Шаблон документа типа '%s' не найден", document_type)
     return None
 
 
@@ -139,10 +140,10 @@ def prepare_employee_context(employee) -> Dict[str, Any]:
     if employee.position:
         if contract_type == 'contractor' and hasattr(employee.position, 'contract_work_name') and employee.position.contract_work_name:
             position_name = employee.position.contract_work_name
-            logger.info(f"Используется наименование работы по договору подряда: {position_name}")
+            logger.info("Используется наименование работы по договору подряда: %s", position_name)
         else:
             position_name = employee.position.position_name
-            logger.info(f"Используется должность: {position_name}")
+            logger.info("Используется должность: %s", position_name)
 
     # Основной контекст данных сотрудника
     context = {
@@ -341,7 +342,7 @@ def prepare_employee_context(employee) -> Dict[str, Any]:
 
 def generate_docx_from_template(template: DocumentTemplate, context: Dict[str, Any],
                                 employee, user=None, post_processor: Optional[Callable] = None,
-                                raise_on_error: bool = False) -> Optional[Dict[str, Any]]:
+                                raise_on_error: bool = False, cache: bool = True) -> Optional[Dict[str, Any]]:
     """
     Генерирует документ DOCX на основе шаблона и контекста данных.
     Не сохраняет в базу данных, возвращает содержимое файла.
@@ -352,35 +353,57 @@ def generate_docx_from_template(template: DocumentTemplate, context: Dict[str, A
         employee: Объект модели Employee
         user: Пользователь, создающий документ (опционально)
         post_processor: Функция пост-обработки документа (например, для обработки таблиц)
+        cache: False - не кэшировать документ (контекст каждый раз разный,
+            например, случайные значения, и в кэш попадали бы одноразовые файлы)
     Returns:
         Optional[Dict]: Словарь с 'content' (байты файла) и 'filename' или None при ошибке
     """
     try:
         template_path = template.template_file.path
-        logger.info(f"Используется шаблон: {template.name} (ID: {template.id}), путь: {template_path}")
+        logger.info("Используется шаблон: %s (ID: %s), путь: %s", template.name, template.id, template_path)
 
         if not os.path.exists(template_path):
-            logger.error(f"Файл шаблона не найден: {template_path}")
+            logger.error("Файл шаблона не найден: %s", template_path)
             raise FileNotFoundError(f"Файл шаблона не найден: {template_path}")
 
         file_size = os.path.getsize(template_path)
         if file_size == 0:
-            logger.error(f"Файл шаблона пуст: {template_path}")
+            logger.error("Файл шаблона пуст: %s", template_path)
             raise ValueError(f"Файл шаблона имеет нулевой размер: {template_path}")
 
-        logger.info(f"Файл шаблона готов к обработке: {template_path}, размер: {file_size} байт")
+        logger.info("Файл шаблона готов к обработке: %s, размер: %s байт", template_path, file_size)
+
+        # Формируем человекочитаемое имя файла
+        # document_type теперь ForeignKey, получаем код через .code
+        doc_type_code = template.document_type.code if template.document_type else 'document'
+        doc_type_name = DOCUMENT_TYPE_NAMES.get(doc_type_code, doc_type_code)
+        employee_initials = get_initials_from_name(employee.full_name_nominative)
+        filename = f"{doc_type_name}_{employee_initials}.docx"
+        logger.info("Имя файла: %s", filename)
+
+        # Удаляем объект employee из контекста перед рендерингом
+        context_to_render = context.copy()
+        context_to_render.pop('employee', None)
+
+        # Повторный запрос того же документа отдаётся из кэша на диске
+        cache_key = document_cache.make_key(
+            template, context_to_render, extra=getattr(post_processor, '__qualname__', None)
+        ) if cache else None
+        cached_content = document_cache.get(template, cache_key)
+        if cached_content is not None:
+            return {
+                'content': cached_content,
+                'filename': filename,
+            }
 
         try:
             doc = DocxTemplate(template_path)
             logger.info("Шаблон успешно загружен в DocxTemplate")
         except Exception as e:
-            logger.error(f"Ошибка при загрузке шаблона в DocxTemplate: {str(e)}")
+            logger.error("Ошибка при загрузке шаблона в DocxTemplate: %s", e)
             raise ValueError(f"Ошибка при загрузке шаблона в DocxTemplate: {str(e)}")
 
         try:
-            # Удаляем объект employee из контекста перед рендерингом
-            context_to_render = context.copy()
-            context_to_render.pop('employee', None)
             doc.render(context_to_render)
             logger.info("Шаблон успешно заполнен данными")
 
@@ -391,32 +414,27 @@ def generate_docx_from_template(template: DocumentTemplate, context: Dict[str, A
                     doc = post_processor(doc, context_to_render)
                     logger.info("Пост-обработчик успешно применен")
                 except Exception as e:
-                    logger.error(f"Ошибка при применении пост-обработчика: {str(e)}")
+                    logger.error("Ошибка при применении пост-обработчика: %s", e)
                     logger.error(traceback.format_exc())
+                    # Документ без пост-обработки в кэш не попадает
+                    cache_key = None
 
         except Exception as e:
-            logger.error(f"Ошибка при заполнении шаблона данными: {str(e)}")
-            logger.error(f"Контекст при ошибке: {context_to_render.keys()}")
+            logger.error("Ошибка при заполнении шаблона данными: %s", e)
+            logger.error("Контекст при ошибке: %s", context_to_render.keys())
             raise ValueError(f"Ошибка при заполнении шаблона данными: {str(e)}")
 
-        # Формируем человекочитаемое имя файла
-        # document_type теперь ForeignKey, получаем код через .code
-        doc_type_code = template.document_type.code if template.document_type else 'document'
-        doc_type_name = DOCUMENT_TYPE_NAMES.get(doc_type_code, doc_type_code)
-        employee_initials = get_initials_from_name(employee.full_name_nominative)
-        filename = f"{doc_type_name}_{employee_initials}.docx"
-        logger.info(f"Имя файла: {filename}")
-
         docx_buffer = io.BytesIO()
         doc.save(docx_buffer)
         docx_buffer.seek(0)
 
         file_content = docx_buffer.getvalue()
         if len(file_content) == 0:
-            logger.error(f"Создан пустой DOCX файл для {filename}")
+            logger.error("Создан пустой DOCX файл для %s", filename)
             raise ValueError("Создан пустой DOCX файл")
 
-        logger.info(f"Создан DOCX файл {filename}, размер: {len(file_content)} байт")
+        logger.info("Создан DOCX файл %s, размер: %s байт", filename, len(file_content))
+        document_cache.set(template, cache_key, file_content)
 
         return {
             'content': file_content,
@@ -424,7 +442,7 @@ def generate_docx_from_template(template: DocumentTemplate, context: Dict[str, A
         }
 
     except Exception as e:
-        logger.error(f"Ошибка при генерации документа: {str(e)}")
+        logger.error("Ошибка при генерации документа: %s", e)
         logger.error(traceback.format_exc())
         if raise_on_error:
             raise
@@ -0,0 +1,240 @@
+# directory/document_generators/document_cache.py
+"""
+🗄️ Кэш сгенерированных DOCX-документов на диске
+
+Ключ - SHA-256 от контекста рендера (JSON с сортировкой ключей) и версии
+файла шаблона (id, имя, размер, время изменения) плюс дополнительные данные
+пост-обработки. Изменение сотрудника, должности, оргструктуры или комиссии
+меняет контекст и, значит, ключ - устаревший документ просто не находится
+(и со временем вытесняется). При изменении шаблона его каталог удаляется
+сигналом (directory/signals.py).
+
+Код генераторов в ключ попадает только через DOCUMENT_CACHE_VERSION: при
+изменении результата рендера (пост-обработка, заполнение таблиц) версию
+увеличивают, и документы, собранные прежним кодом, больше не находятся.
+
+Файлы: DOCUMENT_CACHE_DIR/<id шаблона>/<ключ[:2]>/<ключ>.docx.
+Время изменения файла обновляется при каждом чтении, при превышении
+DOCUMENT_CACHE_MAX_MB удаляются давно не читавшиеся файлы (LRU).
+
+Контекст с несериализуемыми значениями (объекты моделей и т.п.) не кэшируется,
+как и документы, сгенерированные с cache=False (случайные значения в контексте).
+Каталог по умолчанию - PRIVATE_MEDIA_ROOT/document_cache: MEDIA_ROOT отдаётся
+по MEDIA_URL без авторизации.
+"""
+import datetime
+import decimal
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# После очистки размер кэша уменьшается до этой доли лимита
+EVICT_TO_RATIO = 0.8
+
+# Версия кода генераторов в ключе: увеличивать при изменении вывода документов
+DOCUMENT_CACHE_VERSION = 2
+
+
+class _Uncacheable(TypeError):
+    pass
+
+
+def _json_default(value):
+    if isinstance(value, (datetime.date, datetime.datetime, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (decimal.Decimal, uuid.UUID)):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    raise _Uncacheable(type(value).__name__)
+
+
+class DocumentCache:
+    """
+    Content-addressed кэш байтов документов.
+
+    Использование:
+        key = document_cache.make_key(template, context_to_render)
+        content = document_cache.get(template, key)
+        if content is None:
+            content = render(...)
+            document_cache.set(template, key, content)
+    """
+
+    def __init__(self, root=None, max_bytes=None):
+        self._root = Path(root) if root else None
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._written_since_check = None  # None - размер ещё не проверялся в этом процессе
+
+    # ------------------------------------------------------------------
+    # Настройки
+    # ------------------------------------------------------------------
+
+    @property
+    def enabled(self):
+        return getattr(settings, 'DOCUMENT_CACHE_ENABLED', True)
+
+    @property
+    def root(self):
+        if self._root is not None:
+            return self._root
+        return Path(getattr(settings, 'DOCUMENT_CACHE_DIR', None) or Path(settings.PRIVATE_MEDIA_ROOT) / 'document_cache')
+
+    @property
+    def max_bytes(self):
+        if self._max_bytes is not None:
+            return self._max_bytes
+        return getattr(settings, 'DOCUMENT_CACHE_MAX_MB', 200) * 1024 * 1024
+
+    # ------------------------------------------------------------------
+    # Ключ
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def template_version(template):
+        """Версия файла шаблона: меняется при замене или изменении файла"""
+        path = template.template_file.path
+        stat = os.stat(path)
+        return [template.pk, template.template_file.name, stat.st_size, stat.st_mtime_ns]
+
+    def make_key(self, template, context, extra=None):
+        """
+        Ключ документа или None, если кэш выключен или контекст не сериализуется.
+
+        Args:
+            template: DocumentTemplate
+            context: контекст рендера (без объекта employee)
+            extra: данные, которые влияют на результат помимо контекста
+                (например, строки таблицы, заполняемые пост-обработчиком)
+        """
+        if not self.enabled:
+            return None
+        try:
+            payload = json.dumps(
+                {
+                    'version': DOCUMENT_CACHE_VERSION,
+                    'template': self.template_version(template),
+                    'context': context,
+                    'extra': extra,
+                },
+                sort_keys=True,
+                ensure_ascii=False,
+                default=_json_default,
+            )
+        except _Uncacheable as e:
+            logger.debug("Документ не кэшируется: в контексте значение типа %s", e)
+            return None
+        except OSError:
+            return None
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _path(self, template, key):
+        return self.root / str(template.pk) / key[:2] / f'{key}.docx'
+
+    # ------------------------------------------------------------------
+    # Чтение / запись
+    # ------------------------------------------------------------------
+
+    def get(self, template, key):
+        """Байты документа из кэша или None"""
+        if not key:
+            return None
+        path = self._path(template, key)
+        try:
+            content = path.read_bytes()
+            # Отметка последнего обращения для LRU
+            os.utime(path)
+        except OSError:
+            return None
+        logger.debug("Документ взят из кэша: %s", path.name)
+        return content
+
+    def set(self, template, key, content):
+        """Сохраняет документ (атомарно: временный файл + rename)"""
+        if not key or not content:
+            return
+        path = self._path(template, key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as tmp_file:
+                tmp_file.write(content)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("Не удалось сохранить документ в кэш %s: %s", path, e)
+            return
+        self._maybe_evict(len(content))
+
+    def invalidate_template(self, template_id):
+        """Удаляет все документы шаблона"""
+        shutil.rmtree(self.root / str(template_id), ignore_errors=True)
+
+    def clear(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+        self._written_since_check = None
+
+    # ------------------------------------------------------------------
+    # LRU-очистка
+    # ------------------------------------------------------------------
+
+    def _maybe_evict(self, written):
+        """
+        Размер каталога проверяется при первой записи в процессе и далее
+        после записи каждых 10% лимита - не на каждый документ.
+        """
+        with self._lock:
+            if self._written_since_check is not None:
+                self._written_since_check += written
+                if self._written_since_check < self.max_bytes * 0.1:
+                    return
+            self._written_since_check = 0
+        self.evict()
+
+    def _files(self):
+        files = []
+        for dirpath, _dirnames, filenames in os.walk(self.root):
+            for name in filenames:
+                if not name.endswith('.docx'):
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime_ns, stat.st_size, path))
+        return files
+
+    def evict(self):
+        """Удаляет давно не читавшиеся документы, пока кэш больше лимита"""
+        files = self._files()
+        total = sum(size for _mtime, size, _path in files)
+        if total <= self.max_bytes:
+            return 0
+
+        target = self.max_bytes * EVICT_TO_RATIO
+        removed = 0
+        for _mtime, size, path in sorted(files):
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        logger.info("Кэш документов: удалено %s файлов, размер %.1f МБ", removed, total / 1024 / 1024)
+        return removed
+
+
+document_cache = DocumentCache()
@@ -3,6 +3,7 @@
 📄 Генератор для журнала периодического осмотра оборудования (грузовые тележки и др.)
 """
 import logging
+import time
 import traceback
 import datetime
 from typing import Dict, Any, Optional, List
@@ -15,7 +16,9 @@ from docx.oxml import parse_xml
 from docx.oxml.ns import nsdecls
 
 from directory.document_generators.base import get_document_template
+from directory.document_generators.table_fill import RowTemplate, append_rows
 from directory.utils.declension import get_initials_from_name
+from directory.logging_utils import log_sampled
 
 # Настройка логирования
 logger = logging.getLogger(__name__)
@@ -129,19 +132,19 @@ def _reset_equipment_journal_table(table):
     for row_idx, row in enumerate(table.rows):
         if len(row.cells) > 0:
             first_cell_text = row.cells[0].text.strip()
-            logger.info(f"Проверка строки {row_idx}: первая ячейка = '{first_cell_text}'")
+            logger.debug("Проверка строки %s: первая ячейка = '%s'", row_idx, first_cell_text)
             # Если первая ячейка содержит "1" - это строка с номерами столбцов
             if (first_cell_text == '1' or
                 first_cell_text == '1.' or
                 first_cell_text == '1)' or
                 first_cell_text.startswith('1')):
                 last_header_row_idx = row_idx
-                logger.info(f"✓ Найдена строка с номерами столбцов: индекс {row_idx}")
+                logger.info("✓ Найдена строка с номерами столбцов: индекс %s", row_idx)
                 break
 
     # Количество строк заголовка = индекс строки с номерами + 1
     num_header_rows = last_header_row_idx + 1
-    logger.info(f"Количество строк заголовка: {num_header_rows}")
+    logger.info("Количество строк заголовка: %s", num_header_rows)
 
     # Удаляем ВСЕ строки после заголовков
     while len(table.rows) > num_header_rows:
@@ -174,7 +177,7 @@ def _reset_equipment_journal_table(table):
         # Добавляем тег tblHeader для повторения этой строки
         tblHeader = parse_xml(f'<w:tblHeader {nsdecls("w")}/>')
         trPr.insert(0, tblHeader)
-        logger.info(f"  ✓ Установлено повторение для строки {row_idx}")
+        logger.debug("  ✓ Установлено повторение для строки %s", row_idx)
 
 
 def _fill_equipment_journal_rows(table, equipment_records: List[Dict[str, str]], rows_per_page: int = 24):
@@ -193,7 +196,8 @@ def _fill_equipment_journal_rows(table, equipment_records: List[Dict[str, str]],
             - result: Результат осмотра (может быть пустым)
         rows_per_page: Количество строк на одной странице (по умолчанию 30)
     """
-    logger.info(f"Добавление {len(equipment_records)} записей оборудования в таблицу")
+    started = time.perf_counter()
+    total = len(equipment_records)
 
     # Находим последнюю строку заголовка (строку с номерами столбцов)
     header_row_idx = 1  # По умолчанию
@@ -208,59 +212,35 @@ def _fill_equipment_journal_rows(table, equipment_records: List[Dict[str, str]],
 
     # Получаем количество столбцов из строки с номерами
     num_cols = len(table.rows[header_row_idx].cells)
-    logger.info(f"Количество столбцов в таблице: {num_cols}")
-
-    # Добавляем строки с данными
-    for idx, record in enumerate(equipment_records, start=1):
-        # Добавляем новую строку
-        new_row = table.add_row()
-        logger.info(f"Добавлена строка {idx}/{len(equipment_records)}")
-
-        # Заполняем ячейки
-        cells = new_row.cells
-
-        # Столбец 1: № п/п (сквозная нумерация)
-        cells[0].text = str(idx)
-        cells[0].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-        cells[0].paragraphs[0].runs[0].font.size = Pt(14)
-
-        # Столбец 2: Тип оборудования
-        cells[1].text = record.get('type', '')
-        cells[1].paragraphs[0].runs[0].font.size = Pt(14)
-
-        # Столбец 3: Инвентарный номер
-        inventory_number = record.get('inventory_number', '')
-        if inventory_number:
-            cells[2].text = f"Инв. № {inventory_number}"
-        else:
-            cells[2].text = ''
-        cells[2].paragraphs[0].runs[0].font.size = Pt(14)
-
-        # Столбец 4: Место эксплуатации
-        cells[3].text = record.get('location', '')
-        cells[3].paragraphs[0].runs[0].font.size = Pt(14)
-
-        # Столбец 5: Дата осмотра
-        cells[4].text = record.get('inspection_date', '')
-        cells[4].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-        cells[4].paragraphs[0].runs[0].font.size = Pt(14)
-
-        # Столбец 6: Должность, ФИО проверяющего (пусто для ручного заполнения)
-        cells[5].text = record.get('inspector', '')
-        cells[5].paragraphs[0].runs[0].font.size = Pt(14)
-
-        # Столбец 7: Результаты осмотра (пусто для ручного заполнения)
-        cells[6].text = record.get('result', '')
-        cells[6].paragraphs[0].runs[0].font.size = Pt(14)
-
-        # Столбец 8: Подпись (всегда пустое)
-        cells[7].text = ''
+    logger.debug("Количество столбцов в таблице: %s", num_cols)
 
-        # Устанавливаем границы для всех ячеек строки
-        for cell in cells:
-            _set_cell_borders(cell)
+    # Строки с данными: клон прототипа <w:tr> с готовым оформлением на каждую запись
+    template = RowTemplate(
+        table, font_size=14, borders=True,
+        columns={0: {'align': 'center'}, 4: {'align': 'center'}, 7: {'size': None}},
+    )
 
-    logger.info(f"✓ Успешно добавлено {len(equipment_records)} записей")
+    def rows():
+        for idx, record in enumerate(equipment_records, start=1):
+            log_sampled(logger, idx, total, "Добавлена строка %s/%s", idx, total)
+            inventory_number = record.get('inventory_number', '')
+            yield [
+                str(idx),  # № п/п (сквозная нумерация)
+                record.get('type', ''),  # Тип оборудования
+                f"Инв. № {inventory_number}" if inventory_number else '',  # Инвентарный номер
+                record.get('location', ''),  # Место эксплуатации
+                record.get('inspection_date', ''),  # Дата осмотра
+                record.get('inspector', ''),  # Должность, ФИО проверяющего
+                record.get('result', ''),  # Результаты осмотра
+                '',  # Подпись (всегда пустое)
+            ]
+
+    append_rows(table, template, rows())
+
+    logger.info(
+        "✓ Добавлено %s записей оборудования в таблицу (%s столбцов) за %.0f мс",
+        total, num_cols, (time.perf_counter() - started) * 1000
+    )
 
     # Пустые строки не добавляем
 
@@ -276,7 +256,7 @@ def _fill_ladder_journal_rows(table, ladder_records: List[Dict[str, str]]):
     - result
     - next_inspection_date
     """
-    logger.info(f"Добавление {len(ladder_records)} записей лестниц в таблицу")
+    started = time.perf_counter()
 
     header_row_idx = 1
     for row_idx, row in enumerate(table.rows):
@@ -290,41 +270,30 @@ def _fill_ladder_journal_rows(table, ladder_records: List[Dict[str, str]]):
 
     num_cols = len(table.rows[header_row_idx].cells)
     if num_cols < 7:
-        logger.error(f"Недостаточно столбцов для журнала лестниц: {num_cols}")
+        logger.error("Недостаточно столбцов для журнала лестниц: %s", num_cols)
         return
 
-    for idx, record in enumerate(ladder_records, start=1):
-        new_row = table.add_row()
-        cells = new_row.cells
-
-        cells[0].text = str(idx)
-        cells[0].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-        cells[0].paragraphs[0].runs[0].font.size = Pt(14)
-
-        cells[1].text = record.get('object_name', '')
-        cells[1].paragraphs[0].runs[0].font.size = Pt(14)
-
-        cells[2].text = record.get('inspection_date', '')
-        cells[2].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-        cells[2].paragraphs[0].runs[0].font.size = Pt(14)
-
-        inventory_number = record.get('inventory_number', '')
-        cells[3].text = inventory_number or ''
-        cells[3].paragraphs[0].runs[0].font.size = Pt(14)
-
-        cells[4].text = record.get('result', '')
-        cells[4].paragraphs[0].runs[0].font.size = Pt(14)
-
-        cells[5].text = record.get('next_inspection_date', '')
-        cells[5].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-        cells[5].paragraphs[0].runs[0].font.size = Pt(14)
-
-        cells[6].text = ''
-
-        for cell in cells:
-            _set_cell_borders(cell)
+    template = RowTemplate(
+        table, font_size=14, borders=True,
+        columns={0: {'align': 'center'}, 2: {'align': 'center'}, 5: {'align': 'center'}, 6: {'size': None}},
+    )
+    append_rows(table, template, (
+        [
+            str(idx),
+            record.get('object_name', ''),
+            record.get('inspection_date', ''),
+            record.get('inventory_number', '') or '',
+            record.get('result', ''),
+            record.get('next_inspection_date', ''),
+            '',
+        ]
+        for idx, record in enumerate(ladder_records, start=1)
+    ))
 
-    logger.info(f"? Успешно добавлено {len(ladder_records)} записей")
+    logger.info(
+        "✓ Добавлено %s записей лестниц в таблицу за %.0f мс",
+        len(ladder_records), (time.perf_counter() - started) * 1000
+    )
 
 def _post_process_equipment_journal(doc, context: Dict[str, Any]):
     """
@@ -345,7 +314,7 @@ def _post_process_equipment_journal(doc, context: Dict[str, Any]):
         logger.error("Таблица не найдена в документе")
         return doc
 
-    logger.info(f"Найдена таблица с {len(table.rows)} строками")
+    logger.info("Найдена таблица с %s строками", len(table.rows))
 
     # Очищаем таблицу от строк данных
     _reset_equipment_journal_table(table)
@@ -602,7 +571,7 @@ def generate_equipment_journal_for_subdivision(
         template_code = _resolve_template_code(equipment_type=equipment_type)
         template = get_document_template(template_code, employee=None)
         if not template:
-            logger.error(f"Шаблон документа '{template_code}' не найден")
+            logger.error("Шаблон документа '%s' не найден", template_code)
             return None
 
         equipment_list = list(equipment)
@@ -690,7 +659,7 @@ def generate_equipment_journal_for_subdivision(
             'filename': filename,
         }
     except Exception as exc:
-        logger.error(f"Ошибка при генерации журнала оборудования: {str(exc)}")
+        logger.error("Ошибка при генерации журнала оборудования: %s", exc)
         logger.error(traceback.format_exc())
         return None
 
@@ -711,8 +680,8 @@ def generate_equipment_journal(organization, equipment_type_name, start_date=Non
     try:
         from deadline_control.models import Equipment
 
-        logger.info(f"Генерация журнала для организации: {organization.short_name_ru}")
-        logger.info(f"Тип оборудования: {equipment_type_name}")
+        logger.info("Генерация журнала для организации: %s", organization.short_name_ru)
+        logger.info("Тип оборудования: %s", equipment_type_name)
 
         # Устанавливаем даты по умолчанию
         if not start_date:
@@ -720,13 +689,13 @@ def generate_equipment_journal(organization, equipment_type_name, start_date=Non
         if not end_date:
             end_date = datetime.date(datetime.datetime.now().year, 12, 31)
 
-        logger.info(f"Период журнала: {start_date} - {end_date}")
+        logger.info("Период журнала: %s - %s", start_date, end_date)
 
         # Получаем шаблон документа
         template_code = _resolve_template_code(equipment_type_name=equipment_type_name)
         template = get_document_template(template_code, employee=None)
         if not template:
-            logger.error(f"Шаблон документа '{template_code}' не найден")
+            logger.error("Шаблон документа '%s' не найден", template_code)
             return None
 
         # Получаем оборудование из базы данных
@@ -737,8 +706,6 @@ def generate_equipment_journal(organization, equipment_type_name, start_date=Non
             'equipment_type', 'organization', 'subdivision', 'department'
         ).order_by('inventory_number')
 
-        logger.info(f"Найдено оборудования: {equipment_list.count()}")
-
         if template_code == 'lestnicy-journal':
             ladder_records = _build_ladder_records(
                 equipment_list,
@@ -753,7 +720,7 @@ def generate_equipment_journal(organization, equipment_type_name, start_date=Non
                 use_two_level_location=False
             )
 
-        logger.info(f"Подготовлено {len(equipment_records)} записей для журнала")
+        logger.info("Подготовлено %s записей для журнала", len(equipment_records) or len(ladder_records))
 
         # Формируем контекст для шаблона
         context = {
@@ -771,7 +738,7 @@ def generate_equipment_journal(organization, equipment_type_name, start_date=Non
 
         # Генерируем документ
         template_path = template.template_file.path
-        logger.info(f"Загрузка шаблона: {template_path}")
+        logger.info("Загрузка шаблона: %s", template_path)
 
         doc = DocxTemplate(template_path)
 
@@ -792,7 +759,7 @@ def generate_equipment_journal(organization, equipment_type_name, start_date=Non
         date_str = date_for_name.strftime('%d.%m.%Y')
         org_name = _sanitize_filename(organization.short_name_ru)
         filename = f"Журнал осмотра {label} {org_name} {date_str}.docx"
-        logger.info(f"Имя файла: {filename}")
+        logger.info("Имя файла: %s", filename)
 
         # Сохраняем в BytesIO
         docx_buffer = BytesIO()
@@ -800,7 +767,7 @@ def generate_equipment_journal(organization, equipment_type_name, start_date=Non
         docx_buffer.seek(0)
 
         file_content = docx_buffer.getvalue()
-        logger.info(f"✓ Создан DOCX файл {filename}, размер: {len(file_content)} байт")
+        logger.info("✓ Создан DOCX файл %s, размер: %s байт", filename, len(file_content))
 
         return {
             'content': file_content,
@@ -808,6 +775,6 @@ def generate_equipment_journal(organization, equipment_type_name, start_date=Non
         }
 
     except Exception as e:
-        logger.error(f"Ошибка при генерации журнала оборудования: {str(e)}")
+        logger.error("Ошибка при генерации журнала оборудования: %s", e)
         logger.error(traceback.format_exc())
         return None
@@ -22,6 +22,7 @@ from directory.document_generators.base import (
     prepare_employee_context,
     generate_docx_from_template,
 )
+from directory.document_generators.table_fill import RowTemplate, append_rows
 
 logger = logging.getLogger(__name__)
 
@@ -108,12 +109,20 @@ def process_table_rows(doc, context):
             # Заполняем первую строку
             table.rows[row_idx].cells[doc_col].text = docs[0]
 
-            # Добавляем новые строки
-            for doc_name in docs[1:]:
-                new_row = table.add_row()
-                new_row.cells[doc_col].text = doc_name
-                if date_col is not None and date_col < len(new_row.cells):
-                    new_row.cells[date_col].text = context.get("familiarization_date", "")
+            # Добавляем новые строки (шрифт и границы - ниже, в _apply_table_format)
+            template = RowTemplate(table)
+            familiarization_date = context.get("familiarization_date", "")
+
+            def rows():
+                for doc_name in docs[1:]:
+                    values = [""] * template.column_count
+                    if doc_col < len(values):
+                        values[doc_col] = doc_name
+                    if date_col is not None and date_col < len(values):
+                        values[date_col] = familiarization_date
+                    yield values
+
+            append_rows(table, template, rows())
 
             # Оформление
             _apply_table_format(table)
@@ -11,6 +11,7 @@ from docxtpl import DocxTemplate
 from directory.document_generators.base import (
     get_document_template, prepare_employee_context
 )
+from directory.document_generators.table_fill import RowTemplate, append_rows
 from directory.utils.vehicle_utils import combine_instructions
 from directory.utils.declension import get_initials_from_name
 
@@ -143,92 +144,55 @@ def _fill_instruction_journal_rows(table, employees_data: List[Dict[str, str]],
         instruction_type: Вид инструктажа
         instruction_reason: Причина проведения инструктажа
     """
-    from docx.shared import Pt
-    from docx.oxml import parse_xml
-    from docx.oxml.ns import nsdecls
-    from docx.enum.text import WD_ALIGN_PARAGRAPH
-
-    for idx, emp in enumerate(employees_data, start=1):
-        row = table.add_row()
-        cells = row.cells
-        cols = len(cells)
-
-        # Логируем для первой строки данных
-        if idx == 1:
-            logger.info(f"Первая строка данных: количество ячеек = {cols}")
-
-        # Заполняем ячейки данными
-        # Структура журнала инструктажей (10 колонок):
-        # 0: № п/п (оставляем пустым)
-        # 1: Дата проведения инструктажа
-        # 2: ФИО лица, прошедшего инструктаж
-        # 3: Должность (профессия)
-        # 4: Вид инструктажа
-        # 5: Причина проведения (для внепланового/целевого)
-        # 6: Номера инструкций
-        # 7: ФИО проводившего инструктаж
-        # 8: Подпись проводившего
-        # 9: Подпись прошедшего
-
-        if cols > 0:
-            cells[0].text = ""  # Оставляем пустым для ручного заполнения
-        if cols > 1:
-            cells[1].text = instruction_date  # Дата
-        if cols > 2:
-            cells[2].text = emp.get('fio_initials', '')  # ФИО (Фамилия И.О.)
-        if cols > 3:
+    # Структура журнала инструктажей:
+    # 0: № п/п (оставляем пустым)
+    # 1: Дата проведения инструктажа
+    # 2: ФИО лица, прошедшего инструктаж
+    # 3: Должность (профессия)
+    # 4: Вид инструктажа
+    # 5: Причина проведения (для внепланового/целевого)
+    # 6: Номера инструкций
+    # 7: ФИО проводившего инструктаж
+    # 8: Подпись проводившего
+    # 9: Подпись прошедшего
+    # 10+: Стажировка (оставляем пустыми для ручного заполнения)
+    #
+    # Строки не разрываются при переносе на новую страницу, Times New Roman:
+    # ФИО проводившего - 10 кегль, подписи - 9 кегль, остальные - 12 кегль.
+    # Центрируются № п/п, вид инструктажа и подписи.
+    template = RowTemplate(
+        table, font_name='Times New Roman', font_size=12, borders=True, cant_split=True,
+        columns={
+            0: {'align': 'center'},
+            4: {'align': 'center'},
+            7: {'size': 10},
+            8: {'align': 'center', 'size': 9},
+            9: {'align': 'center', 'size': 9},
+        },
+    )
+    logger.info(f"Строки журнала: количество ячеек = {template.column_count}")
+
+    def rows():
+        for emp in employees_data:
             # Профессия/должность - с учётом подрядчиков
             if emp.get('is_contractor'):
-                cells[3].text = emp.get('GPD', 'Работник по договору ГПХ')
+                position = emp.get('GPD', 'Работник по договору ГПХ')
             else:
-                cells[3].text = emp.get('position_nominative', '')
-        if cols > 4:
-            cells[4].text = instruction_type  # Вид инструктажа
-        if cols > 5:
-            cells[5].text = instruction_reason  # Причина
-        if cols > 6:
-            cells[6].text = emp.get('instruction_numbers', '')  # Номера инструкций
-        if cols > 7:
-            # ФИО проводившего инструктаж
-            cells[7].text = "Фамилия, инициалы руководителя"
-        if cols > 8:
-            # Подпись проводившего
-            cells[8].text = "подпись работника"
-        if cols > 9:
-            # Подпись прошедшего
-            cells[9].text = "подпись руководителя"
-        if cols > 10:
-            # Стажировка (оставляем пустым)
-            cells[10].text = ""
-        # Остальные ячейки (11+) оставляем пустыми для ручного заполнения (стажировка)
-
-        # Запрещаем разрыв строки при переносе на новую страницу
-        tr = row._tr
-        trPr = tr.trPr
-        if trPr is None:
-            trPr = parse_xml(f'<w:trPr {nsdecls("w")}/>')
-            tr.insert(0, trPr)
-
-        # Добавляем свойство cantSplit (не разрывать строку)
-        cantSplit = parse_xml(f'<w:cantSplit {nsdecls("w")}/>')
-        trPr.append(cantSplit)
-
-        # Применяем форматирование Times New Roman ко всем ячейкам строки
-        for cell_idx, cell in enumerate(cells):
-            _set_cell_borders(cell)  # Устанавливаем границы для каждой ячейки
-            for paragraph in cell.paragraphs:
-                # Центрируем: № п/п (0), Вид инструктажа (4), Подпись работника (8), Подпись руководителя (9)
-                if cell_idx in [0, 4, 8, 9]:
-                    paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                for run in paragraph.runs:
-                    run.font.name = 'Times New Roman'
-                    # Размеры шрифта по столбцам
-                    if cell_idx == 7:  # Столбец 8: ФИО проводившего - 10 кегль
-                        run.font.size = Pt(10)
-                    elif cell_idx in [8, 9]:  # Столбцы 9-10: подписи - 9 кегль
-                        run.font.size = Pt(9)
-                    else:  # Остальные столбцы - 12 кегль
-                        run.font.size = Pt(12)
+                position = emp.get('position_nominative', '')
+            yield [
+                "",
+                instruction_date,
+                emp.get('fio_initials', ''),  # ФИО (Фамилия И.О.)
+                position,
+                instruction_type,
+                instruction_reason,
+                emp.get('instruction_numbers', ''),
+                "Фамилия, инициалы руководителя",
+                "подпись работника",
+                "подпись руководителя",
+            ]
+
+    append_rows(table, template, rows())
 
 
 def generate_instruction_journal(
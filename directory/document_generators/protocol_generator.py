@@ -13,6 +13,8 @@ from directory.document_generators.base import (
     prepare_employee_context,
     generate_docx_from_template,
 )
+from directory.document_generators.document_cache import document_cache
+from directory.document_generators.table_fill import RowTemplate, append_rows
 
 # Сервисные функции для работы с комиссией (экспортируемые из directory/utils/__init__.py)
 from directory.utils import find_appropriate_commission, get_commission_members_formatted
@@ -109,65 +111,67 @@ def generate_knowledge_protocol(
 
         logger.debug(f"[generate_knowledge_protocol] context keys: {list(context.keys())}")
 
-        # 6) Рендерим шаблон с помощью docxtpl
-        from docxtpl import DocxTemplate
-        from pathlib import Path
-
-        template_path = template.template_file.path
-        doc = DocxTemplate(template_path)
-
-        render_context = context.copy()
-        render_context.pop('employee', None)
-        doc.render(render_context)
-
-        # 7) Заполняем таблицу результатов проверки знаний
+        # 6) Строки таблицы результатов проверки знаний
         from directory.utils.vehicle_utils import needs_vehicle_training, get_vehicle_position_name
 
-        table = _find_knowledge_protocol_table(doc.docx)
-        if table:
-            # Очищаем все строки кроме заголовка
-            _reset_periodic_table(table)
+        ticket_number = custom_context.get('ticket_number', '') if custom_context else ''
 
-            # Формируем данные для строк
-            employees_data = []
+        # Строка 1: проверка знаний по профессии (основная должность)
+        employees_data = [{
+            'fio_nominative': context.get('fio_nominative', ''),
+            'position_nominative': context.get('position_nominative', ''),
+            'ticket_number': ticket_number,
+        }]
 
-            # Строка 1: проверка знаний по профессии (основная должность)
+        # Строка 2: проверка знаний по видам выполняемых работ (управление автомобилем)
+        if needs_vehicle_training(employee):
             employees_data.append({
                 'fio_nominative': context.get('fio_nominative', ''),
-                'position_nominative': context.get('position_nominative', ''),
-                'ticket_number': custom_context.get('ticket_number', '') if custom_context else '',
+                'position_nominative': get_vehicle_position_name(),
+                'ticket_number': ticket_number,
             })
 
-            # Строка 2: проверка знаний по видам выполняемых работ (управление автомобилем)
-            if needs_vehicle_training(employee):
+        # Строки 3+: проверка знаний по видам ответственности
+        if employee.position and employee.position.responsibility_types.exists():
+            for resp_type in employee.position.responsibility_types.filter(is_active=True).order_by('order', 'name'):
                 employees_data.append({
                     'fio_nominative': context.get('fio_nominative', ''),
-                    'position_nominative': get_vehicle_position_name(),
-                    'ticket_number': custom_context.get('ticket_number', '') if custom_context else '',
+                    'position_nominative': resp_type.name,
+                    'ticket_number': ticket_number,
                 })
 
-            # Строки 3+: проверка знаний по видам ответственности
-            if employee.position and employee.position.responsibility_types.exists():
-                for resp_type in employee.position.responsibility_types.filter(is_active=True).order_by('order', 'name'):
-                    employees_data.append({
-                        'fio_nominative': context.get('fio_nominative', ''),
-                        'position_nominative': resp_type.name,
-                        'ticket_number': custom_context.get('ticket_number', '') if custom_context else '',
-                    })
+        from directory.utils.declension import get_initials_from_name
+        employee_initials = get_initials_from_name(context.get('fio_nominative', ''))
+        filename = f"Протокол_{employee_initials}.docx"
+
+        render_context = context.copy()
+        render_context.pop('employee', None)
 
-            # Заполняем таблицу с типом проверки "первичная" (при приёме на работу)
+        # Повторный запрос того же протокола отдаётся из кэша на диске
+        cache_key = document_cache.make_key(template, render_context, extra=employees_data)
+        cached_content = document_cache.get(template, cache_key)
+        if cached_content is not None:
+            return {'content': cached_content, 'filename': filename}
+
+        # 7) Рендерим шаблон с помощью docxtpl
+        template_path = template.template_file.path
+        doc = DocxTemplate(template_path)
+        doc.render(render_context)
+
+        # 8) Заполняем таблицу результатов с типом проверки "первичная" (при приёме на работу)
+        table = _find_knowledge_protocol_table(doc.docx)
+        if table:
+            # Очищаем все строки кроме заголовка
+            _reset_periodic_table(table)
             _fill_periodic_rows(table, employees_data, check_type='первичная')
 
-        # 8) Сохраняем документ
+        # 9) Сохраняем документ
         buffer = BytesIO()
         doc.save(buffer)
-        buffer.seek(0)
+        content = buffer.getvalue()
+        document_cache.set(template, cache_key, content)
 
-        from directory.utils.declension import get_initials_from_name
-        employee_initials = get_initials_from_name(context.get('fio_nominative', ''))
-        filename = f"Протокол_{employee_initials}.docx"
-
-        return {'content': buffer.getvalue(), 'filename': filename}
+        return {'content': content, 'filename': filename}
 
     except Exception:
         logger.error("Ошибка генерации протокола", exc_info=True)
@@ -236,53 +240,24 @@ def _fill_periodic_rows(table, employees_data: List[Dict[str, str]], check_type:
         employees_data: Данные сотрудников для заполнения
         check_type: Тип проверки знаний ('первичная' или 'периодическая')
     """
-    from docx.shared import Pt
-    from docx.oxml import parse_xml
-    from docx.oxml.ns import nsdecls
-
-    for idx, emp in enumerate(employees_data, start=1):
-        row = table.add_row()
-        cells = row.cells
-        cols = len(cells)
-
-        # Заполняем ячейки данными
-        # Используем сквозную нумерацию (стандартная практика для протоколов)
-        cells[0].text = str(idx)
-        if cols > 1:
-            cells[1].text = emp.get('fio_nominative', '')
-        if cols > 2:
-            cells[2].text = emp.get('position_nominative', '')
-        if cols > 3:
-            cells[3].text = check_type
-        if cols > 4:
-            ticket = emp.get('ticket_number') or ""
-            cells[4].text = str(ticket)
-        if cols > 5:
-            cells[5].text = ""
-        if cols > 6:
-            cells[6].text = ""
-
-        # Запрещаем разрыв строки при переносе на новую страницу
-        tr = row._tr
-        trPr = tr.trPr
-        if trPr is None:
-            trPr = parse_xml(f'<w:trPr {nsdecls("w")}/>')
-            tr.insert(0, trPr)
-
-        # Добавляем свойство cantSplit (не разрывать строку)
-        cantSplit = parse_xml(f'<w:cantSplit {nsdecls("w")}/>')
-        trPr.append(cantSplit)
-
-        # Применяем форматирование Times New Roman ко всем ячейкам строки
-        from docx.enum.text import WD_ALIGN_PARAGRAPH
-        for cell_idx, cell in enumerate(cells):
-            for paragraph in cell.paragraphs:
-                # Центрируем первую колонку (№ п/п)
-                if cell_idx == 0:
-                    paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                for run in paragraph.runs:
-                    run.font.name = 'Times New Roman'
-                    run.font.size = Pt(12)
+    # Сквозная нумерация (стандартная практика для протоколов), Times New Roman 12,
+    # № п/п по центру, строка не разрывается при переносе на новую страницу
+    template = RowTemplate(
+        table, font_name='Times New Roman', font_size=12, cant_split=True,
+        columns={0: {'align': 'center'}},
+    )
+    append_rows(table, template, (
+        [
+            str(idx),
+            emp.get('fio_nominative', ''),
+            emp.get('position_nominative', ''),
+            check_type,
+            str(emp.get('ticket_number') or ""),
+            "",
+            "",
+        ]
+        for idx, emp in enumerate(employees_data, start=1)
+    ))
 
 
 def generate_periodic_protocol(
@@ -28,7 +28,8 @@ from directory.document_generators.base import (
     prepare_employee_context,
     generate_docx_from_template,
 )
-from directory.models.siz import SIZNorm
+from directory.document_generators.table_fill import RowTemplate
+from directory.services.siz_norms import SIZNormResolver
 from directory.models.siz_issued import SIZIssued
 from directory.utils.siz_sizes import get_employee_sizes
 
@@ -44,8 +45,14 @@ def generate_siz_card_docx(
         user=None,
         custom_context: Optional[Dict[str, Any]] = None,
         raise_on_error: bool = False,
+        norm_resolver: Optional[SIZNormResolver] = None,
 ) -> Optional[Dict[str, Any]]:
-    """Генерирует карточку учёта СИЗ для сотрудника."""
+    """
+    Генерирует карточку учёта СИЗ для сотрудника.
+
+    norm_resolver - общий SIZNormResolver при массовой генерации,
+    чтобы нормы загружались один раз на пачку, а не на каждую карточку.
+    """
 
     try:
         # 1. Получение шаблона
@@ -77,33 +84,12 @@ def generate_siz_card_docx(
         # 6. Получаем ВСЕ нормы СИЗ для лицевой стороны (независимо от выбора)
         all_norms_data = []
         if employee.position:
-            # Сначала пытаемся получить нормы для конкретной должности
-            all_norms_query = SIZNorm.objects.filter(
-                position=employee.position
-            ).select_related('siz')
-
-            # Если нормы не найдены, ищем эталонную должность
-            if not all_norms_query.exists():
-                logger.info("Нормы не найдены для конкретной должности, ищем эталонную...")
-                from directory.models import Position
-
-                positions_with_same_name = Position.objects.filter(
-                    position_name=employee.position.position_name
-                ).order_by('organization__full_name_ru')
-
-                reference_position = None
-                for pos in positions_with_same_name:
-                    if SIZNorm.objects.filter(position=pos).exists():
-                        reference_position = pos
-                        break
-
-                if reference_position:
-                    logger.info(f"Найдена эталонная должность ID={reference_position.id}")
-                    all_norms_query = SIZNorm.objects.filter(
-                        position=reference_position
-                    ).select_related('siz')
-
-            for norm in all_norms_query:
+            # Собственные нормы должности, а если их нет - нормы эталонной должности
+            if norm_resolver is None:
+                norm_resolver = SIZNormResolver.for_positions([employee.position])
+            position_norms = norm_resolver.norms_for_position(employee.position)
+
+            for norm in position_norms:
                 cost = norm.siz.cost
                 cost_display = f"{cost:.2f}" if cost is not None else ""
                 all_norms_data.append({
@@ -175,6 +161,7 @@ def generate_siz_card_docx(
                     context[k] = v
 
         # 10. Генерация документа + пост-обработка
+        # Размеры СИЗ случайные - ключ кэша каждый раз новый, карточку не кэшируем
         return generate_docx_from_template(
             template,
             context,
@@ -182,6 +169,7 @@ def generate_siz_card_docx(
             user,
             post_processor=process_siz_card_tables,
             raise_on_error=raise_on_error,
+            cache=False,
         )
 
     except Exception as exc:
@@ -344,17 +332,21 @@ def process_front_table(table, row_idx, cell_idx, norms_data):
         if current_row < len(table.rows):
             template_row = table.rows[current_row]
 
+        # Строки норм сверх имеющихся в шаблоне - клоны прототипа с готовым оформлением
+        norm_template = RowTemplate(
+            table, template_row=template_row, font_name="Times New Roman", font_size=12,
+            align="center", columns={0: {"align": "left"}}, borders=True, single_spacing=True,
+        )
+
+        def put_norm_row(norm, row_number):
+            if row_number >= len(table.rows):
+                table._tbl.append(norm_template.build(_front_row_values(norm)))
+            else:
+                _fill_front_row(table.rows[row_number], norm)
+
         if "" in grouped_norms and grouped_norms[""]:
             for norm in grouped_norms[""]:
-                if current_row >= len(table.rows):
-                    new_row = table.add_row()
-                    # Копируем формат с образца, если он есть
-                    if template_row:
-                        _copy_row_properties(template_row, new_row)
-                else:
-                    new_row = table.rows[current_row]
-
-                _fill_front_row(new_row, norm)
+                put_norm_row(norm, current_row)
                 current_row += 1
 
         # Добавляем строки с условиями и соответствующими нормами
@@ -399,15 +391,7 @@ def process_front_table(table, row_idx, cell_idx, norms_data):
 
             # Добавляем нормы для данного условия
             for norm in norms:
-                if current_row >= len(table.rows):
-                    new_row = table.add_row()
-                    # Копируем формат с образца, если он есть
-                    if template_row:
-                        _copy_row_properties(template_row, new_row)
-                else:
-                    new_row = table.rows[current_row]
-
-                _fill_front_row(new_row, norm)
+                put_norm_row(norm, current_row)
                 current_row += 1
 
         # Применяем форматирование ко всей таблице
@@ -435,7 +419,7 @@ def process_back_table(table, row_idx, cell_idx, norms_data, issue_date=""):
                 subheader_row = table.rows[row_idx - 2]
                 _format_header_row(subheader_row)
 
-        # Определяем колонки для заполнения (0-based): 0, 1, 2, 3, 6
+        # Определяем колонки для заполнения (0-based): 0, 1, 2, 3, 5, 6
         cols_to_fill = [0, 1, 2, 3, 5, 6]
 
         # Создаем образец строки с правильным форматированием
@@ -443,90 +427,45 @@ def process_back_table(table, row_idx, cell_idx, norms_data, issue_date=""):
         if row_idx < len(table.rows):
             template_row = table.rows[row_idx]
 
+        # Строки сверх имеющихся в шаблоне - клоны прототипа с готовым оформлением
+        issued_template = RowTemplate(
+            table, template_row=template_row, font_name="Times New Roman", font_size=12,
+            align="center", columns={0: {"align": "left"}}, borders=True, single_spacing=True,
+        )
+
         # Заполняем строки данными
         current_row = row_idx
         for norm in norms_data:
+            values = [
+                norm.get("name", ""),
+                norm.get("classification", ""),
+                issue_date,
+                str(norm.get("quantity", "")),
+                "",
+                norm.get("cost", ""),
+                "✓",  # Галочка в колонке расписки
+            ]
             if current_row >= len(table.rows):
-                new_row = table.add_row()
-                # Копируем формат с образца, если он есть
-                if template_row:
-                    _copy_row_properties(template_row, new_row)
-            else:
-                new_row = table.rows[current_row]
-
-            # Заполняем только нужные колонки
-            if 0 < len(new_row.cells):
-                new_row.cells[0].text = norm.get("name", "")
-                # Выравнивание по левому краю для первой ячейки
-                for paragraph in new_row.cells[0].paragraphs:
-                    paragraph.paragraph_format.line_spacing = 1.0
-                    paragraph.paragraph_format.space_before = Pt(0)
-                    paragraph.paragraph_format.space_after = Pt(0)
-                    paragraph.alignment = WD_ALIGN_PARAGRAPH.LEFT
-                    for run in paragraph.runs:
-                        run.font.name = "Times New Roman"
-                        run.font.size = Pt(12)
-
-            if 1 < len(new_row.cells):
-                new_row.cells[1].text = norm.get("classification", "")
-                # Центрирование для остальных ячеек
-                for paragraph in new_row.cells[1].paragraphs:
-                    paragraph.paragraph_format.line_spacing = 1.0
-                    paragraph.paragraph_format.space_before = Pt(0)
-                    paragraph.paragraph_format.space_after = Pt(0)
-                    paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                    for run in paragraph.runs:
-                        run.font.name = "Times New Roman"
-                        run.font.size = Pt(12)
-
-            if 2 < len(new_row.cells):
-                new_row.cells[2].text = issue_date
-                for paragraph in new_row.cells[2].paragraphs:
-                    paragraph.paragraph_format.line_spacing = 1.0
-                    paragraph.paragraph_format.space_before = Pt(0)
-                    paragraph.paragraph_format.space_after = Pt(0)
-                    paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                    for run in paragraph.runs:
-                        run.font.name = "Times New Roman"
-                        run.font.size = Pt(12)
-
-            if 3 < len(new_row.cells):
-                new_row.cells[3].text = str(norm.get("quantity", ""))
-                for paragraph in new_row.cells[3].paragraphs:
-                    paragraph.paragraph_format.line_spacing = 1.0
-                    paragraph.paragraph_format.space_before = Pt(0)
-                    paragraph.paragraph_format.space_after = Pt(0)
-                    paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                    for run in paragraph.runs:
-                        run.font.name = "Times New Roman"
-                        run.font.size = Pt(12)
-
-            if 5 < len(new_row.cells):
-                new_row.cells[5].text = norm.get("cost", "")
-                for paragraph in new_row.cells[5].paragraphs:
-                    paragraph.paragraph_format.line_spacing = 1.0
-                    paragraph.paragraph_format.space_before = Pt(0)
-                    paragraph.paragraph_format.space_after = Pt(0)
-                    paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                    for run in paragraph.runs:
-                        run.font.name = "Times New Roman"
-                        run.font.size = Pt(12)
+                table._tbl.append(issued_template.build(values))
+                current_row += 1
+                continue
 
-            if 6 < len(new_row.cells):
-                new_row.cells[6].text = "✓"  # Галочка в колонке расписки
-                for paragraph in new_row.cells[6].paragraphs:
+            new_row = table.rows[current_row]
+            cells = new_row.cells
+            # Заполняем только нужные колонки: первая - по левому краю, остальные - по центру
+            for col in cols_to_fill:
+                if col >= len(cells):
+                    continue
+                cells[col].text = values[col]
+                for paragraph in cells[col].paragraphs:
                     paragraph.paragraph_format.line_spacing = 1.0
                     paragraph.paragraph_format.space_before = Pt(0)
                     paragraph.paragraph_format.space_after = Pt(0)
-                    paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
+                    paragraph.alignment = WD_ALIGN_PARAGRAPH.LEFT if col == 0 else WD_ALIGN_PARAGRAPH.CENTER
                     for run in paragraph.runs:
                         run.font.name = "Times New Roman"
                         run.font.size = Pt(12)
-
-            # Форматируем ячейки
-            for col in cols_to_fill:
-                if col < len(new_row.cells):
-                    _set_cell_border(new_row.cells[col])
+                _set_cell_border(cells[col])
 
             current_row += 1
 
@@ -631,6 +570,17 @@ def _find_marker_in_table(table, marker):
     return None, None
 
 
+def _front_row_values(norm):
+    """Текст ячеек строки нормы на лицевой стороне."""
+    return [
+        norm.get("name", ""),
+        norm.get("classification", ""),
+        norm.get("unit", ""),
+        str(norm.get("quantity", "")),
+        norm.get("wear_period", ""),
+    ]
+
+
 def _fill_front_row(row, norm):
     """Заполняет строку таблицы на лицевой стороне."""
     # Проверяем наличие достаточного количества ячеек
@@ -638,16 +588,9 @@ def _fill_front_row(row, norm):
         logger.warning(f"Недостаточно ячеек в строке таблицы: {len(row.cells)}")
         return
 
-    # Очищаем ячейки перед заполнением для предотвращения проблем с форматированием
-    for i in range(5):
-        row.cells[i].text = ""
-
-    # Заполняем ячейки
-    row.cells[0].text = norm.get("name", "")
-    row.cells[1].text = norm.get("classification", "")
-    row.cells[2].text = norm.get("unit", "")
-    row.cells[3].text = str(norm.get("quantity", ""))
-    row.cells[4].text = norm.get("wear_period", "")
+    # Заполняем ячейки (присваивание text заменяет прежнее содержимое)
+    for i, value in enumerate(_front_row_values(norm)):
+        row.cells[i].text = value
 
     # Форматируем ячейки
     for i in range(5):
@@ -0,0 +1,180 @@
+# directory/document_generators/table_fill.py
+"""
+🧱 Быстрое заполнение таблиц DOCX строками на уровне XML
+
+python-docx на каждый table.add_row(), row.cells и run.font заново обходит
+XML таблицы, поэтому журналы на тысячи строк заполнялись сверхлинейно.
+RowTemplate один раз собирает прототип <w:tr> со всем оформлением
+(ширины ячеек из сетки таблицы, границы, выравнивание, шрифт, cantSplit),
+а каждая строка данных - это deepcopy прототипа с подставленным текстом,
+добавленная в конец <w:tbl>.
+
+Использование:
+    template = RowTemplate(
+        table, font_size=14, borders=True,
+        columns={0: {'align': 'center'}, 4: {'align': 'center'}},
+    )
+    append_rows(table, template, ([str(idx), name, ...] for idx, name in ...))
+"""
+from copy import deepcopy
+
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+
+ALIGNMENTS = {
+    'left': 'left',
+    'center': 'center',
+    'right': 'right',
+    'justify': 'both',
+}
+
+BORDER_SIDES = ('top', 'left', 'bottom', 'right')
+
+
+def _element(tag, **attrs):
+    element = OxmlElement(tag)
+    for name, value in attrs.items():
+        element.set(qn(f'w:{name}'), str(value))
+    return element
+
+
+class RowTemplate:
+    """
+    Прототип строки таблицы с готовым оформлением.
+
+    Args:
+        table: Таблица python-docx, в которую добавляются строки
+        columns: Оформление отдельных столбцов {индекс: {'align', 'size', 'font', 'bold', 'italic'}}
+        font_name: Шрифт всех ячеек (по умолчанию - шрифт стиля)
+        font_size: Размер шрифта в пунктах для всех ячеек
+        align: Выравнивание всех ячеек ('left', 'center', 'right', 'justify')
+        borders: Одинарные границы 0.5 pt вокруг каждой ячейки
+        cant_split: Не разрывать строку при переносе на новую страницу
+        single_spacing: Одинарный интервал без отступов до и после абзаца
+        template_row: Строка-образец python-docx - из неё берутся высота и ширины ячеек
+    """
+
+    def __init__(self, table, columns=None, *, font_name=None, font_size=None, align=None,
+                 borders=False, cant_split=False, single_spacing=False, template_row=None):
+        columns = columns or {}
+        widths = self._cell_widths(table, template_row)
+
+        tr = OxmlElement('w:tr')
+        tr_pr = self._row_properties(cant_split, template_row)
+        if tr_pr is not None:
+            tr.append(tr_pr)
+
+        for index, width in enumerate(widths):
+            spec = columns.get(index, {})
+            tc = OxmlElement('w:tc')
+            tr.append(tc)
+
+            tc_pr = OxmlElement('w:tcPr')
+            tc.append(tc_pr)
+            if width is not None:
+                tc_pr.append(deepcopy(width))
+            if borders:
+                tc_borders = OxmlElement('w:tcBorders')
+                for side in BORDER_SIDES:
+                    tc_borders.append(_element(f'w:{side}', val='single', sz=4, space=0, color='000000'))
+                tc_pr.append(tc_borders)
+
+            p = OxmlElement('w:p')
+            tc.append(p)
+            p_pr = OxmlElement('w:pPr')
+            if single_spacing:
+                p_pr.append(_element('w:spacing', before=0, after=0, line=240, lineRule='auto'))
+            alignment = spec.get('align', align)
+            if alignment:
+                p_pr.append(_element('w:jc', val=ALIGNMENTS[alignment]))
+            if len(p_pr):
+                p.append(p_pr)
+
+            r = OxmlElement('w:r')
+            p.append(r)
+            r_pr = OxmlElement('w:rPr')
+            name = spec.get('font', font_name)
+            if name:
+                r_pr.append(_element('w:rFonts', ascii=name, hAnsi=name))
+            if spec.get('bold'):
+                r_pr.append(OxmlElement('w:b'))
+            if spec.get('italic'):
+                r_pr.append(OxmlElement('w:i'))
+            size = spec.get('size', font_size)
+            if size:
+                # w:sz задаётся в половинах пункта
+                r_pr.append(_element('w:sz', val=int(round(size * 2))))
+            if len(r_pr):
+                r.append(r_pr)
+            r.append(OxmlElement('w:t'))
+
+        self._tr = tr
+        self.column_count = len(widths)
+
+    @staticmethod
+    def _cell_widths(table, template_row):
+        """Элементы w:tcW для каждой ячейки: из строки-образца или из сетки таблицы"""
+        grid_cols = table._tbl.tblGrid.gridCol_lst
+        # Строка-образец с объединёнными ячейками не годится - ячеек в ней меньше, чем столбцов сетки
+        if template_row is not None and len(template_row._tr.tc_lst) == len(grid_cols):
+            widths = []
+            for tc in template_row._tr.tc_lst:
+                tc_pr = tc.tcPr
+                widths.append(tc_pr.find(qn('w:tcW')) if tc_pr is not None else None)
+            return widths
+
+        widths = []
+        for grid_col in grid_cols:
+            width = grid_col.get(qn('w:w'))
+            widths.append(_element('w:tcW', w=width, type='dxa') if width is not None else None)
+        return widths
+
+    @staticmethod
+    def _row_properties(cant_split, template_row):
+        tr_pr = OxmlElement('w:trPr')
+        if template_row is not None and template_row._tr.trPr is not None:
+            height = template_row._tr.trPr.find(qn('w:trHeight'))
+            if height is not None:
+                tr_pr.append(deepcopy(height))
+        if cant_split:
+            tr_pr.insert(0, OxmlElement('w:cantSplit'))
+        return tr_pr if len(tr_pr) else None
+
+    def build(self, values):
+        """Новый <w:tr> с текстом values по столбцам (лишние значения отбрасываются)"""
+        tr = deepcopy(self._tr)
+        for t, value in zip(list(tr.iter(qn('w:t'))), values):
+            if value is None or value == '':
+                continue
+            text = str(value)
+            if '\n' not in text:
+                t.text = text
+                if text != text.strip():
+                    t.set('{http://www.w3.org/XML/1998/namespace}space', 'preserve')
+                continue
+            # Перенос строки внутри ячейки - <w:br/> между фрагментами текста
+            r = t.getparent()
+            r.remove(t)
+            for line_idx, line in enumerate(text.split('\n')):
+                if line_idx:
+                    r.append(OxmlElement('w:br'))
+                fragment = OxmlElement('w:t')
+                fragment.text = line
+                fragment.set('{http://www.w3.org/XML/1998/namespace}space', 'preserve')
+                r.append(fragment)
+        return tr
+
+
+def append_rows(table, template, rows):
+    """
+    Добавляет в конец таблицы строки из итерируемого rows (списки значений по столбцам).
+
+    Returns:
+        int: Количество добавленных строк
+    """
+    tbl = table._tbl
+    count = 0
+    for values in rows:
+        tbl.append(template.build(values))
+        count += 1
+    return count
@@ -18,7 +18,6 @@ from directory.models import (
     Department,
     GeneratedDocument
 )
-from deadline_control.models.medical_norm import MedicalExaminationNorm
 
 
 class CombinedEmployeeHiringForm(forms.Form):
@@ -374,29 +373,6 @@ class CombinedEmployeeHiringForm(forms.Form):
             self.fields[
                 'position'].queryset = Position.objects.all()  # Оставляем .all() если организация не выбрана, как было в определении поля
 
-    def clean(self):
-        cleaned_data = super().clean()
-        position = cleaned_data.get('position')
-
-        if position:
-            needs_medical = False
-            if hasattr(position, 'medical_factors') and hasattr(position.medical_factors, 'filter'):
-                needs_medical = position.medical_factors.filter(is_disabled=False).exists()
-
-            if not needs_medical:
-                needs_medical = MedicalExaminationNorm.objects.filter(
-                    position_name=position.position_name
-                ).exists()
-
-            needs_siz = False
-            if hasattr(position, 'siz_norms') and hasattr(position.siz_norms, 'exists'):
-                needs_siz = position.siz_norms.exists()
-
-            if not needs_siz:
-                if hasattr(Position, 'find_reference_norms'):
-                    needs_siz = Position.find_reference_norms(position.position_name).exists()
-        return cleaned_data
-
 
 class DocumentAttachmentForm(forms.Form):
     documents = forms.ModelMultipleChoiceField(
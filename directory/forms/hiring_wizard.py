@@ -12,6 +12,7 @@ from directory.models import (
     StructuralSubdivision,
     Department
 )
+from directory.services.position_requirements import get_requirement_profile
 
 
 class CombinedEmployeeHiringForm(forms.Form):
@@ -241,15 +242,9 @@ class CombinedEmployeeHiringForm(forms.Form):
 
         # Если выбрана должность, определяем необходимость медосмотра и СИЗ
         if position:
-            # Проверяем медосмотр (фильтруем по is_disabled=False)
-            needs_medical = position.medical_factors.filter(is_disabled=False).exists()
-
-            # Если не найдены переопределения, проверяем эталонные нормы медосмотра
-            if not needs_medical:
-                from deadline_control.models.medical_norm import MedicalExaminationNorm
-                needs_medical = MedicalExaminationNorm.objects.filter(
-                    position_name=position.position_name
-                ).exists()
+            # Требования должности (собственные или эталонные нормы) - из профиля
+            requirements = get_requirement_profile(position)
+            needs_medical = requirements.needs_medical
 
             # Если требуется медосмотр, проверяем заполнение обязательных полей
             if needs_medical:
@@ -258,13 +253,6 @@ class CombinedEmployeeHiringForm(forms.Form):
                 if not place_of_residence:
                     self.add_error('place_of_residence', _('Необходимо указать место проживания для медосмотра'))
 
-            # Проверяем СИЗ
-            needs_siz = position.siz_norms.exists()
-
-            # Если нет переопределений, проверяем эталонные нормы СИЗ
-            if not needs_siz:
-                needs_siz = Position.find_reference_norms(position.position_name).exists()
-
             # Для СИЗ не делаем поля обязательными, но можно добавить валидацию при необходимости
 
         return cleaned_data
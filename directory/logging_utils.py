@@ -0,0 +1,75 @@
+"""
+📝 Утилиты логирования для "горячих" участков кода.
+
+- QueuedFileHandler: запись логов в файл в отдельном потоке
+  (QueueHandler + QueueListener), чтобы файловый I/O не блокировал запрос.
+  Подключается в settings.LOGGING при LOG_ASYNC=True.
+- log_sampled: DEBUG-строки в циклах генераторов пишутся не для каждой
+  строки таблицы, а для первой, последней и каждой N-й (LOG_SAMPLE_EVERY).
+"""
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+from django.conf import settings
+
+
+class QueuedFileHandler(QueueHandler):
+    """
+    Обработчик для settings.LOGGING: кладёт записи в очередь,
+    а фоновый QueueListener пишет их в файл.
+
+    Принимает те же параметры, что и logging.FileHandler. Форматтер и уровень,
+    заданные в LOGGING, применяются к файловому обработчику в потоке слушателя.
+    """
+
+    def __init__(self, filename, mode='a', encoding=None, delay=False, queue_size=-1):
+        super().__init__(queue.Queue(queue_size))
+        self.file_handler = logging.FileHandler(filename, mode=mode, encoding=encoding, delay=delay)
+        self.listener = QueueListener(self.queue, self.file_handler, respect_handler_level=True)
+        self.listener.start()
+        atexit.register(self.stop_listener)
+
+    def setFormatter(self, fmt):
+        # Форматирование выполняется в потоке слушателя, а не в потоке запроса
+        self.file_handler.setFormatter(fmt)
+
+    def setLevel(self, level):
+        super().setLevel(level)
+        self.file_handler.setLevel(level)
+
+    def prepare(self, record):
+        # Аргументы подставляем здесь: объекты моделей могут измениться
+        # к моменту, когда запись дойдёт до слушателя
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def stop_listener(self):
+        """Дописывает оставшиеся в очереди записи и останавливает поток (повторный вызов безопасен)"""
+        if self.listener._thread is not None:
+            self.listener.stop()
+
+    def close(self):
+        self.stop_listener()
+        self.file_handler.close()
+        super().close()
+
+
+def log_sampled(logger, index, total, msg, *args):
+    """
+    Пишет DEBUG-сообщение для строки цикла с прореживанием:
+    первая строка, последняя строка и каждая LOG_SAMPLE_EVERY-я.
+
+    index считается с 1. Аргументы форматируются только если
+    сообщение действительно будет записано.
+    """
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    every = getattr(settings, 'LOG_SAMPLE_EVERY', 100)
+    if index == 1 or index == total or (every and index % every == 0):
+        logger.debug(msg, *args)
@@ -0,0 +1,99 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.template.loader import get_template
+from django.urls import reverse
+
+from directory.models import Employee, Position
+from directory.views.home import EMPLOYEE_ROW_URLS, employee_url_prefixes
+
+
+class Command(BaseCommand):
+    help = (
+        'Замер рендеринга дерева сотрудников главной страницы (directory/_home_tree.html) '
+        'на синтетической оргструктуре: без кэша и с кэшированными фрагментами отделов'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            default='1000,5000,10000',
+            help='Число сотрудников через запятую',
+        )
+        parser.add_argument(
+            '--department-size',
+            type=int,
+            default=25,
+            help='Сотрудников в отделе',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=3,
+            help='Повторов замера (берётся лучший)',
+        )
+
+    def build_tree(self, size, department_size):
+        """Организация → подразделения по 5 отделов → сотрудники (без записи в БД)"""
+        positions = [Position(id=pk, position_name=f'Должность {pk}') for pk in range(1, 51)]
+        departments = []
+        for start in range(0, size, department_size):
+            dept_id = len(departments) + 1
+            employees = []
+            for pk in range(start + 1, min(start + department_size, size) + 1):
+                employee = Employee(id=pk, full_name_nominative=f'Сотрудник {pk} Тестович')
+                employee.position = positions[pk % len(positions)]
+                employees.append(employee)
+            departments.append({'id': dept_id, 'name': f'Отдел {dept_id}', 'employees': employees})
+
+        subdivisions = [
+            {'id': index + 1, 'name': f'Подразделение {index + 1}', 'employees': [],
+             'departments': departments[start:start + 5]}
+            for index, start in enumerate(range(0, len(departments), 5))
+        ]
+        return [{
+            'id': 1, 'short_name': 'Бенчмарк', 'employees': [], 'subdivisions': subdivisions,
+            'tree_cache_key': ('benchmark', time.time_ns()),
+        }]
+
+    def measure(self, template, context, repeat):
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            template.render(context)
+            elapsed = (time.perf_counter() - started) * 1000
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    def handle(self, *args, **options):
+        template = get_template('directory/_home_tree.html')
+        urls = employee_url_prefixes()
+        repeat = max(options['repeat'], 1)
+
+        header = f"{'Сотрудников':>12}  {'без кэша':>10}  {'кэш отделов':>12}  {'reverse() x2N':>14}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for size in (int(value) for value in options['sizes'].split(',') if value.strip()):
+            organizations = self.build_tree(size, options['department_size'])
+            context = {
+                'organizations': organizations,
+                'candidate_employees': [],
+                'employee_urls': urls,
+                'tree_cache_timeout': 0,
+            }
+            uncached = self.measure(template, context, repeat)
+
+            # Первый рендер заполняет кэш фрагментов, замеряются повторные
+            context['tree_cache_timeout'] = 300
+            template.render(context)
+            cached = self.measure(template, context, repeat)
+
+            # Сколько стоили бы {% url %} в каждой строке (две ссылки на сотрудника)
+            started = time.perf_counter()
+            for pk in range(1, size + 1):
+                for name in EMPLOYEE_ROW_URLS.values():
+                    reverse(name, args=[pk])
+            reversals = (time.perf_counter() - started) * 1000
+
+            self.stdout.write(f"{size:>12}  {uncached:>10.0f}  {cached:>12.0f}  {reversals:>14.0f}")
+        self.stdout.write('Время - в миллисекундах')
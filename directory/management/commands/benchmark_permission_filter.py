@@ -0,0 +1,187 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+from django.test.utils import CaptureQueriesContext
+
+from directory.models import Department, Employee, Organization, Position, StructuralSubdivision
+from directory.utils.permissions import AccessControlHelper
+
+
+def legacy_filter(queryset, profile):
+    """Прежний фильтр: подзапросы из объединённых querysets с .distinct() (для сравнения)"""
+    org_ids = set(profile.organizations.values_list('id', flat=True))
+    org_ids.update(profile.subdivisions.values_list('organization_id', flat=True))
+    org_ids.update(profile.departments.values_list('organization_id', flat=True))
+    orgs = Organization.objects.filter(id__in=org_ids)
+    subdivs = (
+        StructuralSubdivision.objects.filter(organization__in=profile.organizations.all())
+        | profile.subdivisions.all()
+        | StructuralSubdivision.objects.filter(id__in=profile.departments.values_list('subdivision_id', flat=True))
+    ).distinct()
+    depts = (
+        Department.objects.filter(organization__in=profile.organizations.all())
+        | Department.objects.filter(subdivision__in=profile.subdivisions.all())
+        | profile.departments.all()
+    ).distinct()
+    direct_dept_user = (
+        profile.departments.exists()
+        and not profile.organizations.exists()
+        and not profile.subdivisions.exists()
+    )
+    if direct_dept_user:
+        return queryset.filter(department__isnull=False, department__in=depts).distinct()
+    return queryset.filter(
+        Q(department__isnull=False, department__in=depts)
+        | Q(department__isnull=True, subdivision__isnull=False, subdivision__in=subdivs)
+        | Q(department__isnull=True, subdivision__isnull=True, organization__in=orgs)
+    ).distinct()
+
+
+class Command(BaseCommand):
+    help = (
+        'Замер фильтра прав доступа (AccessControlHelper.filter_queryset) на синтетической '
+        'таблице сотрудников: прежние подзапросы из объединений querysets против плоских списков ID. '
+        'Данные создаются в транзакции и откатываются'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--employees',
+            type=int,
+            default=100000,
+            help='Число сотрудников',
+        )
+        parser.add_argument(
+            '--organizations',
+            type=int,
+            default=20,
+            help='Число организаций (по 10 подразделений, в каждом по 5 отделов)',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=3,
+            help='Повторов замера (берётся лучший)',
+        )
+        parser.add_argument(
+            '--explain',
+            action='store_true',
+            help='Вывести план запроса (EXPLAIN) для каждого варианта',
+        )
+
+    def build_structure(self, organizations_count, employees_count):
+        """Организации → подразделения → отделы; 70% сотрудников в отделах, 20% в подразделениях, 10% в организации"""
+        organizations = Organization.objects.bulk_create([
+            Organization(
+                full_name_ru=f'Бенчмарк {index}', short_name_ru=f'Бенчмарк {index}',
+                full_name_by=f'Бенчмарк {index}', short_name_by=f'Бенчмарк {index}',
+            )
+            for index in range(organizations_count)
+        ])
+        subdivisions = StructuralSubdivision.objects.bulk_create([
+            StructuralSubdivision(name=f'Подразделение {org.pk}-{index}', organization=org)
+            for org in organizations
+            for index in range(10)
+        ])
+        departments = Department.objects.bulk_create([
+            Department(name=f'Отдел {subdiv.pk}-{index}', organization_id=subdiv.organization_id, subdivision=subdiv)
+            for subdiv in subdivisions
+            for index in range(5)
+        ])
+        positions = {
+            org.pk: Position.objects.create(position_name='Должность бенчмарка', organization=org)
+            for org in organizations
+        }
+
+        batch = []
+        for index in range(employees_count):
+            department = departments[index % len(departments)]
+            kind = index % 10
+            batch.append(Employee(
+                full_name_nominative=f'Сотрудник {index} Тестович',
+                organization_id=department.organization_id,
+                subdivision_id=department.subdivision_id if kind < 9 else None,
+                department=department if kind < 7 else None,
+                position=positions[department.organization_id],
+            ))
+            if len(batch) == 5000:
+                Employee.objects.bulk_create(batch)
+                batch = []
+        Employee.objects.bulk_create(batch)
+        return organizations, subdivisions, departments
+
+    def build_users(self, organizations, subdivisions, departments):
+        """Пользователи с доступом разного уровня"""
+        def user(name, orgs=(), subdivs=(), depts=()):
+            instance = User.objects.create_user(f'benchmark_{name}_{time.time_ns()}')
+            instance.profile.organizations.set(orgs)
+            instance.profile.subdivisions.set(subdivs)
+            instance.profile.departments.set(depts)
+            return instance
+
+        org_subdivs = [subdiv for subdiv in subdivisions if subdiv.organization_id == organizations[-1].pk]
+        return [
+            ('организация', user('org', orgs=organizations[:1])),
+            ('подразделения', user('subdiv', subdivs=subdivisions[10:13])),
+            ('смешанный', user('mixed', orgs=organizations[1:2], subdivs=org_subdivs[:2], depts=departments[:3])),
+            ('только отделы', user('dept', depts=departments[100:103])),
+        ]
+
+    def measure(self, build, repeat):
+        best, count, queries = None, None, None
+        for _ in range(repeat):
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                count = len(list(build().values_list('pk', flat=True)))
+                elapsed = (time.perf_counter() - started) * 1000
+            queries = len(captured)
+            best = elapsed if best is None else min(best, elapsed)
+        return best, count, queries
+
+    def explain(self, queryset):
+        """План запроса: для SQLite - колонка detail из EXPLAIN QUERY PLAN"""
+        sql, params = queryset.values('pk').query.sql_with_params()
+        prefix = 'EXPLAIN QUERY PLAN' if connection.vendor == 'sqlite' else 'EXPLAIN'
+        with connection.cursor() as cursor:
+            cursor.execute(f'{prefix} {sql}', params)
+            return '\n'.join(str(row[-1]) for row in cursor.fetchall())
+
+    def handle(self, *args, **options):
+        repeat = max(options['repeat'], 1)
+        with transaction.atomic():
+            self.stdout.write(f"Создание {options['employees']} сотрудников...")
+            structure = self.build_structure(options['organizations'], options['employees'])
+            users = self.build_users(*structure)
+            employees = Employee.objects.filter(organization__in=structure[0])
+            with connection.cursor() as cursor:
+                if connection.vendor == 'postgresql':
+                    cursor.execute(f'ANALYZE {Employee._meta.db_table}')
+                elif connection.vendor == 'sqlite':
+                    cursor.execute('ANALYZE')
+
+            header = f"{'Доступ':>14}  {'строк':>7}  {'прежний':>9}  {'запросов':>8}  {'плоский':>9}  {'запросов':>8}"
+            self.stdout.write(header)
+            self.stdout.write('-' * len(header))
+            for label, user in users:
+                legacy = self.measure(lambda: legacy_filter(employees, user.profile), repeat)
+                # Без request - область доступа вычисляется заново в каждом повторе
+                compiled = self.measure(lambda: AccessControlHelper.filter_queryset(employees, user), repeat)
+                if legacy[1] != compiled[1]:
+                    self.stderr.write(f'{label}: результаты различаются ({legacy[1]} / {compiled[1]})')
+
+                self.stdout.write(
+                    f"{label:>14}  {compiled[1]:>7}  {legacy[0]:>9.1f}  {legacy[2]:>8}  {compiled[0]:>9.1f}  {compiled[2]:>8}"
+                )
+                if options['explain']:
+                    for name, queryset in (
+                        ('прежний', legacy_filter(employees, user.profile)),
+                        ('плоский', AccessControlHelper.filter_queryset(employees, user)),
+                    ):
+                        self.stdout.write(f'--- {label}, {name}:')
+                        self.stdout.write(self.explain(queryset))
+
+            transaction.set_rollback(True)
+        self.stdout.write('Время - в миллисекундах, данные бенчмарка откачены')
@@ -0,0 +1,92 @@
+import time
+
+from docx import Document
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+from docx.shared import Pt
+from django.core.management.base import BaseCommand
+
+from directory.document_generators.table_fill import RowTemplate, append_rows
+
+COLUMNS = 8
+
+
+class Command(BaseCommand):
+    help = (
+        'Замер заполнения таблицы журнала (8 столбцов, 14 pt, границы): '
+        'python-docx add_row()/cells/runs против клонирования прототипа <w:tr>'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            default='500,1000,2000,5000',
+            help='Число строк через запятую',
+        )
+        parser.add_argument(
+            '--skip-python-docx',
+            action='store_true',
+            help='Не замерять заполнение через python-docx (медленно на больших размерах)',
+        )
+
+    def new_table(self):
+        table = Document().add_table(rows=2, cols=COLUMNS)
+        for index, cell in enumerate(table.rows[1].cells, start=1):
+            cell.text = str(index)
+        return table
+
+    def records(self, size):
+        for idx in range(1, size + 1):
+            yield [
+                str(idx), 'Грузовая тележка', f'Инв. № {idx:05d}', 'Склад №1',
+                '01.10.2026', 'Мастер Иванов И.И.', 'Исправна', '',
+            ]
+
+    def fill_python_docx(self, table, size):
+        """Прежний способ: add_row(), row.cells, шрифт и границы по ячейкам"""
+        for values in self.records(size):
+            cells = table.add_row().cells
+            for index, value in enumerate(values):
+                cells[index].text = value
+                if index in (0, 4):
+                    cells[index].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+                if value:
+                    cells[index].paragraphs[0].runs[0].font.size = Pt(14)
+            for cell in cells:
+                tc_borders = OxmlElement('w:tcBorders')
+                for side in ('top', 'left', 'bottom', 'right'):
+                    border = OxmlElement(f'w:{side}')
+                    border.set(qn('w:val'), 'single')
+                    border.set(qn('w:sz'), '4')
+                    tc_borders.append(border)
+                cell._element.get_or_add_tcPr().append(tc_borders)
+
+    def fill_row_template(self, table, size):
+        template = RowTemplate(
+            table, font_size=14, borders=True,
+            columns={0: {'align': 'center'}, 4: {'align': 'center'}, 7: {'size': None}},
+        )
+        append_rows(table, template, self.records(size))
+
+    def measure(self, fill, size):
+        table = self.new_table()
+        started = time.perf_counter()
+        fill(table, size)
+        return (time.perf_counter() - started) * 1000
+
+    def handle(self, *args, **options):
+        header = f"{'Строк':>8}  {'python-docx':>12}  {'мкс/строка':>10}  {'прототип':>10}  {'мкс/строка':>10}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for size in (int(value) for value in options['sizes'].split(',') if value.strip()):
+            if options['skip_python_docx']:
+                legacy, legacy_row = '-', '-'
+            else:
+                elapsed = self.measure(self.fill_python_docx, size)
+                legacy, legacy_row = f'{elapsed:.0f}', f'{elapsed * 1000 / size:.0f}'
+            elapsed = self.measure(self.fill_row_template, size)
+            self.stdout.write(
+                f"{size:>8}  {legacy:>12}  {legacy_row:>10}  {elapsed:>10.0f}  {elapsed * 1000 / size:>10.0f}"
+            )
+        self.stdout.write('Время - в миллисекундах; линейное заполнение держит мкс/строка постоянным')
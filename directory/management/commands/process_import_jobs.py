@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from directory.models import ImportJob
+from directory.services.import_jobs import (
+    expire_import_jobs,
+    pending_import_jobs,
+    resume_import_job,
+    run_import_job,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Выполняет задания единого импорта из очереди и продолжает задания, '
+        'обработчик которых остановился, отменяет давно брошенные задания '
+        '(запускать по cron раз в минуту)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--job',
+            type=int,
+            help='ID задания; задание, остановленное с ошибкой, запускается повторно',
+        )
+
+    def handle(self, *args, **options):
+        if options['job']:
+            try:
+                job = ImportJob.objects.get(pk=options['job'])
+            except ImportJob.DoesNotExist:
+                raise CommandError(f"Задание импорта {options['job']} не найдено")
+            if job.status == ImportJob.STATUS_FAILED:
+                resume_import_job(job, start=False)
+            job_ids = [job.pk]
+        else:
+            expired = expire_import_jobs()
+            if expired:
+                self.stdout.write(f'Отменено заданий, брошенных дольше IMPORT_JOB_EXPIRE_DAYS: {expired}')
+            job_ids = list(pending_import_jobs().values_list('pk', flat=True))
+
+        if not job_ids:
+            self.stdout.write('Нет заданий для обработки')
+            return
+
+        for job_id in job_ids:
+            job = run_import_job(job_id)
+            if job is None:
+                self.stdout.write(self.style.WARNING(f'Задание {job_id} выполняется другим обработчиком'))
+            elif job.status == ImportJob.STATUS_FAILED:
+                self.stdout.write(self.style.ERROR(f'Задание {job_id}: {job.error_message}'))
+            else:
+                self.stdout.write(self.style.SUCCESS(f'Задание {job_id}: {job.get_status_display()}'))
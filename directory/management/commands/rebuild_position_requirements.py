@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from directory.models import Position
+from directory.services.position_requirements import refresh_requirement_profiles
+
+
+class Command(BaseCommand):
+    help = (
+        'Полностью пересобирает профили требований должностей (медосмотры, СИЗ, '
+        'стажировка, инструкции, комиссии) - после массовых изменений в обход сигналов'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--organization',
+            type=int,
+            help='ID организации; без параметра пересобираются все должности',
+        )
+
+    def handle(self, *args, **options):
+        positions = Position.objects.all()
+        if options['organization']:
+            positions = positions.filter(organization_id=options['organization'])
+
+        count = refresh_requirement_profiles(queryset=positions)
+        self.stdout.write(self.style.SUCCESS(f'Пересобрано профилей должностей: {count}'))
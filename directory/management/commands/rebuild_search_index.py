@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from directory.models import Employee, Position
+from directory.utils.search import rebuild_search_text
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает поисковое поле search_text у сотрудников и должностей (после массового импорта)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Размер пакета bulk_update',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        employees = rebuild_search_text(Employee.objects.all(), 'full_name_nominative', batch_size)
+        positions = rebuild_search_text(Position.objects.all(), 'position_name', batch_size)
+        self.stdout.write(self.style.SUCCESS(
+            f'Обновлено: сотрудников - {employees}, должностей - {positions}'
+        ))
@@ -0,0 +1,64 @@
+from django.core.management.base import BaseCommand
+
+from directory.utils.request_metrics import metrics_store
+
+
+class Command(BaseCommand):
+    help = 'Выводит p50/p95/p99 времени ответа и число SQL-запросов по каждому view'
+
+    SORT_FIELDS = {
+        'p50': 'p50_ms',
+        'p95': 'p95_ms',
+        'p99': 'p99_ms',
+        'count': 'count',
+        'queries': 'p95_queries',
+        'db': 'p95_db_ms',
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sort',
+            choices=sorted(self.SORT_FIELDS),
+            default='p95',
+            help='Поле сортировки (по убыванию)',
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=30,
+            help='Сколько view показать (0 - все)',
+        )
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Очистить накопленные метрики после вывода отчёта',
+        )
+
+    def handle(self, *args, **options):
+        rows = metrics_store.summarize()
+        if not rows:
+            self.stdout.write(self.style.WARNING('Замеров пока нет'))
+            return
+
+        rows.sort(key=lambda row: row[self.SORT_FIELDS[options['sort']]], reverse=True)
+        if options['limit']:
+            rows = rows[:options['limit']]
+
+        name_width = max(len('View'), *(len(row['view_name']) for row in rows))
+        header = (
+            f"{'View':<{name_width}}  {'N':>6}  {'p50':>8}  {'p95':>8}  {'p99':>8}  "
+            f"{'SQL avg':>8}  {'SQL p95':>8}  {'DB p95':>8}"
+        )
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for row in rows:
+            self.stdout.write(
+                f"{row['view_name']:<{name_width}}  {row['count']:>6}  "
+                f"{row['p50_ms']:>8.0f}  {row['p95_ms']:>8.0f}  {row['p99_ms']:>8.0f}  "
+                f"{row['avg_queries']:>8}  {row['p95_queries']:>8}  {row['p95_db_ms']:>8.0f}"
+            )
+        self.stdout.write('Время - в миллисекундах')
+
+        if options['reset']:
+            metrics_store.reset()
+            self.stdout.write(self.style.SUCCESS('Метрики сброшены'))
@@ -1,15 +1,32 @@
 from django.core.management.base import BaseCommand
-from directory.utils.medical_examination import update_medical_examination_statuses
+
+from deadline_control.services import MedicalStatusRecalculator
 
 
 class Command(BaseCommand):
-    help = 'Обновляет статусы медицинских осмотров'
+    help = (
+        'Обновляет статусы медицинских осмотров. По умолчанию инкрементально: '
+        'только записи, пересёкшие границу статуса или изменённые с прошлого запуска'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Проверить все записи, а не только изменившиеся с прошлого запуска',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            help='Записей в одном UPDATE (по умолчанию MEDICAL_STATUS_CHUNK_SIZE)',
+        )
 
     def handle(self, *args, **options):
-        result = update_medical_examination_statuses()
+        run = MedicalStatusRecalculator(chunk_size=options['chunk_size']).run(full=options['full'])
 
         self.stdout.write(
             self.style.SUCCESS(
-                f'Обновлено статусов: to_issue={result["to_issue_updated"]}, expired={result["expired_updated"]}'
+                f'Обновлено статусов ({run.get_mode_display().lower()}, проверено {run.scanned_count}): '
+                f'to_issue={run.to_issue_updated}, expired={run.expired_updated}'
             )
-        )
\ No newline at end of file
+        )
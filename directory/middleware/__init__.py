@@ -1,5 +1,6 @@
 # directory/middleware/__init__.py
 from .exam_subdomain import ExamSubdomainMiddleware
 from .access_cache import AccessCacheMiddleware
+from .request_metrics import RequestMetricsMiddleware
 
-__all__ = ['ExamSubdomainMiddleware', 'AccessCacheMiddleware']
+__all__ = ['ExamSubdomainMiddleware', 'AccessCacheMiddleware', 'RequestMetricsMiddleware']
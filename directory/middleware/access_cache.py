@@ -15,6 +15,7 @@ class AccessCacheMiddleware:
     - _user_orgs_cache: QuerySet доступных организаций
     - _user_subdivs_cache: QuerySet доступных подразделений
     - _user_depts_cache: QuerySet доступных отделов
+    - _access_scope_cache: AccessScope (плоские списки ID доступных объектов)
 
     Эти атрибуты заполняются лениво (при первом обращении) в AccessControlHelper.
     """
@@ -27,6 +28,7 @@ class AccessCacheMiddleware:
         request._user_orgs_cache = None
         request._user_subdivs_cache = None
         request._user_depts_cache = None
+        request._access_scope_cache = None
 
         # Обрабатываем запрос
         response = self.get_response(request)
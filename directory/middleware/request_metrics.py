@@ -0,0 +1,100 @@
+# directory/middleware/request_metrics.py
+"""
+Middleware для сбора метрик производительности запросов.
+
+Для каждого запроса замеряет:
+- общее время обработки (wall time)
+- количество SQL-запросов и суммарное время в БД
+
+Работает без DEBUG: SQL перехватывается через connection.execute_wrapper,
+а не через connection.queries. Замеры группируются по имени URL и
+складываются в RequestMetricsStore (см. directory/utils/request_metrics.py).
+
+Если запрос медленнее REQUEST_METRICS_SLOW_MS, его SQL пишется в лог.
+"""
+import logging
+import time
+from contextlib import ExitStack
+
+from django.db import connections
+
+from directory.utils.request_metrics import get_metrics_setting, metrics_store
+
+logger = logging.getLogger('directory.request_metrics')
+
+# Пути, которые не имеет смысла замерять
+SKIP_PATH_PREFIXES = ('/static/', '/media/', '/favicon.ico', '/__debug__/')
+
+
+class QueryCollector:
+    """Execute-wrapper: считает SQL-запросы, время в БД и сохраняет текст SQL."""
+
+    def __init__(self, sql_limit):
+        self.count = 0
+        self.duration = 0.0
+        self.sql_limit = sql_limit
+        self.statements = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.count += 1
+            self.duration += elapsed
+            if len(self.statements) < self.sql_limit:
+                self.statements.append((elapsed * 1000, sql))
+
+
+class RequestMetricsMiddleware:
+    """
+    Замеряет время, число SQL-запросов и время в БД для каждого запроса.
+
+    Должен стоять в начале MIDDLEWARE, чтобы учитывать работу остальных middleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not get_metrics_setting('ENABLED', True) or request.path.startswith(SKIP_PATH_PREFIXES):
+            return self.get_response(request)
+
+        collector = QueryCollector(get_metrics_setting('SQL_LIMIT', 50))
+        start = time.perf_counter()
+
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(collector))
+            response = self.get_response(request)
+
+        wall_ms = (time.perf_counter() - start) * 1000
+        db_ms = collector.duration * 1000
+        view_name = self._get_view_name(request)
+
+        metrics_store.record(view_name, wall_ms, collector.count, db_ms)
+
+        if wall_ms >= get_metrics_setting('SLOW_MS', 1000):
+            self._log_slow_request(request, view_name, wall_ms, db_ms, collector)
+
+        return response
+
+    @staticmethod
+    def _get_view_name(request):
+        match = getattr(request, 'resolver_match', None)
+        if match is None:
+            return '<unresolved>'
+        return match.view_name or match._func_path
+
+    @staticmethod
+    def _log_slow_request(request, view_name, wall_ms, db_ms, collector):
+        sql_lines = '\n'.join(
+            f'  [{duration:.1f} ms] {sql}' for duration, sql in collector.statements
+        )
+        if collector.count > len(collector.statements):
+            sql_lines += f'\n  ... ещё {collector.count - len(collector.statements)} запросов'
+        logger.warning(
+            'Slow request %s %s (view=%s): %.0f ms, %d queries, %.0f ms in DB\n%s',
+            request.method, request.path, view_name, wall_ms, collector.count, db_ms, sql_lines,
+        )
@@ -0,0 +1,75 @@
+from django.db import migrations, models
+
+
+def populate_search_text(apps, schema_editor):
+    """Заполняет search_text у существующих сотрудников и должностей"""
+    from directory.utils.search import rebuild_search_text
+
+    rebuild_search_text(apps.get_model('directory', 'Employee').objects.all(), 'full_name_nominative')
+    rebuild_search_text(apps.get_model('directory', 'Position').objects.all(), 'position_name')
+
+
+def create_trigram_indexes(apps, schema_editor):
+    """На PostgreSQL добавляет GIN-индексы pg_trgm для поиска по подстроке"""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS emp_search_trgm_idx '
+        'ON directory_employee USING gin (search_text gin_trgm_ops)'
+    )
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS position_search_trgm_idx '
+        'ON directory_position USING gin (search_text gin_trgm_ops)'
+    )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS emp_search_trgm_idx')
+    schema_editor.execute('DROP INDEX IF EXISTS position_search_trgm_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('directory', '0056_add_show_in_hiring_flag'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employee',
+            name='search_text',
+            field=models.CharField(
+                blank=True,
+                default='',
+                editable=False,
+                help_text='Нормализованное ФИО для поиска (заполняется автоматически)',
+                max_length=512,
+                verbose_name='Поисковая строка',
+            ),
+        ),
+        migrations.AddField(
+            model_name='position',
+            name='search_text',
+            field=models.CharField(
+                blank=True,
+                default='',
+                editable=False,
+                help_text='Нормализованное название для поиска (заполняется автоматически)',
+                max_length=512,
+                verbose_name='Поисковая строка',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['search_text'], name='emp_search_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='position',
+            index=models.Index(fields=['search_text'], name='position_search_idx'),
+        ),
+        migrations.RunPython(populate_search_text, migrations.RunPython.noop),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.0.14 on 2026-10-18 22:23
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('directory', '0057_add_search_text'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file', models.FileField(upload_to='imports/%Y/%m/', verbose_name='Файл')),
+                ('original_name', models.CharField(blank=True, max_length=255, verbose_name='Имя файла')),
+                ('status', models.CharField(choices=[('queued', 'В очереди'), ('staging', 'Разбор файла'), ('validating', 'Проверка данных'), ('validated', 'Ожидает подтверждения'), ('committing', 'Импорт'), ('done', 'Завершён'), ('failed', 'Ошибка')], db_index=True, default='queued', max_length=20, verbose_name='Статус')),
+                ('total_rows', models.PositiveIntegerField(default=0, verbose_name='Строк в файле')),
+                ('processed_rows', models.PositiveIntegerField(default=0, verbose_name='Обработано строк (текущий этап)')),
+                ('sheets', models.JSONField(default=dict, help_text='Заголовки колонок по листам: {имя_листа: [колонки]}', verbose_name='Листы')),
+                ('preview', models.JSONField(blank=True, default=dict, verbose_name='Результат проверки')),
+                ('result', models.JSONField(blank=True, default=dict, verbose_name='Результат импорта')),
+                ('commit_cursor', models.JSONField(blank=True, default=dict, help_text='Последний импортированный номер строки по листам', verbose_name='Позиция импорта')),
+                ('error_message', models.TextField(blank=True, verbose_name='Ошибка')),
+                ('staged_at', models.DateTimeField(blank=True, null=True, verbose_name='Файл разобран')),
+                ('validated_at', models.DateTimeField(blank=True, null=True, verbose_name='Проверка завершена')),
+                ('confirmed_at', models.DateTimeField(blank=True, null=True, verbose_name='Импорт подтверждён')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Импорт завершён')),
+                ('heartbeat_at', models.DateTimeField(blank=True, help_text='Обновляется обработчиком; устаревшее значение - обработчик остановился', null=True, verbose_name='Последняя активность')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Создано')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Обновлено')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL, verbose_name='Создано пользователем')),
+                ('organization', models.ForeignKey(blank=True, help_text='Подставляется в строки без org_short_name_ru', null=True, on_delete=django.db.models.deletion.SET_NULL, to='directory.organization', verbose_name='Организация')),
+            ],
+            options={
+                'verbose_name': '📥 Задание импорта',
+                'verbose_name_plural': '📥 Задания импорта',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ImportStagingRow',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sheet_name', models.CharField(max_length=50, verbose_name='Лист')),
+                ('row_number', models.PositiveIntegerField(verbose_name='Номер строки')),
+                ('values', models.JSONField(default=list, verbose_name='Значения')),
+                ('errors', models.JSONField(blank=True, default=list, verbose_name='Ошибки проверки')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rows', to='directory.importjob', verbose_name='Задание')),
+            ],
+            options={
+                'verbose_name': '📄 Строка импорта',
+                'verbose_name_plural': '📄 Строки импорта',
+                'ordering': ['job', 'sheet_name', 'row_number'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='importstagingrow',
+            constraint=models.UniqueConstraint(fields=('job', 'sheet_name', 'row_number'), name='import_staging_row_unique'),
+        ),
+    ]
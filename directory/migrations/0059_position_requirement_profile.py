@@ -0,0 +1,37 @@
+# Generated by Django 5.0.14 on 2026-10-18 22:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('directory', '0058_import_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PositionRequirementProfile',
+            fields=[
+                ('position', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='requirement_profile', serialize=False, to='directory.position', verbose_name='Должность')),
+                ('has_custom_medical', models.BooleanField(default=False, verbose_name='Собственные факторы медосмотра')),
+                ('has_reference_medical', models.BooleanField(default=False, verbose_name='Эталонные нормы медосмотра')),
+                ('has_custom_siz', models.BooleanField(default=False, verbose_name='Собственные нормы СИЗ')),
+                ('has_reference_siz', models.BooleanField(default=False, verbose_name='Эталонные нормы СИЗ')),
+                ('needs_internship', models.BooleanField(default=False, verbose_name='Стажировка')),
+                ('drives_company_vehicle', models.BooleanField(default=False, verbose_name='Управляет служебным автомобилем')),
+                ('is_responsible_for_safety', models.BooleanField(default=False, verbose_name='Ответственный за ОТ')),
+                ('has_responsibility_types', models.BooleanField(default=False, verbose_name='Есть виды ответственности')),
+                ('has_documents', models.BooleanField(default=False, verbose_name='Есть документы для ознакомления')),
+                ('has_instructions', models.BooleanField(default=False, verbose_name='Есть инструкции по ОТ')),
+                ('instruction_numbers', models.TextField(blank=True, verbose_name='Номера инструкций')),
+                ('commission_roles', models.JSONField(blank=True, default=list, help_text='Список {commission_name, role, role_display, employee_name}', verbose_name='Роли сотрудников в комиссиях')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Обновлено')),
+            ],
+            options={
+                'verbose_name': '📋 Требования должности',
+                'verbose_name_plural': '📋 Требования должностей',
+            },
+        ),
+    ]
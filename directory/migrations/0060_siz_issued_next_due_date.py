@@ -0,0 +1,29 @@
+# Generated by Django 5.0.14 on 2026-10-18 23:14
+
+from django.db import migrations, models
+
+
+def fill_next_due_date(apps, schema_editor):
+    """Плановая замена = дата замены невозвращённых СИЗ (одним UPDATE)"""
+    SIZIssued = apps.get_model('directory', 'SIZIssued')
+    SIZIssued.objects.filter(is_returned=False).update(next_due_date=models.F('replacement_date'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('directory', '0059_position_requirement_profile'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sizissued',
+            name='next_due_date',
+            field=models.DateField(blank=True, editable=False, null=True, verbose_name='Плановая замена'),
+        ),
+        migrations.AddIndex(
+            model_name='sizissued',
+            index=models.Index(fields=['next_due_date'], name='siz_issued_next_due_idx'),
+        ),
+        migrations.RunPython(fill_next_due_date, migrations.RunPython.noop),
+    ]
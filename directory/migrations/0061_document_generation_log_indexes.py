@@ -0,0 +1,21 @@
+# Generated by Django 5.0.14 on 2026-10-18 23:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('directory', '0060_siz_issued_next_due_date'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='documentgenerationlog',
+            index=models.Index(fields=['-created_at'], name='doc_gen_log_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='documentgenerationlog',
+            index=models.Index(fields=['employee', '-created_at'], name='doc_gen_log_employee_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-19 00:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('directory', '0061_document_generation_log_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='importjob',
+            name='status',
+            field=models.CharField(choices=[('queued', 'В очереди'), ('staging', 'Разбор файла'), ('validating', 'Проверка данных'), ('validated', 'Ожидает подтверждения'), ('committing', 'Импорт'), ('done', 'Завершён'), ('failed', 'Ошибка'), ('cancelled', 'Отменён')], db_index=True, default='queued', max_length=20, verbose_name='Статус'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.14 on 2026-10-19 01:11
+
+import directory.models.import_job
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('directory', '0062_import_job_cancelled_status'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='importjob',
+            name='file',
+            field=models.FileField(storage=directory.models.import_job.import_file_storage, upload_to=directory.models.import_job.import_file_upload_to, verbose_name='Файл'),
+        ),
+    ]
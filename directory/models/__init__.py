@@ -5,6 +5,7 @@ from .subdivision_email import SubdivisionEmail
 from .department import Department
 from .document import Document
 from .position import Position, ResponsibilityType
+from .position_requirement import PositionRequirementProfile
 from .employee import Employee
 from .profile import Profile
 from .menu_item import MenuItem
@@ -13,6 +14,7 @@ from .siz import SIZ, SIZNorm
 from .document_template import DocumentTemplateType, DocumentTemplate, GeneratedDocument, DocumentGenerationLog
 from .commission import Commission, CommissionMember
 from .hiring import EmployeeHiring
+from .import_job import ImportJob, ImportStagingRow
 # Добавляем импорт моделей экзаменов
 from .quiz import QuizCategory, QuizCategoryOrder, Quiz, Question, Answer, QuizAttempt, UserAnswer, QuizAccessToken, QuizQuestionOrder
 
@@ -26,6 +28,7 @@ __all__ = [
     'Document',
     'Position',
     'ResponsibilityType',
+    'PositionRequirementProfile',
     'Employee',
     'SIZIssued',
     'SIZ',
@@ -37,6 +40,8 @@ __all__ = [
     'Commission',
     'CommissionMember',
     'EmployeeHiring',
+    'ImportJob',
+    'ImportStagingRow',
     # Добавляем модели экзаменов в список экспорта
     'QuizCategory',
     'QuizCategoryOrder',
@@ -212,6 +212,10 @@ class DocumentGenerationLog(models.Model):
         verbose_name = _("📋 Лог генерации документов")
         verbose_name_plural = _("📋 Логи генерации документов")
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at'], name='doc_gen_log_created_idx'),
+            models.Index(fields=['employee', '-created_at'], name='doc_gen_log_employee_idx'),
+        ]
 
     def __str__(self):
         return f"Документы для {self.employee} ({self.created_at.strftime('%d.%m.%Y %H:%M')})"
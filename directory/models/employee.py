@@ -148,6 +148,14 @@ class Employee(models.Model):
         verbose_name="Договор подряда",
         help_text="Устаревшее поле, используйте contract_type"
     )
+    search_text = models.CharField(
+        max_length=512,
+        blank=True,
+        default='',
+        editable=False,
+        verbose_name="Поисковая строка",
+        help_text="Нормализованное ФИО для поиска (заполняется автоматически)"
+    )
 
     objects = EmployeeQuerySet.as_manager()
 
@@ -162,6 +170,8 @@ class Employee(models.Model):
             models.Index(fields=['status'], name='emp_status_idx'),
             # Индекс для сортировки по ФИО
             models.Index(fields=['full_name_nominative'], name='emp_name_idx'),
+            # Индекс для поиска по нормализованному ФИО
+            models.Index(fields=['search_text'], name='emp_search_idx'),
             # Индекс для фильтрации активных сотрудников в древе
             models.Index(fields=['status', 'organization'], name='emp_status_org_idx'),
         ]
@@ -206,8 +216,15 @@ class Employee(models.Model):
                 })
 
     def save(self, *args, **kwargs):
+        from directory.utils.search import build_search_text
+
         # Синхронизация is_contractor с contract_type для обратной совместимости
         self.is_contractor = (self.contract_type == 'contractor')
+        # 🔎 Поисковая строка обновляется вместе с ФИО
+        self.search_text = build_search_text(self.full_name_nominative)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'full_name_nominative' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'search_text'}
         self.clean()
         super().save(*args, **kwargs)
 
@@ -234,7 +251,7 @@ class Employee(models.Model):
             return f"{self.full_name_nominative} — {self.position}"
         return self.full_name_nominative
 
-    def get_medical_status(self):
+    def get_medical_status(self, reference_norms=None):
         """
         🏥 Возвращает статус медицинских осмотров сотрудника.
 
@@ -244,6 +261,14 @@ class Employee(models.Model):
         - Рассчитывает следующую дату медосмотра на основе минимальной периодичности
         - Определяет статус (no_date, expired, upcoming, normal)
 
+        Для списков сотрудников: если у queryset сделан prefetch_related(
+        'medical_examinations__harmful_factor', 'position__medical_factors__harmful_factor'),
+        а reference_norms получены из MedicalExaminationNorm.get_factors_by_position_name(),
+        метод не выполняет ни одного SQL-запроса.
+
+        Args:
+            reference_norms: dict {position_name: [HarmfulFactor]} или None
+
         Returns:
             dict или None: Словарь с информацией о статусе медосмотра или None, если медосмотров нет
             {
@@ -265,29 +290,43 @@ class Employee(models.Model):
 
         # ШАГИ 1-2: Получаем вредные факторы с учетом иерархии
         # 1. Проверяем переопределения для конкретной должности (PositionMedicalFactor)
-        position_factors = self.position.medical_factors.filter(is_disabled=False).select_related('harmful_factor')
+        if 'medical_factors' in getattr(self.position, '_prefetched_objects_cache', {}):
+            position_factors = [pf for pf in self.position.medical_factors.all() if not pf.is_disabled]
+        else:
+            position_factors = list(
+                self.position.medical_factors.filter(is_disabled=False).select_related('harmful_factor')
+            )
 
         harmful_factors = []
-        if position_factors.exists():
+        if position_factors:
             # Используем переопределённые факторы
             harmful_factors = [pf.harmful_factor for pf in position_factors]
+        elif reference_norms is not None:
+            # 2. Эталонные нормы, заранее загруженные для всего списка
+            harmful_factors = reference_norms.get(self.position.position_name, [])
         else:
             # 2. Если переопределений нет - берём эталонные нормы по названию должности
-            reference_norms = MedicalExaminationNorm.objects.filter(
+            norms = MedicalExaminationNorm.objects.filter(
                 position_name=self.position.position_name
             ).select_related('harmful_factor')
-            harmful_factors = [norm.harmful_factor for norm in reference_norms]
+            harmful_factors = [norm.harmful_factor for norm in norms]
 
         # Если вообще нет факторов - медосмотры не требуются
         if not harmful_factors:
             return None
 
         # ШАГ 3: Получаем записи медосмотров для этих факторов (только активные)
-        harmful_factor_ids = [f.id for f in harmful_factors]
-        examinations = self.medical_examinations.filter(
-            harmful_factor_id__in=harmful_factor_ids,
-            is_disabled=False  # Игнорируем отключенные медосмотры
-        ).select_related('harmful_factor')
+        harmful_factor_ids = {f.id for f in harmful_factors}
+        if 'medical_examinations' in getattr(self, '_prefetched_objects_cache', {}):
+            examinations = [
+                exam for exam in self.medical_examinations.all()
+                if exam.harmful_factor_id in harmful_factor_ids and not exam.is_disabled
+            ]
+        else:
+            examinations = list(self.medical_examinations.filter(
+                harmful_factor_id__in=harmful_factor_ids,
+                is_disabled=False  # Игнорируем отключенные медосмотры
+            ).select_related('harmful_factor'))
 
         # ШАГ 4: Собираем информацию о факторах и датах
         factors = []
@@ -296,7 +335,7 @@ class Employee(models.Model):
         earliest_date = None
 
         # Если записей медосмотров нет - используем факторы напрямую
-        if not examinations.exists():
+        if not examinations:
             for factor in harmful_factors:
                 factors.append({
                     'name': factor.full_name,
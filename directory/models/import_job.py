@@ -0,0 +1,186 @@
+# directory/models/import_job.py
+"""
+📥 Фоновый импорт справочников (единый импорт)
+
+ImportJob - задание импорта: файл, этап, прогресс, результаты предпросмотра
+и импорта. ImportStagingRow - строки листов, разобранные из файла один раз;
+проверка, предпросмотр и импорт читают их из БД, а не из файла.
+"""
+import os
+import uuid
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.db import models
+from django.utils import timezone
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+
+
+class PrivateFileSystemStorage(FileSystemStorage):
+    """
+    Файлы в PRIVATE_MEDIA_ROOT: MEDIA_ROOT отдаётся по MEDIA_URL без
+    авторизации, а в файлах импорта - персональные данные.
+    Каталог читается из настроек лениво (как MEDIA_ROOT у FileSystemStorage).
+    """
+
+    @cached_property
+    def base_location(self):
+        return self._value_or_setting(self._location, settings.PRIVATE_MEDIA_ROOT)
+
+    def _clear_cached_properties(self, setting, **kwargs):
+        super()._clear_cached_properties(setting, **kwargs)
+        if setting == 'PRIVATE_MEDIA_ROOT':
+            self.__dict__.pop('base_location', None)
+            self.__dict__.pop('location', None)
+
+
+def import_file_storage():
+    """Хранилище файлов импорта (вне MEDIA_ROOT)"""
+    return PrivateFileSystemStorage()
+
+
+def import_file_upload_to(instance, filename):
+    """Случайное имя файла (исходное хранится в original_name), расширение нужно для разбора"""
+    extension = os.path.splitext(filename)[1].lower()
+    return f"imports/{timezone.now():%Y/%m}/{uuid.uuid4().hex}{extension}"
+
+
+class ImportJob(models.Model):
+    """
+    📥 Задание единого импорта справочников
+
+    Этапы: разбор файла в staging -> проверка (dry run) -> ожидание
+    подтверждения -> импорт пачками. Этап, на котором задание
+    остановилось, определяется по отметкам времени, поэтому после сбоя
+    задание продолжается с того же места.
+    """
+
+    STATUS_QUEUED = 'queued'
+    STATUS_STAGING = 'staging'
+    STATUS_VALIDATING = 'validating'
+    STATUS_VALIDATED = 'validated'
+    STATUS_COMMITTING = 'committing'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CANCELLED = 'cancelled'
+
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, _('В очереди')),
+        (STATUS_STAGING, _('Разбор файла')),
+        (STATUS_VALIDATING, _('Проверка данных')),
+        (STATUS_VALIDATED, _('Ожидает подтверждения')),
+        (STATUS_COMMITTING, _('Импорт')),
+        (STATUS_DONE, _('Завершён')),
+        (STATUS_FAILED, _('Ошибка')),
+        (STATUS_CANCELLED, _('Отменён')),
+    ]
+
+    # Статусы, в которых задание выполняется (или должно быть продолжено)
+    ACTIVE_STATUSES = (STATUS_QUEUED, STATUS_STAGING, STATUS_VALIDATING, STATUS_COMMITTING)
+    # Статусы, из которых задание можно отменить
+    CANCELLABLE_STATUSES = (STATUS_VALIDATED, STATUS_FAILED)
+
+    file = models.FileField(_("Файл"), upload_to=import_file_upload_to, storage=import_file_storage)
+    original_name = models.CharField(_("Имя файла"), max_length=255, blank=True)
+    organization = models.ForeignKey(
+        'directory.Organization',
+        verbose_name=_("Организация"),
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        help_text=_("Подставляется в строки без org_short_name_ru")
+    )
+    created_by = models.ForeignKey(
+        'auth.User',
+        verbose_name=_("Создано пользователем"),
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True
+    )
+
+    status = models.CharField(
+        _("Статус"), max_length=20, choices=STATUS_CHOICES, default=STATUS_QUEUED, db_index=True
+    )
+    total_rows = models.PositiveIntegerField(_("Строк в файле"), default=0)
+    processed_rows = models.PositiveIntegerField(_("Обработано строк (текущий этап)"), default=0)
+    sheets = models.JSONField(
+        _("Листы"),
+        default=dict,
+        help_text=_("Заголовки колонок по листам: {имя_листа: [колонки]}")
+    )
+    preview = models.JSONField(_("Результат проверки"), default=dict, blank=True)
+    result = models.JSONField(_("Результат импорта"), default=dict, blank=True)
+    commit_cursor = models.JSONField(
+        _("Позиция импорта"),
+        default=dict,
+        blank=True,
+        help_text=_("Последний импортированный номер строки по листам")
+    )
+    error_message = models.TextField(_("Ошибка"), blank=True)
+
+    staged_at = models.DateTimeField(_("Файл разобран"), null=True, blank=True)
+    validated_at = models.DateTimeField(_("Проверка завершена"), null=True, blank=True)
+    confirmed_at = models.DateTimeField(_("Импорт подтверждён"), null=True, blank=True)
+    finished_at = models.DateTimeField(_("Импорт завершён"), null=True, blank=True)
+    heartbeat_at = models.DateTimeField(
+        _("Последняя активность"),
+        null=True,
+        blank=True,
+        help_text=_("Обновляется обработчиком; устаревшее значение - обработчик остановился")
+    )
+    created_at = models.DateTimeField(_("Создано"), auto_now_add=True)
+    updated_at = models.DateTimeField(_("Обновлено"), auto_now=True)
+
+    class Meta:
+        verbose_name = _("📥 Задание импорта")
+        verbose_name_plural = _("📥 Задания импорта")
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"Импорт {self.original_name or self.file.name} ({self.get_status_display()})"
+
+    @property
+    def is_active(self):
+        return self.status in self.ACTIVE_STATUSES
+
+    @property
+    def progress_percent(self):
+        """Прогресс текущего этапа в процентах"""
+        if not self.total_rows:
+            return 0
+        return min(100, int(self.processed_rows * 100 / self.total_rows))
+
+
+class ImportStagingRow(models.Model):
+    """
+    📄 Строка листа из файла импорта
+
+    values - значения ячеек в порядке колонок ImportJob.sheets[sheet_name]
+    (заголовки уже нормализованы, организация подставлена).
+    """
+
+    job = models.ForeignKey(
+        ImportJob,
+        verbose_name=_("Задание"),
+        on_delete=models.CASCADE,
+        related_name='rows'
+    )
+    sheet_name = models.CharField(_("Лист"), max_length=50)
+    row_number = models.PositiveIntegerField(_("Номер строки"))
+    values = models.JSONField(_("Значения"), default=list)
+    errors = models.JSONField(_("Ошибки проверки"), default=list, blank=True)
+
+    class Meta:
+        verbose_name = _("📄 Строка импорта")
+        verbose_name_plural = _("📄 Строки импорта")
+        ordering = ['job', 'sheet_name', 'row_number']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['job', 'sheet_name', 'row_number'],
+                name='import_staging_row_unique'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.sheet_name}: строка {self.row_number}"
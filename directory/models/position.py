@@ -82,6 +82,14 @@ class Position(models.Model):
         max_length=255,
         verbose_name="Название"
     )
+    search_text = models.CharField(
+        max_length=512,
+        blank=True,
+        default='',
+        editable=False,
+        verbose_name="Поисковая строка",
+        help_text="Нормализованное название для поиска (заполняется автоматически)"
+    )
     organization = models.ForeignKey(
         'directory.Organization',
         on_delete=models.PROTECT,
@@ -181,6 +189,10 @@ class Position(models.Model):
         unique_together = [
             ['position_name', 'organization', 'subdivision', 'department']
         ]
+        indexes = [
+            # Поиск и автодополнение по нормализованному названию
+            models.Index(fields=['search_text'], name='position_search_idx'),
+        ]
 
     def clean(self):
         if self.department:
@@ -209,6 +221,13 @@ class Position(models.Model):
             })
 
     def save(self, *args, **kwargs):
+        from directory.utils.search import build_search_text
+
+        # 🔎 Поисковая строка обновляется вместе с названием
+        self.search_text = build_search_text(self.position_name)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'position_name' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'search_text'}
         self.clean()
         super().save(*args, **kwargs)
 
@@ -0,0 +1,84 @@
+# directory/models/position_requirement.py
+"""
+📋 Требования должности (денормализованная таблица)
+
+Нужны ли должности медосмотр, СИЗ, стажировка, инструктаж по служебному
+автомобилю, инструкции по ОТ и кто из её сотрудников входит в комиссии -
+вычисляется один раз и хранится здесь, а не пересчитывается несколькими
+запросами на каждой странице.
+
+Профиль обновляется сигналами (directory/signals.py) при изменении
+должности, норм СИЗ, факторов медосмотра, эталонных норм медосмотров и
+состава комиссий; полная пересборка - команда rebuild_position_requirements.
+"""
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class PositionRequirementProfile(models.Model):
+    """
+    📋 Профиль требований должности
+    """
+
+    position = models.OneToOneField(
+        'directory.Position',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='requirement_profile',
+        verbose_name=_("Должность"),
+    )
+
+    # Медосмотры: собственные факторы должности или эталонные нормы по названию
+    has_custom_medical = models.BooleanField(_("Собственные факторы медосмотра"), default=False)
+    has_reference_medical = models.BooleanField(_("Эталонные нормы медосмотра"), default=False)
+
+    # СИЗ: собственные нормы или нормы должности с тем же названием
+    has_custom_siz = models.BooleanField(_("Собственные нормы СИЗ"), default=False)
+    has_reference_siz = models.BooleanField(_("Эталонные нормы СИЗ"), default=False)
+
+    needs_internship = models.BooleanField(_("Стажировка"), default=False)
+    drives_company_vehicle = models.BooleanField(_("Управляет служебным автомобилем"), default=False)
+    is_responsible_for_safety = models.BooleanField(_("Ответственный за ОТ"), default=False)
+    has_responsibility_types = models.BooleanField(_("Есть виды ответственности"), default=False)
+    has_documents = models.BooleanField(_("Есть документы для ознакомления"), default=False)
+
+    has_instructions = models.BooleanField(_("Есть инструкции по ОТ"), default=False)
+    instruction_numbers = models.TextField(_("Номера инструкций"), blank=True)
+
+    commission_roles = models.JSONField(
+        _("Роли сотрудников в комиссиях"),
+        default=list,
+        blank=True,
+        help_text=_("Список {commission_name, role, role_display, employee_name}")
+    )
+
+    updated_at = models.DateTimeField(_("Обновлено"), auto_now=True)
+
+    class Meta:
+        verbose_name = _("📋 Требования должности")
+        verbose_name_plural = _("📋 Требования должностей")
+
+    def __str__(self):
+        return f"Требования: {self.position_id}"
+
+    @property
+    def needs_medical(self):
+        return self.has_custom_medical or self.has_reference_medical
+
+    @property
+    def needs_siz(self):
+        return self.has_custom_siz or self.has_reference_siz
+
+    @property
+    def is_commission_member(self):
+        return bool(self.commission_roles)
+
+    @property
+    def needs_knowledge_protocol(self):
+        """Протокол проверки знаний: стажировка, ответственный за ОТ, виды ответственности или водитель"""
+        return (
+            self.needs_internship
+            or self.is_responsible_for_safety
+            or self.has_responsibility_types
+            or self.drives_company_vehicle
+        )
@@ -1,10 +1,78 @@
 # 📁 directory/models/siz_issued.py
 from django.db import models
+from django.db.models import Count, F, Q
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 from datetime import timedelta
 
 
+class SIZIssuedQuerySet(models.QuerySet):
+    """
+    📅 Выборки "просрочена замена / скоро замена" по индексированному next_due_date.
+
+    next_due_date заполнен только у невозвращённых СИЗ с известной датой замены,
+    поэтому диапазонное условие по нему уже отсекает возвращённые и "до износа".
+    """
+
+    def _today(self, today):
+        return today or timezone.now().date()
+
+    def for_organizations(self, organization_ids):
+        return self.filter(employee__organization_id__in=organization_ids)
+
+    def in_use(self):
+        """Невозвращённые СИЗ работающих (не уволенных) сотрудников"""
+        return self.filter(is_returned=False).exclude(employee__status='fired')
+
+    def overdue(self, today=None):
+        """Срок замены уже прошёл (дата < сегодня)"""
+        return self.filter(next_due_date__lt=self._today(today))
+
+    def due_within(self, days, today=None):
+        """Просроченные и подлежащие замене в ближайшие days дней (дата <= сегодня + days)"""
+        today = self._today(today)
+        return self.filter(next_due_date__lte=today + timedelta(days=days))
+
+    def replacement_counts(self, days, today=None):
+        """
+        Считает просроченные и предстоящие замены одним запросом.
+
+        Returns:
+            dict: {'overdue': int, 'upcoming': int}
+        """
+        today = self._today(today)
+        return self.due_within(days, today).aggregate(
+            overdue=Count('pk', filter=Q(next_due_date__lt=today)),
+            upcoming=Count('pk', filter=Q(next_due_date__gte=today)),
+        )
+
+    def sync_due_dates(self, batch_size=1000):
+        """
+        Пересчитывает next_due_date (после update(), bulk_create() и т.п., минуя save()).
+
+        Returns:
+            int: Количество обновлённых строк
+        """
+        updated = self.filter(is_returned=True, next_due_date__isnull=False).update(next_due_date=None)
+        updated += self.filter(is_returned=False).update(next_due_date=F('replacement_date'))
+
+        # Дата замены не рассчитана (записи созданы без save()) - считаем как в save()
+        pending = []
+        missing = self.filter(
+            is_returned=False, replacement_date__isnull=True, siz__wear_period__gt=0
+        ).select_related('siz')
+        for item in missing.iterator(chunk_size=batch_size):
+            item.replacement_date = item.calculate_replacement_date()
+            item.next_due_date = item.replacement_date
+            pending.append(item)
+            if len(pending) >= batch_size:
+                updated += SIZIssued.objects.bulk_update(pending, ['replacement_date', 'next_due_date'])
+                pending = []
+        if pending:
+            updated += SIZIssued.objects.bulk_update(pending, ['replacement_date', 'next_due_date'])
+        return updated
+
+
 class SIZIssued(models.Model):
     """
     🛡️ Модель для хранения информации о выданных сотрудникам СИЗ
@@ -82,10 +150,25 @@ class SIZIssued(models.Model):
         default=False
     )
 
+    # Плановая дата замены для графика замены СИЗ: дата замены невозвращённого СИЗ,
+    # для возвращённых и "до износа" - пусто. Пересчитывается в save()
+    next_due_date = models.DateField(
+        verbose_name="Плановая замена",
+        null=True,
+        blank=True,
+        editable=False
+    )
+
+    objects = SIZIssuedQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Выданное СИЗ"
         verbose_name_plural = "Выданные СИЗ"
         ordering = ['-issue_date', 'employee__full_name_nominative']
+        indexes = [
+            # График замены: "просрочено / скоро замена" по всем выдачам
+            models.Index(fields=['next_due_date'], name='siz_issued_next_due_idx'),
+        ]
 
     def __str__(self):
         return f"{self.siz} - {self.employee} ({self.issue_date})"
@@ -122,15 +205,29 @@ class SIZIssued(models.Model):
         - Выполняет валидацию перед сохранением
         """
         # Если дата замены не указана, вычисляем на основе срока носки
-        if not self.replacement_date and self.siz and self.siz.wear_period > 0 and self.issue_date:
-            wear_period_days = self.siz.wear_period * 30  # Примерное количество дней
-            self.replacement_date = self.issue_date + timedelta(days=wear_period_days)
+        if not self.replacement_date:
+            self.replacement_date = self.calculate_replacement_date()
+
+        # Плановая замена - только для СИЗ, которые ещё у сотрудника
+        self.next_due_date = None if self.is_returned else self.replacement_date
 
         # Выполняем валидацию
         self.clean()
 
         super().save(*args, **kwargs)
 
+    def calculate_replacement_date(self):
+        """
+        📆 Дата замены по сроку носки СИЗ
+
+        Returns:
+            date или None: None для "До износа" (срок носки 0) и без даты выдачи
+        """
+        if self.siz and self.siz.wear_period > 0 and self.issue_date:
+            wear_period_days = self.siz.wear_period * 30  # Примерное количество дней
+            return self.issue_date + timedelta(days=wear_period_days)
+        return None
+
     @property
     def days_until_replacement(self):
         """
@@ -0,0 +1,206 @@
+"""
+⚡ Пакетный импорт для ресурсов django-import-export
+
+OrgStructureCache - справочник организаций, подразделений, отделов и должностей
+на время одного импорта. Загружается одним набором запросов по организациям
+из файла (before_import), дальше строки разрешаются по словарям, а недостающие
+записи создаются один раз и сразу попадают в кэш.
+
+BulkImportMixin - режим Resource(bulk=True): включает use_bulk/batch_size
+django-import-export для экземпляра ресурса (bulk_create/bulk_update пачками).
+bulk_create/bulk_update не вызывают save() модели, поэтому ресурс повторяет
+нужные действия save() в prepare_bulk_instance().
+"""
+import copy
+
+from django.conf import settings
+
+from directory.models import Department, Organization, Position, StructuralSubdivision
+
+ORG_COLUMN = 'org_short_name_ru'
+
+# Размер пачки для запросов вида field__in=[...]
+IN_QUERY_CHUNK = 500
+
+
+def dataset_column_values(dataset, column):
+    """Непустые значения колонки dataset (пустое множество, если колонки нет)"""
+    if not dataset.headers or column not in dataset.headers:
+        return set()
+    return {value for value in dataset[column] if value not in (None, '')}
+
+
+def chunked(values, size=IN_QUERY_CHUNK):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _name(obj):
+    return obj.name if obj is not None else ''
+
+
+class OrgStructureCache:
+    """
+    Организации / подразделения / отделы / должности по названиям.
+    Отсутствующие записи создаются в БД при первом обращении.
+    """
+
+    def __init__(self):
+        self.organizations = {}
+        self.subdivisions = {}
+        self.departments = {}
+        self.positions = {}
+
+    def preload(self, org_names, positions=False):
+        """Загружает структуру организаций из файла (4 запроса на весь импорт)"""
+        org_names = {str(name).strip() for name in org_names if str(name).strip()}
+        if not org_names:
+            return self
+
+        for organization in Organization.objects.filter(short_name_ru__in=org_names):
+            self.organizations[organization.short_name_ru] = organization
+        org_by_id = {org.pk: org for org in self.organizations.values()}
+
+        for subdivision in StructuralSubdivision.objects.filter(organization_id__in=org_by_id):
+            subdivision.organization = org_by_id[subdivision.organization_id]
+            self.subdivisions[(subdivision.organization.short_name_ru, subdivision.name)] = subdivision
+        sub_by_id = {sub.pk: sub for sub in self.subdivisions.values()}
+
+        for department in Department.objects.filter(organization_id__in=org_by_id):
+            department.organization = org_by_id[department.organization_id]
+            department.subdivision = sub_by_id.get(department.subdivision_id)
+            key = (department.organization.short_name_ru, _name(department.subdivision), department.name)
+            self.departments[key] = department
+
+        if positions:
+            dept_by_id = {dept.pk: dept for dept in self.departments.values()}
+            for position in Position.objects.filter(organization_id__in=org_by_id):
+                position.organization = org_by_id[position.organization_id]
+                position.subdivision = sub_by_id.get(position.subdivision_id)
+                position.department = dept_by_id.get(position.department_id)
+                self.positions[self.position_key(
+                    position.organization, position.subdivision, position.department, position.position_name
+                )] = position
+        return self
+
+    @staticmethod
+    def position_key(organization, subdivision, department, position_name):
+        return (organization.short_name_ru, _name(subdivision), _name(department), position_name)
+
+    def organization(self, short_name):
+        organization = self.organizations.get(short_name)
+        if organization is None:
+            organization = Organization(
+                short_name_ru=short_name,
+                full_name_ru=short_name,
+                short_name_by=short_name,
+                full_name_by=short_name,
+                location='г. Минск',
+            )
+            organization.save()
+            self.organizations[short_name] = organization
+        return organization
+
+    def subdivision(self, organization, name):
+        key = (organization.short_name_ru, name)
+        subdivision = self.subdivisions.get(key)
+        if subdivision is None:
+            subdivision = StructuralSubdivision(name=name, short_name=name, organization=organization)
+            subdivision.save()
+            self.subdivisions[key] = subdivision
+        return subdivision
+
+    def department(self, organization, subdivision, name):
+        key = (organization.short_name_ru, _name(subdivision), name)
+        department = self.departments.get(key)
+        if department is None:
+            department = Department(
+                name=name, short_name=name, organization=organization, subdivision=subdivision
+            )
+            department.save()
+            self.departments[key] = department
+        return department
+
+    def find_position(self, organization, subdivision, department, position_name):
+        return self.positions.get(self.position_key(organization, subdivision, department, position_name))
+
+    def add_position(self, position):
+        self.positions[self.position_key(
+            position.organization, position.subdivision, position.department, position.position_name
+        )] = position
+
+    def position(self, organization, subdivision, department, position_name):
+        position = self.find_position(organization, subdivision, department, position_name)
+        if position is None:
+            position = Position(
+                position_name=position_name,
+                organization=organization,
+                subdivision=subdivision,
+                department=department,
+            )
+            position.save()
+            self.add_position(position)
+        return position
+
+
+class BulkImportMixin:
+    """
+    Пакетный режим и общий кэш оргструктуры для ModelResource.
+
+    Resource() - построчное сохранение (как раньше, с save() модели);
+    Resource(bulk=True) - bulk_create/bulk_update пачками по batch_size.
+    """
+
+    # Поля модели для bulk_update (поля ресурса вида org_short_name_ru не подходят)
+    bulk_update_fields = ()
+    # Загружать ли должности в OrgStructureCache
+    preload_positions = False
+
+    def __init__(self, *args, bulk=False, batch_size=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lookups = OrgStructureCache()
+        if bulk:
+            # Опции копируются, чтобы не менять Meta класса для остальных экземпляров
+            self._meta = copy.copy(self._meta)
+            self._meta.use_bulk = True
+            self._meta.batch_size = batch_size or getattr(settings, 'IMPORT_BULK_BATCH_SIZE', 500)
+            # Построчный diff (deepcopy + html) при пакетной загрузке не показывается
+            self._meta.skip_diff = True
+
+    def before_import(self, dataset, **kwargs):
+        super().before_import(dataset, **kwargs)
+        self.lookups = OrgStructureCache().preload(
+            dataset_column_values(dataset, ORG_COLUMN),
+            positions=self.preload_positions,
+        )
+
+    def after_import(self, dataset, result, **kwargs):
+        """bulk_create/bulk_update не отправляют сигналы - сбрасываем снимки оргструктуры"""
+        super().after_import(dataset, result, **kwargs)
+        if self._meta.use_bulk and not kwargs.get('dry_run'):
+            from directory.services.org_structure import OrgStructureResolver
+
+            OrgStructureResolver.invalidate_all()
+
+    def prepare_bulk_instance(self, instance):
+        """Действия save() модели, которые нужно повторить перед bulk_create/bulk_update"""
+
+    def save_instance(self, instance, is_create, row, **kwargs):
+        if self._meta.use_bulk:
+            self.prepare_bulk_instance(instance)
+            if instance.pk is None:
+                is_create = True
+            pending = self.create_instances if is_create else self.update_instances
+            if any(obj is instance for obj in pending):
+                # Строка повторяет запись, которая уже ждёт сохранения в текущей пачке:
+                # изменения применены к тому же объекту, второй раз его не добавляем
+                self.before_save_instance(instance, row, **kwargs)
+                self.after_save_instance(instance, row, **kwargs)
+                return
+        super().save_instance(instance, is_create, row, **kwargs)
+
+    def get_bulk_update_fields(self):
+        if self.bulk_update_fields:
+            return list(self.bulk_update_fields)
+        return super().get_bulk_update_fields()
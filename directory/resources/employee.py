@@ -2,7 +2,9 @@
 👥 Resource для импорта/экспорта сотрудников
 """
 from import_export import resources, fields, widgets
-from directory.models import Employee, Organization, StructuralSubdivision, Department, Position
+from directory.models import Employee
+from directory.resources.bulk import BulkImportMixin, chunked, dataset_column_values
+from directory.utils.search import build_search_text
 from django.core.exceptions import ValidationError
 from datetime import datetime
 
@@ -69,13 +71,33 @@ class SafeRelatedField(fields.Field):
         return data.get(self.column_name, '')
 
 
-class EmployeeResource(resources.ModelResource):
+class EmployeeResource(BulkImportMixin, resources.ModelResource):
     """
     👥 Ресурс для импорта/экспорта сотрудников.
 
     Простой подход: создаем organization/subdivision/department/position в before_import_row.
+    Оргструктура и сотрудники из файла загружаются один раз в before_import,
+    EmployeeResource(bulk=True) сохраняет пачками. bulk_create/bulk_update не
+    вызывают сигнал post_save, поэтому медосмотры новых сотрудников и
+    сменивших должность (и недостающие профили требований их должностей)
+    создаются в after_import.
     """
 
+    preload_positions = True
+    bulk_update_fields = (
+        'organization',
+        'subdivision',
+        'department',
+        'position',
+        'full_name_nominative',
+        'search_text',
+        'hire_date',
+        'start_date',
+        'contract_type',
+        'is_contractor',
+        'status',
+    )
+
     hire_date = fields.Field(
         column_name='hire_date',
         attribute='hire_date',
@@ -148,44 +170,21 @@ class EmployeeResource(resources.ModelResource):
         if department_name and not subdivision_name:
             raise ValidationError('Нельзя указать отдел без структурного подразделения')
 
-        # 3. Создаем или находим организацию
-        organization, _ = Organization.objects.get_or_create(
-            short_name_ru=org_short_name,
-            defaults={
-                'full_name_ru': org_short_name,
-                'short_name_by': org_short_name,
-                'full_name_by': org_short_name,
-                'location': 'г. Минск'
-            }
-        )
+        # 3. Находим или создаем организацию (из кэша, загруженного в before_import)
+        organization = self.lookups.organization(org_short_name)
 
-        # 4. Создаем или находим подразделение (если указано)
+        # 4. Находим или создаем подразделение (если указано)
         subdivision = None
         if subdivision_name:
-            subdivision, _ = StructuralSubdivision.objects.get_or_create(
-                name=subdivision_name,
-                organization=organization,
-                defaults={'short_name': subdivision_name}
-            )
+            subdivision = self.lookups.subdivision(organization, subdivision_name)
 
-        # 5. Создаем или находим отдел (если указан)
+        # 5. Находим или создаем отдел (если указан)
         department = None
         if department_name:
-            department, _ = Department.objects.get_or_create(
-                name=department_name,
-                organization=organization,
-                subdivision=subdivision,
-                defaults={'short_name': department_name}
-            )
+            department = self.lookups.department(organization, subdivision, department_name)
 
-        # 6. Создаем или находим должность
-        position, _ = Position.objects.get_or_create(
-            position_name=position_name,
-            organization=organization,
-            subdivision=subdivision,
-            department=department,
-            defaults={'position_name': position_name}
-        )
+        # 6. Находим или создаем должность
+        position = self.lookups.position(organization, subdivision, department, position_name)
 
         # 7. Сохраняем связанные объекты в специальных полях row
         # Эти поля будут доступны в after_init_instance
@@ -216,14 +215,69 @@ class EmployeeResource(resources.ModelResource):
         if not instance.status:
             instance.status = 'active'
 
+        # Новый сотрудник сразу попадает в кэш - повторная строка с тем же ФИО найдет его
+        full_name = row.get('full_name_nominative')
+        if new and full_name:
+            instance.full_name_nominative = full_name
+            self._employees_by_name[full_name] = [instance]
+
+    def before_import(self, dataset, **kwargs):
+        """Загружаем сотрудников с ФИО из файла одним набором запросов"""
+        super().before_import(dataset, **kwargs)
+        self._employees_by_name = {}
+        # Должности сотрудников до импорта и сотрудники, которым нужны медосмотры (bulk)
+        self._original_positions = {}
+        self._medical_employees = {}
+        names = dataset_column_values(dataset, 'full_name_nominative')
+        for names_chunk in chunked(names):
+            for employee in Employee.objects.filter(full_name_nominative__in=names_chunk):
+                self._employees_by_name.setdefault(employee.full_name_nominative, []).append(employee)
+                self._original_positions[employee.pk] = employee.position_id
+
+    def after_import(self, dataset, result, **kwargs):
+        """
+        Медосмотры новых сотрудников и сменивших должность и профили требований
+        их должностей (bulk - без сигнала post_save)
+        """
+        super().after_import(dataset, result, **kwargs)
+        if not self._meta.use_bulk or kwargs.get('dry_run') or not self._medical_employees:
+            return
+
+        from deadline_control.services import ensure_medical_examinations
+        from deadline_control.services.harmful_factors import EMPLOYEE_PREFETCH
+        from directory.models import Position
+        from directory.services.position_requirements import ensure_requirement_profiles
+
+        position_ids = {employee.position_id for employee in self._medical_employees.values() if employee.position_id}
+        for ids_chunk in chunked(sorted(position_ids)):
+            ensure_requirement_profiles(Position.objects.filter(pk__in=ids_chunk))
+
+        employee_ids = [employee.pk for employee in self._medical_employees.values() if employee.pk]
+        for ids_chunk in chunked(employee_ids):
+            ensure_medical_examinations(
+                Employee.objects.filter(pk__in=ids_chunk, position__isnull=False)
+                .select_related('position').prefetch_related(EMPLOYEE_PREFETCH)
+            )
+
+    def prepare_bulk_instance(self, instance):
+        """Повторяем Employee.save(): is_contractor, поисковая строка, проверки clean()"""
+        instance.is_contractor = (instance.contract_type == 'contractor')
+        instance.search_text = build_search_text(instance.full_name_nominative)
+        instance.clean()
+        if instance.pk is None or self._original_positions.get(instance.pk) != instance.position_id:
+            self._medical_employees[id(instance)] = instance
+
     def get_instance(self, instance_loader, row):
         """Ищем существующего сотрудника по ФИО"""
         full_name = row.get('full_name_nominative')
         if full_name:
-            try:
-                return Employee.objects.get(full_name_nominative=full_name)
-            except Employee.DoesNotExist:
-                pass
+            employees = self._employees_by_name.get(full_name, [])
+            if len(employees) > 1:
+                raise Employee.MultipleObjectsReturned(
+                    f'Найдено несколько сотрудников с ФИО "{full_name}"'
+                )
+            if employees:
+                return employees[0]
         return None
 
     def get_export_queryset(self, queryset=None):
@@ -3,7 +3,9 @@
 Organization → StructuralSubdivision → Department → Position
 """
 from import_export import resources, fields, widgets
-from directory.models import Organization, StructuralSubdivision, Department, Position
+from directory.models import Position
+from directory.resources.bulk import BulkImportMixin, chunked, dataset_column_values
+from directory.utils.search import build_search_text
 from django.core.exceptions import ValidationError
 
 
@@ -27,14 +29,32 @@ class BooleanRussianWidget(widgets.BooleanWidget):
         return False
 
 
-class OrganizationStructureResource(resources.ModelResource):
+class OrganizationStructureResource(BulkImportMixin, resources.ModelResource):
     """
     📊 Ресурс для импорта/экспорта организационной структуры.
 
     Простой подход: импортируем только поля Position,
     а organization/subdivision/department создаем в before_import_row.
+    Оргструктура и должности организаций из файла загружаются один раз
+    (OrgStructureCache), OrganizationStructureResource(bulk=True) сохраняет пачками.
     """
 
+    preload_positions = True
+    bulk_update_fields = (
+        'organization',
+        'subdivision',
+        'department',
+        'position_name',
+        'search_text',
+        'safety_instructions_numbers',
+        'internship_period_days',
+        'is_responsible_for_safety',
+        'can_be_internship_leader',
+        'can_sign_orders',
+        'drives_company_vehicle',
+        'company_vehicle_instructions',
+    )
+
     org_short_name_ru = fields.Field(
         column_name='org_short_name_ru',
         attribute='organization__short_name_ru',
@@ -133,35 +153,18 @@ class OrganizationStructureResource(resources.ModelResource):
         if department_name and not subdivision_name:
             raise ValidationError('Нельзя указать отдел без структурного подразделения')
 
-        # 3. Создаем или находим организацию
-        organization, _ = Organization.objects.get_or_create(
-            short_name_ru=org_short_name,
-            defaults={
-                'full_name_ru': org_short_name,
-                'short_name_by': org_short_name,
-                'full_name_by': org_short_name,
-                'location': 'г. Минск'
-            }
-        )
+        # 3. Находим или создаем организацию (из кэша, загруженного в before_import)
+        organization = self.lookups.organization(org_short_name)
 
-        # 4. Создаем или находим подразделение (если указано)
+        # 4. Находим или создаем подразделение (если указано)
         subdivision = None
         if subdivision_name:
-            subdivision, _ = StructuralSubdivision.objects.get_or_create(
-                name=subdivision_name,
-                organization=organization,
-                defaults={'short_name': subdivision_name}
-            )
+            subdivision = self.lookups.subdivision(organization, subdivision_name)
 
-        # 5. Создаем или находим отдел (если указан)
+        # 5. Находим или создаем отдел (если указан)
         department = None
         if department_name:
-            department, _ = Department.objects.get_or_create(
-                name=department_name,
-                organization=organization,
-                subdivision=subdivision,
-                defaults={'short_name': department_name}
-            )
+            department = self.lookups.department(organization, subdivision, department_name)
 
         # 6. Добавляем связанные объекты напрямую (не ID)
         row['_organization'] = organization
@@ -180,23 +183,46 @@ class OrganizationStructureResource(resources.ModelResource):
         if row.get('drives_company_vehicle') in (None, ''):
             row['drives_company_vehicle'] = False
 
-    def import_obj(self, obj, data, dry_run, **kwargs):
+    def import_instance(self, instance, row, **kwargs):
         """
         Переопределяем метод импорта для установки связанных объектов
         """
         # Устанавливаем связанные объекты из before_import_row ДО вызова super()
         # чтобы они были установлены до валидации модели
-        if '_organization' in data:
-            obj.organization = data['_organization']
-        if '_subdivision' in data:
-            obj.subdivision = data['_subdivision']
-        if '_department' in data:
-            obj.department = data['_department']
+        if '_organization' in row:
+            instance.organization = row['_organization']
+        if '_subdivision' in row:
+            instance.subdivision = row['_subdivision']
+        if '_department' in row:
+            instance.department = row['_department']
 
         # Теперь вызываем родительский метод для обработки остальных полей
-        obj = super().import_obj(obj, data, dry_run, **kwargs)
+        super().import_instance(instance, row, **kwargs)
 
-        return obj
+    def after_init_instance(self, instance, new, row, **kwargs):
+        """Новая должность сразу попадает в кэш - повторная строка файла найдет её"""
+        super().after_init_instance(instance, new, row, **kwargs)
+        if new and row.get('_organization'):
+            instance.organization = row['_organization']
+            instance.subdivision = row.get('_subdivision')
+            instance.department = row.get('_department')
+            instance.position_name = row.get('position_name')
+            self.lookups.add_position(instance)
+
+    def prepare_bulk_instance(self, instance):
+        """Повторяем Position.save(): поисковая строка и проверка иерархии"""
+        instance.search_text = build_search_text(instance.position_name)
+        instance.clean()
+
+    def after_import(self, dataset, result, **kwargs):
+        """bulk_create/bulk_update не отправляют сигналы - пересчитываем профили требований должностей"""
+        super().after_import(dataset, result, **kwargs)
+        if self._meta.use_bulk and not kwargs.get('dry_run') and not result.has_errors():
+            from directory.services.position_requirements import refresh_requirement_profiles
+
+            position_names = {str(name).strip() for name in dataset_column_values(dataset, 'position_name')}
+            for names_chunk in chunked(sorted(position_names)):
+                refresh_requirement_profiles(position_names=names_chunk)
 
     def before_save_instance(self, instance, row, dry_run, **kwargs):
         """
@@ -219,15 +245,7 @@ class OrganizationStructureResource(resources.ModelResource):
         if not organization:
             return None
 
-        try:
-            return Position.objects.get(
-                position_name=position_name,
-                organization=organization,
-                subdivision=subdivision,
-                department=department
-            )
-        except Position.DoesNotExist:
-            return None
+        return self.lookups.find_position(organization, subdivision, department, position_name)
 
     def get_export_queryset(self, queryset=None):
         """Оптимизация для экспорта"""
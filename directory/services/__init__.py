@@ -1,11 +1,45 @@
 """
 📦 Сервисный слой для бизнес-логики
 """
-from .global_import import parse_workbook, dry_run_import, commit_import, export_all_to_workbook
+from .global_import import (
+    parse_workbook,
+    dry_run_import,
+    commit_import,
+    export_all_to_file,
+    export_all_to_workbook,
+)
+from .import_jobs import (
+    create_import_job,
+    start_import_job,
+    run_import_job,
+    confirm_import_job,
+    cancel_import_job,
+    resume_import_job,
+)
+from .menu_visibility import MenuVisibility
+from .org_structure import OrgStructureResolver
+from .siz_norms import SIZNormResolver
+from .siz_replacement import SIZReplacementSchedule
+from .xlsx_export import export_resources_to_file, iter_resource_rows, write_sheet, xlsx_file_response
 
 __all__ = [
     'parse_workbook',
     'dry_run_import',
     'commit_import',
+    'export_all_to_file',
     'export_all_to_workbook',
+    'create_import_job',
+    'start_import_job',
+    'run_import_job',
+    'confirm_import_job',
+    'cancel_import_job',
+    'resume_import_job',
+    'MenuVisibility',
+    'OrgStructureResolver',
+    'SIZNormResolver',
+    'SIZReplacementSchedule',
+    'export_resources_to_file',
+    'iter_resource_rows',
+    'write_sheet',
+    'xlsx_file_response',
 ]
@@ -18,6 +18,8 @@ from directory.resources.employee import EmployeeResource
 from deadline_control.resources.equipment import EquipmentResource
 from directory.models import Position, Employee, Organization
 from deadline_control.models import Equipment
+from deadline_control.services import DeadlineSummaryService
+from directory.services.xlsx_export import export_resources_to_file
 
 
 # Словарь сопоставления имён листов и ресурсов
@@ -34,6 +36,71 @@ CRITICAL_SHEETS = {'Структура'}
 PROCESSING_ORDER = ['Структура', 'Сотрудники', 'Оборудование']
 
 
+def _cell_to_str(cell) -> str:
+    """Значение ячейки как строка (None -> пустая строка)"""
+    return str(cell) if cell is not None else ''
+
+
+def iter_sheet_rows(sheet):
+    """
+    Строки листа openpyxl (read_only) как списки строк.
+
+    Полностью пустые строки пропускаются; первая выданная строка - заголовки.
+    Строки читаются потоком, лист целиком в память не загружается.
+    """
+    width = None
+    for row in sheet.iter_rows(values_only=True):
+        if not any(cell is not None and str(cell).strip() for cell in row):
+            continue
+        values = [_cell_to_str(cell) for cell in row]
+        if width is None:
+            width = len(values)
+        # Строки короче заголовка дополняем пустыми значениями
+        if len(values) < width:
+            values.extend([''] * (width - len(values)))
+        yield values[:width]
+
+
+def open_workbook(file_obj):
+    """
+    Открывает Excel-файл импорта (openpyxl, read_only).
+
+    Args:
+        file_obj: Файловый объект (UploadedFile или файл из хранилища)
+
+    Returns:
+        (workbook, found_sheets): книга и поддерживаемые листы в порядке файла
+
+    Raises:
+        ValidationError: Если формат не поддерживается или в файле нет нужных листов
+    """
+    # Определяем формат файла
+    file_name = getattr(file_obj, 'name', 'file.xlsx')
+    file_format = file_name.split('.')[-1].lower()
+
+    if file_format not in ['xlsx', 'xls']:
+        raise ValidationError('Поддерживаются только файлы XLSX и XLS')
+
+    # Используем openpyxl для чтения листов. В режиме read_only книга читается
+    # из файла по мере обхода строк, поэтому файл должен оставаться открытым
+    # до workbook.close()
+    import openpyxl
+
+    if hasattr(file_obj, 'seek'):
+        file_obj.seek(0)
+    workbook = openpyxl.load_workbook(file_obj, read_only=True, data_only=True)
+
+    # Проверяем наличие хотя бы одного поддерживаемого листа
+    found_sheets = [name for name in workbook.sheetnames if name in RESOURCE_MAPPING]
+    if not found_sheets:
+        workbook.close()
+        raise ValidationError(
+            f'Файл не содержит ни одного поддерживаемого листа. '
+            f'Ожидаются листы: {", ".join(RESOURCE_MAPPING.keys())}'
+        )
+    return workbook, found_sheets
+
+
 def parse_workbook(file_obj) -> Dict[str, Dataset]:
     """
     Парсит Excel-файл и возвращает словарь {имя_листа: Dataset}
@@ -48,65 +115,27 @@ def parse_workbook(file_obj) -> Dict[str, Dataset]:
         ValidationError: Если файл некорректный или не содержит поддерживаемых листов
     """
     try:
-        # Определяем формат файла
-        file_name = getattr(file_obj, 'name', 'file.xlsx')
-        file_format = file_name.split('.')[-1].lower()
-
-        if file_format not in ['xlsx', 'xls']:
-            raise ValidationError('Поддерживаются только файлы XLSX и XLS')
-
-        # Читаем файл
-        file_content = file_obj.read()
-        if hasattr(file_obj, 'seek'):
-            file_obj.seek(0)  # Возвращаем указатель в начало на случай повторного чтения
-
-        # Используем openpyxl для чтения листов
-        import openpyxl
-        from io import BytesIO
-
-        workbook = openpyxl.load_workbook(BytesIO(file_content), read_only=True, data_only=True)
-        sheet_names = workbook.sheetnames
-
-        # Проверяем наличие хотя бы одного поддерживаемого листа
-        found_sheets = [name for name in sheet_names if name in RESOURCE_MAPPING]
-        if not found_sheets:
-            raise ValidationError(
-                f'Файл не содержит ни одного поддерживаемого листа. '
-                f'Ожидаются листы: {", ".join(RESOURCE_MAPPING.keys())}'
-            )
+        workbook, found_sheets = open_workbook(file_obj)
 
         # Парсим каждый найденный лист
         datasets = {}
         for sheet_name in found_sheets:
-            sheet = workbook[sheet_name]
-
-            # Читаем данные листа
-            data = []
-            for row in sheet.iter_rows(values_only=True):
-                # Пропускаем полностью пустые строки
-                if any(cell is not None and str(cell).strip() for cell in row):
-                    data.append(row)
-
-            if not data:
+            # Читаем данные листа (без полностью пустых строк)
+            rows = iter_sheet_rows(workbook[sheet_name])
+            headers = next(rows, None)
+            if headers is None:
                 continue  # Пустой лист - пропускаем
 
-            # Создаём Dataset из данных
-            dataset = Dataset()
-
-            # Первая строка - заголовки
-            if data:
-                headers = [str(h) if h is not None else '' for h in data[0]]
-                dataset.headers = headers
-
-                # Остальные строки - данные
-                for row_data in data[1:]:
-                    # Преобразуем None в пустые строки
-                    clean_row = [str(cell) if cell is not None else '' for cell in row_data]
-                    dataset.append(clean_row)
+            # Первая строка - заголовки, остальные строки - данные
+            dataset = Dataset(headers=headers)
+            for row_data in rows:
+                dataset.append(row_data)
 
             datasets[sheet_name] = dataset
 
         workbook.close()
+        if hasattr(file_obj, 'seek'):
+            file_obj.seek(0)  # Возвращаем указатель в начало на случай повторного чтения
         return datasets
 
     except ValidationError:
@@ -115,6 +144,65 @@ def parse_workbook(file_obj) -> Dict[str, Dataset]:
         raise ValidationError(f'Ошибка при чтении файла: {str(e)}')
 
 
+def collect_result_errors(result) -> tuple:
+    """
+    Статус листа и список ошибок из ImportResult django-import-export
+
+    Returns:
+        (status, errors): status - 'ok'|'warn'|'error',
+        errors - List[{'row': int, 'message': str}]
+    """
+    errors = []
+
+    if result.has_errors():
+        for row_number, errors_list in result.row_errors():
+            for error in errors_list:
+                errors.append({
+                    'row': row_number,
+                    'message': str(error.error)
+                })
+        return 'error', errors
+
+    if result.has_validation_errors():
+        # Собираем validation errors из invalid_rows
+        for invalid_row in result.invalid_rows:
+            row_number = invalid_row.number
+
+            # Собираем ошибки по полям
+            for field_name, error_messages in invalid_row.field_specific_errors.items():
+                for msg in error_messages:
+                    errors.append({
+                        'row': row_number,
+                        'message': f'[{field_name}] {msg}'
+                    })
+
+            # Собираем общие ошибки (не привязанные к полям)
+            for msg in invalid_row.non_field_specific_errors:
+                errors.append({
+                    'row': row_number,
+                    'message': str(msg)
+                })
+        return 'warn', errors
+
+    return 'ok', errors
+
+
+def summarize_preview(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Итог предпросмотра по результатам листов"""
+    return {
+        'sheets': results,
+        'has_errors': any(r['status'] == 'error' for r in results),
+        'has_critical_errors': any(
+            r['status'] == 'error' and r['sheet_name'] in CRITICAL_SHEETS
+            for r in results
+        ),
+        'ready_for_import': not any(
+            (r['status'] == 'error' or (r['status'] == 'warn' and r['sheet_name'] in CRITICAL_SHEETS))
+            for r in results
+        ),
+    }
+
+
 def dry_run_import(datasets: Dict[str, Dataset], organization: Optional[Organization] = None) -> Dict[str, Any]:
     """
     Выполняет предпросмотр импорта без сохранения в БД
@@ -169,40 +257,7 @@ def dry_run_import(datasets: Dict[str, Dataset], organization: Optional[Organiza
                 sheet_result['result'] = result
 
                 # Собираем ошибки
-                if result.has_errors():
-                    sheet_result['status'] = 'error'
-
-                    for row_error in result.row_errors():
-                        row_number = row_error[0]
-                        errors_list = row_error[1]
-
-                        for error in errors_list:
-                            sheet_result['errors'].append({
-                                'row': row_number,
-                                'message': str(error.error)
-                            })
-
-                elif result.has_validation_errors():
-                    sheet_result['status'] = 'warn'
-
-                    # Собираем validation errors из invalid_rows
-                    for invalid_row in result.invalid_rows:
-                        row_number = invalid_row.number
-
-                        # Собираем ошибки по полям
-                        for field_name, error_messages in invalid_row.field_specific_errors.items():
-                            for msg in error_messages:
-                                sheet_result['errors'].append({
-                                    'row': row_number,
-                                    'message': f'[{field_name}] {msg}'
-                                })
-
-                        # Собираем общие ошибки (не привязанные к полям)
-                        for msg in invalid_row.non_field_specific_errors:
-                            sheet_result['errors'].append({
-                                'row': row_number,
-                                'message': str(msg)
-                            })
+                sheet_result['status'], sheet_result['errors'] = collect_result_errors(result)
 
                 # Принудительный откат (даже если нет ошибок - это dry_run)
                 transaction.set_rollback(True)
@@ -216,18 +271,42 @@ def dry_run_import(datasets: Dict[str, Dataset], organization: Optional[Organiza
 
         results.append(sheet_result)
 
-    return {
-        'sheets': results,
-        'has_errors': any(r['status'] == 'error' for r in results),
-        'has_critical_errors': any(
-            r['status'] == 'error' and r['sheet_name'] in CRITICAL_SHEETS
-            for r in results
-        ),
-        'ready_for_import': not any(
-            (r['status'] == 'error' or (r['status'] == 'warn' and r['sheet_name'] in CRITICAL_SHEETS))
-            for r in results
-        ),
-    }
+    return summarize_preview(results)
+
+
+# Алиасы колонок: упрощённое_название → полное_название
+HEADER_ALIASES = {
+    'Структура': {
+        'subdivision': 'subdivision_name',
+        'department': 'department_name',
+    },
+    'Сотрудники': {
+        'subdivision': 'subdivision_name',
+        'department': 'department_name',
+        'position': 'position_name',
+    },
+    'Оборудование': {
+        'subdivision': 'subdivision_name',
+        'department': 'department_name',
+    },
+}
+
+
+def normalize_headers(headers: List[str], sheet_name: str) -> List[str]:
+    """
+    Заменяет упрощённые названия колонок на полные (поддержка упрощённых форматов)
+
+    Args:
+        headers: Заголовки листа
+        sheet_name: Название листа ('Структура', 'Сотрудники', 'Оборудование')
+    """
+    aliases = HEADER_ALIASES.get(sheet_name, {})
+    new_headers = []
+    for header in headers:
+        header_str = str(header).strip() if header else ''
+        # Если есть алиас - используем полное название
+        new_headers.append(aliases.get(header_str, header))
+    return new_headers
 
 
 def _normalize_dataset_headers(dataset: Dataset, sheet_name: str):
@@ -238,42 +317,10 @@ def _normalize_dataset_headers(dataset: Dataset, sheet_name: str):
         dataset: Dataset для обработки
         sheet_name: Название листа ('Структура', 'Сотрудники', 'Оборудование')
     """
-    if not dataset.headers:
+    if not dataset.headers or sheet_name not in HEADER_ALIASES:
         return
 
-    # Словарь алиасов: упрощённое_название → полное_название
-    ALIASES = {
-        'Структура': {
-            'subdivision': 'subdivision_name',
-            'department': 'department_name',
-        },
-        'Сотрудники': {
-            'subdivision': 'subdivision_name',
-            'department': 'department_name',
-            'position': 'position_name',
-        },
-        'Оборудование': {
-            'subdivision': 'subdivision_name',
-            'department': 'department_name',
-        },
-    }
-
-    if sheet_name not in ALIASES:
-        return
-
-    aliases = ALIASES[sheet_name]
-
-    # Заменяем упрощённые названия на полные
-    new_headers = []
-    for header in dataset.headers:
-        header_str = str(header).strip() if header else ''
-        # Если есть алиас - используем полное название
-        if header_str in aliases:
-            new_headers.append(aliases[header_str])
-        else:
-            new_headers.append(header)
-
-    dataset.headers = new_headers
+    dataset.headers = normalize_headers(dataset.headers, sheet_name)
 
 
 def _apply_organization_to_dataset(dataset: Dataset, organization: Organization):
@@ -360,8 +407,8 @@ def commit_import(datasets: Dict[str, Dataset], organization: Optional[Organizat
                 if organization:
                     _apply_organization_to_dataset(dataset, organization)
 
-                # Создаём ресурс
-                resource = resource_class()
+                # Создаём ресурс в пакетном режиме (bulk_create/bulk_update пачками)
+                resource = resource_class(bulk=True)
 
                 # Выполняем импорт
                 result = resource.import_data(dataset, dry_run=False, raise_errors=False)
@@ -402,6 +449,9 @@ def commit_import(datasets: Dict[str, Dataset], organization: Optional[Organizat
 
             results.append(sheet_result)
 
+        # bulk_create/bulk_update не отправляют сигналы - сбрасываем кэш сводки сроков
+        transaction.on_commit(DeadlineSummaryService.invalidate_all)
+
         return {
             'sheets': results,
             'success': all(r['status'] == 'success' for r in results),
@@ -420,80 +470,48 @@ def commit_import(datasets: Dict[str, Dataset], organization: Optional[Organizat
         }
 
 
-def export_all_to_workbook(organization: Optional[Organization] = None) -> bytes:
+def _export_sheets(organization: Optional[Organization] = None) -> List[tuple]:
+    """Список (имя_листа, resource, queryset) для экспорта справочников"""
+    querysets = {
+        'Структура': Position.objects.select_related('organization', 'subdivision', 'department'),
+        'Сотрудники': Employee.objects.select_related('organization', 'subdivision', 'department', 'position'),
+        'Оборудование': Equipment.objects.select_related('organization', 'subdivision', 'department'),
+    }
+
+    sheets = []
+    for sheet_name in PROCESSING_ORDER:
+        queryset = querysets[sheet_name]
+        # Фильтруем по организации (если указана)
+        if organization:
+            queryset = queryset.filter(organization=organization)
+        # Стабильный порядок строк для iterator()
+        sheets.append((sheet_name, RESOURCE_MAPPING[sheet_name](), queryset.order_by('pk')))
+    return sheets
+
+
+def export_all_to_file(organization: Optional[Organization] = None, output=None):
     """
-    Экспортирует все три справочника в один Excel-файл с несколькими листами
+    Экспортирует все три справочника в один Excel-файл (потоково, write_only).
 
     Args:
         organization: Организация для фильтрации данных (опционально)
+        output: file-like объект или путь (по умолчанию - временный файл)
 
     Returns:
-        bytes: Содержимое Excel-файла
+        Файл с результатом, перемотанный в начало
     """
-    import openpyxl
-    from io import BytesIO
+    return export_resources_to_file(_export_sheets(organization), output)
 
-    # Создаём новый workbook
-    wb = openpyxl.Workbook()
-    wb.remove(wb.active)  # Удаляем дефолтный лист
 
-    # Экспортируем каждый справочник
-    for sheet_name in PROCESSING_ORDER:
-        resource_class = RESOURCE_MAPPING[sheet_name]
-        resource = resource_class()
-
-        # Получаем queryset для экспорта
-        if sheet_name == 'Структура':
-            queryset = Position.objects.all()
-        elif sheet_name == 'Сотрудники':
-            queryset = Employee.objects.all()
-        elif sheet_name == 'Оборудование':
-            queryset = Equipment.objects.all()
-        else:
-            continue
+def export_all_to_workbook(organization: Optional[Organization] = None) -> bytes:
+    """
+    Экспортирует все три справочника в один Excel-файл с несколькими листами
 
-        # Фильтруем по организации (если указана)
-        if organization:
-            queryset = queryset.filter(organization=organization)
+    Args:
+        organization: Организация для фильтрации данных (опционально)
 
-        # Оптимизируем запрос
-        if sheet_name == 'Структура':
-            queryset = queryset.select_related('organization', 'subdivision', 'department')
-        elif sheet_name == 'Сотрудники':
-            queryset = queryset.select_related('organization', 'subdivision', 'department', 'position')
-        elif sheet_name == 'Оборудование':
-            queryset = queryset.select_related('organization', 'subdivision', 'department')
-
-        # Экспортируем dataset
-        dataset = resource.export(queryset)
-
-        # Создаём лист в workbook
-        ws = wb.create_sheet(title=sheet_name)
-
-        # Записываем заголовки
-        if dataset.headers:
-            ws.append(dataset.headers)
-
-        # Записываем данные
-        for row in dataset:
-            ws.append(row)
-
-        # Автоматическая ширина колонок (для удобства)
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if cell.value:
-                        max_length = max(max_length, len(str(cell.value)))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)  # Максимум 50 символов
-            ws.column_dimensions[column_letter].width = adjusted_width
-
-    # Сохраняем в BytesIO
-    output = BytesIO()
-    wb.save(output)
-    output.seek(0)
-
-    return output.getvalue()
+    Returns:
+        bytes: Содержимое Excel-файла
+    """
+    with export_all_to_file(organization) as output:
+        return output.read()
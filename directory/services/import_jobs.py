@@ -0,0 +1,517 @@
+"""
+📥 Фоновый единый импорт справочников через staging-таблицу
+
+Этапы задания ImportJob:
+1. stage_import_job    - файл разбирается один раз: строки листов потоком
+                          пишутся в ImportStagingRow (заголовки нормализованы,
+                          организация подставлена);
+2. validate_import_job - dry run пачками строк из staging, ошибки сохраняются
+                          в строки, итог - в job.preview (предпросмотр);
+3. confirm_import_job  - пользователь подтверждает импорт;
+4. commit_import_job   - импорт из staging пачками, каждая пачка - отдельная
+                          транзакция вместе с позицией job.commit_cursor.
+
+Задание выполняется в фоновом потоке (IMPORT_JOBS_RUN_IN_THREAD) и не держит
+запрос админки. Если процесс остановился (перезапуск gunicorn, ошибка),
+задание продолжается с последнего завершённого этапа / последней пачки:
+командой `python manage.py process_import_jobs` (cron) или кнопкой
+"Продолжить" на странице задания.
+
+Загруженный файл хранится вне MEDIA_ROOT (ImportJob.file, PRIVATE_MEDIA_ROOT)
+и удаляется, как только задание завершено, остановлено с ошибкой или
+отменено. Задания, не подтверждённые или брошенные после ошибки дольше
+IMPORT_JOB_EXPIRE_DAYS, отменяет process_import_jobs (expire_import_jobs).
+"""
+import logging
+import threading
+from datetime import timedelta
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+from tablib import Dataset
+
+from deadline_control.services import DeadlineSummaryService
+from directory.models import ImportJob, ImportStagingRow, Organization
+from directory.services.global_import import (
+    CRITICAL_SHEETS,
+    PROCESSING_ORDER,
+    RESOURCE_MAPPING,
+    collect_result_errors,
+    iter_sheet_rows,
+    normalize_headers,
+    open_workbook,
+    summarize_preview,
+)
+
+logger = logging.getLogger(__name__)
+
+ORG_COLUMN = 'org_short_name_ru'
+
+# Порядок "тяжести" статуса листа при объединении результатов пачек
+_STATUS_SEVERITY = {'ok': 0, 'warn': 1, 'error': 2}
+
+
+def _stage_chunk_size():
+    return getattr(settings, 'IMPORT_STAGE_CHUNK_SIZE', 1000)
+
+
+def _commit_chunk_size():
+    return getattr(settings, 'IMPORT_COMMIT_CHUNK_SIZE', 2000)
+
+
+def _stale_after():
+    return timedelta(seconds=getattr(settings, 'IMPORT_JOB_STALE_SECONDS', 300))
+
+
+def _max_preview_errors():
+    return getattr(settings, 'IMPORT_PREVIEW_MAX_ERRORS', 200)
+
+
+def _expire_days():
+    return getattr(settings, 'IMPORT_JOB_EXPIRE_DAYS', 7)
+
+
+def _save(job, **fields):
+    """Сохраняет поля задания и отметку активности обработчика"""
+    for name, value in fields.items():
+        setattr(job, name, value)
+    job.heartbeat_at = timezone.now()
+    job.save(update_fields=[*fields, 'heartbeat_at', 'updated_at'])
+
+
+# ----------------------------------------------------------------------
+# Создание и запуск
+# ----------------------------------------------------------------------
+
+def create_import_job(import_file, organization: Optional[Organization] = None, user=None) -> ImportJob:
+    """Сохраняет файл и создаёт задание импорта (ещё не запущенное)"""
+    return ImportJob.objects.create(
+        file=import_file,
+        original_name=getattr(import_file, 'name', '')[:255],
+        organization=organization,
+        created_by=user if user is not None and user.is_authenticated else None,
+    )
+
+
+def start_import_job(job: ImportJob):
+    """
+    Запускает обработку задания в фоновом потоке после коммита транзакции.
+
+    При IMPORT_JOBS_RUN_IN_THREAD = False задание только ставится в очередь
+    и выполняется командой process_import_jobs.
+    """
+    if not getattr(settings, 'IMPORT_JOBS_RUN_IN_THREAD', True):
+        return
+
+    def _start():
+        threading.Thread(
+            target=_run_in_thread,
+            args=(job.pk,),
+            name=f'import-job-{job.pk}',
+            daemon=True,
+        ).start()
+
+    transaction.on_commit(_start)
+
+
+def _run_in_thread(job_id):
+    try:
+        run_import_job(job_id)
+    finally:
+        # Соединения потока не закрываются Django автоматически
+        connections.close_all()
+
+
+def claim_import_job(job_id) -> bool:
+    """
+    Захватывает задание для обработки (одним UPDATE).
+
+    Задание свободно, если оно активно и обработчик не отмечался дольше
+    IMPORT_JOB_STALE_SECONDS (или не отмечался вовсе).
+    """
+    now = timezone.now()
+    return ImportJob.objects.filter(
+        pk=job_id,
+        status__in=ImportJob.ACTIVE_STATUSES,
+    ).filter(
+        Q(heartbeat_at__isnull=True) | Q(heartbeat_at__lt=now - _stale_after())
+    ).update(heartbeat_at=now) == 1
+
+
+def run_import_job(job_id) -> Optional[ImportJob]:
+    """
+    Выполняет (или продолжает) задание с первого незавершённого этапа.
+
+    Returns:
+        ImportJob или None, если задание занято другим обработчиком
+    """
+    if not claim_import_job(job_id):
+        return None
+
+    job = ImportJob.objects.select_related('organization').get(pk=job_id)
+    try:
+        if job.staged_at is None:
+            stage_import_job(job)
+        if job.validated_at is None:
+            validate_import_job(job)
+        if job.confirmed_at is not None and job.finished_at is None:
+            commit_import_job(job)
+    except Exception as e:
+        logger.exception("Задание импорта %s остановлено с ошибкой", job.pk)
+        message = '; '.join(e.messages) if isinstance(e, ValidationError) else str(e)
+        _save(job, status=ImportJob.STATUS_FAILED, error_message=message)
+        # Файл после ошибки не храним: повторный запуск продолжает по строкам staging
+        _delete_file(job)
+    finally:
+        ImportJob.objects.filter(pk=job.pk).update(heartbeat_at=None)
+    return job
+
+
+def confirm_import_job(job: ImportJob):
+    """Подтверждение импорта после предпросмотра"""
+    if job.status != ImportJob.STATUS_VALIDATED:
+        raise ValidationError('Задание не ожидает подтверждения')
+    if not job.preview.get('ready_for_import'):
+        raise ValidationError('Импорт невозможен: исправьте ошибки в файле и загрузите его заново')
+
+    job.confirmed_at = timezone.now()
+    job.status = ImportJob.STATUS_COMMITTING
+    job.processed_rows = sum(job.commit_cursor.values())
+    job.heartbeat_at = None
+    job.save(update_fields=['confirmed_at', 'status', 'processed_rows', 'heartbeat_at', 'updated_at'])
+    start_import_job(job)
+
+
+def cancel_import_job(job: ImportJob):
+    """
+    Отмена задания, ожидающего подтверждения или остановленного с ошибкой.
+    Уже импортированные пачки строк остаются; staging и файл удаляются.
+    """
+    if job.status not in ImportJob.CANCELLABLE_STATUSES:
+        raise ValidationError('Отменить можно только задание, ожидающее подтверждения или остановленное с ошибкой')
+
+    job.status = ImportJob.STATUS_CANCELLED
+    job.heartbeat_at = None
+    job.save(update_fields=['status', 'heartbeat_at', 'updated_at'])
+    job.rows.all().delete()
+    _delete_file(job)
+
+
+def _delete_file(job: ImportJob):
+    """Удаляет загруженный файл задания (строки уже в staging или больше не нужны)"""
+    if not job.file:
+        return
+    job.file.delete(save=False)
+    job.save(update_fields=['file', 'updated_at'])
+
+
+def resume_import_job(job: ImportJob, start=True):
+    """
+    Повторный запуск задания, остановленного с ошибкой.
+    start=False - только вернуть задание в очередь (обработает вызывающий код)
+    """
+    if job.status != ImportJob.STATUS_FAILED:
+        raise ValidationError('Продолжить можно только задание, остановленное с ошибкой')
+    if job.staged_at is None and not job.file:
+        raise ValidationError('Файл задания не был разобран и уже удалён: загрузите его заново')
+
+    job.status = ImportJob.STATUS_COMMITTING if job.confirmed_at else ImportJob.STATUS_QUEUED
+    job.error_message = ''
+    job.heartbeat_at = None
+    job.save(update_fields=['status', 'error_message', 'heartbeat_at', 'updated_at'])
+    if start:
+        start_import_job(job)
+
+
+# ----------------------------------------------------------------------
+# Этапы
+# ----------------------------------------------------------------------
+
+def _organization_filler(headers, organization):
+    """
+    Заголовки и функция подстановки организации в строку без org_short_name_ru
+    (аналог _apply_organization_to_dataset для потока строк)
+    """
+    if organization is None:
+        return headers, lambda values: values
+
+    org_name = organization.short_name_ru
+    if ORG_COLUMN not in headers:
+        return [ORG_COLUMN] + list(headers), lambda values: [org_name] + values
+
+    org_index = headers.index(ORG_COLUMN)
+
+    def fill(values):
+        if not str(values[org_index]).strip():
+            values[org_index] = org_name
+        return values
+
+    return headers, fill
+
+
+def stage_import_job(job: ImportJob):
+    """
+    Этап 1: разбор файла в ImportStagingRow.
+
+    Строки читаются потоком и пишутся bulk_create пачками по
+    IMPORT_STAGE_CHUNK_SIZE. Повторный запуск начинает разбор заново.
+    """
+    _save(job, status=ImportJob.STATUS_STAGING, processed_rows=0)
+    job.rows.all().delete()
+
+    chunk_size = _stage_chunk_size()
+    sheets = {}
+    staged = 0
+
+    with job.file.open('rb') as file_obj:
+        workbook, found_sheets = open_workbook(file_obj)
+        try:
+            for sheet_name in PROCESSING_ORDER:
+                if sheet_name not in found_sheets:
+                    continue
+                rows = iter_sheet_rows(workbook[sheet_name])
+                headers = next(rows, None)
+                if headers is None:
+                    continue  # Пустой лист - пропускаем
+
+                headers, fill = _organization_filler(
+                    normalize_headers(headers, sheet_name), job.organization
+                )
+                sheets[sheet_name] = headers
+
+                batch = []
+                for row_number, values in enumerate(rows, start=1):
+                    batch.append(ImportStagingRow(
+                        job=job, sheet_name=sheet_name, row_number=row_number, values=fill(values)
+                    ))
+                    if len(batch) >= chunk_size:
+                        ImportStagingRow.objects.bulk_create(batch)
+                        staged += len(batch)
+                        batch = []
+                        _save(job, processed_rows=staged)
+                if batch:
+                    ImportStagingRow.objects.bulk_create(batch)
+                    staged += len(batch)
+        finally:
+            workbook.close()
+
+    _save(job, sheets=sheets, total_rows=staged, processed_rows=staged, staged_at=timezone.now())
+    logger.info("Задание импорта %s: разобрано %s строк (%s)", job.pk, staged, ', '.join(sheets))
+
+
+def iter_staging_chunks(job: ImportJob, sheet_name: str, chunk_size: int, after: int = 0):
+    """
+    Пачки строк листа из staging по возрастанию номера строки
+    (постраничная выборка по row_number, без OFFSET)
+    """
+    queryset = job.rows.filter(sheet_name=sheet_name).only(
+        'pk', 'row_number', 'values', 'errors'
+    ).order_by('row_number')
+    while True:
+        chunk = list(queryset.filter(row_number__gt=after)[:chunk_size])
+        if not chunk:
+            return
+        yield chunk
+        after = chunk[-1].row_number
+
+
+def _chunk_dataset(headers, chunk) -> Dataset:
+    return Dataset(*[row.values for row in chunk], headers=headers)
+
+
+def validate_import_job(job: ImportJob):
+    """
+    Этап 2: dry run пачками строк из staging.
+
+    Каждая пачка проверяется в отдельной транзакции с откатом. Ошибки
+    сохраняются в ImportStagingRow.errors, сводка - в job.preview
+    (в формате dry_run_import, ошибок на лист не больше IMPORT_PREVIEW_MAX_ERRORS).
+    """
+    _save(job, status=ImportJob.STATUS_VALIDATING, processed_rows=0)
+    job.rows.update(errors=[])
+
+    chunk_size = _stage_chunk_size()
+    max_errors = _max_preview_errors()
+    results = []
+    processed = 0
+
+    for sheet_name in PROCESSING_ORDER:
+        if sheet_name not in job.sheets:
+            continue
+        headers = job.sheets[sheet_name]
+        resource_class = RESOURCE_MAPPING[sheet_name]
+
+        sheet_result = {
+            'sheet_name': sheet_name,
+            'status': 'ok',
+            'total_rows': job.rows.filter(sheet_name=sheet_name).count(),
+            'errors': [],
+            'error_count': 0,
+        }
+
+        for chunk in iter_staging_chunks(job, sheet_name, chunk_size):
+            try:
+                with transaction.atomic():
+                    result = resource_class().import_data(
+                        _chunk_dataset(headers, chunk), dry_run=True, raise_errors=False
+                    )
+                    # Принудительный откат (это dry_run)
+                    transaction.set_rollback(True)
+                status, errors = collect_result_errors(result)
+            except Exception as e:
+                status, errors = 'error', [{
+                    'row': 0,
+                    'message': f'Критическая ошибка обработки листа: {str(e)}'
+                }]
+
+            if _STATUS_SEVERITY[status] > _STATUS_SEVERITY[sheet_result['status']]:
+                sheet_result['status'] = status
+
+            # Номер строки в пачке -> номер строки листа
+            rows_with_errors = {}
+            for error in errors:
+                if 0 < error['row'] <= len(chunk):
+                    row = chunk[error['row'] - 1]
+                    error = {**error, 'row': row.row_number}
+                    rows_with_errors.setdefault(row.pk, row).errors.append(error['message'])
+                sheet_result['error_count'] += 1
+                if len(sheet_result['errors']) < max_errors:
+                    sheet_result['errors'].append(error)
+            if rows_with_errors:
+                ImportStagingRow.objects.bulk_update(rows_with_errors.values(), ['errors'])
+
+            processed += len(chunk)
+            _save(job, processed_rows=processed)
+
+        results.append(sheet_result)
+
+    _save(
+        job,
+        status=ImportJob.STATUS_VALIDATED,
+        preview=summarize_preview(results),
+        validated_at=timezone.now(),
+    )
+
+
+def _empty_sheet_result(sheet_name):
+    return {
+        'sheet_name': sheet_name,
+        'status': 'success',
+        'created': 0,
+        'updated': 0,
+        'errors': 0,
+        'skipped': 0,
+    }
+
+
+def _summarize_commit(sheet_results) -> Dict[str, Any]:
+    """Итог импорта в формате commit_import"""
+    return {
+        'sheets': sheet_results,
+        'success': all(r['status'] == 'success' for r in sheet_results),
+        'total_created': sum(r['created'] for r in sheet_results),
+        'total_updated': sum(r['updated'] for r in sheet_results),
+        'total_errors': sum(r['errors'] for r in sheet_results),
+    }
+
+
+def commit_import_job(job: ImportJob):
+    """
+    Этап 4: импорт из staging пачками по IMPORT_COMMIT_CHUNK_SIZE строк.
+
+    Пачка импортируется ресурсом в пакетном режиме (bulk=True) в одной
+    транзакции с обновлением job.commit_cursor и счётчиков - после сбоя
+    импорт продолжается со следующей пачки, уже сохранённые строки
+    повторно не импортируются. Ошибка в пачке критического листа
+    откатывает эту пачку и останавливает задание.
+    """
+    _save(job, status=ImportJob.STATUS_COMMITTING)
+
+    chunk_size = _commit_chunk_size()
+    sheet_results = {r['sheet_name']: r for r in job.result.get('sheets', [])}
+
+    for sheet_name in PROCESSING_ORDER:
+        if sheet_name not in job.sheets:
+            continue
+        headers = job.sheets[sheet_name]
+        resource_class = RESOURCE_MAPPING[sheet_name]
+        sheet_result = sheet_results.setdefault(sheet_name, _empty_sheet_result(sheet_name))
+
+        for chunk in iter_staging_chunks(job, sheet_name, chunk_size, after=job.commit_cursor.get(sheet_name, 0)):
+            with transaction.atomic():
+                result = resource_class(bulk=True).import_data(
+                    _chunk_dataset(headers, chunk), dry_run=False, raise_errors=False
+                )
+
+                if result.has_errors() and sheet_name in CRITICAL_SHEETS:
+                    raise ValidationError(
+                        f'Импорт остановлен. Обнаружены ошибки в критическом листе "{sheet_name}" '
+                        f'(строки {chunk[0].row_number}-{chunk[-1].row_number}). '
+                        f'Ошибок: {result.totals.get("error", 0)}'
+                    )
+
+                sheet_result['created'] += result.totals.get('new', 0)
+                sheet_result['updated'] += result.totals.get('update', 0)
+                sheet_result['errors'] += result.totals.get('error', 0)
+                sheet_result['skipped'] += result.totals.get('skip', 0) + result.totals.get('invalid', 0)
+                if result.has_errors():
+                    sheet_result['status'] = 'error'
+                elif result.has_validation_errors() and sheet_result['status'] == 'success':
+                    sheet_result['status'] = 'warning'
+
+                cursor = {**job.commit_cursor, sheet_name: chunk[-1].row_number}
+                _save(
+                    job,
+                    commit_cursor=cursor,
+                    processed_rows=sum(cursor.values()),
+                    result=_summarize_commit(list(sheet_results.values())),
+                )
+                # bulk_create/bulk_update не отправляют сигналы - сбрасываем кэш сводки сроков
+                transaction.on_commit(DeadlineSummaryService.invalidate_all)
+
+    _save(
+        job,
+        status=ImportJob.STATUS_DONE,
+        result=_summarize_commit(list(sheet_results.values())),
+        finished_at=timezone.now(),
+    )
+    # Строки staging и файл после импорта не нужны (ошибки проверки остались в job.preview)
+    job.rows.all().delete()
+    _delete_file(job)
+    logger.info("Задание импорта %s завершено: %s", job.pk, job.result)
+
+
+def expire_import_jobs() -> int:
+    """
+    Отменяет задания, которые ждут подтверждения или остановлены с ошибкой
+    дольше IMPORT_JOB_EXPIRE_DAYS (0 - не отменять): удаляются их staging и файл.
+
+    Returns:
+        Количество отменённых заданий
+    """
+    days = _expire_days()
+    if not days:
+        return 0
+
+    expired = ImportJob.objects.filter(
+        status__in=ImportJob.CANCELLABLE_STATUSES,
+        updated_at__lt=timezone.now() - timedelta(days=days),
+    )
+    count = 0
+    for job in expired.iterator():
+        cancel_import_job(job)
+        count += 1
+    return count
+
+
+def pending_import_jobs():
+    """Активные задания без живого обработчика (для process_import_jobs)"""
+    return ImportJob.objects.filter(
+        status__in=ImportJob.ACTIVE_STATUSES,
+    ).filter(
+        Q(heartbeat_at__isnull=True) | Q(heartbeat_at__lt=timezone.now() - _stale_after())
+    ).order_by('created_at')
@@ -0,0 +1,119 @@
+"""
+🍔 Видимость пунктов меню для пользователя
+
+MenuVisibility загружает активные пункты меню и ограничения профиля
+(visible_menu_items) двумя запросами и хранит упорядоченный список видимых
+пользователю пунктов.
+
+Снимок кэшируется (MENU_VISIBILITY_CACHE_TIMEOUT секунд) под версией меню
+пользователя: сигналы (directory/signals.py) меняют глобальную версию при
+изменении пунктов меню, версию пользователя - при изменении его
+visible_menu_items и самого пользователя (is_superuser). При попадании в кэш
+боковое меню строится без запросов к БД, а в пределах HTTP-запроса снимок
+запоминается на объекте пользователя.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from directory.models import MenuItem
+
+SNAPSHOT_KEY = 'menu_visibility:user:%s:v%s'
+USER_VERSION_KEY = 'menu_visibility:version:user:%s'
+GLOBAL_VERSION_KEY = 'menu_visibility:version:global'
+
+
+class MenuVisibility:
+    """
+    Использование:
+        menu = MenuVisibility.for_user(request.user)
+        menu.items_for('sidebar')                      # [MenuItem] в порядке (order, name)
+        menu.is_url_visible('deadline_control:dashboard')
+    """
+
+    def __init__(self, items, known_url_names):
+        # Видимые пользователю активные пункты в порядке отображения
+        self.items = items
+        self.item_ids = {item.pk for item in items}
+        self.visible_url_names = {item.url_name for item in items if item.url_name}
+        # url_name всех активных пунктов: остальные URL меню не ограничивает
+        self.known_url_names = known_url_names
+
+    @classmethod
+    def load(cls, user):
+        items = list(MenuItem.objects.filter(is_active=True).order_by('order', 'name'))
+
+        allowed = None
+        if user.is_authenticated and not user.is_superuser and hasattr(user, 'profile'):
+            # Если у пользователя нет явных ограничений - показываем все
+            allowed = set(user.profile.visible_menu_items.values_list('pk', flat=True)) or None
+
+        def visible(item):
+            if item.requires_auth and not user.is_authenticated:
+                return False
+            return user.is_superuser or allowed is None or item.pk in allowed
+
+        return cls(
+            [item for item in items if visible(item)],
+            {item.url_name for item in items if item.url_name},
+        )
+
+    # ------------------------------------------------------------------
+    # Кэш
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def invalidate(*user_ids):
+        """Новая версия меню пользователей"""
+        version = time.time_ns()
+        cache.set_many({USER_VERSION_KEY % pk: version for pk in set(user_ids) if pk}, None)
+
+    @staticmethod
+    def invalidate_all():
+        """Сбрасывает меню всех пользователей (изменились сами пункты меню)"""
+        cache.set(GLOBAL_VERSION_KEY, time.time_ns(), None)
+
+    @staticmethod
+    def _version(key):
+        return cache.get_or_set(key, time.time_ns(), None)
+
+    @classmethod
+    def menu_version(cls, user_id):
+        return '%s.%s' % (cls._version(GLOBAL_VERSION_KEY), cls._version(USER_VERSION_KEY % user_id))
+
+    @classmethod
+    def for_user(cls, user):
+        """Снимок меню пользователя: из памяти запроса, из кэша или из БД"""
+        snapshot = getattr(user, '_menu_visibility_cache', None)
+        if snapshot is not None:
+            return snapshot
+
+        user_key = user.pk if user.is_authenticated else 'anonymous'
+        key = SNAPSHOT_KEY % (user_key, cls.menu_version(user_key))
+        snapshot = cache.get(key)
+        if snapshot is None:
+            snapshot = cls.load(user)
+            cache.set(key, snapshot, settings.MENU_VISIBILITY_CACHE_TIMEOUT)
+
+        user._menu_visibility_cache = snapshot
+        return snapshot
+
+    # ------------------------------------------------------------------
+    # Проверки
+    # ------------------------------------------------------------------
+
+    def items_for(self, location='sidebar'):
+        """Видимые пункты для расположения ('sidebar', 'top', 'both')"""
+        if location == 'both':
+            return list(self.items)
+        return [item for item in self.items if item.location in (location, 'both')]
+
+    def is_item_visible(self, menu_item):
+        return menu_item.is_active and menu_item.pk in self.item_ids
+
+    def is_url_visible(self, url_name):
+        """Пункт с таким url_name виден; URL, которого нет в меню, считается видимым"""
+        if url_name not in self.known_url_names:
+            return True
+        return url_name in self.visible_url_names
@@ -0,0 +1,162 @@
+"""
+🏛️ Подписанты, руководители стажировки и комиссии по оргструктуре
+
+OrgStructureResolver загружает по организации тремя запросами всех
+подписантов (can_sign_orders), руководителей стажировки
+(can_be_internship_leader) и активные комиссии с участниками, а ближайший
+уровень (отдел → подразделение → организация) для сотрудника находит в памяти.
+
+Снимок организации кэшируется (ORG_STRUCTURE_CACHE_TIMEOUT секунд) под
+версией структуры (structure_version): сигналы (directory/signals.py) меняют
+версию при изменении сотрудников, должностей, подразделений, отделов и
+комиссий, пакетный импорт - глобальную версию.
+"""
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Prefetch, Q
+
+from directory.models import Commission, CommissionMember, Employee
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_KEY = 'org_structure:org:%s:v%s'
+ORG_VERSION_KEY = 'org_structure:version:org:%s'
+GLOBAL_VERSION_KEY = 'org_structure:version:global'
+
+
+def employee_scopes(employee):
+    """Уровни поиска для сотрудника от ближайшего: (level, id)"""
+    if employee.department_id:
+        yield 'department', employee.department_id
+    if employee.subdivision_id:
+        yield 'subdivision', employee.subdivision_id
+    if employee.organization_id:
+        yield 'organization', employee.organization_id
+
+
+class OrgStructureSnapshot:
+    """Подписанты, руководители стажировки и комиссии одной организации"""
+
+    def __init__(self, organization_id):
+        self.organization_id = organization_id
+        self.signers = {}
+        self.leaders = {}
+        self.commissions = {}
+
+    @classmethod
+    def load(cls, organization_id):
+        snapshot = cls(organization_id)
+
+        employees = Employee.objects.filter(organization_id=organization_id).filter(
+            Q(position__can_sign_orders=True) | Q(position__can_be_internship_leader=True)
+        ).select_related('organization', 'subdivision', 'department', 'position').order_by('full_name_nominative', 'pk')
+        for employee in employees:
+            for scope in employee_scopes(employee):
+                if employee.position.can_sign_orders:
+                    snapshot.signers.setdefault(scope, []).append(employee)
+                if employee.position.can_be_internship_leader:
+                    snapshot.leaders.setdefault(scope, []).append(employee)
+
+        active_members = CommissionMember.objects.filter(is_active=True).select_related('employee__position')
+        commissions = Commission.objects.filter(organization_id=organization_id, is_active=True).prefetch_related(
+            Prefetch('members', queryset=active_members, to_attr='active_members')
+        ).order_by('name', 'pk')
+        for commission in commissions:
+            key = (commission.commission_type, commission.subdivision_id, commission.department_id)
+            snapshot.commissions.setdefault(key, commission)
+        return snapshot
+
+
+class OrgStructureResolver:
+    """
+    Иерархический поиск по кэшированным снимкам организаций.
+
+    Использование:
+        resolver = OrgStructureResolver()
+        signer, level, found = resolver.document_signer(employee)
+        commission = resolver.commission(employee, 'ot')
+
+    Один экземпляр на пачку документов - снимок организации читается из кэша один раз.
+    """
+
+    def __init__(self):
+        self._snapshots = {}
+
+    # ------------------------------------------------------------------
+    # Инвалидация
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def invalidate(*organization_ids):
+        """Новая версия структуры организаций"""
+        version = time.time_ns()
+        cache.set_many({ORG_VERSION_KEY % pk: version for pk in set(organization_ids) if pk}, None)
+
+    @staticmethod
+    def invalidate_all():
+        """Сбрасывает снимки всех организаций (например, после пакетного импорта)"""
+        cache.set(GLOBAL_VERSION_KEY, time.time_ns(), None)
+
+    @staticmethod
+    def _version(key):
+        return cache.get_or_set(key, time.time_ns(), None)
+
+    @classmethod
+    def structure_version(cls, organization_id):
+        """
+        Версия структуры организации - меняется при любом изменении сотрудников,
+        должностей, подразделений, отделов и комиссий. Годится и для других
+        кэшей, построенных по оргструктуре (например, фрагменты дерева на главной).
+        """
+        return '%s.%s' % (cls._version(GLOBAL_VERSION_KEY), cls._version(ORG_VERSION_KEY % organization_id))
+
+    def snapshot(self, organization_id):
+        if organization_id not in self._snapshots:
+            key = SNAPSHOT_KEY % (organization_id, self.structure_version(organization_id))
+            snapshot = cache.get(key)
+            if snapshot is None:
+                snapshot = OrgStructureSnapshot.load(organization_id)
+                cache.set(key, snapshot, getattr(settings, 'ORG_STRUCTURE_CACHE_TIMEOUT', 3600))
+            self._snapshots[organization_id] = snapshot
+        return self._snapshots[organization_id]
+
+    # ------------------------------------------------------------------
+    # Поиск
+    # ------------------------------------------------------------------
+
+    def _nearest(self, employee, attr, exclude_self=False):
+        if not employee.organization_id:
+            return None, None, False
+        candidates = getattr(self.snapshot(employee.organization_id), attr)
+        for level, pk in employee_scopes(employee):
+            for candidate in candidates.get((level, pk), ()):
+                if not (exclude_self and candidate.pk == employee.pk):
+                    return candidate, level, True
+        return None, None, False
+
+    def document_signer(self, employee):
+        """(signer, level, success), level: "department", "subdivision", "organization" """
+        return self._nearest(employee, 'signers')
+
+    def internship_leader(self, employee):
+        """(leader, level, success); сам сотрудник руководителем своей стажировки не бывает"""
+        return self._nearest(employee, 'leaders', exclude_self=True)
+
+    def commission(self, employee, commission_type='ot'):
+        """Активная комиссия отдела, затем подразделения (без отдела), затем организации"""
+        if not employee.organization_id:
+            return None
+        commissions = self.snapshot(employee.organization_id).commissions
+        keys = []
+        if employee.department_id:
+            keys.append((commission_type, employee.subdivision_id, employee.department_id))
+        if employee.subdivision_id:
+            keys.append((commission_type, employee.subdivision_id, None))
+        keys.append((commission_type, None, None))
+        for key in keys:
+            if key in commissions:
+                return commissions[key]
+        return None
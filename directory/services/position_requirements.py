@@ -0,0 +1,231 @@
+"""
+📋 Профили требований должностей (PositionRequirementProfile)
+
+refresh_requirement_profiles() пересчитывает профили пачкой должностей
+фиксированным числом запросов (не зависящим от числа должностей) и
+сохраняет их одним upsert на пачку.
+
+Сигналы не пересчитывают профиль сразу: schedule_requirement_refresh()
+накапливает изменённые должности и названия должностей до конца транзакции,
+поэтому сохранение формы с десятком норм СИЗ пересчитывает профиль один раз.
+"""
+import logging
+import threading
+from collections import defaultdict
+
+from django.db import connection, transaction
+from django.db.models import Q
+
+from deadline_control.models.medical_norm import MedicalExaminationNorm, PositionMedicalFactor
+from directory.models import CommissionMember, Position
+from directory.models.position_requirement import PositionRequirementProfile
+from directory.resources.bulk import chunked
+from directory.services.siz_norms import SIZNormResolver
+
+logger = logging.getLogger(__name__)
+
+# Должностей в одной пачке пересчёта
+REFRESH_BATCH_SIZE = 500
+
+PROFILE_FIELDS = [
+    'has_custom_medical',
+    'has_reference_medical',
+    'has_custom_siz',
+    'has_reference_siz',
+    'needs_internship',
+    'drives_company_vehicle',
+    'is_responsible_for_safety',
+    'has_responsibility_types',
+    'has_documents',
+    'has_instructions',
+    'instruction_numbers',
+    'commission_roles',
+    'updated_at',
+]
+
+
+def _strip(value):
+    return (value or '').strip()
+
+
+def instruction_numbers_for(position):
+    """Номера инструкций должности через запятую (инструкции по автомобилю - только для водителей)"""
+    parts = [_strip(position.safety_instructions_numbers), _strip(position.contract_safety_instructions)]
+    if position.drives_company_vehicle:
+        parts.append(_strip(position.company_vehicle_instructions))
+    return ", ".join(part for part in parts if part)
+
+
+def build_requirement_profiles(positions):
+    """Несохранённые профили для списка должностей"""
+    positions = list(positions)
+    if not positions:
+        return []
+    ids = [position.pk for position in positions]
+    names = {position.position_name for position in positions}
+
+    custom_medical = set(
+        PositionMedicalFactor.objects.filter(position_id__in=ids, is_disabled=False)
+        .values_list('position_id', flat=True)
+    )
+    reference_medical = set()
+    for names_chunk in chunked(sorted(names)):
+        reference_medical.update(
+            MedicalExaminationNorm.objects.filter(position_name__in=names_chunk)
+            .values_list('position_name', flat=True)
+        )
+
+    norm_resolver = SIZNormResolver(names)
+
+    responsibility = set(
+        Position.responsibility_types.through.objects.filter(
+            position_id__in=ids, responsibilitytype__is_active=True
+        ).values_list('position_id', flat=True)
+    )
+    documents = set(
+        Position.documents.through.objects.filter(position_id__in=ids).values_list('position_id', flat=True)
+    )
+
+    commission_roles = defaultdict(list)
+    members = CommissionMember.objects.filter(
+        employee__position_id__in=ids, is_active=True
+    ).select_related('commission', 'employee').order_by('commission__name', 'role', 'employee__full_name_nominative')
+    for member in members:
+        commission_roles[member.employee.position_id].append({
+            'commission_name': member.commission.name,
+            'role': member.role,
+            'role_display': member.get_role_display(),
+            'employee_name': member.employee.full_name_nominative,
+        })
+
+    profiles = []
+    for position in positions:
+        has_custom_siz = norm_resolver.has_own_norms(position)
+        has_custom_medical = position.pk in custom_medical
+        profiles.append(PositionRequirementProfile(
+            position=position,
+            has_custom_medical=has_custom_medical,
+            has_reference_medical=not has_custom_medical and position.position_name in reference_medical,
+            has_custom_siz=has_custom_siz,
+            has_reference_siz=not has_custom_siz and norm_resolver.has_reference_norms(position.position_name),
+            needs_internship=(position.internship_period_days or 0) > 0,
+            drives_company_vehicle=position.drives_company_vehicle,
+            is_responsible_for_safety=position.is_responsible_for_safety,
+            has_responsibility_types=position.pk in responsibility,
+            has_documents=position.pk in documents,
+            has_instructions=any(_strip(value) for value in (
+                position.safety_instructions_numbers,
+                position.contract_safety_instructions,
+                position.company_vehicle_instructions,
+            )),
+            instruction_numbers=instruction_numbers_for(position),
+            commission_roles=commission_roles.get(position.pk, []),
+        ))
+    return profiles
+
+
+def _save_profiles(profiles):
+    PositionRequirementProfile.objects.bulk_create(
+        profiles,
+        update_conflicts=True,
+        unique_fields=['position'],
+        update_fields=PROFILE_FIELDS,
+    )
+
+
+def refresh_requirement_profiles(position_ids=None, position_names=None, queryset=None):
+    """
+    Пересчитывает и сохраняет профили.
+
+    Args:
+        position_ids: id должностей
+        position_names: названия должностей (эталонные нормы СИЗ и медосмотров
+            задаются по названию, поэтому их изменение затрагивает все
+            должности с этим названием)
+        queryset: явный набор должностей; если ничего не задано - все должности
+
+    Returns:
+        int: число пересчитанных профилей
+    """
+    if queryset is None:
+        queryset = Position.objects.all()
+        if position_ids is not None or position_names is not None:
+            condition = Q(pk__in=list(position_ids or ())) | Q(position_name__in=list(position_names or ()))
+            queryset = queryset.filter(condition)
+
+    count = 0
+    last_pk = 0
+    while True:
+        batch = list(queryset.filter(pk__gt=last_pk).order_by('pk')[:REFRESH_BATCH_SIZE])
+        if not batch:
+            break
+        _save_profiles(build_requirement_profiles(batch))
+        count += len(batch)
+        last_pk = batch[-1].pk
+    return count
+
+
+def ensure_requirement_profiles(queryset):
+    """Создаёт недостающие профили для должностей queryset (например, после bulk_create)"""
+    missing = queryset.filter(requirement_profile__isnull=True)
+    if not missing.exists():
+        return 0
+    return refresh_requirement_profiles(queryset=Position.objects.filter(pk__in=missing.values('pk')))
+
+
+def get_requirement_profile(position):
+    """
+    Профиль требований должности.
+
+    Для чтения «одним join» загружайте должность с
+    select_related('requirement_profile') - тогда запросов не будет.
+    """
+    try:
+        return position.requirement_profile
+    except PositionRequirementProfile.DoesNotExist:
+        _save_profiles(build_requirement_profiles([position]))
+        profile = PositionRequirementProfile.objects.get(pk=position.pk)
+        Position.requirement_profile.related.set_cached_value(position, profile)
+        return profile
+
+
+# ---------------------------------------------------------------------------
+# Отложенный пересчёт (сигналы)
+# ---------------------------------------------------------------------------
+
+_pending = threading.local()
+
+
+class _RefreshBatch:
+    """Должности, изменённые в текущей транзакции"""
+
+    def __init__(self):
+        self.position_ids = set()
+        self.position_names = set()
+        self.done = False
+
+    def __call__(self):
+        self.done = True
+        if not self.position_ids and not self.position_names:
+            return
+        try:
+            refresh_requirement_profiles(position_ids=self.position_ids, position_names=self.position_names)
+        except Exception:
+            # Профили можно восстановить командой rebuild_position_requirements
+            logger.exception("Не удалось обновить профили требований должностей")
+
+
+def schedule_requirement_refresh(position_ids=(), position_names=()):
+    """Пересчитывает профили после фиксации текущей транзакции (один раз на транзакцию)"""
+    batch = getattr(_pending, 'batch', None)
+    # При откате транзакции Django удаляет её on_commit-обработчики - тогда нужна новая пачка
+    if batch is None or batch.done or not any(callback[1] is batch for callback in connection.run_on_commit):
+        batch = _pending.batch = _RefreshBatch()
+        registered = False
+    else:
+        registered = True
+    batch.position_ids.update(pk for pk in position_ids if pk)
+    batch.position_names.update(name for name in position_names if name)
+    if not registered:
+        # Вне транзакции обработчик выполняется сразу
+        transaction.on_commit(batch)
@@ -0,0 +1,119 @@
+"""
+🛡️ Определение норм СИЗ для должностей пачкой
+
+Нормы должности - её собственные нормы, а если их нет - нормы эталонной
+должности: первой (по полному названию организации) должности с тем же
+названием, у которой нормы есть.
+
+SIZNormResolver загружает индекс норм одним запросом на пачку должностей,
+после чего проверки «есть ли нормы» не обращаются к БД. Сами нормы
+(с СИЗ) загружаются вторым запросом - только когда они запрошены.
+"""
+from collections import defaultdict
+
+from directory.models.siz import SIZNorm
+
+
+class SIZNormResolver:
+    """
+    Использование:
+        resolver = SIZNormResolver.for_positions(e.position for e in employees)
+        for employee in employees:
+            if resolver.has_norms(employee.position):
+                norms = resolver.norms_for_position(employee.position)
+    """
+
+    def __init__(self, position_names=None):
+        """
+        Args:
+            position_names: названия должностей, для которых нужны нормы;
+                None - все должности (например, для дерева в админке)
+        """
+        self._position_names = None if position_names is None else set(position_names)
+        self._own = None          # id должностей с собственными нормами
+        self._reference = None    # название должности -> id эталонной должности
+        self._norms = None        # id должности -> [SIZNorm]
+
+    @classmethod
+    def for_positions(cls, positions):
+        return cls({position.position_name for position in positions if position is not None})
+
+    def _scoped(self, queryset):
+        if self._position_names is None:
+            return queryset
+        return queryset.filter(position__position_name__in=self._position_names)
+
+    def _load_index(self):
+        if self._own is not None:
+            return
+        rows = self._scoped(SIZNorm.objects.all()).order_by().values_list(
+            'position_id', 'position__position_name', 'position__organization__full_name_ru'
+        ).distinct()
+
+        self._own = set()
+        candidates = {}
+        for position_id, position_name, organization_name in rows:
+            self._own.add(position_id)
+            key = (organization_name or '', position_id)
+            if position_name not in candidates or key < candidates[position_name]:
+                candidates[position_name] = key
+        self._reference = {name: key[1] for name, key in candidates.items()}
+
+    def _load_norms(self):
+        if self._norms is not None:
+            return
+        self._load_index()
+        self._norms = defaultdict(list)
+        if not self._own:
+            return
+        # Эталонные должности - подмножество должностей с нормами, поэтому достаточно одного запроса
+        norms = self._scoped(SIZNorm.objects.all()).select_related('siz')
+        for norm in norms:
+            self._norms[norm.position_id].append(norm)
+
+    # ------------------------------------------------------------------
+    # Проверки
+    # ------------------------------------------------------------------
+
+    def has_own_norms(self, position):
+        """У должности есть собственные (переопределённые) нормы"""
+        self._load_index()
+        return position.pk in self._own
+
+    def has_reference_norms(self, position_name):
+        """Есть должность с таким названием, у которой заданы нормы"""
+        self._load_index()
+        return position_name in self._reference
+
+    def has_norms(self, position):
+        """Нормы есть - собственные или эталонные"""
+        return self.has_own_norms(position) or self.has_reference_norms(position.position_name)
+
+    def position_names_with_norms(self):
+        """Названия должностей, для которых нормы определены"""
+        self._load_index()
+        return set(self._reference)
+
+    # ------------------------------------------------------------------
+    # Нормы
+    # ------------------------------------------------------------------
+
+    def source_position_id(self, position):
+        """id должности, нормы которой применяются (собственной или эталонной), или None"""
+        self._load_index()
+        if position.pk in self._own:
+            return position.pk
+        return self._reference.get(position.position_name)
+
+    def norms_for_position(self, position):
+        """Список норм СИЗ (с загруженным siz) для должности"""
+        source_id = self.source_position_id(position)
+        if source_id is None:
+            return []
+        self._load_norms()
+        return list(self._norms.get(source_id, ()))
+
+    def norms_for_employee(self, employee):
+        if not employee.position_id:
+            return []
+        return self.norms_for_position(employee.position)
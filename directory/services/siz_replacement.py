@@ -0,0 +1,67 @@
+"""
+🛡️ График замены выданных СИЗ
+
+Плановая дата замены хранится в SIZIssued.next_due_date (индекс
+siz_issued_next_due_idx) и пересчитывается при сохранении выдачи: дата
+замены невозвращённого СИЗ, для возвращённых и "до износа" - пусто.
+Поэтому "просрочено / замена в ближайшие N дней" по всем организациям -
+один диапазонный запрос, фильтрация идёт на стороне БД.
+
+Записи, изменённые в обход save() (update(), bulk_create()), приводятся
+в порядок SIZIssued.objects.sync_due_dates() или командой
+send_siz_replacement_notifications --sync.
+"""
+from django.utils import timezone
+
+from directory.models import SIZIssued
+
+
+class SIZReplacementSchedule:
+    """
+    Использование:
+        schedule = SIZReplacementSchedule(days=30)
+        for organization_id, due in schedule.by_organization().items():
+            due['overdue'], due['upcoming']  # списки SIZIssued по next_due_date
+    """
+
+    def __init__(self, days=30, today=None):
+        self.days = days
+        self.today = today or timezone.now().date()
+
+    def due_queryset(self, issued_qs=None):
+        """Выдачи со сроком замены не позже today + days (сначала самые давние)"""
+        if issued_qs is None:
+            issued_qs = SIZIssued.objects.all()
+        return issued_qs.in_use().due_within(self.days, self.today).select_related(
+            'siz', 'employee__organization', 'employee__subdivision', 'employee__position'
+        ).order_by('next_due_date', 'employee__full_name_nominative', 'pk')
+
+    def split(self, items):
+        """(просроченные, предстоящие)"""
+        overdue, upcoming = [], []
+        for item in items:
+            (overdue if item.next_due_date < self.today else upcoming).append(item)
+        return overdue, upcoming
+
+    def counts(self, issued_qs=None):
+        """{'overdue': int, 'upcoming': int} одним запросом"""
+        if issued_qs is None:
+            issued_qs = SIZIssued.objects.all()
+        return issued_qs.in_use().replacement_counts(self.days, self.today)
+
+    def by_organization(self, organization_ids=None):
+        """
+        Просроченные и предстоящие замены, сгруппированные по организациям, одним запросом.
+
+        Returns:
+            dict: {organization_id: {'overdue': [SIZIssued], 'upcoming': [SIZIssued]}}
+        """
+        issued_qs = SIZIssued.objects.all()
+        if organization_ids is not None:
+            issued_qs = issued_qs.for_organizations(organization_ids)
+
+        grouped = {}
+        for item in self.due_queryset(issued_qs):
+            due = grouped.setdefault(item.employee.organization_id, {'overdue': [], 'upcoming': []})
+            due['overdue' if item.next_due_date < self.today else 'upcoming'].append(item)
+        return grouped
@@ -1,8 +1,16 @@
 # 📁 directory/signals.py
-from django.db.models.signals import post_save, pre_save
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models.signals import m2m_changed, post_delete, post_migrate, post_save, pre_save
 from django.dispatch import receiver
 from django.contrib.auth.models import User
-from directory.models import Employee, Position, StructuralSubdivision, Profile
+from directory.models import (
+    Commission, CommissionMember, Department, DocumentTemplate, Employee, MenuItem, Position, ResponsibilityType,
+    PositionRequirementProfile, SIZNorm, StructuralSubdivision, Profile,
+)
+from directory.document_generators.document_cache import document_cache
+from directory.services.menu_visibility import MenuVisibility
+from directory.services.org_structure import OrgStructureResolver
+from directory.services.position_requirements import ensure_requirement_profiles, schedule_requirement_refresh
 
 
 @receiver(post_save, sender=User)
@@ -34,6 +42,17 @@ def update_departments(sender, instance, **kwargs):
         instance.department_set.all().update(organization=instance.organization)
 
 
+@receiver(post_save, sender=DocumentTemplate)
+@receiver(post_delete, sender=DocumentTemplate)
+def invalidate_document_cache(sender, instance, **kwargs):
+    """
+    Удаляет из кэша документы, сгенерированные по изменённому шаблону.
+    Изменения сотрудников и оргструктуры меняют контекст (ключ кэша) и
+    отдельной очистки не требуют.
+    """
+    document_cache.invalidate_template(instance.pk)
+
+
 @receiver(pre_save, sender=Employee)
 def cache_old_position(sender, instance, **kwargs):
     """
@@ -42,13 +61,17 @@ def cache_old_position(sender, instance, **kwargs):
     """
     if instance.pk:
         try:
-            # Сохраняем старую должность в самом объекте instance
-            instance._old_position = Employee.objects.get(pk=instance.pk).position
+            # Сохраняем старую должность (и организацию) в самом объекте instance
+            old = Employee.objects.get(pk=instance.pk)
+            instance._old_position = old.position
+            instance._old_organization_id = old.organization_id
         except Employee.DoesNotExist:
             instance._old_position = None
+            instance._old_organization_id = None
     else:
         # Для нового сотрудника старой должности нет
         instance._old_position = None
+        instance._old_organization_id = None
 
 
 def get_harmful_factors_for_position(position):
@@ -136,3 +159,149 @@ def update_medical_examinations_on_change(sender, instance, created, **kwargs):
         # Факторы, которые были в старой должности, но нет в новой, мы не трогаем.
         # Логика их фильтрации теперь лежит в методе Employee.get_medical_status(),
         # который учитывает только факторы ТЕКУЩЕЙ должности.
+
+
+# =============================================
+# 🏛️ Снимки оргструктуры (подписанты, руководители стажировки, комиссии)
+# =============================================
+
+@receiver([post_save, post_delete], sender=Employee)
+def invalidate_org_structure_on_employee(sender, instance, **kwargs):
+    OrgStructureResolver.invalidate(instance.organization_id, getattr(instance, '_old_organization_id', None))
+
+
+@receiver([post_save, post_delete], sender=Position)
+@receiver([post_save, post_delete], sender=StructuralSubdivision)
+@receiver([post_save, post_delete], sender=Department)
+@receiver([post_save, post_delete], sender=Commission)
+def invalidate_org_structure(sender, instance, **kwargs):
+    OrgStructureResolver.invalidate(instance.organization_id)
+
+
+@receiver([post_save, post_delete], sender=CommissionMember)
+def invalidate_org_structure_on_commission_member(sender, instance, **kwargs):
+    OrgStructureResolver.invalidate(
+        Commission.objects.filter(pk=instance.commission_id).values_list('organization_id', flat=True).first()
+    )
+
+
+# =============================================
+# 🍔 Видимость пунктов меню
+# =============================================
+
+@receiver([post_save, post_delete], sender=MenuItem)
+def invalidate_menu_visibility(sender, instance, **kwargs):
+    MenuVisibility.invalidate_all()
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_user_menu_visibility(sender, instance, **kwargs):
+    """Суперпользователь видит все пункты - меню зависит от прав пользователя"""
+    MenuVisibility.invalidate(instance.pk)
+
+
+@receiver(m2m_changed, sender=Profile.visible_menu_items.through)
+def invalidate_menu_visibility_on_profile(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        MenuVisibility.invalidate(instance.user_id)
+    elif pk_set:
+        MenuVisibility.invalidate(*Profile.objects.filter(pk__in=pk_set).values_list('user_id', flat=True))
+    else:
+        # menu_item.user_profiles.clear() - затронутые профили уже не узнать
+        MenuVisibility.invalidate_all()
+
+
+# =============================================
+# 📋 Профили требований должностей
+# =============================================
+# Пересчёт откладывается до конца транзакции (schedule_requirement_refresh),
+# эталонные нормы СИЗ и медосмотров затрагивают все должности с тем же названием.
+
+def _position_name(position_id):
+    return Position.objects.filter(pk=position_id).values_list('position_name', flat=True).first()
+
+
+@receiver(pre_save, sender=Position)
+def cache_old_position_name(sender, instance, **kwargs):
+    """Запоминаем прежнее название должности: при переименовании меняются эталонные нормы"""
+    instance._old_position_name = _position_name(instance.pk) if instance.pk else None
+
+
+@receiver(post_save, sender=Position)
+def refresh_position_requirements(sender, instance, **kwargs):
+    names = ()
+    old_name = getattr(instance, '_old_position_name', None)
+    if old_name and old_name != instance.position_name:
+        names = (old_name, instance.position_name)
+    schedule_requirement_refresh(position_ids=[instance.pk], position_names=names)
+
+
+@receiver(m2m_changed, sender=Position.documents.through)
+@receiver(m2m_changed, sender=Position.responsibility_types.through)
+def refresh_requirements_on_m2m(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        schedule_requirement_refresh(position_ids=[instance.pk])
+    elif pk_set:
+        schedule_requirement_refresh(position_ids=pk_set)
+    else:
+        # post_clear со стороны документа/вида ответственности: pk_set не передаётся
+        schedule_requirement_refresh(position_ids=instance.positions.values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=ResponsibilityType)
+def refresh_requirements_on_responsibility_type(sender, instance, created, **kwargs):
+    if not created:
+        schedule_requirement_refresh(position_ids=instance.positions.values_list('pk', flat=True))
+
+
+@receiver([post_save, post_delete], sender=SIZNorm)
+def refresh_requirements_on_siz_norm(sender, instance, **kwargs):
+    schedule_requirement_refresh(position_names=[_position_name(instance.position_id)])
+
+
+@receiver([post_save, post_delete], sender='deadline_control.PositionMedicalFactor')
+def refresh_requirements_on_medical_factor(sender, instance, **kwargs):
+    schedule_requirement_refresh(position_ids=[instance.position_id])
+
+
+@receiver([post_save, post_delete], sender='deadline_control.MedicalExaminationNorm')
+def refresh_requirements_on_medical_norm(sender, instance, **kwargs):
+    schedule_requirement_refresh(position_names=[instance.position_name])
+
+
+@receiver([post_save, post_delete], sender=CommissionMember)
+def refresh_requirements_on_commission_member(sender, instance, **kwargs):
+    position_id = Employee.objects.filter(pk=instance.employee_id).values_list('position_id', flat=True).first()
+    schedule_requirement_refresh(position_ids=[position_id])
+
+
+@receiver(post_save, sender=Commission)
+def refresh_requirements_on_commission(sender, instance, created, **kwargs):
+    if not created:
+        schedule_requirement_refresh(
+            position_ids=instance.members.values_list('employee__position_id', flat=True)
+        )
+
+
+@receiver(post_save, sender=Employee)
+def refresh_requirements_on_employee(sender, instance, created, **kwargs):
+    """Роли в комиссиях хранятся с ФИО и привязаны к должности сотрудника"""
+    if created or not instance.commission_roles.exists():
+        return
+    old_position = getattr(instance, '_old_position', None)
+    schedule_requirement_refresh(position_ids=[instance.position_id, getattr(old_position, 'pk', None)])
+
+
+@receiver(post_migrate)
+def build_missing_requirement_profiles(sender, app_config=None, using=DEFAULT_DB_ALIAS, **kwargs):
+    """Профили для должностей, созданных до появления таблицы или через bulk_create"""
+    if app_config is None or app_config.label != 'directory':
+        return
+    # После отката миграций (migrate directory 0058) таблицы профилей ещё нет
+    if PositionRequirementProfile._meta.db_table not in connections[using].introspection.table_names():
+        return
+    ensure_requirement_profiles(Position.objects.all())
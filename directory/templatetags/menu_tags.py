@@ -1,9 +1,13 @@
 # directory/templatetags/menu_tags.py
 """
 Теги и фильтры для работы с системой меню и правами доступа.
+
+Видимость считается один раз на пользователя (MenuVisibility) и берётся
+из кэша, поэтому повторные проверки в шаблоне не обращаются к БД.
 """
 from django import template
 from directory.models import MenuItem
+from directory.services.menu_visibility import MenuVisibility
 
 register = template.Library()
 
@@ -18,30 +22,13 @@ def get_visible_menu_items(context, location='sidebar'):
         location: Расположение меню ('sidebar', 'top', 'both')
 
     Returns:
-        QuerySet активных пунктов меню, видимых для пользователя
+        list активных пунктов меню, видимых для пользователя (в порядке order, name)
     """
     request = context.get('request')
     if not request:
         return MenuItem.objects.none()
 
-    user = request.user
-
-    # Получаем все активные пункты меню для указанного расположения
-    if location == 'both':
-        menu_items = MenuItem.objects.filter(is_active=True)
-    else:
-        menu_items = MenuItem.objects.filter(
-            is_active=True,
-            location__in=[location, 'both']
-        )
-
-    # Фильтруем по видимости для пользователя
-    visible_items = []
-    for item in menu_items.order_by('order', 'name'):
-        if item.is_visible_for_user(user):
-            visible_items.append(item)
-
-    return visible_items
+    return MenuVisibility.for_user(request.user).items_for(location)
 
 
 @register.filter
@@ -57,17 +44,13 @@ def is_menu_visible(menu_item, user):
         bool: True если пункт виден
     """
     if isinstance(menu_item, str):
-        # Если передана строка (url_name), находим соответствующий MenuItem
-        try:
-            menu_item = MenuItem.objects.get(url_name=menu_item, is_active=True)
-        except MenuItem.DoesNotExist:
-            # Если пункт меню не найден в базе, считаем его видимым (обратная совместимость)
-            return True
+        # Строка (url_name): пункт, которого нет в меню, считаем видимым (обратная совместимость)
+        return MenuVisibility.for_user(user).is_url_visible(menu_item)
 
     if not isinstance(menu_item, MenuItem):
         return True
 
-    return menu_item.is_visible_for_user(user)
+    return MenuVisibility.for_user(user).is_item_visible(menu_item)
 
 
 @register.simple_tag
@@ -82,9 +65,5 @@ def check_url_visibility(user, url_name):
     Returns:
         bool: True если URL виден пользователю
     """
-    try:
-        menu_item = MenuItem.objects.get(url_name=url_name, is_active=True)
-        return menu_item.is_visible_for_user(user)
-    except MenuItem.DoesNotExist:
-        # Если пункт не найден в MenuItem, считаем его видимым
-        return True
+    # Если пункт не найден в MenuItem, считаем его видимым
+    return MenuVisibility.for_user(user).is_url_visible(url_name)
@@ -0,0 +1,111 @@
+import json
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from deadline_control.models import (
+    EmployeeMedicalExamination,
+    Equipment,
+    HarmfulFactor,
+    KeyDeadlineCategory,
+    KeyDeadlineItem,
+    MedicalExaminationNorm,
+)
+from deadline_control.models.querysets import deadlines_bulk_updated
+from directory.models import Employee, Organization, Position
+
+
+class BulkDateUpdateTests(TestCase):
+    """Массовое проведение ТО / мероприятий / медосмотров: один bulk_update и одно событие"""
+
+    @classmethod
+    def setUpTestData(cls):
+        def organization(name):
+            return Organization.objects.create(
+                short_name_ru=name, full_name_ru=name, short_name_by=name, full_name_by=name, location='г. Минск',
+            )
+
+        cls.org_a = organization('ООО "Альфа"')
+        cls.org_b = organization('ООО "Бета"')
+        for idx, org in enumerate([cls.org_a, cls.org_a, cls.org_b]):
+            Equipment.objects.create(
+                equipment_name=f'Кран {idx}', inventory_number=f'INV-{idx}', organization=org,
+                last_maintenance_date=date(2025, 1, 10), maintenance_period_months=6 * (idx + 1),
+            )
+
+        category = KeyDeadlineCategory.objects.create(name='Поверка', periodicity_months=12)
+        cls.item = KeyDeadlineItem.objects.create(
+            organization=cls.org_a, category=category, name='Манометры', current_date=date(2025, 3, 1),
+        )
+
+        cls.noise = HarmfulFactor.objects.create(short_name='4.2', full_name='Шум', periodicity=24)
+        cls.dust = HarmfulFactor.objects.create(short_name='1.1', full_name='Пыль', periodicity=12)
+        MedicalExaminationNorm.objects.create(position_name='Слесарь', harmful_factor=cls.noise)
+        MedicalExaminationNorm.objects.create(position_name='Слесарь', harmful_factor=cls.dust)
+        position = Position.objects.create(position_name='Слесарь', organization=cls.org_a)
+        cls.employees = [
+            Employee.objects.create(full_name_nominative=f'Сотрудник {idx}', organization=cls.org_a, position=position)
+            for idx in range(3)
+        ]
+        # Записи медосмотров заводятся сигналом при создании сотрудника; одной не хватает
+        EmployeeMedicalExamination.objects.filter(employee=cls.employees[0], harmful_factor=cls.dust).delete()
+
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'pass')
+
+    def setUp(self):
+        self.events = []
+
+        def listener(sender, organization_ids, **kwargs):
+            self.events.append((sender, organization_ids))
+
+        deadlines_bulk_updated.connect(listener)
+        self.addCleanup(deadlines_bulk_updated.disconnect, listener)
+
+    def test_equipment_perform_maintenance(self):
+        # Выборка, savepoint-ы транзакции и UPDATE на группу одинаковых значений:
+        # у каждой единицы своя история ТО, поэтому здесь три группы
+        with self.assertNumQueries(6):
+            updated = Equipment.objects.all().perform_maintenance(date(2026, 8, 31), comment='Плановое')
+
+        self.assertEqual(updated, 3)
+        self.assertEqual(self.events, [(Equipment, {self.org_a.pk, self.org_b.pk})])
+        next_dates = list(Equipment.objects.order_by('inventory_number').values_list('next_maintenance_date', flat=True))
+        # Конец месяца: 31.08 + 6 мес. = 28.02
+        self.assertEqual(next_dates, [date(2027, 2, 28), date(2027, 8, 31), date(2028, 2, 29)])
+        equipment = Equipment.objects.get(inventory_number='INV-0')
+        self.assertEqual(equipment.maintenance_history, [{'date': '2025-01-10', 'comment': 'Плановое'}])
+
+    def test_key_deadline_mark_completed(self):
+        KeyDeadlineItem.objects.filter(pk=self.item.pk).mark_completed(date(2026, 5, 15))
+        self.item.refresh_from_db()
+        self.assertEqual((self.item.current_date, self.item.next_date), (date(2026, 5, 15), date(2027, 5, 15)))
+        self.assertEqual(self.events, [(KeyDeadlineItem, {self.org_a.pk})])
+
+    def test_perform_examination_statuses(self):
+        exams = EmployeeMedicalExamination.objects.filter(employee=self.employees[0])
+        self.assertEqual(exams.perform_examination(date(2020, 3, 15)), 1)
+        exam = exams.get()
+        # Следующая дата (через 24 мес.) уже прошла - статус как в save()
+        self.assertEqual((exam.next_date, exam.status), (date(2022, 3, 15), 'expired'))
+
+    def test_update_multiple_creates_and_updates_examinations(self):
+        self.client.force_login(self.user)
+        response = self.client.post(
+            reverse('deadline_control:medical:update_multiple_examinations'),
+            data=json.dumps({
+                'employee_ids': [employee.pk for employee in self.employees],
+                'examination_date': '2026-10-01',
+            }),
+            content_type='application/json',
+        )
+
+        self.assertEqual(response.json(), {'success': True, 'updated_count': 3})
+        exams = EmployeeMedicalExamination.objects.all()
+        self.assertEqual(exams.count(), 6)
+        self.assertEqual(
+            set(exams.values_list('harmful_factor__short_name', 'next_date', 'status')),
+            {('4.2', date(2028, 10, 1), 'completed'), ('1.1', date(2027, 10, 1), 'completed')},
+        )
+        self.assertEqual(self.events, [(EmployeeMedicalExamination, {self.org_a.pk})])
@@ -0,0 +1,108 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from tablib import Dataset
+
+from deadline_control.models import EmployeeMedicalExamination, Equipment, HarmfulFactor, MedicalExaminationNorm
+from directory.models import Employee, Position
+from directory.services.global_import import commit_import
+
+ORG = 'ООО "Импорт"'
+
+
+def make_dataset(headers, rows):
+    dataset = Dataset()
+    dataset.headers = headers
+    for row in rows:
+        dataset.append(row)
+    return dataset
+
+
+def make_datasets(size, start=0):
+    """Листы глобального импорта: повторяющиеся должности, сотрудники, оборудование без номеров"""
+    rows = range(start, start + size)
+    return {
+        'Структура': make_dataset(
+            ['org_short_name_ru', 'subdivision_name', 'department_name', 'position_name'],
+            [[ORG, f'Цех {i % 4}', f'Участок {i % 8}' if i % 2 else '', f'Должность {i % 10}'] for i in rows],
+        ),
+        'Сотрудники': make_dataset(
+            ['org_short_name_ru', 'subdivision_name', 'department_name', 'position_name',
+             'full_name_nominative', 'hire_date'],
+            [[ORG, f'Цех {i % 4}', f'Участок {i % 8}' if i % 2 else '', f'Должность {i % 10}',
+              f'Сотрудник {i:04d} Импортович', '01.02.2020'] for i in rows],
+        ),
+        'Оборудование': make_dataset(
+            ['org_short_name_ru', 'subdivision_name', 'equipment_name', 'inventory_number',
+             'maintenance_period_months', 'last_maintenance_date'],
+            [[ORG, f'Цех {i % 4}', f'Станок {i}', '' if i % 2 else f'INV-{i}', '6', '01.01.2025'] for i in rows],
+        ),
+    }
+
+
+class BulkImportTests(TestCase):
+    """Глобальный импорт в пакетном режиме"""
+
+    def test_commit_import_creates_everything(self):
+        result = commit_import(make_datasets(40))
+        self.assertTrue(result['success'], result)
+
+        # 40 строк - 30 уникальных сочетаний подразделение/отдел/должность
+        self.assertEqual(Position.objects.filter(organization__short_name_ru=ORG).count(), 30)
+        employees = Employee.objects.filter(organization__short_name_ru=ORG)
+        self.assertEqual(employees.count(), 40)
+        self.assertFalse(employees.filter(search_text='').exists())
+        self.assertFalse(employees.exclude(position__organization__short_name_ru=ORG).exists())
+
+        generated = sorted(
+            Equipment.objects.filter(inventory_number__regex=r'^\d{8}$').values_list('inventory_number', flat=True)
+        )
+        self.assertEqual(generated, [f'{number:08d}' for number in range(1, 21)])
+        self.assertFalse(Equipment.objects.filter(next_maintenance_date__isnull=True).exists())
+
+    def test_reimport_updates_existing_rows(self):
+        commit_import(make_datasets(20))
+        result = commit_import(make_datasets(20))
+        sheets = {sheet['sheet_name']: sheet for sheet in result['sheets']}
+
+        self.assertEqual(sheets['Сотрудники']['updated'], 20)
+        self.assertEqual(sheets['Сотрудники']['created'], 0)
+        self.assertEqual(Employee.objects.count(), 20)
+        # Оборудование с номером обновляется, без номера - создается заново
+        self.assertEqual(sheets['Оборудование']['updated'], 10)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        def count_queries(size, start):
+            with CaptureQueriesContext(connection) as ctx:
+                commit_import(make_datasets(size, start))
+            return len(ctx.captured_queries)
+
+        commit_import(make_datasets(80))  # оргструктура и все должности уже созданы
+        small = count_queries(40, 1000)
+        large = count_queries(80, 2000)
+        # Запросы растут только за счет разбиения пачек bulk-операций по лимиту параметров СУБД
+        self.assertLess(large - small, 40 // 10, f'{small} → {large} запросов')
+
+    def test_bulk_import_creates_medical_examinations(self):
+        factor = HarmfulFactor.objects.create(short_name='4.2', full_name='Шум', periodicity=24)
+        MedicalExaminationNorm.objects.create(position_name='Должность 1', harmful_factor=factor)
+
+        commit_import(make_datasets(20))
+        exams = EmployeeMedicalExamination.objects.filter(harmful_factor=factor)
+        self.assertEqual(
+            set(exams.values_list('employee__full_name_nominative', flat=True)),
+            {'Сотрудник 0001 Импортович', 'Сотрудник 0011 Импортович'},
+        )
+
+        # Сотрудник переведён на должность с вредным фактором при повторном импорте
+        datasets = make_datasets(3)
+        datasets['Сотрудники'][2] = datasets['Сотрудники'][2][:3] + ('Должность 1',) + datasets['Сотрудники'][2][4:]
+        commit_import(datasets)
+        self.assertTrue(exams.filter(employee__full_name_nominative='Сотрудник 0002 Импортович').exists())
+        self.assertEqual(exams.count(), 3)
+
+    def test_bulk_import_builds_requirement_profiles(self):
+        datasets = make_datasets(20)
+        commit_import({'Сотрудники': datasets['Сотрудники']})
+        self.assertTrue(Employee.objects.exists())
+        self.assertFalse(Position.objects.filter(requirement_profile__isnull=True).exists())
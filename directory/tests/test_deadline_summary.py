@@ -0,0 +1,50 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from deadline_control.models import Equipment
+from deadline_control.services import DeadlineSummaryService
+from directory.models import Organization
+
+
+class DeadlineSummaryServiceTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_superuser(username='admin', password='testpass123')
+        self.org = Organization.objects.create(
+            full_name_ru='Общество с ограниченной ответственностью "Ромашка"',
+            short_name_ru='ООО "Ромашка"',
+        )
+        today = timezone.now().date()
+        self.overdue = Equipment.objects.create(
+            equipment_name='Тележка 1', inventory_number='INV-1', organization=self.org,
+        )
+        Equipment.objects.filter(pk=self.overdue.pk).update(next_maintenance_date=today - timedelta(days=3))
+        Equipment.objects.create(
+            equipment_name='Тележка 2', inventory_number='INV-2', organization=self.org,
+        )
+
+    def test_summary_is_cached_per_org(self):
+        """Повторный расчёт сводки организации берётся из кэша без запросов к данным"""
+        summary = DeadlineSummaryService().get_summary(self.user)
+        self.assertEqual(summary['equipment']['total'], 2)
+        self.assertEqual([eq.pk for eq in summary['equipment']['overdue']], [self.overdue.pk])
+
+        with CaptureQueriesContext(connection) as ctx:
+            DeadlineSummaryService().get_org_summary(self.org.pk)
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    def test_save_invalidates_org_summary(self):
+        """Сохранение оборудования сбрасывает кэш сводки его организации"""
+        DeadlineSummaryService().get_summary(self.user)
+
+        self.overdue.last_maintenance_date = timezone.now().date()
+        self.overdue.save()
+
+        summary = DeadlineSummaryService().get_summary(self.user)
+        self.assertEqual(summary['equipment']['overdue'], [])
@@ -0,0 +1,90 @@
+import os
+import shutil
+import tempfile
+from types import SimpleNamespace
+from unittest import mock
+
+import docx
+from django.test import SimpleTestCase
+
+from directory.document_generators import base, document_cache
+from directory.document_generators.document_cache import DocumentCache
+
+
+class DocumentCacheTests(SimpleTestCase):
+    """Кэш сгенерированных документов: повторный запрос без рендера, LRU-лимит"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir, ignore_errors=True)
+
+        template_path = os.path.join(self.tmp_dir, 'order.docx')
+        document = docx.Document()
+        document.add_paragraph('Распоряжение: {{ fio_nominative }}')
+        document.save(template_path)
+
+        self.template = SimpleNamespace(
+            pk=1, id=1, name='Распоряжение',
+            template_file=SimpleNamespace(path=template_path, name='order.docx'),
+            document_type=SimpleNamespace(code='all_orders'),
+        )
+        self.employee = SimpleNamespace(full_name_nominative='Иванов Иван Иванович')
+        self.cache = DocumentCache(root=os.path.join(self.tmp_dir, 'cache'))
+
+    def generate(self, context):
+        return base.generate_docx_from_template(self.template, context, self.employee, raise_on_error=True)
+
+    def test_repeat_request_served_from_disk(self):
+        context = {'fio_nominative': 'Иванов Иван Иванович', 'employee': object()}
+        with mock.patch.object(base, 'document_cache', self.cache), \
+                mock.patch.object(base, 'DocxTemplate', wraps=base.DocxTemplate) as docx_template:
+            first = self.generate(context)
+            second = self.generate(dict(context))
+            self.assertEqual(docx_template.call_count, 1)
+            self.assertEqual(first, second)
+
+            # Изменились данные сотрудника - другой ключ, документ рендерится заново
+            changed = self.generate({'fio_nominative': 'Петров Пётр Петрович'})
+            self.assertEqual(docx_template.call_count, 2)
+            self.assertNotEqual(changed['content'], first['content'])
+
+            # Изменился файл шаблона - кэш по старой версии не используется
+            os.utime(self.template.template_file.path, ns=(0, 1))
+            self.generate(context)
+            self.assertEqual(docx_template.call_count, 3)
+
+    def test_cache_disabled_for_generator(self):
+        context = {'fio_nominative': 'Иванов Иван Иванович'}
+        with mock.patch.object(base, 'document_cache', self.cache), \
+                mock.patch.object(base, 'DocxTemplate', wraps=base.DocxTemplate) as docx_template:
+            for _ in range(2):
+                base.generate_docx_from_template(
+                    self.template, context, self.employee, raise_on_error=True, cache=False
+                )
+            self.assertEqual(docx_template.call_count, 2)
+        self.assertFalse(os.path.exists(self.cache.root))
+
+    def test_uncacheable_context_is_rendered(self):
+        self.assertIsNone(self.cache.make_key(self.template, {'position': object()}))
+
+    def test_generator_version_changes_key(self):
+        key = self.cache.make_key(self.template, {'n': 1})
+        with mock.patch.object(document_cache, 'DOCUMENT_CACHE_VERSION', document_cache.DOCUMENT_CACHE_VERSION + 1):
+            self.assertNotEqual(self.cache.make_key(self.template, {'n': 1}), key)
+
+    def test_lru_eviction_keeps_recent_documents(self):
+        cache = DocumentCache(root=os.path.join(self.tmp_dir, 'lru'), max_bytes=3500)
+        keys = [cache.make_key(self.template, {'n': n}) for n in range(4)]
+        for index, key in enumerate(keys[:3]):
+            cache.set(self.template, key, b'x' * 1000)
+            path = cache._path(self.template, key)
+            os.utime(path, ns=(index, index))
+        # Первый документ прочитан - он новее второго
+        self.assertIsNotNone(cache.get(self.template, keys[0]))
+
+        # Четвёртый документ превышает лимит: удаляются два давно не читавшихся
+        cache.set(self.template, keys[3], b'x' * 1000)
+        self.assertIsNotNone(cache.get(self.template, keys[0]))
+        self.assertIsNone(cache.get(self.template, keys[1]))
+        self.assertIsNone(cache.get(self.template, keys[2]))
+        self.assertIsNotNone(cache.get(self.template, keys[3]))
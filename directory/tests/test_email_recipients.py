@@ -0,0 +1,72 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from deadline_control.models import EmailSettings
+from directory.models import Employee, Organization, Position, StructuralSubdivision, SubdivisionEmail
+from directory.utils.email_recipients import collect_recipients_for_organization, collect_recipients_for_subdivision
+
+
+class CollectRecipientsForOrganizationTests(TestCase):
+    """Получатели всех подразделений организации - три запроса, список организации из кэша"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.org = Organization.objects.create(
+            short_name_ru='ООО "Альфа"', full_name_ru='ООО "Альфа"',
+            short_name_by='ТАА "Альфа"', full_name_by='ТАА "Альфа"', location='г. Минск',
+        )
+        cls.settings = EmailSettings.get_settings(cls.org)
+        cls.settings.is_active = True
+        cls.settings.recipient_emails = 'HR@alfa.by\n'
+        cls.settings.instruction_journal_recipients = 'ot@alfa.by'
+        cls.settings.save()
+
+        cls.subdivisions = [
+            StructuralSubdivision.objects.create(name=f'Цех №{number}', organization=cls.org)
+            for number in range(1, 4)
+        ]
+        SubdivisionEmail.objects.create(subdivision=cls.subdivisions[0], email='shop1@alfa.by')
+        SubdivisionEmail.objects.create(subdivision=cls.subdivisions[1], email='off@alfa.by', is_active=False)
+        engineer = Position.objects.create(
+            position_name='Инженер по ОТ', organization=cls.org, subdivision=cls.subdivisions[1],
+            is_responsible_for_safety=True,
+        )
+        Employee.objects.create(
+            full_name_nominative='Иванов Иван Иванович', organization=cls.org,
+            subdivision=cls.subdivisions[1], position=engineer, email=' Ivanov@alfa.by ',
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.org = Organization.objects.get(pk=self.org.pk)
+
+    def test_matches_per_subdivision_collection(self):
+        with self.assertNumQueries(3):
+            recipients = collect_recipients_for_organization(self.org, self.subdivisions)
+        self.assertEqual(recipients, {
+            self.subdivisions[0].pk: ['hr@alfa.by', 'shop1@alfa.by'],
+            self.subdivisions[1].pk: ['hr@alfa.by', 'ivanov@alfa.by'],
+            self.subdivisions[2].pk: ['hr@alfa.by'],
+        })
+        for subdivision in self.subdivisions:
+            self.assertEqual(
+                sorted(collect_recipients_for_subdivision(subdivision, self.org)), recipients[subdivision.pk]
+            )
+
+        # Список организации закэширован отдельно для каждого типа уведомления
+        self.org = Organization.objects.get(pk=self.org.pk)
+        with self.assertNumQueries(3):
+            journal = collect_recipients_for_organization(
+                self.org, self.subdivisions, notification_type='instruction_journal'
+            )
+        self.assertEqual(journal[self.subdivisions[2].pk], ['ot@alfa.by'])
+        with self.assertNumQueries(2):
+            collect_recipients_for_organization(self.org, self.subdivisions)
+
+    def test_email_settings_change_resets_cache(self):
+        collect_recipients_for_organization(self.org, self.subdivisions)
+        self.settings.recipient_emails = 'director@alfa.by'
+        self.settings.save()
+        organization = Organization.objects.get(pk=self.org.pk)
+        recipients = collect_recipients_for_organization(organization, self.subdivisions)
+        self.assertEqual(recipients[self.subdivisions[2].pk], ['director@alfa.by'])
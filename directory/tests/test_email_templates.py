@@ -0,0 +1,82 @@
+from types import SimpleNamespace
+
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase, TestCase
+
+from deadline_control.management.commands.send_medical_notifications import Command as MedicalCommand
+from deadline_control.models import EmailTemplate, EmailTemplateType
+from deadline_control.utils.email_templates import (
+    MissingTemplateVariable,
+    find_variables,
+    render_email_template,
+)
+
+
+class CompiledTemplateTests(SimpleTestCase):
+    """Подстановка совместима с str.format, но не падает на одиночных скобках"""
+
+    def test_braces_match_str_format(self):
+        source = '<style>p {{ margin: 0; }}</style>{{name}} {{{name}}} {name}'
+        self.assertEqual(
+            render_email_template(source, {'name': 'Иванов'}),
+            source.format(name='Иванов'),
+        )
+
+    def test_stray_braces_stay_literal(self):
+        self.assertEqual(
+            render_email_template('{color: red} {name} {}', {'name': 'X'}),
+            '{color: red} X {}',
+        )
+        self.assertEqual(find_variables('{a} {b-c} {{d}} {e}'), {'a', 'e'})
+
+    def test_missing_variable_is_key_error(self):
+        with self.assertRaises(KeyError):
+            render_email_template('{organization_name}', {})
+        with self.assertRaises(MissingTemplateVariable):
+            render_email_template('{organization_name}', {'other': 1})
+
+    def test_section_values_are_escaped(self):
+        employee = SimpleNamespace(
+            full_name_nominative='<b>Иванов</b>',
+            position=SimpleNamespace(position_name='Слесарь & сварщик'),
+        )
+        status = {'factors': [{'short_name': '4.2'}], 'date_completed': None, 'days_until': None}
+        html = MedicalCommand()._format_html_section([{'employee': employee, 'status': status}], 'no_date')
+
+        self.assertIn('&lt;b&gt;Иванов&lt;/b&gt;', html)
+        self.assertIn('Слесарь &amp; сварщик', html)
+        self.assertNotIn('<b>Иванов', html)
+
+
+class EmailTemplateValidationTests(TestCase):
+    """Неизвестные переменные отклоняются при сохранении шаблона"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.template_type = EmailTemplateType.objects.create(
+            name='Медосмотры', code='medical_test',
+            available_variables={'organization_name': 'Организация', 'overdue_count': 'Просрочено'},
+        )
+
+    def test_unknown_variable_rejected(self):
+        template = EmailTemplate(
+            template_type=self.template_type, name='Шаблон',
+            subject='{organization_name}', body='<p>{overdue_count} {employee_name}</p>',
+        )
+        with self.assertRaises(ValidationError) as ctx:
+            template.full_clean()
+        self.assertIn('body', ctx.exception.message_dict)
+        self.assertNotIn('subject', ctx.exception.message_dict)
+        self.assertIn('{employee_name}', ctx.exception.message_dict['body'][0])
+
+    def test_known_variables_render(self):
+        template = EmailTemplate(
+            template_type=self.template_type, name='Шаблон',
+            subject='{organization_name}', body='<style>p {{ margin: 0; }}</style>{overdue_count}',
+        )
+        template.full_clean()
+        self.assertEqual(template.get_formatted_subject({'organization_name': 'Альфа'}), 'Альфа')
+        self.assertEqual(
+            template.get_formatted_body({'overdue_count': 3}),
+            '<style>p { margin: 0; }</style>3',
+        )
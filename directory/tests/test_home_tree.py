@@ -0,0 +1,53 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from directory.models import Department, Employee, Organization, Position, StructuralSubdivision
+
+
+class HomeTreeFragmentCacheTests(TestCase):
+    """Фрагменты отделов на главной кэшируются до изменения оргструктуры"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.org = Organization.objects.create(
+            short_name_ru='ООО "Альфа"', full_name_ru='ООО "Альфа"',
+            short_name_by='ТАА "Альфа"', full_name_by='ТАА "Альфа"', location='г. Минск',
+        )
+        subdivision = StructuralSubdivision.objects.create(name='Цех №1', organization=cls.org)
+        department = Department.objects.create(name='Участок сборки', organization=cls.org, subdivision=subdivision)
+        position = Position.objects.create(
+            position_name='Слесарь', organization=cls.org, subdivision=subdivision, department=department
+        )
+        cls.employee = Employee.objects.create(
+            full_name_nominative='Иванов Иван Иванович', organization=cls.org,
+            subdivision=subdivision, department=department, position=position,
+        )
+        cls.user = User.objects.create_superuser(username='admin', password='test123')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+        self.url = reverse('directory:employee_home') + f'?org={self.org.pk}'
+
+    def test_department_rows_use_url_prefixes_and_follow_structure_version(self):
+        response = self.client.get(self.url)
+        self.assertContains(response, 'Иванов Иван Иванович - Слесарь')
+        self.assertContains(
+            response, f'href="{reverse("directory:documents:document_selection", args=[self.employee.pk])}"'
+        )
+        self.assertContains(
+            response, f'href="{reverse("directory:siz:siz_personal_card", args=[self.employee.pk])}"'
+        )
+
+        # update() не отправляет сигналов - отдел отдаётся из кэша
+        Employee.objects.filter(pk=self.employee.pk).update(full_name_nominative='Сидоров Сидор Сидорович')
+        self.assertContains(self.client.get(self.url), 'Иванов Иван Иванович - Слесарь')
+
+        # Сохранение сотрудника меняет версию структуры - фрагмент отдела строится заново
+        self.employee.full_name_nominative = 'Петров Петр Петрович'
+        self.employee.save()
+        response = self.client.get(self.url)
+        self.assertContains(response, 'Петров Петр Петрович - Слесарь')
+        self.assertNotContains(response, 'Иванов Иван Иванович')
@@ -0,0 +1,164 @@
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from io import BytesIO
+from unittest import mock
+
+import openpyxl
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from deadline_control.models import Equipment
+from directory.models import Employee, ImportJob, Organization, Position
+from directory.services import import_jobs
+from directory.services.import_jobs import (
+    cancel_import_job,
+    confirm_import_job,
+    create_import_job,
+    expire_import_jobs,
+    resume_import_job,
+    run_import_job,
+)
+from directory.tests.test_bulk_import import ORG, make_datasets
+
+MEDIA_ROOT = tempfile.mkdtemp()
+PRIVATE_MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def make_upload(datasets, drop_org_column=False):
+    """xlsx-файл с листами глобального импорта"""
+    workbook = openpyxl.Workbook()
+    workbook.remove(workbook.active)
+    for sheet_name, dataset in datasets.items():
+        sheet = workbook.create_sheet(sheet_name)
+        headers = list(dataset.headers)
+        skip = headers.index('org_short_name_ru') if drop_org_column else None
+        sheet.append([h for i, h in enumerate(headers) if i != skip])
+        for row in dataset:
+            sheet.append([v for i, v in enumerate(row) if i != skip])
+    output = BytesIO()
+    workbook.save(output)
+    return SimpleUploadedFile('import.xlsx', output.getvalue())
+
+
+@override_settings(
+    MEDIA_ROOT=MEDIA_ROOT,
+    PRIVATE_MEDIA_ROOT=PRIVATE_MEDIA_ROOT,
+    IMPORT_JOBS_RUN_IN_THREAD=False,
+    IMPORT_STAGE_CHUNK_SIZE=25,
+    IMPORT_COMMIT_CHUNK_SIZE=15,
+)
+class ImportJobTests(TestCase):
+    """Фоновый импорт: staging -> проверка -> подтверждение -> импорт пачками"""
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        shutil.rmtree(PRIVATE_MEDIA_ROOT, ignore_errors=True)
+
+    def test_stage_validate_and_commit(self):
+        organization = Organization.objects.create(
+            short_name_ru=ORG, full_name_ru=ORG, short_name_by=ORG, full_name_by=ORG, location='г. Минск'
+        )
+        job = create_import_job(make_upload(make_datasets(40), drop_org_column=True), organization=organization)
+        file_path = job.file.path
+        # Файл - вне MEDIA_ROOT (не отдаётся по MEDIA_URL) и под случайным именем
+        self.assertTrue(file_path.startswith(os.path.abspath(PRIVATE_MEDIA_ROOT)))
+        self.assertNotIn('import', os.path.basename(file_path))
+        self.assertTrue(file_path.endswith('.xlsx'))
+
+        job = run_import_job(job.pk)
+        self.assertEqual(job.status, ImportJob.STATUS_VALIDATED, job.error_message)
+        self.assertEqual(job.total_rows, 120)
+        self.assertEqual(job.sheets['Сотрудники'][0], 'org_short_name_ru')
+        self.assertTrue(job.preview['ready_for_import'], job.preview)
+        # Проверка ничего не сохраняет
+        self.assertFalse(Employee.objects.exists())
+
+        confirm_import_job(job)
+        job = run_import_job(job.pk)
+        self.assertEqual(job.status, ImportJob.STATUS_DONE, job.error_message)
+        self.assertTrue(job.result['success'], job.result)
+        self.assertEqual(job.commit_cursor, {'Структура': 40, 'Сотрудники': 40, 'Оборудование': 40})
+        self.assertEqual(Position.objects.filter(organization=organization).count(), 30)
+        self.assertEqual(Employee.objects.filter(organization=organization).count(), 40)
+        self.assertEqual(Equipment.objects.filter(organization=organization).count(), 40)
+        self.assertFalse(job.rows.exists())
+        # Файл после импорта удаляется
+        self.assertFalse(os.path.exists(file_path))
+        self.assertFalse(ImportJob.objects.get(pk=job.pk).file)
+
+    def test_cancel_deletes_staging_and_file(self):
+        job = run_import_job(create_import_job(make_upload(make_datasets(5))).pk)
+        file_path = job.file.path
+        self.assertTrue(job.rows.exists())
+
+        cancel_import_job(job)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, ImportJob.STATUS_CANCELLED)
+        self.assertFalse(job.rows.exists())
+        self.assertFalse(job.file)
+        self.assertFalse(os.path.exists(file_path))
+        with self.assertRaises(ValidationError):
+            confirm_import_job(job)
+        with self.assertRaises(ValidationError):
+            cancel_import_job(job)
+
+    def test_expire_cancels_abandoned_jobs(self):
+        abandoned = run_import_job(create_import_job(make_upload(make_datasets(5))).pk)
+        fresh = run_import_job(create_import_job(make_upload(make_datasets(5))).pk)
+        file_path = abandoned.file.path
+        ImportJob.objects.filter(pk=abandoned.pk).update(updated_at=timezone.now() - timedelta(days=8))
+
+        self.assertEqual(expire_import_jobs(), 1)
+
+        abandoned.refresh_from_db()
+        self.assertEqual(abandoned.status, ImportJob.STATUS_CANCELLED)
+        self.assertFalse(abandoned.rows.exists())
+        self.assertFalse(os.path.exists(file_path))
+        fresh.refresh_from_db()
+        self.assertEqual(fresh.status, ImportJob.STATUS_VALIDATED)
+        self.assertTrue(fresh.file)
+
+    def test_resume_after_failure_continues_from_cursor(self):
+        job = create_import_job(make_upload(make_datasets(40)))
+        job = run_import_job(job.pk)
+        file_path = job.file.path
+        confirm_import_job(job)
+
+        # Сбой на второй пачке сотрудников (после трёх пачек структуры и первой пачки сотрудников)
+        original = import_jobs._summarize_commit
+        calls = []
+
+        def failing_summarize(sheet_results):
+            calls.append(1)
+            if len(calls) == 5:
+                raise RuntimeError('Обрыв соединения')
+            return original(sheet_results)
+
+        with mock.patch.object(import_jobs, '_summarize_commit', failing_summarize):
+            job = run_import_job(job.pk)
+        self.assertEqual(job.status, ImportJob.STATUS_FAILED)
+        self.assertIn('Обрыв соединения', job.error_message)
+        job.refresh_from_db()
+        self.assertEqual(job.commit_cursor, {'Структура': 40, 'Сотрудники': 15})
+        self.assertEqual(Employee.objects.count(), 15)
+        # Файл удаляется и при ошибке: продолжение идёт по строкам staging
+        self.assertFalse(job.file)
+        self.assertFalse(os.path.exists(file_path))
+
+        with self.assertRaises(ValidationError):
+            confirm_import_job(job)
+
+        resume_import_job(job)
+        job = run_import_job(job.pk)
+        self.assertEqual(job.status, ImportJob.STATUS_DONE, job.error_message)
+        self.assertEqual(Employee.objects.count(), 40)
+        self.assertEqual(Equipment.objects.count(), 40)
+        created = {sheet['sheet_name']: sheet['created'] for sheet in job.result['sheets']}
+        self.assertEqual(created['Сотрудники'], 40)
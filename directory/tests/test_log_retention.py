@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from deadline_control.models import (
+    MedicalNotificationSendDetail,
+    MedicalNotificationSendLog,
+    SendLogMonthlySummary,
+)
+from deadline_control.services import SendLogRetention
+from directory.models import Organization
+
+
+@override_settings(MEDICAL_SEND_LOG_TTL_DAYS=180, LOG_ADMIN_DEFAULT_DAYS=30)
+class SendLogRetentionTests(TestCase):
+    """Старые логи сворачиваются в месячные сводки и удаляются пачками"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.now = timezone.make_aware(datetime(2026, 10, 15, 12, 0))
+        cls.org = Organization.objects.create(
+            short_name_ru='ООО "Альфа"', full_name_ru='ООО "Альфа"',
+            short_name_by='ООО "Альфа"', full_name_by='ООО "Альфа"', location='г. Минск',
+        )
+
+        def make_log(created_at, status, successful, failed, expired, details=0):
+            log = MedicalNotificationSendLog.objects.create(
+                organization=cls.org, status=status, successful_count=successful,
+                failed_count=failed, expired_count=expired,
+            )
+            for _ in range(details):
+                MedicalNotificationSendDetail.objects.create(send_log=log, status='success')
+            MedicalNotificationSendLog.objects.filter(pk=log.pk).update(created_at=created_at)
+            return log
+
+        january = timezone.make_aware(datetime(2026, 1, 10, 9, 0))
+        make_log(january, 'completed', 2, 0, 5, details=2)
+        make_log(january + timedelta(days=5), 'partial', 1, 1, 3, details=1)
+        make_log(timezone.make_aware(datetime(2026, 2, 3, 9, 0)), 'completed', 1, 0, 0)
+        cls.recent = make_log(cls.now - timedelta(days=10), 'completed', 1, 0, 1, details=1)
+        cls.old_month = make_log(cls.now - timedelta(days=60), 'completed', 1, 0, 0)
+
+    def test_purge_rolls_up_statistics(self):
+        retention = SendLogRetention(batch_size=2, now=self.now)
+        self.assertEqual(retention.pending('medical'), 3)
+
+        result = retention.purge('medical')
+        self.assertEqual(result, {'deleted': 3, 'details': 3, 'batches': 2})
+        self.assertEqual(
+            set(MedicalNotificationSendLog.objects.values_list('pk', flat=True)),
+            {self.recent.pk, self.old_month.pk},
+        )
+        self.assertEqual(MedicalNotificationSendDetail.objects.count(), 1)
+
+        january = SendLogMonthlySummary.objects.get(log_type='medical', month=datetime(2026, 1, 1).date())
+        self.assertEqual(january.organization, self.org)
+        self.assertEqual(
+            (january.runs_count, january.successful_count, january.failed_count, january.details_count),
+            (2, 3, 1, 3),
+        )
+        self.assertEqual(january.status_counts, {'completed': 1, 'partial': 1})
+        self.assertEqual(january.extra['expired_count'], 8)
+        self.assertEqual(SendLogMonthlySummary.objects.count(), 2)
+
+        # Повторный запуск ничего не удаляет и не удваивает сводки
+        self.assertEqual(retention.purge('medical')['deleted'], 0)
+        self.assertEqual(SendLogMonthlySummary.objects.get(pk=january.pk).runs_count, 2)
+
+    def test_command_dry_run_and_unlimited_types(self):
+        out = StringIO()
+        call_command('purge_send_logs', '--type', 'medical', '--dry-run', stdout=out)
+        self.assertIn('medical: старше', out.getvalue())
+        self.assertEqual(MedicalNotificationSendLog.objects.count(), 5)
+
+        with override_settings(MEDICAL_SEND_LOG_TTL_DAYS=0):
+            self.assertIsNone(SendLogRetention().cutoff('medical'))
+            self.assertEqual(SendLogRetention().purge('medical')['deleted'], 0)
+
+    def test_admin_changelist_defaults_to_recent_period(self):
+        self.client.force_login(User.objects.create_superuser(username='admin', password='testpass123'))
+        url = reverse('admin:deadline_control_medicalnotificationsendlog_changelist')
+
+        response = self.client.get(url)
+        self.assertEqual(list(response.context['cl'].result_list), [self.recent])
+
+        response = self.client.get(url, {'period': 'all'})
+        self.assertEqual(response.context['cl'].result_count, 5)
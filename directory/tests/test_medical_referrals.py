@@ -0,0 +1,101 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+from datetime import date
+
+import docx
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from deadline_control.models import (
+    HarmfulFactor,
+    MedicalExaminationNorm,
+    MedicalReferral,
+    PositionMedicalFactor,
+)
+from deadline_control.services import MedicalReferralBatch
+from directory.models import Employee, Organization, Position
+
+
+class MedicalReferralBatchTests(TestCase):
+    """Пакетная выдача направлений: один шаблон, bulk_create, ZIP или общий DOCX"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'pass')
+        cls.org = Organization.objects.create(
+            short_name_ru='ООО "Альфа"', full_name_ru='ООО "Альфа"',
+            short_name_by='ООО "Альфа"', full_name_by='ООО "Альфа"', location='г. Минск',
+        )
+        noise = HarmfulFactor.objects.create(short_name='4.2', full_name='Шум', periodicity=24)
+        dust = HarmfulFactor.objects.create(short_name='1.1', full_name='Пыль', periodicity=12)
+        MedicalExaminationNorm.objects.create(position_name='Слесарь', harmful_factor=noise)
+
+        fitter = Position.objects.create(position_name='Слесарь', organization=cls.org)
+        welder = Position.objects.create(position_name='Сварщик', organization=cls.org)
+        PositionMedicalFactor.objects.create(position=welder, harmful_factor=dust)
+
+        def employee(name, position, **kwargs):
+            defaults = {'date_of_birth': date(1990, 5, 1), 'place_of_residence': 'г. Минск'}
+            return Employee.objects.create(
+                full_name_nominative=name, organization=cls.org, position=position, **{**defaults, **kwargs}
+            )
+
+        cls.fitter = employee('Иванов Иван Иванович', fitter)
+        cls.welder = employee('Петров Пётр Петрович', welder)
+        cls.no_birth_date = employee('Сидоров Сидор Сидорович', fitter, date_of_birth=None)
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        etalon_dir = os.path.join(self.media_root, 'document_templates', 'etalon')
+        os.makedirs(etalon_dir)
+        document = docx.Document()
+        document.add_paragraph('{{ full_name }} - {{ position_name }}: {{ harmful_factors }}')
+        document.save(os.path.join(etalon_dir, 'napravlenie_blank.docx'))
+
+        media_override = override_settings(MEDIA_ROOT=self.media_root)
+        media_override.enable()
+        self.addCleanup(media_override.disable)
+        self.ids = [self.fitter.pk, self.welder.pk, self.no_birth_date.pk]
+
+    def test_zip_with_bulk_created_referrals(self):
+        # Число запросов не зависит от числа сотрудников: выборка с префетчем факторов,
+        # настройки организации, эталонные нормы, два bulk_create и bulk_update
+        with self.assertNumQueries(13):
+            result = MedicalReferralBatch(self.user, output='zip').generate(self.ids)
+
+        self.assertEqual([employee for employee, _ in result['skipped']], [self.no_birth_date])
+        referrals = MedicalReferral.objects.prefetch_related('harmful_factors').order_by('employee__full_name_nominative')
+        self.assertEqual(
+            [(r.employee_id, [f.full_name for f in r.harmful_factors.all()]) for r in referrals],
+            [(self.fitter.pk, ['Шум']), (self.welder.pk, ['Пыль'])],
+        )
+        self.assertTrue(all(os.path.exists(r.document.path) for r in referrals))
+
+        with zipfile.ZipFile(io.BytesIO(result['content'])) as archive:
+            texts = sorted(
+                docx.Document(io.BytesIO(archive.read(name))).paragraphs[0].text for name in archive.namelist()
+            )
+        self.assertEqual(texts, ['Иванов Иван Иванович - Слесарь: Шум', 'Петров Пётр Петрович - Сварщик: Пыль'])
+
+    def test_merged_docx_endpoint(self):
+        self.client.force_login(self.user)
+        response = self.client.post(
+            reverse('deadline_control:medical:referral_bulk'),
+            data=json.dumps({'employee_ids': self.ids, 'format': 'docx'}),
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Referrals-Created'], '2')
+        self.assertEqual(response['X-Referrals-Skipped'], '1')
+
+        paragraphs = [p.text for p in docx.Document(io.BytesIO(response.content)).paragraphs if p.text]
+        self.assertEqual(paragraphs, [
+            'Иванов Иван Иванович - Слесарь: Шум',
+            'Петров Пётр Петрович - Сварщик: Пыль',
+        ])
@@ -0,0 +1,76 @@
+from datetime import date, timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from deadline_control.models import EmployeeMedicalExamination, HarmfulFactor, MedicalSettings, MedicalStatusRun
+from deadline_control.services import MedicalStatusRecalculator
+from directory.models import Employee, Organization, Position
+
+# save() считает статус от текущей даты, поэтому и пересчёт идёт от неё
+DAY_ONE = timezone.now().date()
+DAY_TWO = DAY_ONE + timedelta(days=1)
+
+
+class MedicalStatusRecalculatorTests(TestCase):
+    """Инкрементальный пересчёт статусов: только пересёкшие границу и изменённые записи"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.org = Organization.objects.create(
+            short_name_ru='ООО "Альфа"', full_name_ru='ООО "Альфа"',
+            short_name_by='ООО "Альфа"', full_name_by='ООО "Альфа"', location='г. Минск',
+        )
+        MedicalSettings.objects.create(organization=cls.org, days_before_issue=30)
+        position = Position.objects.create(position_name='Слесарь', organization=cls.org)
+        cls.employee = Employee.objects.create(full_name_nominative='Иванов Иван', organization=cls.org, position=position)
+        factor = HarmfulFactor.objects.create(short_name='4.2', full_name='Шум', periodicity=24)
+
+        def exam(next_date):
+            return EmployeeMedicalExamination.objects.create(
+                employee=cls.employee, harmful_factor=factor, date_completed=date(2025, 1, 1), next_date=next_date,
+            )
+
+        cls.becomes_expired = exam(DAY_ONE)
+        cls.enters_window = exam(DAY_TWO + timedelta(days=30))
+        cls.mid_window = exam(DAY_TWO + timedelta(days=45))
+        cls.far = [exam(DAY_TWO + timedelta(days=200 + idx)) for idx in range(5)]
+        EmployeeMedicalExamination.objects.update(status='completed')
+
+    def statuses(self):
+        return dict(EmployeeMedicalExamination.objects.values_list('pk', 'status'))
+
+    def test_incremental_run_touches_only_crossed_and_changed_rows(self):
+        first = MedicalStatusRecalculator(today=DAY_ONE).run(full=True)
+        self.assertEqual((first.mode, first.scanned_count), ('full', 0))
+
+        # Изменена после прошлого запуска: новая дата сразу внутри окна "к выдаче"
+        edited = self.far[0]
+        edited.next_date = DAY_TWO + timedelta(days=10)
+        edited.save()
+
+        run = MedicalStatusRecalculator(today=DAY_TWO, chunk_size=1).run()
+
+        self.assertEqual(run.mode, 'incremental')
+        self.assertEqual(run.previous_run, first)
+        self.assertEqual(run.scanned_count, 3)
+        self.assertEqual((run.expired_updated, run.to_issue_updated), (1, 2))
+        statuses = self.statuses()
+        self.assertEqual(statuses[self.becomes_expired.pk], 'expired')
+        self.assertEqual(statuses[self.enters_window.pk], 'to_issue')
+        self.assertEqual(statuses[edited.pk], 'to_issue')
+        self.assertEqual(statuses[self.mid_window.pk], 'completed')
+
+        # Полный пересчёт на тот же день ничего не находит - результаты совпадают
+        self.assertEqual(MedicalStatusRecalculator(today=DAY_TWO).recalculate()['scanned_count'], 0)
+
+    def test_changed_window_rescans_organization(self):
+        MedicalStatusRecalculator(today=DAY_ONE).run(full=True)
+        MedicalSettings.objects.filter(organization=self.org).update(days_before_issue=60)
+
+        run = MedicalStatusRecalculator(today=DAY_TWO).run()
+
+        self.assertEqual(run.windows, {str(self.org.pk): 60})
+        self.assertEqual(run.to_issue_updated, 2)
+        self.assertEqual(self.statuses()[self.mid_window.pk], 'to_issue')
+        self.assertEqual(MedicalStatusRun.objects.filter(status='success').count(), 2)
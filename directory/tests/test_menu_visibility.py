@@ -0,0 +1,60 @@
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.cache import cache
+from django.template import Context, Template
+from django.test import RequestFactory, TestCase
+
+from directory.models import MenuItem
+from directory.services import MenuVisibility
+
+
+class MenuVisibilityTests(TestCase):
+    """Видимые пункты меню - один раз на пользователя, из кэша без запросов, сброс по версии"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employees = MenuItem.objects.create(name='Сотрудники', url_name='directory:employee_home', order=1)
+        cls.dashboard = MenuItem.objects.create(
+            name='Сроки', url_name='deadline_control:dashboard', order=2, location='top',
+        )
+        cls.public = MenuItem.objects.create(name='Справка', url='/help/', order=3, requires_auth=False)
+        MenuItem.objects.create(name='Архив', url_name='directory:archive', is_active=False)
+        cls.user = User.objects.create_user('restricted')
+        cls.user.profile.visible_menu_items.add(cls.employees)
+
+    def setUp(self):
+        cache.clear()
+
+    def fresh_user(self):
+        # Новый объект на каждый HTTP-запрос - снимок не запомнен на нём
+        return User.objects.get(pk=self.user.pk)
+
+    def render_sidebar(self, user):
+        request = RequestFactory().get('/')
+        request.user = user
+        return Template(
+            "{% load menu_tags %}"
+            "{% get_visible_menu_items 'both' as items %}{% for item in items %}{{ item.name }};{% endfor %}"
+            "{% check_url_visibility user 'deadline_control:dashboard' as show_dashboard %}{{ show_dashboard }};"
+            "{% check_url_visibility user 'directory:quiz:quiz_list' as show_quiz %}{{ show_quiz }}"
+        ).render(Context({'request': request, 'user': user}))
+
+    def test_cache_hit_renders_without_queries(self):
+        self.assertEqual(self.render_sidebar(self.fresh_user()), 'Сотрудники;False;True')
+
+        user = self.fresh_user()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.render_sidebar(user), 'Сотрудники;False;True')
+
+        self.assertEqual(
+            [item.name for item in MenuVisibility.for_user(AnonymousUser()).items_for('sidebar')], ['Справка'],
+        )
+
+    def test_profile_and_menu_changes_bump_version(self):
+        self.render_sidebar(self.fresh_user())
+
+        self.user.profile.visible_menu_items.add(self.dashboard)
+        self.assertEqual(self.render_sidebar(self.fresh_user()), 'Сотрудники;Сроки;True;True')
+
+        self.employees.is_active = False
+        self.employees.save()
+        self.assertEqual(self.render_sidebar(self.fresh_user()), 'Сроки;True;True')
@@ -0,0 +1,78 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from directory.models import (
+    Commission, CommissionMember, Department, Employee, Organization, Position, StructuralSubdivision,
+)
+from directory.services.org_structure import OrgStructureResolver
+from directory.utils.commission_service import find_appropriate_commission
+from directory.views.documents.utils import get_commission_members, get_document_signer, get_internship_leader
+
+
+class OrgStructureResolverTests(TestCase):
+    """Подписант, руководитель стажировки и комиссия - ближайший уровень из кэшированного снимка"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.org = Organization.objects.create(
+            short_name_ru='ООО "Альфа"', full_name_ru='ООО "Альфа"',
+            short_name_by='ТАА "Альфа"', full_name_by='ТАА "Альфа"', location='г. Минск',
+        )
+        cls.subdivision = StructuralSubdivision.objects.create(name='Цех №1', organization=cls.org)
+        cls.department = Department.objects.create(
+            name='Участок сборки', organization=cls.org, subdivision=cls.subdivision
+        )
+
+        director = Position.objects.create(position_name='Директор', organization=cls.org, can_sign_orders=True)
+        master = Position.objects.create(
+            position_name='Мастер', organization=cls.org, subdivision=cls.subdivision,
+            department=cls.department, can_be_internship_leader=True,
+        )
+        worker = Position.objects.create(
+            position_name='Слесарь', organization=cls.org, subdivision=cls.subdivision, department=cls.department
+        )
+        cls.director = cls.employee('Петров Петр Петрович', director)
+        cls.master = cls.employee('Сидоров Сидор Сидорович', master, cls.subdivision, cls.department)
+        cls.worker = cls.employee('Иванов Иван Иванович', worker, cls.subdivision, cls.department)
+
+        cls.commission = Commission.objects.create(name='Комиссия по ОТ', commission_type='ot', organization=cls.org)
+        for employee, role in ((cls.director, 'chairman'), (cls.master, 'member'), (cls.worker, 'secretary')):
+            CommissionMember.objects.create(commission=cls.commission, employee=employee, role=role)
+
+    @classmethod
+    def employee(cls, name, position, subdivision=None, department=None):
+        return Employee.objects.create(
+            full_name_nominative=name, organization=cls.org, subdivision=subdivision,
+            department=department, position=position,
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_nearest_level_and_cached_snapshot(self):
+        self.assertEqual(get_document_signer(self.worker), (self.director, 'organization', True))
+        self.assertEqual(get_internship_leader(self.worker), (self.master, 'department', True))
+        # Сам сотрудник руководителем своей стажировки не бывает
+        self.assertEqual(get_internship_leader(self.master), (None, None, False))
+
+        with self.assertNumQueries(0):
+            resolver = OrgStructureResolver()
+            self.assertEqual(find_appropriate_commission(self.worker, resolver=resolver), self.commission)
+            members, success = get_commission_members(self.worker, resolver=resolver)
+        self.assertTrue(success)
+        self.assertEqual(
+            [member['role'] for member in members],
+            ['Председатель комиссии', 'Член комиссии', 'Секретарь комиссии'],
+        )
+
+    def test_structure_change_invalidates_snapshot(self):
+        OrgStructureResolver().snapshot(self.org.pk)
+
+        workshop_commission = Commission.objects.create(
+            name='Комиссия цеха', commission_type='ot', organization=self.org, subdivision=self.subdivision
+        )
+        self.assertEqual(find_appropriate_commission(self.worker), workshop_commission)
+
+        self.master.position.can_sign_orders = True
+        self.master.position.save()
+        self.assertEqual(get_document_signer(self.worker), (self.master, 'department', True))
@@ -0,0 +1,72 @@
+from django.contrib.auth.models import User
+from django.test import RequestFactory, TestCase
+
+from directory.models import Department, Employee, Organization, Position, StructuralSubdivision
+from directory.utils.permissions import AccessControlHelper
+
+
+class AccessScopeFilterTests(TestCase):
+    """Фильтр прав: плоские списки ID, одно условие без подзапросов, прежняя логика иерархии"""
+
+    @classmethod
+    def setUpTestData(cls):
+        def organization(name):
+            return Organization.objects.create(
+                short_name_ru=name, full_name_ru=name, short_name_by=name, full_name_by=name,
+            )
+
+        cls.org_a, cls.org_b, cls.org_c = organization('А'), organization('Б'), organization('В')
+        cls.subdiv_b = StructuralSubdivision.objects.create(name='Цех Б', organization=cls.org_b)
+        cls.other_subdiv_b = StructuralSubdivision.objects.create(name='Склад Б', organization=cls.org_b)
+        cls.subdiv_c = StructuralSubdivision.objects.create(name='Цех В', organization=cls.org_c)
+        cls.dept_c = Department.objects.create(name='Участок 1', organization=cls.org_c, subdivision=cls.subdiv_c)
+        cls.other_dept_c = Department.objects.create(name='Участок 2', organization=cls.org_c, subdivision=cls.subdiv_c)
+
+        def employee(name, org, subdivision=None, department=None):
+            position = Position.objects.create(position_name=f'Должность {name}', organization=org)
+            return Employee.objects.create(
+                full_name_nominative=name, organization=org, subdivision=subdivision,
+                department=department, position=position,
+            )
+
+        cls.employees = {
+            'org_a': employee('Организация А', cls.org_a),
+            'subdiv_b': employee('Цех Б', cls.org_b, cls.subdiv_b),
+            'other_subdiv_b': employee('Склад Б', cls.org_b, cls.other_subdiv_b),
+            'org_b': employee('Организация Б', cls.org_b),
+            'dept_c': employee('Участок 1', cls.org_c, cls.subdiv_c, cls.dept_c),
+            'other_dept_c': employee('Участок 2', cls.org_c, cls.subdiv_c, cls.other_dept_c),
+            'subdiv_c': employee('Цех В', cls.org_c, cls.subdiv_c),
+        }
+
+        cls.user = User.objects.create_user('mixed')
+        cls.user.profile.organizations.add(cls.org_a)
+        cls.user.profile.subdivisions.add(cls.subdiv_b)
+        cls.user.profile.departments.add(cls.dept_c)
+
+    def visible(self, user, request=None):
+        queryset = AccessControlHelper.filter_queryset(Employee.objects.all(), user, request)
+        ids = set(queryset.values_list('pk', flat=True))
+        return {key for key, employee in self.employees.items() if employee.pk in ids}
+
+    def test_mixed_scope_keeps_hierarchy_rules(self):
+        request = RequestFactory().get('/')
+        # Закрепления профиля и дочерние подразделения/отделы - два запроса, дальше из кеша запроса
+        with self.assertNumQueries(2):
+            scope = AccessControlHelper.get_scope(self.user, request)
+        with self.assertNumQueries(0):
+            self.assertIs(AccessControlHelper.get_scope(self.user, request), scope)
+
+        self.assertEqual(scope.organization_ids, tuple(sorted([self.org_a.pk, self.org_b.pk, self.org_c.pk])))
+        self.assertEqual(self.visible(self.user, request), {'org_a', 'subdiv_b', 'org_b', 'dept_c', 'subdiv_c'})
+
+        sql = str(AccessControlHelper.filter_queryset(Employee.objects.all(), self.user, request).query)
+        self.assertEqual(sql.count('SELECT'), 1)
+
+    def test_direct_department_user_sees_only_department(self):
+        user = User.objects.create_user('dept')
+        user.profile.departments.add(self.dept_c)
+
+        self.assertEqual(self.visible(user), {'dept_c'})
+        departments = AccessControlHelper.filter_queryset(Department.objects.all(), user)
+        self.assertEqual(list(departments), [self.dept_c])
@@ -0,0 +1,90 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from deadline_control.models import HarmfulFactor, MedicalExaminationNorm, PositionMedicalFactor
+from directory.models import Commission, CommissionMember, Employee, Organization, Position, PositionRequirementProfile
+from directory.models.siz import SIZ, SIZNorm
+from directory.services.position_requirements import get_requirement_profile
+
+
+def make_org(name):
+    return Organization.objects.create(
+        short_name_ru=name, full_name_ru=name, short_name_by=name, full_name_by=name, location='г. Минск'
+    )
+
+
+class PositionRequirementProfileTests(TestCase):
+    """Профиль требований должности пересчитывается сигналами после фиксации транзакции"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.org_a = make_org('ООО "Альфа"')
+        cls.org_b = make_org('ООО "Бета"')
+        cls.siz = SIZ.objects.create(name='Перчатки', unit='пара', wear_period=1)
+        cls.factor = HarmfulFactor.objects.create(short_name='4.1', full_name='Шум', periodicity=12)
+
+    def profile(self, position):
+        return PositionRequirementProfile.objects.get(pk=position.pk)
+
+    def test_reference_norms_update_same_named_positions(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            reference = Position.objects.create(position_name='Слесарь', organization=self.org_a)
+            position = Position.objects.create(
+                position_name='Слесарь', organization=self.org_b,
+                internship_period_days=5, safety_instructions_numbers=' 12, 15 ',
+            )
+        profile = self.profile(position)
+        self.assertTrue(profile.needs_internship)
+        self.assertTrue(profile.has_instructions)
+        self.assertEqual(profile.instruction_numbers, '12, 15')
+        self.assertFalse(profile.needs_siz)
+        self.assertFalse(profile.needs_medical)
+
+        # Нормы эталонной должности и эталонные нормы медосмотра - по названию
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            SIZNorm.objects.create(position=reference, siz=self.siz)
+            MedicalExaminationNorm.objects.create(position_name='Слесарь', harmful_factor=self.factor)
+        self.assertEqual(len(callbacks), 1)
+        profile = self.profile(position)
+        self.assertTrue(profile.has_reference_siz)
+        self.assertFalse(profile.has_custom_siz)
+        self.assertTrue(profile.has_reference_medical)
+        self.assertTrue(self.profile(reference).has_custom_siz)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            PositionMedicalFactor.objects.create(position=position, harmful_factor=self.factor)
+            reference.delete()
+        profile = self.profile(position)
+        self.assertTrue(profile.has_custom_medical)
+        self.assertFalse(profile.has_reference_medical)
+        self.assertFalse(profile.needs_siz)
+
+    def test_commission_roles_and_rebuild_command(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            position = Position.objects.create(position_name='Инженер по ОТ', organization=self.org_a)
+            employee = Employee.objects.create(
+                full_name_nominative='Иванов Иван Иванович', organization=self.org_a, position=position
+            )
+            commission = Commission.objects.create(name='Комиссия по ОТ', commission_type='ot', organization=self.org_a)
+            CommissionMember.objects.create(commission=commission, employee=employee, role='chairman')
+        roles = self.profile(position).commission_roles
+        self.assertEqual(len(roles), 1)
+        self.assertEqual(roles[0]['employee_name'], 'Иванов Иван Иванович')
+
+        # Профиль, потерянный при изменениях в обход сигналов, восстанавливается командой
+        PositionRequirementProfile.objects.all().delete()
+        call_command('rebuild_position_requirements', stdout=StringIO())
+        self.assertTrue(self.profile(position).is_commission_member)
+
+    def test_missing_profile_is_built_on_read(self):
+        position = Position.objects.create(position_name='Токарь', organization=self.org_a, drives_company_vehicle=True,
+                                           company_vehicle_instructions='7')
+        PositionRequirementProfile.objects.filter(pk=position.pk).delete()
+        position = Position.objects.select_related('requirement_profile').get(pk=position.pk)
+        profile = get_requirement_profile(position)
+        self.assertTrue(profile.drives_company_vehicle)
+        self.assertEqual(profile.instruction_numbers, '7')
+        with self.assertNumQueries(0):
+            get_requirement_profile(position)
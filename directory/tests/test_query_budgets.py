@@ -0,0 +1,223 @@
+"""
+Регрессионные тесты количества SQL-запросов для "горячих" страниц.
+
+Каждая страница открывается дважды: на синтетической организации размера N
+и после добавления ещё N сотрудников (со своими медосмотрами, оборудованием
+и ключевыми сроками). Число запросов не должно зависеть от числа сотрудников
+и не должно превышать бюджет из QUERY_BUDGETS.
+
+Структура организации берётся из команды create_test_structure.
+
+Переменные окружения:
+    QUERY_BUDGET_ORG_SIZE - сколько сотрудников добавлять за шаг (по умолчанию 30)
+    QUERY_BUDGET_REPORT   - путь к JSON-отчёту с временем рендера
+                            (по умолчанию отчёт не пишется)
+"""
+import json
+import os
+import time
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from deadline_control.models import (
+    Equipment,
+    EquipmentType,
+    EmployeeMedicalExamination,
+    HarmfulFactor,
+    KeyDeadlineCategory,
+    KeyDeadlineItem,
+    MedicalExaminationNorm,
+)
+from directory.models import (
+    Employee,
+    Organization,
+    Position,
+    Quiz,
+    QuizAccessToken,
+    QuizCategory,
+    Question,
+)
+
+ORG_SIZE = int(os.getenv('QUERY_BUDGET_ORG_SIZE', 30))
+REPORT_PATH = os.getenv('QUERY_BUDGET_REPORT')
+
+# Максимальное число SQL-запросов на страницу (при фиксированной оргструктуре)
+QUERY_BUDGETS = {
+    'home': 37,
+    'dashboard': 38,
+    'medical_list': 30,
+    'equipment_journal': 33,
+    'exam_home': 19,
+    'admin_position_tree': 35,
+}
+
+
+class QueryBudgetTests(TestCase):
+    """Бюджеты SQL-запросов горячих страниц не растут с числом сотрудников"""
+
+    report = {}
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command('create_test_structure', stdout=StringIO())
+        # Профили требований пересчитываются on_commit, а в TestCase фиксации нет
+        call_command('rebuild_position_requirements', stdout=StringIO())
+        cls.org = Organization.objects.get(short_name_ru='ООО "Тестовый Завод"')
+        cls.positions = list(Position.objects.filter(organization=cls.org).select_related('subdivision', 'department'))
+
+        cls.factor = HarmfulFactor.objects.create(short_name='4.1', full_name='Шум', periodicity=12)
+        MedicalExaminationNorm.objects.create(position_name='Слесарь-сборщик', harmful_factor=cls.factor)
+        MedicalExaminationNorm.objects.create(position_name='Токарь', harmful_factor=cls.factor)
+
+        cls.equipment_type, _ = EquipmentType.objects.get_or_create(
+            name='Лестница', defaults={'default_maintenance_period_months': 6}
+        )
+        cls.deadline_category = KeyDeadlineCategory.objects.create(name='Проверка знаний', periodicity_months=12)
+
+        cls.superuser = User.objects.create_superuser(username='perf_admin', password='test123')
+        cls.director = User.objects.get(username='director')
+        cls.director.set_password('test123')
+        cls.director.save()
+
+        category = QuizCategory.objects.create(name='Общие вопросы')
+        cls.quiz = Quiz.objects.create(title='Итоговый экзамен')
+        cls.quiz.categories.add(category)
+        Question.objects.create(category=category, question_text='Вопрос 1')
+        cls.token = QuizAccessToken.objects.create(
+            quiz=cls.quiz,
+            user=cls.director,
+            valid_from=timezone.now() - timedelta(days=1),
+            valid_until=timezone.now() + timedelta(days=1),
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        if not REPORT_PATH:
+            return
+        report_path = Path(REPORT_PATH)
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(report_path, 'w', encoding='utf-8') as report_file:
+            json.dump({
+                'org_size_step': ORG_SIZE,
+                'generated_at': timezone.now().isoformat(),
+                'views': cls.report,
+            }, report_file, ensure_ascii=False, indent=2)
+
+    def seed_employees(self, count):
+        """Добавляет сотрудников по всем должностям вместе с медосмотрами, оборудованием и сроками"""
+        today = timezone.now().date()
+        start = Employee.objects.count()
+        employees = []
+        for index in range(start, start + count):
+            position = self.positions[index % len(self.positions)]
+            employees.append(Employee(
+                full_name_nominative=f'Сотрудник {index:05d} Тестович',
+                organization=self.org,
+                subdivision=position.subdivision,
+                department=position.department,
+                position=position,
+            ))
+        employees = Employee.objects.bulk_create(employees)
+
+        EmployeeMedicalExamination.objects.bulk_create([
+            EmployeeMedicalExamination(
+                employee=employee,
+                harmful_factor=self.factor,
+                date_completed=today - timedelta(days=300 + i % 100),
+                next_date=today + timedelta(days=65 - i % 100),
+                status='completed',
+            )
+            for i, employee in enumerate(employees)
+            if employee.position.position_name in ('Слесарь-сборщик', 'Токарь')
+        ])
+
+        Equipment.objects.bulk_create([
+            Equipment(
+                equipment_name=f'Лестница {employee.pk}',
+                inventory_number=f'PERF-{employee.pk}',
+                equipment_type=self.equipment_type,
+                organization=self.org,
+                subdivision=employee.subdivision,
+                department=employee.department,
+                last_maintenance_date=today - timedelta(days=170 + i % 30),
+                next_maintenance_date=today + timedelta(days=10 - i % 30),
+            )
+            for i, employee in enumerate(employees)
+        ])
+
+        KeyDeadlineItem.objects.bulk_create([
+            KeyDeadlineItem(
+                organization=self.org,
+                category=self.deadline_category,
+                name=f'Мероприятие {employee.pk}',
+                current_date=today - timedelta(days=360),
+                next_date=today + timedelta(days=5 - i % 20),
+            )
+            for i, employee in enumerate(employees)
+        ])
+
+    def measure(self, name, url, user, session=None):
+        """Открывает страницу, возвращает число SQL-запросов и пишет время рендера в отчёт"""
+        # bulk_create не отправляет сигналы, поэтому меряем "холодный" кэш
+        cache.clear()
+        self.client.force_login(user)
+        if session:
+            client_session = self.client.session
+            client_session.update(session)
+            client_session.save()
+
+        with CaptureQueriesContext(connection) as ctx:
+            start = time.perf_counter()
+            response = self.client.get(url)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+
+        self.assertEqual(response.status_code, 200, f'{name}: {url} вернул {response.status_code}')
+        self.report.setdefault(name, []).append({
+            'employees': Employee.objects.count(),
+            'queries': len(ctx.captured_queries),
+            'render_ms': round(elapsed_ms, 1),
+        })
+        return len(ctx.captured_queries)
+
+    def assert_budget(self, name, url, user, session=None):
+        self.seed_employees(ORG_SIZE)
+        small = self.measure(name, url, user, session)
+        self.seed_employees(ORG_SIZE)
+        large = self.measure(name, url, user, session)
+
+        self.assertLessEqual(large, QUERY_BUDGETS[name], f'{name}: {large} запросов, бюджет {QUERY_BUDGETS[name]}')
+        self.assertEqual(
+            small, large,
+            f'{name}: число запросов растёт с числом сотрудников ({small} → {large})'
+        )
+
+    def test_home_page(self):
+        self.assert_budget('home', reverse('directory:employee_home') + f'?org={self.org.pk}', self.director)
+
+    def test_dashboard(self):
+        self.assert_budget('dashboard', reverse('deadline_control:dashboard'), self.director)
+
+    def test_medical_list(self):
+        self.assert_budget('medical_list', reverse('deadline_control:medical:list'), self.director)
+
+    def test_equipment_journal(self):
+        url = reverse('deadline_control:equipment:journal') + f'?equipment_type={self.equipment_type.pk}'
+        self.assert_budget('equipment_journal', url, self.director)
+
+    def test_exam_home(self):
+        session = {'quiz_token_mode': True, 'quiz_token_id': self.token.pk}
+        self.assert_budget('exam_home', reverse('directory:quiz:exam_home'), self.director, session)
+
+    def test_admin_position_tree(self):
+        self.assert_budget('admin_position_tree', reverse('admin:directory_position_changelist'), self.superuser)
@@ -0,0 +1,73 @@
+"""
+Запись в таблицу сессий при прохождении экзамена.
+
+Порядок вопросов хранится в QuizQuestionOrder, поэтому ответ на вопрос
+не должен изменять сессию. Тесты проверяют число запросов к django_session
+на один ответ для backends.db и backends.cached_db.
+"""
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from directory.models import Answer, Question, Quiz, QuizAttempt, QuizCategory
+
+
+def session_queries(captured):
+    """Запросы к таблице сессий: (чтения, записи)"""
+    queries = [q['sql'] for q in captured if 'django_session' in q['sql']]
+    writes = [sql for sql in queries if not sql.lstrip().upper().startswith('SELECT')]
+    return len(queries) - len(writes), len(writes)
+
+
+class QuizSessionWritesTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser(username='quiz_admin', password='test123')
+        category = QuizCategory.objects.create(name='Общие вопросы')
+        cls.quiz = Quiz.objects.create(title='Итоговый экзамен')
+        cls.quiz.categories.add(category)
+        for index in range(3):
+            question = Question.objects.create(category=category, question_text=f'Вопрос {index}')
+            Answer.objects.create(question=question, answer_text='Да', is_correct=True)
+            Answer.objects.create(question=question, answer_text='Нет')
+
+    def answer_all(self):
+        """Начинает экзамен и отвечает на все вопросы; возвращает (чтения, записи) сессии на ответ"""
+        cache.clear()
+        self.client.force_login(self.user)
+        self.client.get(reverse('directory:quiz:quiz_start', args=[self.quiz.pk]))
+        attempt = QuizAttempt.objects.get(quiz=self.quiz, user=self.user)
+        self.assertNotIn(f'quiz_questions_{attempt.pk}', self.client.session)
+
+        reads = writes = 0
+        question_ids = list(attempt.question_orders.order_by('order').values_list('question_id', flat=True))
+        for question_id in question_ids:
+            answer = Answer.objects.get(question_id=question_id, is_correct=True)
+            url = reverse('directory:quiz:quiz_answer', args=[attempt.pk, question_id])
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.post(url, {'answer_id': answer.pk})
+            self.assertEqual(response.status_code, 200)
+            answer_reads, answer_writes = session_queries(ctx.captured_queries)
+            reads += answer_reads
+            writes += answer_writes
+
+        attempt.refresh_from_db()
+        self.assertEqual(attempt.status, QuizAttempt.STATUS_COMPLETED)
+        self.assertEqual(attempt.correct_answers, len(question_ids))
+        return reads / len(question_ids), writes / len(question_ids)
+
+    @override_settings(SESSION_ENGINE='django.contrib.sessions.backends.db')
+    def test_db_sessions_are_not_written_per_answer(self):
+        reads, writes = self.answer_all()
+        # Сессия читается один раз на запрос, но не записывается
+        self.assertLessEqual(reads, 1)
+        self.assertEqual(writes, 0)
+
+    @override_settings(SESSION_ENGINE='django.contrib.sessions.backends.cached_db')
+    def test_cached_db_sessions_skip_database(self):
+        reads, writes = self.answer_all()
+        self.assertEqual((reads, writes), (0, 0))
@@ -0,0 +1,60 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from directory.utils.request_metrics import metrics_store, percentile
+
+
+class PercentileTests(TestCase):
+    def test_nearest_rank(self):
+        """Перцентиль методом ближайшего ранга"""
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 95), 95)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([7], 99), 7)
+        self.assertIsNone(percentile([], 50))
+
+
+@override_settings(REQUEST_METRICS_FLUSH_EVERY=1, REQUEST_METRICS_RING_SIZE=3)
+class RequestMetricsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        metrics_store.reset()
+        self.staff = User.objects.create_user(username='staff', password='testpass123', is_staff=True)
+        self.user = User.objects.create_user(username='user', password='testpass123')
+
+    def test_requests_are_grouped_by_view_name(self):
+        """Замеры группируются по имени URL, буфер ограничен RING_SIZE"""
+        self.client.login(username='user', password='testpass123')
+        for _ in range(5):
+            self.client.get(reverse('home'))
+
+        samples = metrics_store.get_samples()
+        self.assertIn('home', samples)
+        self.assertEqual(len(samples['home']), 3)
+
+        row = next(r for r in metrics_store.summarize() if r['view_name'] == 'home')
+        self.assertEqual(row['count'], 3)
+        self.assertGreater(row['max_queries'], 0)
+
+    def test_metrics_page_is_staff_only(self):
+        """Страница метрик доступна только персоналу"""
+        url = reverse('admin:request_metrics')
+
+        self.client.login(username='user', password='testpass123')
+        self.assertEqual(self.client.get(url).status_code, 302)
+
+        self.client.login(username='staff', password='testpass123')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'admin/system/request_metrics.html')
+
+    @override_settings(REQUEST_METRICS_SLOW_MS=0)
+    def test_slow_request_logs_sql(self):
+        """Медленный запрос пишет SQL в лог"""
+        self.client.login(username='user', password='testpass123')
+        with self.assertLogs('directory.request_metrics', level='WARNING') as logs:
+            self.client.get(reverse('home'))
+        self.assertIn('SELECT', '\n'.join(logs.output))
@@ -0,0 +1,56 @@
+from django.test import TestCase
+
+from directory.models import Employee, Organization, Position
+from directory.utils.search import build_search_text, rebuild_search_text, search_queryset
+
+
+class SearchTests(TestCase):
+    """Поиск по нормализованному полю search_text"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.org = Organization.objects.create(
+            full_name_ru='ООО "Поиск"', short_name_ru='Поиск', location='г. Минск'
+        )
+        cls.position = Position.objects.create(position_name='Электрогазосварщик', organization=cls.org)
+        cls.employee = Employee.objects.create(
+            full_name_nominative='Семёнов Пётр Иванович', organization=cls.org, position=cls.position
+        )
+        Employee.objects.create(
+            full_name_nominative='Петров Семён Ильич',
+            organization=cls.org,
+            position=Position.objects.create(position_name='Токарь', organization=cls.org),
+        )
+
+    def test_search_text_is_built_on_save(self):
+        self.assertEqual(
+            self.employee.search_text,
+            'семенов петр иванович semenov petr ivanovich'
+        )
+        self.assertEqual(build_search_text('  Слесарь-ремонтник  '), 'слесарь ремонтник slesar remontnik')
+
+    def test_case_yo_and_transliteration(self):
+        for query in ('СЕМЁНОВ', 'семенов петр', 'semenov', 'иванович семен'):
+            with self.subTest(query=query):
+                names = list(search_queryset(Employee.objects.all(), query).values_list(
+                    'full_name_nominative', flat=True
+                ))
+                self.assertIn('Семёнов Пётр Иванович', names)
+
+    def test_rank_prefers_prefix_match(self):
+        names = list(
+            search_queryset(Employee.objects.all(), 'семен')
+            .order_by('search_rank', 'full_name_nominative')
+            .values_list('full_name_nominative', flat=True)
+        )
+        self.assertEqual(names, ['Семёнов Пётр Иванович', 'Петров Семён Ильич'])
+
+    def test_search_by_position(self):
+        qs = search_queryset(Employee.objects.all(), 'сварщик', fields=('search_text', 'position__search_text'))
+        self.assertEqual(list(qs), [self.employee])
+
+    def test_rebuild_after_queryset_update(self):
+        Position.objects.filter(pk=self.position.pk).update(position_name='Фрезеровщик', search_text='')
+        self.assertEqual(rebuild_search_text(Position.objects.all(), 'position_name'), 1)
+        self.position.refresh_from_db()
+        self.assertEqual(self.position.search_text, 'фрезеровщик frezerovshchik')
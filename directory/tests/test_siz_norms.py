@@ -0,0 +1,73 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from directory.models import Department, Employee, Organization, Position, StructuralSubdivision
+from directory.models.siz import SIZ, SIZNorm
+from directory.services.siz_norms import SIZNormResolver
+
+
+def make_org(name):
+    return Organization.objects.create(
+        short_name_ru=name, full_name_ru=name, short_name_by=name, full_name_by=name, location='г. Минск'
+    )
+
+
+class SIZNormResolverTests(TestCase):
+    """Нормы СИЗ: собственные, эталонные по названию должности, без норм"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.org_a = make_org('ООО "Альфа"')
+        cls.org_b = make_org('ООО "Бета"')
+        cls.subdivision = StructuralSubdivision.objects.create(name='Цех', organization=cls.org_b)
+        cls.department = Department.objects.create(name='Участок', organization=cls.org_b, subdivision=cls.subdivision)
+
+        gloves = SIZ.objects.create(name='Перчатки', unit='пара', wear_period=1)
+        suit = SIZ.objects.create(name='Костюм', unit='шт', wear_period=12)
+
+        # Эталон для «Слесаря» - должность организации, первой по названию
+        cls.reference = Position.objects.create(position_name='Слесарь', organization=cls.org_a)
+        SIZNorm.objects.create(position=cls.reference, siz=gloves)
+        other = Position.objects.create(position_name='Слесарь', organization=cls.org_b)
+        SIZNorm.objects.create(position=other, siz=suit)
+
+        cls.locksmith = Position.objects.create(
+            position_name='Слесарь', organization=cls.org_b,
+            subdivision=cls.subdivision, department=cls.department,
+        )
+        cls.welder = Position.objects.create(
+            position_name='Сварщик', organization=cls.org_b,
+            subdivision=cls.subdivision, department=cls.department,
+        )
+        SIZNorm.objects.create(position=cls.welder, siz=suit, condition='При сварке')
+        cls.clerk = Position.objects.create(
+            position_name='Секретарь', organization=cls.org_b,
+            subdivision=cls.subdivision, department=cls.department,
+        )
+        for index, position in enumerate([cls.locksmith, cls.welder, cls.clerk] * 2):
+            Employee.objects.create(
+                full_name_nominative=f'Сотрудник {index} Тестович', organization=cls.org_b,
+                subdivision=cls.subdivision, department=cls.department, position=position,
+            )
+
+    def test_resolves_own_and_reference_norms_in_two_queries(self):
+        positions = [self.locksmith, self.welder, self.clerk]
+        resolver = SIZNormResolver.for_positions(positions)
+        with self.assertNumQueries(2):
+            self.assertFalse(resolver.has_own_norms(self.locksmith))
+            self.assertTrue(resolver.has_norms(self.locksmith))
+            self.assertFalse(resolver.has_norms(self.clerk))
+            self.assertEqual(resolver.source_position_id(self.locksmith), self.reference.pk)
+            self.assertEqual([n.siz.name for n in resolver.norms_for_position(self.locksmith)], ['Перчатки'])
+            self.assertEqual([n.condition for n in resolver.norms_for_position(self.welder)], ['При сварке'])
+            self.assertEqual(resolver.norms_for_position(self.clerk), [])
+        self.assertEqual(resolver.position_names_with_norms(), {'Слесарь', 'Сварщик'})
+
+    def test_mass_generation_counts_employees_with_norms(self):
+        self.client.force_login(User.objects.create_superuser(username='siz_admin', password='test123'))
+        response = self.client.get(reverse('directory:siz:mass_generation'))
+        self.assertEqual(response.status_code, 200)
+        subdivisions = list(response.context['subdivisions'])
+        self.assertEqual(subdivisions, [self.subdivision])
+        self.assertEqual(subdivisions[0].employees_with_norms_count, 4)
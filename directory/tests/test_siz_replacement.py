@@ -0,0 +1,110 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from deadline_control.services import DeadlineSummaryService
+from directory.models import Employee, Organization, Position, SIZIssued
+from directory.models.siz import SIZ, SIZNorm
+from directory.services import SIZReplacementSchedule
+
+
+def make_org(name):
+    return Organization.objects.create(
+        short_name_ru=name, full_name_ru=name, short_name_by=name, full_name_by=name, location='г. Минск'
+    )
+
+
+class SIZReplacementScheduleTests(TestCase):
+    """Плановая дата замены хранится в next_due_date, выборки - по организации и сроку"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.today = timezone.now().date()
+        cls.org_a = make_org('ООО "Альфа"')
+        cls.org_b = make_org('ООО "Бета"')
+        cls.gloves = SIZ.objects.create(name='Перчатки', unit='пара', wear_period=1)
+        cls.boots = SIZ.objects.create(name='Сапоги', unit='пара', wear_period=0)
+
+        position = Position.objects.create(position_name='Слесарь', organization=cls.org_a)
+        cls.worker = Employee.objects.create(
+            full_name_nominative='Иванов Иван Иванович', organization=cls.org_a, position=position
+        )
+        fired = Employee.objects.create(
+            full_name_nominative='Петров Петр Петрович', organization=cls.org_a, position=position, status='fired'
+        )
+        other = Employee.objects.create(
+            full_name_nominative='Сидоров Сидор Сидорович', organization=cls.org_b,
+            position=Position.objects.create(position_name='Кладовщик', organization=cls.org_b),
+        )
+
+        def issue(employee, days_ago, siz=None, **kwargs):
+            return SIZIssued.objects.create(
+                employee=employee, siz=siz or cls.gloves, issue_date=cls.today - timedelta(days=days_ago), **kwargs
+            )
+
+        # Перчатки: срок носки 1 мес. = 30 дней
+        cls.overdue = issue(cls.worker, 40)
+        cls.upcoming = issue(cls.worker, 20)
+        cls.later = issue(cls.worker, 0)
+        cls.wear_out = issue(cls.worker, 40, siz=cls.boots)  # До износа
+        cls.returned = issue(cls.worker, 40, is_returned=True, return_date=cls.today)
+        issue(fired, 40)
+        cls.other_org = issue(other, 35)
+
+    def test_next_due_date_follows_replacement_and_return(self):
+        self.assertEqual(self.overdue.next_due_date, self.today - timedelta(days=10))
+        self.assertIsNone(self.wear_out.next_due_date)
+        self.assertIsNone(self.returned.next_due_date)
+
+        self.overdue.is_returned = True
+        self.overdue.return_date = self.today
+        self.overdue.save()
+        self.assertIsNone(SIZIssued.objects.get(pk=self.overdue.pk).next_due_date)
+
+        # Изменения в обход save() приводятся в порядок sync_due_dates()
+        SIZIssued.objects.filter(pk=self.upcoming.pk).update(next_due_date=None)
+        SIZIssued.objects.sync_due_dates()
+        self.assertEqual(SIZIssued.objects.get(pk=self.upcoming.pk).next_due_date, self.today + timedelta(days=10))
+
+    def test_due_by_organization(self):
+        schedule = SIZReplacementSchedule(days=14, today=self.today)
+        with self.assertNumQueries(1):
+            due = schedule.by_organization()
+        self.assertEqual(set(due), {self.org_a.pk, self.org_b.pk})
+        self.assertEqual(due[self.org_a.pk]['overdue'], [self.overdue])
+        self.assertEqual(due[self.org_a.pk]['upcoming'], [self.upcoming])
+        self.assertEqual(due[self.org_b.pk]['overdue'], [self.other_org])
+
+        self.assertEqual(schedule.counts(SIZIssued.objects.for_organizations([self.org_a.pk])), {
+            'overdue': 1, 'upcoming': 1,
+        })
+
+    def test_dashboard_summary_section(self):
+        cache.clear()
+        user = User.objects.create_superuser(username='admin', password='testpass123')
+        summary = DeadlineSummaryService(warning_days=14, today=self.today).get_summary(user)
+        self.assertEqual(summary['siz']['total'], 4)
+        self.assertEqual((summary['siz']['overdue_count'], summary['siz']['upcoming_count']), (2, 1))
+        self.assertEqual(summary['siz']['overdue'], [self.overdue, self.other_org])
+
+        self.client.force_login(user)
+        response = self.client.get(reverse('deadline_control:dashboard'))
+        self.assertContains(response, 'Просроченная замена СИЗ (2)')
+        self.assertContains(response, reverse('directory:siz:siz_personal_card', args=[self.worker.pk]))
+
+        # Выдача СИЗ сбрасывает кэш сводки организации
+        SIZIssued.objects.create(employee=self.worker, siz=self.gloves, issue_date=self.today - timedelta(days=25))
+        summary = DeadlineSummaryService(warning_days=14, today=self.today).get_summary(user)
+        self.assertEqual(summary['siz']['upcoming_count'], 2)
+
+    def test_personal_card_uses_position_norms(self):
+        SIZNorm.objects.create(position=self.worker.position, siz=self.gloves)
+        SIZNorm.objects.create(position=self.worker.position, siz=self.boots, condition='При работе в сырости')
+        self.client.force_login(User.objects.create_superuser(username='admin', password='testpass123'))
+        response = self.client.get(reverse('directory:siz:siz_personal_card', args=[self.worker.pk]))
+        self.assertEqual([norm.siz for norm in response.context['base_norms']], [self.gloves])
+        self.assertEqual(response.context['condition_groups'][0]['name'], 'При работе в сырости')
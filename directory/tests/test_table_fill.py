@@ -0,0 +1,57 @@
+from docx import Document
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.oxml.ns import qn
+from docx.shared import Pt
+from django.test import SimpleTestCase
+
+from directory.document_generators.instruction_journal_generator import _fill_instruction_journal_rows
+from directory.document_generators.table_fill import RowTemplate, append_rows
+
+
+class RowTemplateTests(SimpleTestCase):
+    """Строки из прототипа <w:tr> читаются python-docx с тем же текстом и оформлением"""
+
+    def setUp(self):
+        self.table = Document().add_table(rows=1, cols=4)
+
+    def test_rows_keep_text_and_formatting(self):
+        template = RowTemplate(
+            self.table, font_name='Times New Roman', font_size=12, borders=True, cant_split=True,
+            columns={0: {'align': 'center'}, 3: {'size': 9}},
+        )
+        added = append_rows(self.table, template, [['1', 'Иванов И.И.', 'Строка 1\nСтрока 2', 'подпись'], ['2']])
+
+        self.assertEqual(added, 2)
+        self.assertEqual(len(self.table.rows), 3)
+        row = self.table.rows[1]
+        self.assertEqual([cell.text for cell in row.cells], ['1', 'Иванов И.И.', 'Строка 1\nСтрока 2', 'подпись'])
+        self.assertEqual(row.cells[0].paragraphs[0].alignment, WD_ALIGN_PARAGRAPH.CENTER)
+        self.assertIsNone(row.cells[1].paragraphs[0].alignment)
+        run = row.cells[1].paragraphs[0].runs[0]
+        self.assertEqual((run.font.name, run.font.size), ('Times New Roman', Pt(12)))
+        self.assertEqual(row.cells[3].paragraphs[0].runs[0].font.size, Pt(9))
+        self.assertIsNotNone(row._tr.trPr.find(qn('w:cantSplit')))
+        self.assertIsNotNone(row.cells[2]._tc.tcPr.find(qn('w:tcBorders')))
+        self.assertEqual(row.cells[0].width, self.table.columns[0].width)
+
+        # Строки независимы: текст одной не попадает в другую
+        self.assertEqual([cell.text for cell in self.table.rows[2].cells], ['2', '', '', ''])
+
+    def test_instruction_journal_rows(self):
+        table = Document().add_table(rows=1, cols=10)
+        employees = [
+            {'fio_initials': 'Иванов И.И.', 'position_nominative': 'Слесарь', 'instruction_numbers': '1, 2'},
+            {'fio_initials': 'Петров П.П.', 'is_contractor': True, 'GPD': 'Подрядчик'},
+        ]
+        _fill_instruction_journal_rows(table, employees, '01.10.2026', 'Повторный', '')
+
+        self.assertEqual(len(table.rows), 3)
+        first, second = table.rows[1].cells, table.rows[2].cells
+        self.assertEqual(
+            [cell.text for cell in first][:8],
+            ['', '01.10.2026', 'Иванов И.И.', 'Слесарь', 'Повторный', '', '1, 2', 'Фамилия, инициалы руководителя'],
+        )
+        self.assertEqual(second[3].text, 'Подрядчик')
+        self.assertEqual(first[7].paragraphs[0].runs[0].font.size, Pt(10))
+        self.assertEqual(first[8].paragraphs[0].runs[0].font.size, Pt(9))
+        self.assertEqual(first[8].paragraphs[0].alignment, WD_ALIGN_PARAGRAPH.CENTER)
@@ -0,0 +1,35 @@
+from io import StringIO
+
+import openpyxl
+from django.core.management import call_command
+from django.test import TestCase
+
+from directory.models import Organization
+from directory.services.global_import import _export_sheets, export_all_to_file
+from directory.services.xlsx_export import iter_resource_rows
+
+
+class StreamingExportTests(TestCase):
+    """Потоковый экспорт совпадает с выгрузкой через resource.export()"""
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command('create_test_structure', stdout=StringIO())
+        cls.org = Organization.objects.get(short_name_ru='ООО "Тестовый Завод"')
+
+    def test_rows_match_resource_export(self):
+        for sheet_name, resource, queryset in _export_sheets(self.org):
+            with self.subTest(sheet=sheet_name):
+                expected = [list(row) for row in resource.export(queryset=queryset)]
+                self.assertEqual(list(iter_resource_rows(resource, queryset, chunk_size=3)), expected)
+
+    def test_workbook_contains_all_sheets(self):
+        with export_all_to_file(self.org) as output:
+            wb = openpyxl.load_workbook(output, read_only=True)
+            self.assertEqual(wb.sheetnames, ['Структура', 'Сотрудники', 'Оборудование'])
+
+            sheet_name, resource, queryset = _export_sheets(self.org)[0]
+            rows = list(wb[sheet_name].iter_rows(values_only=True))
+            self.assertEqual(list(rows[0]), resource.get_export_headers())
+            self.assertEqual(len(rows) - 1, queryset.count())
+            wb.close()
@@ -8,54 +8,24 @@ from directory.utils.declension import get_initials_before_surname  # Форма
 
 logger = logging.getLogger(__name__)
 
-def find_appropriate_commission(employee: Employee, commission_type: str = "ot") -> Optional[Commission]:
+def find_appropriate_commission(employee: Employee, commission_type: str = "ot", resolver=None) -> Optional[Commission]:
     """
     Находит подходящую комиссию для сотрудника по иерархии:
       1. Отдел (department)
       2. Подразделение (subdivision) без конкретного отдела
       3. Организация (organization), без subdivision/department
-    """
-    # Уровень 1: Ищем комиссию на уровне отдела
-    if employee.department_id:
-        commission = Commission.objects.filter(
-            organization_id=employee.organization_id,
-            subdivision_id=employee.subdivision_id,
-            department_id=employee.department_id,
-            commission_type=commission_type,
-            is_active=True
-        ).first()
-        if commission:
-            logger.debug(f"Найдена комиссия на уровне отдела: {commission}")
-            return commission
-
-    # Уровень 2: Ищем комиссию на уровне подразделения (без отдела)
-    if employee.subdivision_id:
-        commission = Commission.objects.filter(
-            organization_id=employee.organization_id,
-            subdivision_id=employee.subdivision_id,
-            department__isnull=True,
-            commission_type=commission_type,
-            is_active=True
-        ).first()
-        if commission:
-            logger.debug(f"Найдена комиссия на уровне подразделения: {commission}")
-            return commission
 
-    # Уровень 3: Ищем комиссию на уровне организации (без подразделения и отдела)
-    if employee.organization_id:
-        commission = Commission.objects.filter(
-            organization_id=employee.organization_id,
-            subdivision__isnull=True,
-            department__isnull=True,
-            commission_type=commission_type,
-            is_active=True
-        ).first()
-        if commission:
-            logger.debug(f"Найдена комиссия на уровне организации: {commission}")
-            return commission
+    Активные комиссии организации с участниками берутся из кэшированного
+    снимка (OrgStructureResolver), поиск по уровням - в памяти.
+    """
+    from directory.services.org_structure import OrgStructureResolver
 
-    logger.debug("Подходящая комиссия не найдена.")
-    return None
+    commission = (resolver or OrgStructureResolver()).commission(employee, commission_type)
+    if commission:
+        logger.debug(f"Найдена комиссия: {commission}")
+    else:
+        logger.debug("Подходящая комиссия не найдена.")
+    return commission
 
 
 def get_commission_members_formatted(commission: Commission) -> Dict[str, any]:
@@ -70,8 +40,11 @@ def get_commission_members_formatted(commission: Commission) -> Dict[str, any]:
     secretary_data = {}
     members_data = []
 
-    # Загружаем всех участников комиссии
-    for member in commission.members.filter(is_active=True).select_related('employee', 'employee__position'):
+    # Загружаем всех участников комиссии (у комиссий из OrgStructureResolver они уже загружены)
+    members = getattr(commission, 'active_members', None)
+    if members is None:
+        members = commission.members.filter(is_active=True).select_related('employee', 'employee__position')
+    for member in members:
         full_name = member.employee.full_name_nominative or ""
         initials = get_initials_before_surname(full_name)  # Формат "И.О. Фамилия"
         position = member.employee.position.position_name if member.employee.position else ""
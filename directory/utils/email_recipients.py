@@ -7,13 +7,20 @@
 3. EmailSettings.recipient_emails - общие email организации
 
 Все источники работают параллельно, результаты объединяются без дубликатов.
+Для массовых рассылок по всем подразделениям организации -
+collect_recipients_for_organization() (три запроса на организацию).
 """
 import logging
 from typing import List, Optional, Set, Dict
+from django.conf import settings
+from django.core.cache import cache
 from django.db.models import QuerySet
 
 logger = logging.getLogger(__name__)
 
+ORGANIZATION_RECIPIENTS_KEY = 'email_recipients:org:%s:%s'
+NOTIFICATION_TYPES = ('general', 'instruction_journal')
+
 
 def collect_recipients_for_subdivision(
     subdivision: Optional['StructuralSubdivision'],
@@ -82,8 +89,9 @@ def collect_recipients_for_subdivision(
     subdivision_name = subdivision.name if subdivision else "без подразделения"
 
     logger.info(
-        f"🔍 Начинаем сбор получателей для '{subdivision_name}' "
-        f"(организация: {organization.short_name_ru})"
+        "🔍 Начинаем сбор получателей для '%s' "
+        "(организация: %s)",
+        subdivision_name, organization.short_name_ru
     )
 
     # =================================================================
@@ -105,19 +113,22 @@ def collect_recipients_for_subdivision(
                 recipients.update(cleaned_emails)
 
                 logger.info(
-                    f"✅ [Источник 1: SubdivisionEmail] Подразделение '{subdivision.name}': "
-                    f"найдено {count} активных email"
+                    "✅ [Источник 1: SubdivisionEmail] Подразделение '%s': "
+                    "найдено %s активных email",
+                    subdivision.name, count
                 )
-                logger.debug(f"   Адреса: {', '.join(cleaned_emails)}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("   Адреса: %s", ', '.join(cleaned_emails))
             else:
                 logger.debug(
-                    f"ℹ️  [Источник 1: SubdivisionEmail] Подразделение '{subdivision.name}': "
-                    f"email не настроены"
+                    "ℹ️  [Источник 1: SubdivisionEmail] Подразделение '%s': "
+                    "email не настроены",
+                    subdivision.name
                 )
 
         except Exception as e:
             logger.warning(
-                f"⚠️ [Источник 1: SubdivisionEmail] Ошибка получения email для '{subdivision.name}': {e}",
+                "⚠️ [Источник 1: SubdivisionEmail] Ошибка получения email для '%s': %s", subdivision.name, e,
                 exc_info=True
             )
 
@@ -151,22 +162,25 @@ def collect_recipients_for_subdivision(
                 recipients.update(cleaned_emails)
 
                 logger.info(
-                    f"✅ [Источник 2: Employee] Ответственные за ОТ в '{subdivision.name}': "
-                    f"найдено {count} сотрудников с email"
+                    "✅ [Источник 2: Employee] Ответственные за ОТ в '%s': "
+                    "найдено %s сотрудников с email",
+                    subdivision.name, count
                 )
 
                 # Логируем имена для отладки
-                for email, name in responsible_data:
-                    logger.debug(f"   • {name}: {email}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    for email, name in responsible_data:
+                        logger.debug("   • %s: %s", name, email)
             else:
                 logger.debug(
-                    f"ℹ️  [Источник 2: Employee] Ответственные за ОТ в '{subdivision.name}': "
-                    f"не найдены или email не заполнены"
+                    "ℹ️  [Источник 2: Employee] Ответственные за ОТ в '%s': "
+                    "не найдены или email не заполнены",
+                    subdivision.name
                 )
 
         except Exception as e:
             logger.warning(
-                f"⚠️ [Источник 2: Employee] Ошибка получения ответственных за ОТ для '{subdivision.name}': {e}",
+                "⚠️ [Источник 2: Employee] Ошибка получения ответственных за ОТ для '%s': %s", subdivision.name, e,
                 exc_info=True
             )
 
@@ -176,57 +190,10 @@ def collect_recipients_for_subdivision(
         )
 
     # =================================================================
-    # ИСТОЧНИК 3: Email организации (EmailSettings)
+    # ИСТОЧНИК 3: Email организации (EmailSettings, кэшируется)
     # =================================================================
     if include_organization_emails:
-        try:
-            # Получаем настройки email организации
-            email_settings = organization.email_settings
-
-            # Проверяем, активны ли настройки
-            if email_settings.is_active:
-                # Выбираем метод получения получателей в зависимости от типа уведомления
-                if notification_type == 'instruction_journal':
-                    org_emails = email_settings.get_instruction_journal_recipients()
-                    source_name = "EmailSettings (журналы инструктажей)"
-                else:
-                    org_emails = email_settings.get_recipient_list()
-                    source_name = "EmailSettings (общие)"
-
-                count = len(org_emails)
-
-                if count > 0:
-                    # Очищаем и добавляем email
-                    cleaned_emails = _clean_email_list(org_emails)
-                    recipients.update(cleaned_emails)
-
-                    logger.info(
-                        f"✅ [Источник 3: {source_name}] Организация '{organization.short_name_ru}': "
-                        f"найдено {count} email"
-                    )
-                    logger.debug(f"   Адреса: {', '.join(cleaned_emails)}")
-                else:
-                    logger.debug(
-                        f"ℹ️  [Источник 3: {source_name}] Организация '{organization.short_name_ru}': "
-                        f"список получателей пуст"
-                    )
-            else:
-                logger.warning(
-                    f"⚠️ [Источник 3: EmailSettings] EmailSettings для '{organization.short_name_ru}' "
-                    f"отключены (is_active=False)"
-                )
-
-        except organization._meta.model.email_settings.RelatedObjectDoesNotExist:
-            logger.warning(
-                f"⚠️ [Источник 3: EmailSettings] EmailSettings не существует для организации "
-                f"'{organization.short_name_ru}'. Создайте настройки в админке."
-            )
-        except Exception as e:
-            logger.error(
-                f"❌ [Источник 3: EmailSettings] Неожиданная ошибка при получении настроек "
-                f"для '{organization.short_name_ru}': {e}",
-                exc_info=True
-            )
+        recipients.update(get_organization_recipients(organization, notification_type))
 
     # =================================================================
     # ИТОГОВАЯ СТАТИСТИКА
@@ -235,21 +202,155 @@ def collect_recipients_for_subdivision(
 
     if total_count > 0:
         logger.info(
-            f"✅ ИТОГО для '{subdivision_name}': {total_count} уникальных получателей"
+            "✅ ИТОГО для '%s': %s уникальных получателей", subdivision_name, total_count
         )
-        logger.debug(f"   Итоговый список: {', '.join(sorted(recipients))}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("   Итоговый список: %s", ', '.join(sorted(recipients)))
     else:
         logger.warning(
-            f"⚠️ ВНИМАНИЕ: Для '{subdivision_name}' не найдено ни одного получателя! "
-            f"Проверьте настройки:\n"
-            f"   1. SubdivisionEmail (админка → Структурные подразделения)\n"
-            f"   2. Employee.email для ответственных за ОТ\n"
-            f"   3. EmailSettings.recipient_emails (админка → Email Settings)"
+            "⚠️ ВНИМАНИЕ: Для '%s' не найдено ни одного получателя! "
+            "Проверьте настройки:\n"
+            "   1. SubdivisionEmail (админка → Структурные подразделения)\n"
+            "   2. Employee.email для ответственных за ОТ\n"
+            "   3. EmailSettings.recipient_emails (админка → Email Settings)",
+            subdivision_name
         )
 
     return list(recipients)
 
 
+def _load_organization_recipients(organization: 'Organization', notification_type: str) -> List[str]:
+    """Получатели из EmailSettings организации (без кэша)"""
+    try:
+        # Получаем настройки email организации
+        email_settings = organization.email_settings
+
+        # Проверяем, активны ли настройки
+        if not email_settings.is_active:
+            logger.warning(
+                "⚠️ [Источник 3: EmailSettings] EmailSettings для '%s' "
+                "отключены (is_active=False)",
+                organization.short_name_ru
+            )
+            return []
+
+        # Выбираем метод получения получателей в зависимости от типа уведомления
+        if notification_type == 'instruction_journal':
+            org_emails = email_settings.get_instruction_journal_recipients()
+            source_name = "EmailSettings (журналы инструктажей)"
+        else:
+            org_emails = email_settings.get_recipient_list()
+            source_name = "EmailSettings (общие)"
+
+        cleaned_emails = _clean_email_list(org_emails)
+        logger.info(
+            "✅ [Источник 3: %s] Организация '%s': найдено %s email",
+            source_name, organization.short_name_ru, len(cleaned_emails)
+        )
+        return cleaned_emails
+
+    except organization._meta.model.email_settings.RelatedObjectDoesNotExist:
+        logger.warning(
+            "⚠️ [Источник 3: EmailSettings] EmailSettings не существует для организации "
+            "'%s'. Создайте настройки в админке.",
+            organization.short_name_ru
+        )
+    except Exception as e:
+        logger.error(
+            "❌ [Источник 3: EmailSettings] Неожиданная ошибка при получении настроек "
+            "для '%s': %s",
+            organization.short_name_ru, e,
+            exc_info=True
+        )
+    return []
+
+
+def get_organization_recipients(organization: 'Organization', notification_type: str = 'general') -> List[str]:
+    """
+    Получатели из EmailSettings организации для типа уведомления.
+
+    Список кэшируется (EMAIL_RECIPIENTS_CACHE_TIMEOUT секунд) отдельно для
+    каждого типа уведомления и сбрасывается при сохранении EmailSettings
+    (deadline_control/signals.py).
+    """
+    key = ORGANIZATION_RECIPIENTS_KEY % (organization.pk, notification_type)
+    emails = cache.get(key)
+    if emails is None:
+        emails = _load_organization_recipients(organization, notification_type)
+        cache.set(key, emails, getattr(settings, 'EMAIL_RECIPIENTS_CACHE_TIMEOUT', 300))
+    return list(emails)
+
+
+def invalidate_organization_recipients(organization_id: int) -> None:
+    """Сбрасывает кэш получателей организации для всех типов уведомлений"""
+    cache.delete_many([ORGANIZATION_RECIPIENTS_KEY % (organization_id, kind) for kind in NOTIFICATION_TYPES])
+
+
+def collect_recipients_for_organization(
+    organization: 'Organization',
+    subdivisions=None,
+    include_subdivision_emails: bool = True,
+    include_responsible_employees: bool = True,
+    include_organization_emails: bool = True,
+    notification_type: str = 'general'
+) -> Dict[int, List[str]]:
+    """
+    Пакетный вариант collect_recipients_for_subdivision для массовых рассылок.
+
+    Получатели всех подразделений собираются тремя запросами
+    (SubdivisionEmail, ответственные за ОТ, EmailSettings - последний из кэша),
+    а не тремя запросами на каждое подразделение.
+
+    Args:
+        organization: Организация
+        subdivisions: Подразделения (по умолчанию - все подразделения организации)
+        include_*/notification_type: как в collect_recipients_for_subdivision
+
+    Returns:
+        dict: {subdivision_id: [email, ...]} - отсортированные списки без дубликатов
+    """
+    from directory.models import Employee, StructuralSubdivision, SubdivisionEmail
+
+    if subdivisions is None:
+        subdivisions = StructuralSubdivision.objects.filter(organization=organization)
+    subdivision_ids = [subdivision.pk for subdivision in subdivisions]
+    recipients: Dict[int, Set[str]] = {pk: set() for pk in subdivision_ids}
+    if not subdivision_ids:
+        return {}
+
+    # ИСТОЧНИК 1: Email подразделений
+    if include_subdivision_emails:
+        rows = SubdivisionEmail.objects.filter(
+            subdivision_id__in=subdivision_ids, is_active=True
+        ).order_by().values_list('subdivision_id', 'email')
+        for subdivision_id, email in rows:
+            recipients[subdivision_id].update(_clean_email_list([email]))
+
+    # ИСТОЧНИК 2: Ответственные за ОТ
+    if include_responsible_employees:
+        rows = Employee.objects.filter(
+            subdivision_id__in=subdivision_ids,
+            status='active',
+            position__is_responsible_for_safety=True,
+            email__isnull=False
+        ).exclude(email='').order_by().values_list('subdivision_id', 'email')
+        for subdivision_id, email in rows:
+            recipients[subdivision_id].update(_clean_email_list([email]))
+
+    # ИСТОЧНИК 3: Email организации - общий для всех подразделений
+    if include_organization_emails:
+        organization_emails = get_organization_recipients(organization, notification_type)
+        for emails in recipients.values():
+            emails.update(organization_emails)
+
+    empty = [pk for pk, emails in recipients.items() if not emails]
+    logger.info(
+        "📬 Получатели для '%s' (%s): подразделений %s, без получателей %s",
+        organization.short_name_ru, notification_type, len(subdivision_ids), len(empty)
+    )
+    return {pk: sorted(emails) for pk, emails in recipients.items()}
+
+
 def _clean_email_list(emails: List[str]) -> List[str]:
     """
     Очищает список email-адресов от пробелов и приводит к нижнему регистру.
@@ -3,7 +3,6 @@ import csv
 import json
 import datetime
 import openpyxl
-from io import BytesIO
 from django.db import transaction
 from django.http import HttpResponse
 from django.utils import timezone
@@ -27,50 +26,20 @@ def update_medical_examination_statuses():
     1. Для медосмотров, до окончания которых осталось меньше заданного периода - "Нужно выдать направление"
     2. Для просроченных медосмотров - "Просрочен"
 
-    Обрабатывает каждую организацию отдельно с учетом её настроек.
+    Учитывает срок "к выдаче" из настроек каждой организации; организации с
+    одинаковым сроком обрабатываются одним запросом. Полный пересчёт без
+    записи в историю; инкрементальный режим - команда update_medical_statuses.
 
     Returns:
         dict: Информация о количестве обновленных записей
     """
-    from directory.models import Organization
-    today = timezone.now().date()
-
-    to_issue_count = 0
-    expired_count = 0
-
-    # Обрабатываем каждую организацию отдельно
-    for organization in Organization.objects.all():
-        settings = MedicalSettings.get_settings(organization)
-        if not settings:
-            continue
-
-        # Определяем даты для изменения статусов
-        issue_date = today + datetime.timedelta(days=settings.days_before_issue)
-
-        # Находим все медосмотры со статусом "Пройден", у которых срок подходит к концу
-        to_issue_exams = EmployeeMedicalExamination.objects.filter(
-            employee__organization=organization,
-            next_date__lte=issue_date,
-            next_date__gt=today,
-            status='completed'
-        )
-
-        # Меняем статус на "Нужно выдать направление"
-        to_issue_count += to_issue_exams.update(status='to_issue')
-
-        # Находим все просроченные медосмотры
-        expired_exams = EmployeeMedicalExamination.objects.filter(
-            employee__organization=organization,
-            next_date__lt=today,
-            status__in=['completed', 'to_issue']
-        )
+    from deadline_control.services import MedicalStatusRecalculator
 
-        # Меняем статус на "Просрочен"
-        expired_count += expired_exams.update(status='expired')
+    result = MedicalStatusRecalculator().recalculate()
 
     return {
-        'to_issue_updated': to_issue_count,
-        'expired_updated': expired_count,
+        'to_issue_updated': result['to_issue_updated'],
+        'expired_updated': result['expired_updated'],
         'timestamp': timezone.now()
     }
 
@@ -223,12 +192,12 @@ def export_medical_norms(format_type='xlsx', include_headers=True):
 
 
 def export_to_xlsx(norms, include_headers):
-    """Экспорт данных в Excel-файл"""
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Нормы медосмотров"
+    """Экспорт данных в Excel-файл (потоково, openpyxl write_only)"""
+    from directory.services.xlsx_export import (
+        new_workbook, save_to_tempfile, write_sheet, xlsx_file_response
+    )
 
-    # Добавляем заголовки
+    headers = []
     if include_headers:
         headers = [
             'Наименование должности',
@@ -239,44 +208,29 @@ def export_to_xlsx(norms, include_headers):
             'Переопределение периодичности',
             'Примечания'
         ]
-        ws.append(headers)
 
-    # Добавляем данные
-    for norm in norms:
-        row = [
-            norm.position_name,
-            norm.harmful_factor.short_name,
-            norm.harmful_factor.full_name,
-            norm.harmful_factor.examination_type.name,
-            norm.harmful_factor.periodicity,
-            norm.periodicity_override or '',
-            norm.notes
-        ]
-        ws.append(row)
-
-    # Автоматически регулируем ширину столбцов
-    for col in ws.columns:
-        max_length = 0
-        column = col[0].column_letter
-        for cell in col:
-            if cell.value:
-                max_length = max(max_length, len(str(cell.value)))
-        adjusted_width = (max_length + 2)
-        ws.column_dimensions[column].width = adjusted_width
-
-    # Создаем ответ
-    buffer = BytesIO()
-    wb.save(buffer)
-    buffer.seek(0)
+    # Проекция values_list() - без создания объектов моделей
+    rows = (
+        [position_name, short_name, full_name, examination_type, periodicity, periodicity_override or '', notes]
+        for position_name, short_name, full_name, examination_type, periodicity, periodicity_override, notes
+        in norms.values_list(
+            'position_name',
+            'harmful_factor__short_name',
+            'harmful_factor__full_name',
+            'harmful_factor__examination_type__name',
+            'harmful_factor__periodicity',
+            'periodicity_override',
+            'notes',
+        ).iterator(chunk_size=2000)
+    )
+
+    wb = new_workbook()
+    write_sheet(wb, "Нормы медосмотров", headers, rows)
 
     timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
     filename = f"medical_norms_{timestamp}.xlsx"
 
-    response = HttpResponse(buffer.getvalue(),
-                            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-    response['Content-Disposition'] = f'attachment; filename="{filename}"'
-
-    return response
+    return xlsx_file_response(save_to_tempfile(wb), filename)
 
 
 def export_to_csv(norms, include_headers):
@@ -13,9 +13,145 @@
 Оптимизация:
     - Request-level cache (данные кешируются на время HTTP запроса)
     - Оптимизированные запросы (избежание N+1 проблемы)
+    - Область доступа вычисляется один раз в плоские списки ID (AccessScope),
+      фильтры строятся как <поле>_id IN (...) без подзапросов и объединений querysets
 """
+from functools import lru_cache
 
-from django.db.models import Q
+from django.db.models import F, IntegerField, Q, Value
+
+# Уровни закреплений профиля в запросе области доступа
+ORGANIZATION, SUBDIVISION, DEPARTMENT = 0, 1, 2
+
+# Поля области доступа в порядке приоритета: самое конкретное заполненное поле решает
+SCOPE_FIELDS = ('department', 'subdivision', 'organization')
+
+
+@lru_cache(maxsize=None)
+def scope_lookups(model):
+    """
+    Поля области доступа модели: ((поле, lookup), ...) в порядке SCOPE_FIELDS.
+
+    Для внешних ключей lookup - столбец (department_id), чтобы фильтр не
+    требовал JOIN; для прочих полей с тем же именем - само имя.
+    """
+    fields = {field.name: field for field in model._meta.get_fields()}
+    lookups = []
+    for name in SCOPE_FIELDS:
+        field = fields.get(name)
+        if field is None:
+            continue
+        lookups.append((name, field.attname if field.many_to_one and field.concrete else name))
+    return tuple(lookups)
+
+
+class AccessScope:
+    """
+    🔐 Область доступа пользователя в виде плоских списков ID.
+
+    organization_ids / subdivision_ids / department_ids - все доступные
+    организации, подразделения и отделы с учётом иерархии (как в
+    get_accessible_*). Вычисляется не более чем двумя запросами; фильтр
+    для модели собирается один раз и переиспользуется.
+    """
+
+    def __init__(self, organization_ids=(), subdivision_ids=(), department_ids=(), direct_departments_only=False):
+        self.organization_ids = tuple(sorted(organization_ids))
+        self.subdivision_ids = tuple(sorted(subdivision_ids))
+        self.department_ids = tuple(sorted(department_ids))
+        # Закрепление ТОЛЬКО за отделами (без организаций и подразделений)
+        self.direct_departments_only = direct_departments_only
+        self._predicates = {}
+
+    @classmethod
+    def for_profile(cls, profile):
+        """
+        Область доступа профиля: закрепления одним запросом (UNION ALL трёх
+        связей профиля) и дочерние подразделения/отделы ещё одним.
+        """
+        from directory.models import Department, StructuralSubdivision
+
+        def rows(queryset, level, parent_org, parent_sub):
+            # Одинаковый порядок аннотаций - одинаковый порядок столбцов в UNION
+            return queryset.order_by().annotate(
+                level=Value(level), item=F('id'), parent_org=parent_org, parent_sub=parent_sub,
+            ).values_list('level', 'item', 'parent_org', 'parent_sub')
+
+        no_parent = Value(None, output_field=IntegerField())
+        assignments = rows(profile.organizations.all(), ORGANIZATION, F('id'), no_parent).union(
+            rows(profile.subdivisions.all(), SUBDIVISION, F('organization_id'), no_parent),
+            rows(profile.departments.all(), DEPARTMENT, F('organization_id'), F('subdivision_id')),
+            all=True,
+        )
+
+        direct = {ORGANIZATION: set(), SUBDIVISION: set(), DEPARTMENT: set()}
+        # Организации: прямые + родительские для подразделений и отделов
+        organization_ids = set()
+        # Подразделения: прямые + подразделения отделов (+ все подразделения организаций ниже)
+        subdivision_ids = set()
+        for level, item_id, parent_org, parent_sub in assignments:
+            direct[level].add(item_id)
+            organization_ids.add(parent_org)
+            subdivision_ids.add(item_id if level == SUBDIVISION else parent_sub)
+        # Отделы: прямые (+ все отделы организаций и подразделений ниже)
+        department_ids = set(direct[DEPARTMENT])
+
+        direct_orgs, direct_subdivs = direct[ORGANIZATION], direct[SUBDIVISION]
+        if direct_orgs or direct_subdivs:
+            children = rows(
+                StructuralSubdivision.objects.filter(organization_id__in=direct_orgs), SUBDIVISION, no_parent, no_parent,
+            ).union(
+                rows(
+                    Department.objects.filter(Q(organization_id__in=direct_orgs) | Q(subdivision_id__in=direct_subdivs)),
+                    DEPARTMENT, no_parent, no_parent,
+                ),
+                all=True,
+            )
+            for level, item_id, _, _ in children:
+                (subdivision_ids if level == SUBDIVISION else department_ids).add(item_id)
+
+        return cls(
+            organization_ids - {None},
+            subdivision_ids - {None},
+            department_ids,
+            direct_departments_only=bool(direct[DEPARTMENT]) and not direct_orgs and not direct_subdivs,
+        )
+
+    def ids_for(self, field_name):
+        return getattr(self, f'{field_name}_ids')
+
+    def predicate(self, model):
+        """
+        Q-фильтр для модели (None - в модели нет полей области доступа).
+
+        Фильтруем по САМОМУ КОНКРЕТНОМУ заполненному полю:
+        department > subdivision > organization.
+        """
+        if model not in self._predicates:
+            self._predicates[model] = self._compile(model)
+        return self._predicates[model]
+
+    def _compile(self, model):
+        lookups = scope_lookups(model)
+        if not lookups:
+            return None
+
+        if self.direct_departments_only:
+            # Сама модель Department - ровно свои отделы
+            if model._meta.model_name == 'department':
+                return Q(id__in=self.department_ids)
+            # Для моделей с полем department - СТРОГО только записи с заполненным отделом,
+            # без отката на подразделение/организацию
+            for name, lookup in lookups:
+                if name == 'department':
+                    return Q(**{f'{lookup}__in': self.department_ids})
+
+        q_filter = Q()
+        more_specific_empty = {}
+        for name, lookup in lookups:
+            q_filter |= Q(**more_specific_empty, **{f'{lookup}__in': self.ids_for(name)})
+            more_specific_empty[f'{name}__isnull'] = True
+        return q_filter
 
 
 class AccessControlHelper:
@@ -24,6 +160,39 @@ class AccessControlHelper:
     Все методы статические для удобства использования.
     """
 
+    @staticmethod
+    def get_scope(user, request=None):
+        """
+        Возвращает AccessScope пользователя (None - без ограничений, суперпользователь).
+
+        Args:
+            user: объект User
+            request: объект HttpRequest (для кеширования)
+
+        Returns:
+            AccessScope | None
+        """
+        if user and user.is_authenticated and user.is_superuser:
+            return None
+
+        # Request-level cache
+        if request and getattr(request, '_access_scope_cache', None) is not None:
+            return request._access_scope_cache
+
+        # Проверка на анонимного пользователя
+        if not user or not user.is_authenticated:
+            scope = AccessScope()
+        elif not hasattr(user, 'profile') or user.profile is None:
+            scope = AccessScope()
+        else:
+            scope = AccessScope.for_profile(user.profile)
+
+        # Сохраняем в request-cache
+        if request:
+            request._access_scope_cache = scope
+
+        return scope
+
     @staticmethod
     def get_accessible_organizations(user, request=None):
         """
@@ -47,31 +216,11 @@ class AccessControlHelper:
 
         from directory.models import Organization
 
-        # Проверка на анонимного пользователя
-        if not user or not user.is_authenticated:
-            orgs = Organization.objects.none()
-        elif user.is_superuser:
+        scope = AccessControlHelper.get_scope(user, request)
+        if scope is None:
             orgs = Organization.objects.all()
-        elif not hasattr(user, 'profile') or user.profile is None:
-            orgs = Organization.objects.none()
         else:
-            # Получаем организации из всех источников
-            profile = user.profile
-
-            # 1. Прямой доступ к организациям
-            org_ids = set(profile.organizations.values_list('id', flat=True))
-
-            # 2. Организации через подразделения
-            org_ids.update(
-                profile.subdivisions.values_list('organization_id', flat=True)
-            )
-
-            # 3. Организации через отделы
-            org_ids.update(
-                profile.departments.values_list('organization_id', flat=True)
-            )
-
-            orgs = Organization.objects.filter(id__in=org_ids)
+            orgs = Organization.objects.filter(id__in=scope.organization_ids)
 
         # Сохраняем в request-cache
         if request:
@@ -102,32 +251,11 @@ class AccessControlHelper:
 
         from directory.models import StructuralSubdivision
 
-        # Проверка на анонимного пользователя
-        if not user or not user.is_authenticated:
-            subdivs = StructuralSubdivision.objects.none()
-        elif user.is_superuser:
+        scope = AccessControlHelper.get_scope(user, request)
+        if scope is None:
             subdivs = StructuralSubdivision.objects.all()
-        elif not hasattr(user, 'profile') or user.profile is None:
-            subdivs = StructuralSubdivision.objects.none()
         else:
-            # Получаем подразделения из всех источников
-            profile = user.profile
-
-            # 1. Все подразделения доступных организаций
-            subdivs_from_orgs = StructuralSubdivision.objects.filter(
-                organization__in=profile.organizations.all()
-            )
-
-            # 2. Прямой доступ к подразделениям
-            direct_subdivs = profile.subdivisions.all()
-
-            # 3. Подразделения через отделы
-            subdivs_from_depts = StructuralSubdivision.objects.filter(
-                id__in=profile.departments.values_list('subdivision_id', flat=True)
-            )
-
-            # Объединяем все источники
-            subdivs = (subdivs_from_orgs | direct_subdivs | subdivs_from_depts).distinct()
+            subdivs = StructuralSubdivision.objects.filter(id__in=scope.subdivision_ids)
 
         # Сохраняем в request-cache
         if request:
@@ -158,32 +286,11 @@ class AccessControlHelper:
 
         from directory.models import Department
 
-        # Проверка на анонимного пользователя
-        if not user or not user.is_authenticated:
-            depts = Department.objects.none()
-        elif user.is_superuser:
+        scope = AccessControlHelper.get_scope(user, request)
+        if scope is None:
             depts = Department.objects.all()
-        elif not hasattr(user, 'profile') or user.profile is None:
-            depts = Department.objects.none()
         else:
-            # Получаем отделы из всех источников
-            profile = user.profile
-
-            # 1. Все отделы доступных организаций
-            depts_from_orgs = Department.objects.filter(
-                organization__in=profile.organizations.all()
-            )
-
-            # 2. Все отделы доступных подразделений
-            depts_from_subdivs = Department.objects.filter(
-                subdivision__in=profile.subdivisions.all()
-            )
-
-            # 3. Прямой доступ к отделам
-            direct_depts = profile.departments.all()
-
-            # Объединяем все источники
-            depts = (depts_from_orgs | depts_from_subdivs | direct_depts).distinct()
+            depts = Department.objects.filter(id__in=scope.department_ids)
 
         # Сохраняем в request-cache
         if request:
@@ -197,7 +304,8 @@ class AccessControlHelper:
         Универсальный фильтр для любого queryset по правам пользователя.
 
         Автоматически определяет поля organization/subdivision/department в модели
-        и фильтрует по правам.
+        и фильтрует по правам одним условием по плоским спискам ID:
+        department_id IN (...) OR (department IS NULL AND subdivision_id IN (...)) OR ...
 
         Использование:
             qs = Equipment.objects.all()
@@ -217,85 +325,12 @@ class AccessControlHelper:
         if not hasattr(user, 'profile'):
             return queryset.none()
 
-        model = queryset.model
-
-        # Проверяем наличие полей в модели через _meta (правильный способ)
-        field_names = [f.name for f in model._meta.get_fields()]
-        has_org = 'organization' in field_names
-        has_subdiv = 'subdivision' in field_names
-        has_dept = 'department' in field_names
-
         # Если ни одного поля нет - возвращаем пустой queryset
-        if not (has_org or has_subdiv or has_dept):
+        if not scope_lookups(queryset.model):
             return queryset.none()
 
-        # Получаем доступные объекты
-        accessible_orgs = AccessControlHelper.get_accessible_organizations(user, request) if has_org else []
-        accessible_subdivs = AccessControlHelper.get_accessible_subdivisions(user, request) if has_subdiv else []
-        # Отделы нужны и для моделей без поля department (например, Department)
-        # поэтому запрашиваем их без привязки к has_dept
-        accessible_depts = AccessControlHelper.get_accessible_departments(user, request)
-        # Признак: у пользователя есть прямое закрепление ТОЛЬКО за отделами
-        # (без доступа к целым организациям или подразделениям)
-        direct_dept_user = (
-            hasattr(user, 'profile') and
-            user.profile.departments.exists() and
-            not user.profile.organizations.exists() and
-            not user.profile.subdivisions.exists()
-        )
-
-        # Для пользователей, привязанных напрямую к отделам:
-        # 1) список отделов – ровно их own departments
-        # 2) для моделей с полем department – фильтруем только по ним, без отката на подразделение/организацию
-        # 3) НЕ показываем сотрудников подразделения без конкретного отдела
-        if direct_dept_user:
-            # Специальный случай: сама модель Department
-            if model._meta.model_name == 'department':
-                return queryset.filter(id__in=accessible_depts).distinct()
-            # Для моделей с полем department - СТРОГО только сотрудники с заполненным department
-            if has_dept:
-                return queryset.filter(
-                    department__isnull=False,  # ВАЖНО: только с заполненным отделом
-                    department__in=accessible_depts
-                ).distinct()
-
-        # Строим фильтр с приоритетом: department > subdivision > organization
-        # Логика: фильтруем по САМОМУ КОНКРЕТНОМУ заполненному полю
-        q_filter = Q()
-
-        if has_dept and has_subdiv and has_org:
-            # Есть все три поля - фильтруем по приоритету
-            q_filter = (
-                # Если department заполнен, проверяем его
-                Q(department__isnull=False, department__in=accessible_depts) |
-                # Иначе если subdivision заполнен, проверяем его
-                Q(department__isnull=True, subdivision__isnull=False, subdivision__in=accessible_subdivs) |
-                # Иначе проверяем organization
-                Q(department__isnull=True, subdivision__isnull=True, organization__in=accessible_orgs)
-            )
-        elif has_subdiv and has_org:
-            # Есть subdivision и organization
-            q_filter = (
-                Q(subdivision__isnull=False, subdivision__in=accessible_subdivs) |
-                Q(subdivision__isnull=True, organization__in=accessible_orgs)
-            )
-        elif has_dept and has_org:
-            # Есть department и organization (без subdivision)
-            q_filter = (
-                Q(department__isnull=False, department__in=accessible_depts) |
-                Q(department__isnull=True, organization__in=accessible_orgs)
-            )
-        elif has_org:
-            # Только organization
-            q_filter = Q(organization__in=accessible_orgs)
-        elif has_subdiv:
-            # Только subdivision
-            q_filter = Q(subdivision__in=accessible_subdivs)
-        elif has_dept:
-            # Только department
-            q_filter = Q(department__in=accessible_depts)
-
-        return queryset.filter(q_filter).distinct()
+        scope = AccessControlHelper.get_scope(user, request)
+        return queryset.filter(scope.predicate(queryset.model)).distinct()
 
     @staticmethod
     def can_access_object(user, obj):
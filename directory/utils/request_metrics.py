@@ -0,0 +1,157 @@
+# directory/utils/request_metrics.py
+"""
+📈 Хранилище метрик HTTP-запросов (время ответа, число SQL-запросов, время в БД).
+
+Метрики группируются по имени URL (resolver_match.view_name) и хранятся
+кольцевым буфером фиксированного размера для каждого view.
+
+Схема хранения:
+    1. Каждый процесс gunicorn копит замеры в локальном буфере (без обращений к кешу).
+    2. Раз в N запросов (или раз в M секунд) буфер сбрасывается в Django cache.
+    3. Админ-страница и команда request_metrics_report читают данные из кеша.
+
+В production используется Redis (общий для всех воркеров), поэтому отчёт
+видит замеры всех процессов. С LocMemCache отчёт видит только текущий процесс.
+
+Настройки (settings.py):
+    REQUEST_METRICS_ENABLED       - включить сбор метрик (по умолчанию True)
+    REQUEST_METRICS_SLOW_MS       - порог медленного запроса, мс (по умолчанию 1000)
+    REQUEST_METRICS_RING_SIZE     - размер кольцевого буфера на один view (по умолчанию 500)
+    REQUEST_METRICS_FLUSH_EVERY   - сбрасывать буфер в кеш каждые N запросов (по умолчанию 20)
+    REQUEST_METRICS_FLUSH_SECONDS - и не реже, чем раз в N секунд (по умолчанию 10)
+    REQUEST_METRICS_SQL_LIMIT     - сколько SQL логировать для медленного запроса (по умолчанию 50)
+"""
+import math
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+
+CACHE_PREFIX = 'request_metrics'
+VIEWS_INDEX_KEY = f'{CACHE_PREFIX}:views'
+
+
+def get_metrics_setting(name, default):
+    """Возвращает настройку REQUEST_METRICS_<name> со значением по умолчанию."""
+    return getattr(settings, f'REQUEST_METRICS_{name}', default)
+
+
+def _view_key(view_name):
+    return f'{CACHE_PREFIX}:view:{view_name}'
+
+
+def percentile(values, pct):
+    """
+    Перцентиль методом ближайшего ранга.
+
+    Args:
+        values: отсортированный список чисел
+        pct: перцентиль (0-100)
+
+    Returns:
+        float или None для пустого списка
+    """
+    if not values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(values)))
+    return values[min(rank, len(values)) - 1]
+
+
+class RequestMetricsStore:
+    """
+    Кольцевой буфер замеров по view с отложенной записью в кеш.
+
+    Один замер - кортеж (wall_ms, queries, db_ms, timestamp).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = defaultdict(list)
+        self._pending_count = 0
+        self._last_flush = time.monotonic()
+
+    def record(self, view_name, wall_ms, queries, db_ms):
+        """Добавляет замер в локальный буфер и при необходимости сбрасывает его в кеш."""
+        sample = (round(wall_ms, 2), queries, round(db_ms, 2), int(time.time()))
+        with self._lock:
+            self._pending[view_name].append(sample)
+            self._pending_count += 1
+            should_flush = (
+                self._pending_count >= get_metrics_setting('FLUSH_EVERY', 20)
+                or time.monotonic() - self._last_flush >= get_metrics_setting('FLUSH_SECONDS', 10)
+            )
+        if should_flush:
+            self.flush()
+
+    def flush(self):
+        """Переносит накопленные замеры в кеш, обрезая буфер каждого view до RING_SIZE."""
+        with self._lock:
+            pending = self._pending
+            self._pending = defaultdict(list)
+            self._pending_count = 0
+            self._last_flush = time.monotonic()
+
+        if not pending:
+            return
+
+        ring_size = get_metrics_setting('RING_SIZE', 500)
+        stored = cache.get_many([_view_key(name) for name in pending])
+        updates = {}
+        for view_name, samples in pending.items():
+            key = _view_key(view_name)
+            updates[key] = (stored.get(key, []) + samples)[-ring_size:]
+
+        views = set(cache.get(VIEWS_INDEX_KEY, []))
+        views.update(pending)
+        updates[VIEWS_INDEX_KEY] = sorted(views)
+        cache.set_many(updates, timeout=None)
+
+    def get_samples(self):
+        """Возвращает словарь {view_name: [замеры]} с учётом ещё не сброшенного буфера."""
+        self.flush()
+        views = cache.get(VIEWS_INDEX_KEY, [])
+        stored = cache.get_many([_view_key(name) for name in views])
+        return {name: stored.get(_view_key(name), []) for name in views}
+
+    def summarize(self):
+        """
+        Сводная статистика по каждому view.
+
+        Returns:
+            list[dict]: отсортирован по p95 времени ответа (по убыванию)
+        """
+        rows = []
+        for view_name, samples in self.get_samples().items():
+            if not samples:
+                continue
+            wall = sorted(s[0] for s in samples)
+            queries = sorted(s[1] for s in samples)
+            db = sorted(s[2] for s in samples)
+            rows.append({
+                'view_name': view_name,
+                'count': len(samples),
+                'p50_ms': percentile(wall, 50),
+                'p95_ms': percentile(wall, 95),
+                'p99_ms': percentile(wall, 99),
+                'max_ms': wall[-1],
+                'avg_queries': round(sum(queries) / len(queries), 1),
+                'p95_queries': percentile(queries, 95),
+                'max_queries': queries[-1],
+                'p95_db_ms': percentile(db, 95),
+                'last_seen': max(s[3] for s in samples),
+            })
+        rows.sort(key=lambda row: row['p95_ms'], reverse=True)
+        return rows
+
+    def reset(self):
+        """Очищает все накопленные метрики."""
+        with self._lock:
+            self._pending = defaultdict(list)
+            self._pending_count = 0
+        views = cache.get(VIEWS_INDEX_KEY, [])
+        cache.delete_many([_view_key(name) for name in views] + [VIEWS_INDEX_KEY])
+
+
+metrics_store = RequestMetricsStore()
@@ -0,0 +1,133 @@
+"""
+🔎 Поиск сотрудников и должностей по нормализованному полю search_text.
+
+Вместо full_name_nominative__icontains / position_name__icontains
+(полный просмотр таблицы, на SQLite без учёта регистра кириллицы)
+модели хранят поле search_text, которое обновляется при сохранении:
+
+    "Иванов Пётр" -> "иванов петр ivanov petr"
+
+- нижний регистр (casefold), ё -> е, лишние пробелы и знаки убраны;
+- добавлена транслитерация, поэтому "ivanov" находит "Иванов".
+
+Запрос нормализуется так же, каждое слово запроса ищется в search_text
+(все слова должны совпасть). На PostgreSQL поиск идёт по GIN-индексу
+pg_trgm (миграция 0057), на остальных СУБД - LIKE по короткому
+нормализованному полю с обычным индексом. Результаты ранжируются:
+совпадение с начала строки -> с начала слова -> внутри слова.
+"""
+import re
+
+from django.db.models import Case, IntegerField, Q, Value, When
+
+TRANSLIT_TABLE = {
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e', 'ж': 'zh',
+    'з': 'z', 'и': 'i', 'й': 'y', 'к': 'k', 'л': 'l', 'м': 'm', 'н': 'n',
+    'о': 'o', 'п': 'p', 'р': 'r', 'с': 's', 'т': 't', 'у': 'u', 'ф': 'f',
+    'х': 'kh', 'ц': 'ts', 'ч': 'ch', 'ш': 'sh', 'щ': 'shch', 'ъ': '',
+    'ы': 'y', 'ь': '', 'э': 'e', 'ю': 'yu', 'я': 'ya',
+    # Белорусский и украинский алфавиты
+    'і': 'i', 'ў': 'u', 'ї': 'yi', 'є': 'ye', 'ґ': 'g',
+}
+
+_NON_WORD_RE = re.compile(r'[^\w]+', re.UNICODE)
+
+SEARCH_TEXT_MAX_LENGTH = 512
+
+
+def normalize_search_text(value):
+    """
+    Приводит строку к виду для поиска: нижний регистр, ё -> е,
+    знаки препинания заменены пробелами, пробелы схлопнуты.
+    """
+    if not value:
+        return ''
+    value = str(value).casefold().replace('ё', 'е')
+    return ' '.join(_NON_WORD_RE.sub(' ', value).split())
+
+
+def transliterate(value):
+    """Транслитерация нормализованной строки кириллицей в латиницу"""
+    return ''.join(TRANSLIT_TABLE.get(char, char) for char in value)
+
+
+def build_search_text(*parts):
+    """
+    Строит значение поля search_text из нескольких строк:
+    нормализованный текст + его транслитерация (если отличается).
+    """
+    normalized = normalize_search_text(' '.join(str(part) for part in parts if part))
+    translit = transliterate(normalized)
+    if translit != normalized:
+        normalized = f'{normalized} {translit}'
+    return normalized[:SEARCH_TEXT_MAX_LENGTH]
+
+
+def search_filter(query, fields=('search_text',)):
+    """
+    Условие Q для поиска: каждое слово запроса должно найтись
+    хотя бы в одном из полей. Для пустого запроса - пустой Q().
+    """
+    condition = Q()
+    for term in normalize_search_text(query).split():
+        term_filter = Q()
+        for field in fields:
+            term_filter |= Q(**{f'{field}__contains': term})
+        condition &= term_filter
+    return condition
+
+
+def search_queryset(queryset, query, fields=('search_text',)):
+    """
+    Фильтрует queryset по нормализованному поисковому полю и ранжирует результаты.
+
+    Args:
+        queryset: QuerySet модели с полем search_text
+        query: строка поиска от пользователя
+        fields: поисковые поля (например, ('search_text', 'position__search_text'));
+            слово запроса должно найтись хотя бы в одном из них
+
+    Returns:
+        QuerySet с аннотацией search_rank (0 - лучшее совпадение).
+        Сортировку задаёт вызывающий код: order_by('search_rank', ...)
+    """
+    terms = normalize_search_text(query).split()
+    if not terms:
+        return queryset.annotate(search_rank=Value(0, output_field=IntegerField()))
+
+    queryset = queryset.filter(search_filter(query, fields))
+
+    # Ранг по первому слову запроса и основному полю
+    main_field, first_term = fields[0], terms[0]
+    return queryset.annotate(
+        search_rank=Case(
+            When(**{f'{main_field}__startswith': first_term}, then=Value(0)),
+            When(**{f'{main_field}__contains': f' {first_term}'}, then=Value(1)),
+            When(**{f'{main_field}__contains': first_term}, then=Value(2)),
+            default=Value(3),
+            output_field=IntegerField(),
+        )
+    )
+
+
+def rebuild_search_text(queryset, source_field, batch_size=500):
+    """
+    Пересчитывает search_text для записей queryset (после bulk_create/update,
+    которые не вызывают save()). Возвращает число обновлённых записей.
+    """
+    updated = 0
+    batch = []
+    for obj in queryset.only('pk', source_field, 'search_text').iterator(chunk_size=batch_size):
+        search_text = build_search_text(getattr(obj, source_field))
+        if obj.search_text == search_text:
+            continue
+        obj.search_text = search_text
+        batch.append(obj)
+        if len(batch) >= batch_size:
+            queryset.model.objects.bulk_update(batch, ['search_text'])
+            updated += len(batch)
+            batch = []
+    if batch:
+        queryset.model.objects.bulk_update(batch, ['search_text'])
+        updated += len(batch)
+    return updated
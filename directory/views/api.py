@@ -5,7 +5,8 @@ from django.contrib.auth.decorators import login_required
 from django.views.decorators.http import require_GET
 import logging
 
-from directory.models import Position, MedicalExaminationNorm
+from directory.models import Position
+from directory.services.position_requirements import get_requirement_profile
 
 # Настройка логирования
 logger = logging.getLogger(__name__)
@@ -19,29 +20,14 @@ def position_needs_step_info(request, position_id):
     для выбранной должности
     """
     try:
-        position = get_object_or_404(Position, pk=position_id)
+        position = get_object_or_404(Position.objects.select_related('requirement_profile'), pk=position_id)
 
         logger.debug(f"Запрос информации о шагах для должности ID={position_id} ({position.position_name})")
 
-        # Проверяем медосмотр
-        has_custom_medical = position.medical_factors.filter(is_disabled=False).exists()
-        has_reference_medical = False
-
-        if not has_custom_medical:
-            has_reference_medical = MedicalExaminationNorm.objects.filter(
-                position_name=position.position_name
-            ).exists()
-
-        needs_medical = has_custom_medical or has_reference_medical
-
-        # Проверяем СИЗ
-        has_custom_siz = position.siz_norms.exists()
-        has_reference_siz = False
-
-        if not has_custom_siz:
-            has_reference_siz = Position.find_reference_norms(position.position_name).exists()
-
-        needs_siz = has_custom_siz or has_reference_siz
+        # Медосмотр и СИЗ (собственные или эталонные нормы) - из профиля требований
+        requirements = get_requirement_profile(position)
+        needs_medical = requirements.needs_medical
+        needs_siz = requirements.needs_siz
 
         logger.debug(f"Результат для должности {position.position_name}: "
                      f"needs_medical={needs_medical}, needs_siz={needs_siz}")
@@ -13,13 +13,24 @@ from io import BytesIO
 from zipfile import ZipFile
 from datetime import date
 
-from directory.models import Employee
+from directory.models import Employee, Position
 from directory.utils.permissions import AccessControlHelper
+from directory.services.position_requirements import ensure_requirement_profiles, get_requirement_profile
+from deadline_control.utils.email_templates import render_email_template
 
 # Настройка логирования
 logger = logging.getLogger(__name__)
 
 
+def _ensure_position_profiles(organization):
+    """
+    Недостающие профили требований должностей организации: сотрудники
+    отбираются по флагу профиля, а должность без профиля (например, после
+    пакетного импорта) иначе выпала бы из рассылки
+    """
+    ensure_requirement_profiles(Position.objects.filter(organization=organization))
+
+
 class InstructionJournalView(LoginRequiredMixin, TemplateView):
     """
     Представление для формирования образца заполнения журнала повторных инструктажей.
@@ -36,7 +47,7 @@ class InstructionJournalView(LoginRequiredMixin, TemplateView):
     def get_base_queryset(self):
         """Возвращает базовый queryset всех активных сотрудников с должностью"""
         qs = Employee.objects.select_related(
-            'organization', 'subdivision', 'department', 'position'
+            'organization', 'subdivision', 'department', 'position', 'position__requirement_profile'
         )
         # Фильтруем по правам доступа
         qs = AccessControlHelper.filter_queryset(qs, self.request.user, self.request)
@@ -88,13 +99,9 @@ class InstructionJournalView(LoginRequiredMixin, TemplateView):
             sub = emp.subdivision
             dept = emp.department
 
-            # Проверяем наличие инструкций у должности
+            # Наличие инструкций у должности - из профиля требований
             position = emp.position
-            has_instructions = bool(
-                (position.safety_instructions_numbers and position.safety_instructions_numbers.strip()) or
-                (position.contract_safety_instructions and position.contract_safety_instructions.strip()) or
-                (position.company_vehicle_instructions and position.company_vehicle_instructions.strip())
-            )
+            has_instructions = get_requirement_profile(position).has_instructions
 
             # Формируем данные о сотруднике
             employee_data = {
@@ -337,23 +344,13 @@ def send_instruction_sample(request, subdivision_id):
     logger.info(f"Начало отправки образца журнала для подразделения '{subdivision.name}'")
 
     # Получаем сотрудников подразделения с инструкциями
-    employees = Employee.objects.filter(
+    # Только сотрудники, у должностей которых есть инструкции (флаг профиля требований)
+    _ensure_position_profiles(organization)
+    employees_with_instructions = list(Employee.objects.filter(
         subdivision=subdivision,
         status='active',
-        position__isnull=False
-    ).select_related('organization', 'subdivision', 'department', 'position')
-
-    # Фильтруем только сотрудников с инструкциями
-    employees_with_instructions = []
-    for emp in employees:
-        position = emp.position
-        has_instructions = bool(
-            (position.safety_instructions_numbers and position.safety_instructions_numbers.strip()) or
-            (position.contract_safety_instructions and position.contract_safety_instructions.strip()) or
-            (position.company_vehicle_instructions and position.company_vehicle_instructions.strip())
-        )
-        if has_instructions:
-            employees_with_instructions.append(emp)
+        position__requirement_profile__has_instructions=True,
+    ).select_related('organization', 'subdivision', 'department', 'position'))
 
     # Получаем вводные данные инструктажа из сессии
     briefing_data = request.session.get('briefing_data', {})
@@ -552,8 +549,8 @@ def send_instruction_sample(request, subdivision_id):
             return redirect('directory:documents:instruction_journal')
 
         # Форматируем тему и текст письма с использованием переменных
-        subject = template_data[0].format(**template_vars)
-        html_message = template_data[1].format(**template_vars)
+        subject = render_email_template(template_data[0], template_vars)
+        html_message = render_email_template(template_data[1], template_vars)
 
         # Создаем текстовую версию (для клиентов без HTML)
         from django.utils.html import strip_tags
@@ -658,7 +655,7 @@ def send_instruction_samples_for_organization(request, organization_id):
     from django.utils.safestring import mark_safe
     from django.urls import reverse
     from directory.models import Organization, StructuralSubdivision
-    from directory.utils.email_recipients import collect_recipients_for_subdivision
+    from directory.utils.email_recipients import collect_recipients_for_organization
     from deadline_control.models import EmailSettings, InstructionJournalSendLog, InstructionJournalSendDetail
     from directory.document_generators.instruction_journal_generator import generate_instruction_journal
     import json
@@ -735,28 +732,23 @@ def send_instruction_samples_for_organization(request, organization_id):
     total_recipients = set()  # Уникальные получатели
     total_employees = 0
 
+    # Получатели всех подразделений - одним пакетом
+    recipients_map = collect_recipients_for_organization(
+        organization, subdivisions, notification_type='instruction_journal'
+    )
+
     # Обрабатываем каждое подразделение
+    _ensure_position_profiles(organization)
     for subdivision in subdivisions:
         logger.info(f"Обработка подразделения: {subdivision.name}")
 
         # Получаем сотрудников подразделения с инструкциями
-        employees = Employee.objects.filter(
+        # Только сотрудники, у должностей которых есть инструкции (флаг профиля требований)
+        employees_with_instructions = list(Employee.objects.filter(
             subdivision=subdivision,
             status='active',
-            position__isnull=False
-        ).select_related('organization', 'subdivision', 'department', 'position')
-
-        # Фильтруем только сотрудников с инструкциями
-        employees_with_instructions = []
-        for emp in employees:
-            position = emp.position
-            has_instructions = bool(
-                (position.safety_instructions_numbers and position.safety_instructions_numbers.strip()) or
-                (position.contract_safety_instructions and position.contract_safety_instructions.strip()) or
-                (position.company_vehicle_instructions and position.company_vehicle_instructions.strip())
-            )
-            if has_instructions:
-                employees_with_instructions.append(emp)
+            position__requirement_profile__has_instructions=True,
+        ).select_related('organization', 'subdivision', 'department', 'position'))
 
         if not employees_with_instructions:
             # Создаём запись о пропуске
@@ -778,12 +770,8 @@ def send_instruction_samples_for_organization(request, organization_id):
         total_subdivisions += 1
         logger.info(f"Найдено {len(employees_with_instructions)} сотрудников с инструкциями")
 
-        # Собираем получателей для журналов инструктажей
-        recipients = collect_recipients_for_subdivision(
-            subdivision=subdivision,
-            organization=organization,
-            notification_type='instruction_journal'
-        )
+        # Получатели для журналов инструктажей
+        recipients = recipients_map.get(subdivision.pk, [])
 
         if not recipients:
             # Создаём запись о пропуске
@@ -906,8 +894,8 @@ def send_instruction_samples_for_organization(request, organization_id):
                 continue
 
             # Форматируем тему и текст письма
-            subject = template_data[0].format(**template_vars)
-            html_message = template_data[1].format(**template_vars)
+            subject = render_email_template(template_data[0], template_vars)
+            html_message = render_email_template(template_data[1], template_vars)
 
             # Создаем текстовую версию (для клиентов без HTML)
             from django.utils.html import strip_tags
@@ -1034,6 +1022,7 @@ def preview_mass_send_instruction_samples(request, organization_id):
     с информацией о получателях перед массовой отправкой.
     """
     from directory.models import Organization, StructuralSubdivision, Employee
+    from directory.utils.email_recipients import collect_recipients_for_organization
     from deadline_control.models import EmailSettings
 
     try:
@@ -1086,39 +1075,26 @@ def preview_mass_send_instruction_samples(request, organization_id):
     tree_data = []
     total_recipients = set()
     has_any_recipients = False
+    recipients_map = collect_recipients_for_organization(
+        organization, subdivisions, notification_type='instruction_journal'
+    )
 
+    _ensure_position_profiles(organization)
     for subdivision in subdivisions:
         # Получаем сотрудников с инструкциями
-        employees = Employee.objects.filter(
+        # Только сотрудники с инструкциями (любого типа) - флаг профиля требований
+        employees_with_instructions = list(Employee.objects.filter(
             organization=organization,
             subdivision=subdivision,
             status='active',
-            position__isnull=False
-        ).select_related('position', 'department')
-
-        # Фильтруем только сотрудников с инструкциями (проверяем все типы инструкций)
-        employees_with_instructions = []
-        for emp in employees:
-            position = emp.position
-            if position:
-                has_instructions = bool(
-                    (position.safety_instructions_numbers and position.safety_instructions_numbers.strip()) or
-                    (position.contract_safety_instructions and position.contract_safety_instructions.strip()) or
-                    (position.company_vehicle_instructions and position.company_vehicle_instructions.strip())
-                )
-                if has_instructions:
-                    employees_with_instructions.append(emp)
+            position__requirement_profile__has_instructions=True,
+        ).select_related('position', 'department'))
 
         if not employees_with_instructions:
             continue
 
-        # Собираем информацию о получателях для этого подразделения
-        from directory.utils.email_recipients import collect_recipients_for_subdivision
-        recipients = collect_recipients_for_subdivision(
-            subdivision,
-            organization,
-            notification_type='instruction_journal'
-        )
+        # Получатели этого подразделения
+        recipients = recipients_map.get(subdivision.pk, [])
 
         # Собираем уникальные отделы сотрудников
         departments_in_subdivision = {}
@@ -1156,7 +1132,7 @@ def preview_mass_send_instruction_samples(request, organization_id):
         # Получаем шаблон письма из новой системы шаблонов
         template_data = email_settings.get_email_template('instruction_journal')
         if template_data:
-            subject = template_data[0].format(**template_vars)
+            subject = render_email_template(template_data[0], template_vars)
         else:
             subject = "Шаблон не настроен"
 
@@ -1182,7 +1158,7 @@ def preview_mass_send_instruction_samples(request, organization_id):
             'instruction_type': briefing_data.get('instruction_type', 'Повторный'),
             'instruction_reason': briefing_data.get('instruction_reason', ''),
         }
-        email_body_preview = template_data[1].format(**example_vars)
+        email_body_preview = render_email_template(template_data[1], example_vars)
     elif template_data:
         email_body_preview = template_data[1]
     else:
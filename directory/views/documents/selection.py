@@ -14,6 +14,7 @@ import datetime
 from directory.models import Employee
 from directory.models.document_template import DocumentTemplate, DocumentGenerationLog
 from directory.forms.document_forms import DocumentSelectionForm
+from directory.services.position_requirements import get_requirement_profile
 from directory.utils.declension import get_initials_from_name
 # --- Обновленные импорты ---
 from directory.document_generators.base import get_document_template  # Базовая функция для получения шаблона
@@ -62,52 +63,31 @@ def get_auto_selected_document_types(employee):
     # Получаем флаг договора подряда
     is_contractor = getattr(employee, 'contract_type', 'standard') == 'contractor'
 
-    # Проверяем срок стажировки и договор подряда
-    internship_period = getattr(employee.position, 'internship_period_days', 0)
+    # Требования должности (стажировка, ответственность, СИЗ, документы) - из профиля
+    requirements = get_requirement_profile(employee.position)
 
-    # Проверяем ответственность за ОТ
-    is_responsible_for_safety = getattr(employee.position, 'is_responsible_for_safety', False)
-
-    # Проверяем управление служебным автомобилем
-    drives_company_vehicle = getattr(employee.position, 'drives_company_vehicle', False)
-
-    # Проверяем наличие типов ответственности
-    has_responsibility_types = (
-        employee.position and
-        employee.position.responsibility_types.filter(is_active=True).exists()
-    )
-
-    if internship_period > 0:
+    if requirements.needs_internship:
         # Если это не договор подряда, добавляем распоряжение о стажировке
         if not is_contractor:
             document_types.append('all_orders')
 
     # Протокол проверки знаний - если есть стажировка ИЛИ ответственный за ОТ ИЛИ типы ответственности
-    if internship_period > 0 or is_responsible_for_safety or has_responsibility_types:
+    if requirements.needs_internship or requirements.is_responsible_for_safety or requirements.has_responsibility_types:
         document_types.append('knowledge_protocol')
 
     # ВОДИТЕЛЬ СЛУЖЕБНОГО АВТОМОБИЛЯ: всегда нужны распоряжения и протокол
-    if drives_company_vehicle:
+    if requirements.drives_company_vehicle:
         if 'all_orders' not in document_types:
             document_types.append('all_orders')
         if 'knowledge_protocol' not in document_types:
             document_types.append('knowledge_protocol')
 
     # Проверяем связанные документы для должности
-    has_documents = False
-    if hasattr(employee.position, 'documents') and employee.position.documents.exists():
-        has_documents = True
+    if requirements.has_documents:
         document_types.append('doc_familiarization')
 
-    # Проверяем наличие норм СИЗ
-    has_siz_norms = False
-
-    # Проверяем эталонные нормы СИЗ
-    from directory.models.siz import SIZNorm
-    if SIZNorm.objects.filter(position=employee.position).exists():
-        has_siz_norms = True
-
-    if has_siz_norms:
+    # Нормы СИЗ - собственные или эталонные (карточка СИЗ строится по тем же правилам)
+    if requirements.needs_siz:
         document_types.append('siz_card')
 
     # Если есть договор подряда, добавляем Личную карточку по ОТ
@@ -139,7 +119,7 @@ class DocumentSelectionView(LoginRequiredMixin, FormView):
 
             # Получаем сотрудника
             try:
-                employee = Employee.objects.get(id=employee_id)
+                employee = Employee.objects.select_related('position__requirement_profile').get(id=employee_id)
 
                 # Автоматически выбираем типы документов
                 document_types = get_auto_selected_document_types(employee)
@@ -156,20 +136,16 @@ class DocumentSelectionView(LoginRequiredMixin, FormView):
 
         if employee_id:
             try:
-                employee = Employee.objects.get(id=employee_id)
+                employee = Employee.objects.select_related('position__requirement_profile').get(id=employee_id)
                 context['employee'] = employee
 
                 # Добавляем информацию о правилах выбора документов
                 context['internship_period'] = getattr(employee.position, 'internship_period_days',
                                                        0) if employee.position else 0
                 context['is_contractor'] = getattr(employee, 'is_contractor', False)
-                context['has_documents'] = hasattr(employee.position,
-                                                   'documents') and employee.position.documents.exists() if employee.position else False
-
-                # Проверяем наличие норм СИЗ
-                from directory.models.siz import SIZNorm
-                context['has_siz_norms'] = SIZNorm.objects.filter(
-                    position=employee.position).exists() if employee.position else False
+                requirements = get_requirement_profile(employee.position) if employee.position else None
+                context['has_documents'] = bool(requirements and requirements.has_documents)
+                context['has_siz_norms'] = bool(requirements and requirements.needs_siz)
 
             except Employee.DoesNotExist:
                 logger.error(f"Сотрудник с ID {employee_id} не найден")
@@ -6,124 +6,61 @@
 import logging
 from directory.utils.declension import get_initials_from_name, decline_full_name, decline_phrase
 from directory.models import Employee
+from directory.services.org_structure import OrgStructureResolver
 
 # Настройка логирования
 logger = logging.getLogger(__name__)
 
 
-def get_internship_leader(employee):
+def get_internship_leader(employee, resolver=None):
     """
     Выполняет иерархический поиск руководителя стажировки для сотрудника.
     Ищет только сотрудников с явно установленным флагом can_be_internship_leader=True.
+    Поиск идёт по кэшированному снимку организации (OrgStructureResolver).
 
     Args:
         employee: Объект сотрудника Employee
+        resolver: OrgStructureResolver, общий для пачки документов (опционально)
     Returns:
         tuple: (leader, level, success)
         где level: "department", "subdivision", "organization"
     """
-    logger.info(f"Поиск руководителя стажировки для сотрудника {employee.full_name_nominative}")
+    logger.info("Поиск руководителя стажировки для сотрудника %s", employee.full_name_nominative)
 
     # Проверяем, что у сотрудника указана должность
-    if not employee.position:
-        logger.warning(f"У сотрудника {employee.full_name_nominative} не указана должность")
+    if not employee.position_id:
+        logger.warning("У сотрудника %s не указана должность", employee.full_name_nominative)
         return None, None, False
 
-    # Логируем информацию о подразделении и отделе
-    logger.info(f"Подразделение: {employee.subdivision.name if employee.subdivision else 'Не указано'}")
-    logger.info(f"Отдел: {employee.department.name if employee.department else 'Не указан'}")
-
-    # 1. Сначала ищем в отделе
-    if employee.department:
-        leaders_in_dept = list(employee.department.employees.filter(
-            position__can_be_internship_leader=True
-        ).exclude(id=employee.id))  # Исключаем самого сотрудника
-
-        logger.info(f"Найдено {len(leaders_in_dept)} руководителей стажировки в отделе")
-
-        if leaders_in_dept:
-            leader = leaders_in_dept[0]
-            logger.info(f"Найден руководитель стажировки в отделе: {leader.full_name_nominative}")
-            return leader, "department", True
-
-    # 2. Если не нашли, ищем в подразделении
-    if employee.subdivision:
-        leaders_in_subdiv = list(Employee.objects.filter(
-            subdivision=employee.subdivision,
-            position__can_be_internship_leader=True,
-        ).exclude(id=employee.id))  # Исключаем самого сотрудника
-
-        logger.info(f"Найдено {len(leaders_in_subdiv)} руководителей стажировки в подразделении")
-
-        if leaders_in_subdiv:
-            leader = leaders_in_subdiv[0]
-            logger.info(f"Найден руководитель стажировки в подразделении: {leader.full_name_nominative}")
-            return leader, "subdivision", True
-
-    # 3. Если не нашли, ищем в организации
-    if employee.organization:
-        leaders_in_org = list(Employee.objects.filter(
-            organization=employee.organization,
-            position__can_be_internship_leader=True,
-        ).exclude(id=employee.id))  # Исключаем самого сотрудника
-
-        logger.info(f"Найдено {len(leaders_in_org)} руководителей стажировки в организации")
-
-        if leaders_in_org:
-            leader = leaders_in_org[0]
-            logger.info(f"Найден руководитель стажировки в организации: {leader.full_name_nominative}")
-            return leader, "organization", True
-
-    # Если нигде не нашли - возвращаем отрицательный результат
-    logger.warning(f"Руководитель стажировки для {employee.full_name_nominative} не найден")
-    return None, None, False
+    leader, level, success = (resolver or OrgStructureResolver()).internship_leader(employee)
+    if success:
+        logger.info("Найден руководитель стажировки (%s): %s", level, leader.full_name_nominative)
+    else:
+        logger.warning("Руководитель стажировки для %s не найден", employee.full_name_nominative)
+    return leader, level, success
 
 
-def get_document_signer(employee):
+def get_document_signer(employee, resolver=None):
     """
     Получает подписанта документов для сотрудника с учетом иерархии.
     Ищет только сотрудников с явно установленным флагом can_sign_orders=True.
+    Поиск идёт по кэшированному снимку организации (OrgStructureResolver).
 
     Args:
         employee: Объект сотрудника Employee
+        resolver: OrgStructureResolver, общий для пачки документов (опционально)
     Returns:
         tuple: (signer, level, success)
         где level: "department", "subdivision", "organization"
     """
-    logger.info(f"Поиск подписанта документов для сотрудника {employee.full_name_nominative}")
-
-    # 1. Сначала ищем в отделе
-    if employee.department:
-        signer = employee.department.employees.filter(
-            position__can_sign_orders=True
-        ).first()
-        if signer:
-            logger.info(f"Найден подписант в отделе: {signer.full_name_nominative}")
-            return signer, "department", True
-
-    # 2. Если не нашли, ищем в подразделении
-    if employee.subdivision:
-        signer = Employee.objects.filter(
-            subdivision=employee.subdivision,
-            position__can_sign_orders=True,
-        ).first()
-        if signer:
-            logger.info(f"Найден подписант в подразделении: {signer.full_name_nominative}")
-            return signer, "subdivision", True
-
-    # 3. Если не нашли, ищем в организации
-    if employee.organization:
-        signer = Employee.objects.filter(
-            organization=employee.organization,
-            position__can_sign_orders=True,
-        ).first()
-        if signer:
-            logger.info(f"Найден подписант в организации: {signer.full_name_nominative}")
-            return signer, "organization", True
-
-    # Если нигде не нашли
-    logger.warning(f"Подписант документов для {employee.full_name_nominative} не найден")
-    return None, None, False
+    logger.info("Поиск подписанта документов для сотрудника %s", employee.full_name_nominative)
+
+    signer, level, success = (resolver or OrgStructureResolver()).document_signer(employee)
+    if success:
+        logger.info("Найден подписант (%s): %s", level, signer.full_name_nominative)
+    else:
+        logger.warning("Подписант документов для %s не найден", employee.full_name_nominative)
+    return signer, level, success
 
 
 def get_internship_leader_position(employee):
@@ -186,11 +123,8 @@ def format_commission_member(employee):
     Returns:
         str: Строка вида "Иванов И.И., директор"
     """
-    from directory.utils.declension import get_initials_from_name
-    from directory.models import Employee # Ensure Employee is available if not globally imported
-
     if not isinstance(employee, Employee):
-        logger.error(f"Invalid type passed to format_commission_member: {type(employee)}")
+        logger.error("Invalid type passed to format_commission_member: %s", type(employee))
         return "Ошибка формата" # Or handle appropriately
 
     position_name = ""
@@ -203,7 +137,7 @@ def format_commission_member(employee):
     if hasattr(employee, 'full_name_nominative') and isinstance(employee.full_name_nominative, str):
          name_initials = get_initials_from_name(employee.full_name_nominative)
     else:
-         logger.warning(f"Employee {employee.id} has no full_name_nominative or it's not a string.")
+         logger.warning("Employee %s has no full_name_nominative or it's not a string.", employee.id)
 
 
     # Формируем строку вида "Иванов И.И., директор"
@@ -221,138 +155,62 @@ def default_commission():
         'secretary': "Кузнецова К.К., секретарь"
     }
 
-def get_commission_members(employee):
+def get_commission_members(employee, resolver=None):
     """
     Получает список членов комиссии для протокола проверки знаний.
-    Поиск ВСЕХ ролей (chairman, member, secretary) выполняется
-    напрямую в организации сотрудника,
-    у которых в должности указана соответствующая роль commission_role.
-    (Подразумевается, что неактивные сотрудники не должны иметь таких ролей
-    или должны быть удалены из системы)
+    Комиссия (тип "ot") ищется по иерархии отдел → подразделение → организация
+    среди активных комиссий, в расчёт берутся активные участники.
 
     Args:
         employee: Объект сотрудника Employee
+        resolver: OrgStructureResolver, общий для пачки документов (опционально)
     Returns:
         tuple: (members_list, success) - members_list содержит найденных членов в виде словарей,
                success=True если найдены председатель, секретарь и хотя бы 1 член.
     """
-    from directory.models import Employee # Ensure Employee is available
-    import logging # Ensure logging is available
-
-    logger = logging.getLogger(__name__) # Ensure logger is initialized
-
     # Проверяем организацию
-    if not employee.organization:
-        logger.warning(f"У сотрудника {employee.pk} ({employee.full_name_nominative}) не указана организация")
+    if not employee.organization_id:
+        logger.warning("У сотрудника %s (%s) не указана организация", employee.pk, employee.full_name_nominative)
         return [], False
 
-    organization = employee.organization
-    commission = {
-        'chairman': None,
-        'members': [],
-        'secretary': None
-    }
-    chairman_found_obj = None
-    members_found_objs = []
-    secretary_found_obj = None
-    # Get organization name safely for logging, falling back to ID
-    organization_name_for_log = getattr(organization, 'name', None) # Use getattr for safety
-    if organization_name_for_log is None and hasattr(organization, 'full_name'): # Check for full_name if name is missing
-         organization_name_for_log = getattr(organization, 'full_name', str(organization.id))
-    elif organization_name_for_log is None: # Fallback to ID if neither name nor full_name exists
-         organization_name_for_log = str(organization.id)
-
-
-    # 1. Ищем председателя комиссии ВО ВСЕЙ ОРГАНИЗАЦИИ
-    try:
-        chairman_found_obj = Employee.objects.filter(
-            organization=organization,
-            position__commission_role='chairman' # Removed is_active=True
-        ).select_related('position').first()
-        if chairman_found_obj:
-            commission['chairman'] = format_commission_member(chairman_found_obj)
-            logger.info(f"Найден председатель во всей организации: {commission['chairman']}")
-        else:
-             logger.warning(f"Председатель комиссии не найден во всей организации {organization_name_for_log}")
-    except Exception as e:
-        # Log the error with traceback
-        logger.error(f"Ошибка при поиске председателя комиссии в организации {organization_name_for_log}: {e}", exc_info=True)
-
-
-    # 2. Ищем членов комиссии ВО ВСЕЙ ОРГАНИЗАЦИИ
-    try:
-        members_found_objs = list(Employee.objects.filter(
-            organization=organization,
-            position__commission_role='member' # Removed is_active=True
-        ).select_related('position'))
-        commission['members'] = [format_commission_member(m) for m in members_found_objs]
-        logger.info(f"Найдено членов комиссии во всей организации: {len(commission['members'])}")
-        if not commission['members']:
-            logger.warning(f"Члены комиссии не найдены во всей организации {organization_name_for_log}")
-    except Exception as e:
-        logger.error(f"Ошибка при поиске членов комиссии в организации {organization_name_for_log}: {e}", exc_info=True)
-
+    commission = (resolver or OrgStructureResolver()).commission(employee)
+    if commission is None:
+        logger.warning("Комиссия по проверке знаний для %s не найдена", employee.full_name_nominative)
+        return [], False
 
-    # 3. Ищем секретаря комиссии ВО ВСЕЙ ОРГАНИЗАЦИИ
-    try:
-        secretary_found_obj = Employee.objects.filter(
-            organization=organization,
-            position__commission_role='secretary' # Removed is_active=True
-        ).select_related('position').first()
-        if secretary_found_obj:
-            commission['secretary'] = format_commission_member(secretary_found_obj)
-            logger.info(f"Найден секретарь во всей организации: {commission['secretary']}")
-        else:
-             logger.warning(f"Секретарь комиссии не найден во всей организации {organization_name_for_log}")
-    except Exception as e:
-        logger.error(f"Ошибка при поиске секретаря комиссии в организации {organization_name_for_log}: {e}", exc_info=True)
+    role_labels = {
+        'chairman': "Председатель комиссии",
+        'member': "Член комиссии",
+        'secretary': "Секретарь комиссии",
+    }
+    by_role = {role: [] for role in role_labels}
+    for member in commission.active_members:
+        by_role.setdefault(member.role, []).append(member.employee)
 
+    # Председатель, затем члены комиссии, затем секретарь
+    result = []
+    for role, employees in (
+        ('chairman', by_role['chairman'][:1]),
+        ('member', by_role['member']),
+        ('secretary', by_role['secretary'][:1]),
+    ):
+        for member_employee in employees:
+            result.append({
+                "role": role_labels[role],
+                "name": format_commission_member(member_employee),  # Уже содержит должность
+                "employee_obj": member_employee,
+            })
 
     # Проверяем, удалось ли найти минимально необходимый состав
-    success = (
-        commission['chairman'] is not None and
-        len(commission['members']) >= 1 and
-        commission['secretary'] is not None
-    )
-
+    success = bool(by_role['chairman'] and by_role['member'] and by_role['secretary'])
     if not success:
         logger.warning(
-            f"Не удалось найти полный минимальный состав комиссии для {employee.full_name_nominative} в организации {organization_name_for_log}. "
-            f"Найдено: председатель={'Да' if commission['chairman'] else 'Нет'}, "
-            f"членов={len(commission['members'])}, "
-            f"секретарь={'Да' if commission['secretary'] else 'Нет'}"
+            "Не удалось найти полный минимальный состав комиссии %s для %s. "
+            "Найдено: председатель=%s, членов=%s, секретарь=%s",
+            commission.name, employee.full_name_nominative,
+            'Да' if by_role['chairman'] else 'Нет', len(by_role['member']), 'Да' if by_role['secretary'] else 'Нет'
         )
 
-    # Преобразуем результат в список словарей для get_commission_formatted
-    result = []
-
-    # Добавляем председателя, если найден
-    if chairman_found_obj:
-        result.append({
-            "role": "Председатель комиссии",
-            "name": commission['chairman'], # Уже содержит должность
-            "employee_obj": chairman_found_obj
-        })
-
-    # Добавляем членов комиссии, если найдены
-    for idx, member_str in enumerate(commission['members']):
-         if idx < len(members_found_objs): # Защита от рассогласования
-            member_obj = members_found_objs[idx] # Получаем объект Employee
-            result.append({
-                "role": "Член комиссии",
-                "name": member_str, # Уже содержит должность
-                "employee_obj": member_obj
-            })
-
-    # Добавляем секретаря, если найден
-    if secretary_found_obj:
-        result.append({
-            "role": "Секретарь комиссии",
-            "name": commission['secretary'], # Уже содержит должность
-            "employee_obj": secretary_found_obj
-        })
-
-    # Возвращаем список найденных членов и флаг успеха (полный ли состав)
     return result, success
 
 # --- Остальной код файла ---
@@ -373,7 +231,7 @@ def get_employee_documents(employee):
             return documents_list, True
 
     # Не найдено
-    logger.warning(f"Для сотрудника {employee.full_name_nominative} не найдены документы для ознакомления")
+    logger.warning("Для сотрудника %s не найдены документы для ознакомления", employee.full_name_nominative)
     return None, False
 
 
@@ -460,11 +318,11 @@ def prepare_internship_context(employee, context=None):
         })
 
         # Добавляем лог об успешном склонении
-        logger.info(f"Подготовлен контекст руководителя стажировки во всех падежах для {employee.full_name_nominative}")
+        logger.info("Подготовлен контекст руководителя стажировки во всех падежах для %s", employee.full_name_nominative)
     else:
         # Для случая отсутствия руководителя не добавляем никаких заглушек,
         # а оставляем поля пустыми, чтобы не вводить пользователя в заблуждение
-        logger.error(f"Руководитель стажировки не найден для сотрудника {employee.full_name_nominative}")
+        logger.error("Руководитель стажировки не найден для сотрудника %s", employee.full_name_nominative)
         # Мы НЕ добавляем заглушки, так как это может привести к ошибкам в документе
 
     return context
@@ -548,10 +406,10 @@ def prepare_director_context(employee, context=None):
             'director_level': level,
         })
 
-        logger.info(f"Подготовлен контекст подписанта документа во всех падежах для {employee.full_name_nominative}")
+        logger.info("Подготовлен контекст подписанта документа во всех падежах для %s", employee.full_name_nominative)
     else:
         # Если подписант не найден - не добавляем заглушки
-        logger.error(f"Подписант документа не найден для сотрудника {employee.full_name_nominative}")
+        logger.error("Подписант документа не найден для сотрудника %s", employee.full_name_nominative)
 
     return context
 
@@ -571,7 +429,7 @@ def get_commission_formatted(employee):
 
     # Возвращаем пустые данные, если комиссия не найдена ИЛИ состав неполный
     if not success or not commission_members_list:
-        logger.warning(f"Не удалось получить полный состав комиссии для сотрудника {employee.full_name_nominative}")
+        logger.warning("Не удалось получить полный состав комиссии для сотрудника %s", employee.full_name_nominative)
         # Не создаем заглушки, возвращаем пустой словарь и False
         return {}, False
 
@@ -585,7 +443,7 @@ def get_commission_formatted(employee):
             member_obj = member_data.get('employee_obj') # Получаем объект сотрудника
 
             if not member_obj:
-                logger.warning(f"Отсутствует объект сотрудника для члена комиссии: {member_data.get('name')}")
+                logger.warning("Отсутствует объект сотрудника для члена комиссии: %s", member_data.get('name'))
                 continue # Пропускаем, если нет объекта
 
             name = member_obj.full_name_nominative
@@ -615,7 +473,7 @@ def get_commission_formatted(employee):
                     'name_prepositional': decline_full_name(name, 'loct'),
                 })
             except Exception as e:
-                 logger.error(f"Ошибка склонения для {name}, {position}: {e}")
+                 logger.error("Ошибка склонения для %s, %s: %s", name, position, e)
                  # Можно добавить пустые строки или оставить как есть
 
             # Распределяем по ролям
@@ -650,13 +508,13 @@ def get_commission_formatted(employee):
         required_keys_in_result = ['chairman', 'members', 'secretary']
         missing_keys = [key for key in required_keys_in_result if key not in result]
         if missing_keys:
-            logger.warning(f"В итоговых данных комиссии отсутствуют ключи: {', '.join(missing_keys)}")
+            logger.warning("В итоговых данных комиссии отсутствуют ключи: %s", ', '.join(missing_keys))
             # Возвращаем то, что есть, но с флагом неуспешности
             return result, False
 
-        logger.info(f"Успешно сформированы данные комиссии для {employee.full_name_nominative}")
+        logger.info("Успешно сформированы данные комиссии для %s", employee.full_name_nominative)
         return result, True # Успех, так как success был True и форматирование прошло
 
     except Exception as e:
-        logger.exception(f"Ошибка при форматировании данных комиссии: {e}") # Используем exception для стектрейса
+        logger.exception("Ошибка при форматировании данных комиссии: %s", e) # Используем exception для стектрейса
         return {}, False
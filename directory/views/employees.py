@@ -16,6 +16,7 @@ from directory.forms.employee_hiring import EmployeeHiringForm
 from directory.utils.declension import decline_full_name
 from directory.mixins import AccessControlMixin, AccessControlObjectMixin
 from directory.utils.permissions import AccessControlHelper
+from directory.utils.search import search_queryset
 
 
 class EmployeeListView(LoginRequiredMixin, AccessControlMixin, ListView):
@@ -41,7 +42,7 @@ class EmployeeListView(LoginRequiredMixin, AccessControlMixin, ListView):
         # Поиск по имени
         search = self.request.GET.get('search')
         if search:
-            queryset = queryset.filter(full_name_nominative__icontains=search)
+            queryset = search_queryset(queryset, search).order_by('search_rank', 'full_name_nominative')
 
         return queryset.select_related('position', 'subdivision', 'organization', 'department')
 
@@ -88,7 +89,7 @@ class EmployeeTreeView(LoginRequiredMixin, AccessControlMixin, ListView):
         # Поиск по имени
         search = self.request.GET.get('search')
         if search:
-            queryset = queryset.filter(full_name_nominative__icontains=search)
+            queryset = search_queryset(queryset, search).order_by('search_rank', 'full_name_nominative')
 
         # 🚀 ОПТИМИЗАЦИЯ: загружаем все связанные объекты одним запросом
         return queryset.select_related('position', 'subdivision', 'organization', 'department')
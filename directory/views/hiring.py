@@ -10,7 +10,6 @@ from django.urls import reverse_lazy, reverse
 from django.db import transaction
 from django.utils import timezone
 from django.http import JsonResponse, HttpResponseRedirect, HttpResponse
-from django.db.models import Q, Prefetch
 from django import forms
 from crispy_forms.helper import FormHelper
 from django.core.mail import EmailMultiAlternatives
@@ -24,8 +23,9 @@ from directory.models import (
     Position,
     GeneratedDocument
 )
-from deadline_control.models.medical_norm import MedicalExaminationNorm
+from directory.services.position_requirements import get_requirement_profile
 from deadline_control.models import EmailSettings
+from deadline_control.utils.email_templates import render_email_template
 from directory.forms.hiring import CombinedEmployeeHiringForm, DocumentAttachmentForm
 from directory.forms.document_forms import DocumentSelectionForm
 from directory.utils.hiring_utils import create_hiring_from_employee, attach_document_to_hiring
@@ -33,6 +33,7 @@ from directory.utils.declension import decline_full_name, get_initials_from_name
 from directory.forms.mixins import OrganizationRestrictionFormMixin
 from directory.mixins import AccessControlMixin, AccessControlObjectMixin
 from directory.utils.permissions import AccessControlHelper
+from directory.utils.search import search_filter
 from directory.views.documents.selection import get_auto_selected_document_types
 from directory.utils.email_recipients import collect_recipients_for_subdivision
 
@@ -175,49 +176,32 @@ def position_requirements_api(request, position_id):
         JsonResponse с данными о требованиях должности
     """
     try:
-        # Получаем должность или 404
-        position = get_object_or_404(Position, pk=position_id)
-
-        # Проверяем переопределения для медосмотра
-        has_custom_medical = position.medical_factors.filter(is_disabled=False).exists()
-
-        # Проверяем эталонные нормы, если нет переопределений
-        has_reference_medical = False
-        if not has_custom_medical:
-            has_reference_medical = MedicalExaminationNorm.objects.filter(
-                position_name=position.position_name
-            ).exists()
-
-        # Проверяем переопределения для СИЗ
-        has_custom_siz = position.siz_norms.exists()
-
-        # Проверяем эталонные нормы СИЗ, если нет переопределений
-        has_reference_siz = False
-        if not has_custom_siz:
-            has_reference_siz = Position.find_reference_norms(position.position_name).exists()
+        # Получаем должность вместе с профилем требований или 404
+        position = get_object_or_404(Position.objects.select_related('requirement_profile'), pk=position_id)
+        requirements = get_requirement_profile(position)
 
         # Логируем информацию для отладки
         logger.info(
             f"Position '{position.position_name}' (ID={position.id}): "
-            f"has_custom_medical={has_custom_medical}, "
-            f"has_reference_medical={has_reference_medical}, "
-            f"has_custom_siz={has_custom_siz}, "
-            f"has_reference_siz={has_reference_siz}"
+            f"has_custom_medical={requirements.has_custom_medical}, "
+            f"has_reference_medical={requirements.has_reference_medical}, "
+            f"has_custom_siz={requirements.has_custom_siz}, "
+            f"has_reference_siz={requirements.has_reference_siz}"
         )
 
         # Формируем ответ
         response_data = {
             'position_id': position.id,
             'position_name': position.position_name,
-            'needs_medical': has_custom_medical or has_reference_medical,
-            'needs_siz': has_custom_siz or has_reference_siz,
+            'needs_medical': requirements.needs_medical,
+            'needs_siz': requirements.needs_siz,
             'status': 'success',
             # Отладочная информация
             'debug': {
-                'has_custom_medical': has_custom_medical,
-                'has_reference_medical': has_reference_medical,
-                'has_custom_siz': has_custom_siz,
-                'has_reference_siz': has_reference_siz,
+                'has_custom_medical': requirements.has_custom_medical,
+                'has_reference_medical': requirements.has_reference_medical,
+                'has_custom_siz': requirements.has_custom_siz,
+                'has_reference_siz': requirements.has_reference_siz,
             }
         }
 
@@ -263,8 +247,7 @@ class HiringTreeView(LoginRequiredMixin, AccessControlMixin, ListView):
         search = self.request.GET.get('search')
         if search:
             queryset = queryset.filter(
-                Q(employee__full_name_nominative__icontains=search) |
-                Q(position__position_name__icontains=search)
+                search_filter(search, ('employee__search_text', 'position__search_text'))
             )
 
         return queryset.select_related(
@@ -379,8 +362,7 @@ class HiringListView(LoginRequiredMixin, AccessControlMixin, ListView):
         search = self.request.GET.get('search')
         if search:
             queryset = queryset.filter(
-                Q(employee__full_name_nominative__icontains=search) |
-                Q(position__position_name__icontains=search)
+                search_filter(search, ('employee__search_text', 'position__search_text'))
             )
 
         return queryset.select_related(
@@ -701,8 +683,8 @@ class HiringDetailView(LoginRequiredMixin, AccessControlObjectMixin, DetailView)
 
         # ШАГ 7: Форматировать тему и тело письма
         try:
-            subject = subject_template.format(**template_vars)
-            html_message = body_template.format(**template_vars)
+            subject = render_email_template(subject_template, template_vars)
+            html_message = render_email_template(body_template, template_vars)
         except KeyError as e:
             messages.error(
                 request,
@@ -990,8 +972,8 @@ def preview_hiring_email(request, hiring_id):
 
     # Форматировать тему и тело
     try:
-        subject = subject_template.format(**template_vars)
-        html_body = body_template.format(**template_vars)
+        subject = render_email_template(subject_template, template_vars)
+        html_body = render_email_template(body_template, template_vars)
     except KeyError as e:
         return JsonResponse({'error': f'Ошибка в шаблоне: переменная {e} не найдена'}, status=500)
 
@@ -1200,8 +1182,8 @@ def send_hiring_documents(request, hiring_id):
 
     # ШАГ 8: Форматировать тему и тело письма
     try:
-        subject = subject_template.format(**template_vars)
-        html_message = body_template.format(**template_vars)
+        subject = render_email_template(subject_template, template_vars)
+        html_message = render_email_template(body_template, template_vars)
     except KeyError as e:
         messages.error(
             request,
@@ -19,7 +19,7 @@ from directory.models import (
 )
 from directory.forms.hiring import CombinedEmployeeHiringForm
 from directory.utils.declension import decline_full_name
-from deadline_control.models.medical_norm import MedicalExaminationNorm
+from directory.services.position_requirements import get_requirement_profile
 
 
 class SimpleHiringView(LoginRequiredMixin, FormView):
@@ -132,33 +132,16 @@ def position_requirements_api(request, position_id):
         JsonResponse с данными о требованиях должности
     """
     try:
-        # Получаем должность или 404
-        position = get_object_or_404(Position, pk=position_id)
-
-        # Проверяем переопределения для медосмотра
-        has_custom_medical = position.medical_factors.filter(is_disabled=False).exists()
-
-        # Проверяем эталонные нормы, если нет переопределений
-        has_reference_medical = False
-        if not has_custom_medical:
-            has_reference_medical = MedicalExaminationNorm.objects.filter(
-                position_name=position.position_name
-            ).exists()
-
-        # Проверяем переопределения для СИЗ
-        has_custom_siz = position.siz_norms.exists()
-
-        # Проверяем эталонные нормы СИЗ, если нет переопределений
-        has_reference_siz = False
-        if not has_custom_siz:
-            has_reference_siz = Position.find_reference_norms(position.position_name).exists()
+        # Получаем должность вместе с профилем требований или 404
+        position = get_object_or_404(Position.objects.select_related('requirement_profile'), pk=position_id)
+        requirements = get_requirement_profile(position)
 
         # Формируем ответ
         response_data = {
             'position_id': position.id,
             'position_name': position.position_name,
-            'needs_medical': has_custom_medical or has_reference_medical,
-            'needs_siz': has_custom_siz or has_reference_siz,
+            'needs_medical': requirements.needs_medical,
+            'needs_siz': requirements.needs_siz,
             'status': 'success'
         }
 
@@ -1,3 +1,8 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.urls import reverse
 from django.views.generic import TemplateView
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.shortcuts import render, redirect
@@ -15,10 +20,36 @@ from directory.models import (
     Employee,
     Position
 )
+from directory.services.org_structure import OrgStructureResolver
 from directory.utils.permissions import AccessControlHelper
+from directory.utils.search import search_filter
 
 logger = logging.getLogger(__name__)
 
+# Поиск по ФИО сотрудника и названию должности
+EMPLOYEE_SEARCH_FIELDS = ('search_text', 'position__search_text')
+
+# Ссылки в строке сотрудника: {% url %} на каждую строку заменён префиксом + id
+EMPLOYEE_ROW_URLS = {
+    'document_selection': 'directory:documents:document_selection',
+    'siz_personal_card': 'directory:siz:siz_personal_card',
+}
+
+
+def employee_url_prefixes():
+    """
+    Префиксы ссылок строки сотрудника: reverse(name, args=[0]) без "0/".
+
+    В шаблоне: href="{{ employee_urls.document_selection }}{{ employee.id }}/"
+    """
+    prefixes = {}
+    for key, name in EMPLOYEE_ROW_URLS.items():
+        url = reverse(name, args=[0])
+        if not url.endswith('/0/'):
+            raise ImproperlyConfigured(f"URL {name} должен заканчиваться на <id>/: {url}")
+        prefixes[key] = url[:-2]
+    return prefixes
+
 
 class HomePageView(LoginRequiredMixin, TemplateView):
     """
@@ -110,10 +141,7 @@ class HomePageView(LoginRequiredMixin, TemplateView):
 
         # Если есть поиск, применяем его и к кандидатам
         if search_query:
-            candidate_employees = candidate_employees.filter(
-                Q(full_name_nominative__icontains=search_query) |
-                Q(position__position_name__icontains=search_query)
-            )
+            candidate_employees = candidate_employees.filter(search_filter(search_query, EMPLOYEE_SEARCH_FIELDS))
 
         # Добавляем кандидатов в контекст
         context['candidate_employees'] = candidate_employees
@@ -127,8 +155,7 @@ class HomePageView(LoginRequiredMixin, TemplateView):
 
             # Фильтруем сотрудников по поисковому запросу
             # Исключаем кандидатов и уволенных (если show_fired не включено)
-            employee_filter = Q(full_name_nominative__icontains=search_query) | Q(
-                position__position_name__icontains=search_query)
+            employee_filter = search_filter(search_query, EMPLOYEE_SEARCH_FIELDS)
             status_filter = ~Q(status='candidate')
             if not show_fired:
                 status_filter &= ~Q(status='fired')
@@ -158,9 +185,18 @@ class HomePageView(LoginRequiredMixin, TemplateView):
         # 📝 Подготавливаем данные для древовидной структуры
         organizations = []
 
+        # 👥 Сотрудники дерева (без кандидатов и уволенных, если show_fired не включено)
+        tree_employees_filter = ~Q(status='candidate')
+        if not show_fired:
+            tree_employees_filter &= ~Q(status='fired')
+        if selected_status:
+            tree_employees_filter &= Q(status=selected_status)
+        if search_query:
+            tree_employees_filter &= search_filter(search_query, EMPLOYEE_SEARCH_FIELDS)
+
         # 📊 Для каждой организации получаем древовидную структуру
         for org in allowed_orgs:
-            # 📋 Получаем подразделения организации
+            # 📋 Подразделения и отделы организации
             subdivisions = StructuralSubdivision.objects.filter(
                 organization=org
             ).prefetch_related(
@@ -170,100 +206,57 @@ class HomePageView(LoginRequiredMixin, TemplateView):
                 )
             )
 
-            # 👥 Получаем сотрудников без подразделения (напрямую в организации),
-            # исключая кандидатов и уволенных (если show_fired не включено)
-            org_employees_filter = Q(organization=org, subdivision__isnull=True) & ~Q(status='candidate')
-            if not show_fired:
-                org_employees_filter &= ~Q(status='fired')
-
-            if selected_status:
-                org_employees_filter &= Q(status=selected_status)
-
-            org_employees = Employee.objects.filter(org_employees_filter).select_related('position')
-
-            # Если есть поисковый запрос, фильтруем сотрудников
-            if search_query:
-                org_employees = org_employees.filter(
-                    Q(full_name_nominative__icontains=search_query) |
-                    Q(position__position_name__icontains=search_query)
-                )
+            # 👥 Все сотрудники организации одним запросом, раскладываем по уровням дерева
+            grouped = defaultdict(list)
+            org_employees = Employee.objects.filter(tree_employees_filter, organization=org).select_related('position')
+            for employee in org_employees:
+                if employee.department_id:
+                    grouped['dept', employee.department_id].append(employee)
+                elif employee.subdivision_id:
+                    grouped['sub', employee.subdivision_id].append(employee)
+                else:
+                    grouped['org', org.id].append(employee)
 
             # 🏢 Формируем структуру организации
             org_data = {
                 'id': org.id,
                 'name': org.full_name_ru,
                 'short_name': org.short_name_ru,
-                'employees': list(org_employees),
-                'subdivisions': []
+                'employees': grouped['org', org.id],
+                'subdivisions': [],
+                # Ключ фрагментного кэша отделов: версия оргструктуры и фильтры дерева
+                'tree_cache_key': (
+                    OrgStructureResolver.structure_version(org.id),
+                    show_fired, selected_status, search_query,
+                ),
             }
 
-            # 🏭 Для каждого подразделения получаем отделы и сотрудников
+            # 🏭 Для каждого подразделения раскладываем отделы и сотрудников
             for subdivision in subdivisions:
-                # 👥 Сотрудники подразделения без отдела
-                # исключая кандидатов и уволенных (если show_fired не включено)
-                sub_employees_filter = Q(subdivision=subdivision, department__isnull=True) & ~Q(status='candidate')
-                if not show_fired:
-                    sub_employees_filter &= ~Q(status='fired')
-
-                if selected_status:
-                    sub_employees_filter &= Q(status=selected_status)
-
-                sub_employees = Employee.objects.filter(sub_employees_filter).select_related('position')
-
-                # Если есть поисковый запрос, фильтруем сотрудников
-                if search_query:
-                    sub_employees = sub_employees.filter(
-                        Q(full_name_nominative__icontains=search_query) |
-                        Q(position__position_name__icontains=search_query)
-                    )
-
-                # 🏭 Формируем структуру подразделения
                 sub_data = {
                     'id': subdivision.id,
                     'name': subdivision.name,
-                    'employees': list(sub_employees),
-                    'departments': []
+                    'employees': grouped['sub', subdivision.id],
+                    'departments': [
+                        {
+                            'id': department.id,
+                            'name': department.name,
+                            'employees': grouped['dept', department.id],
+                        }
+                        for department in subdivision.departments.all()
+                    ]
                 }
 
-                # 📂 Для каждого отдела получаем сотрудников
-                for department in subdivision.departments.all():
-                    # 👥 Сотрудники отдела
-                    # исключая кандидатов и уволенных (если show_fired не включено)
-                    dept_employees_filter = Q(department=department) & ~Q(status='candidate')
-                    if not show_fired:
-                        dept_employees_filter &= ~Q(status='fired')
-
-                    if selected_status:
-                        dept_employees_filter &= Q(status=selected_status)
-
-                    dept_employees = Employee.objects.filter(dept_employees_filter).select_related('position')
-
-                    # Если есть поисковый запрос, фильтруем сотрудников
-                    if search_query:
-                        dept_employees = dept_employees.filter(
-                            Q(full_name_nominative__icontains=search_query) |
-                            Q(position__position_name__icontains=search_query)
-                        )
-
-                    # 📂 Формируем структуру отдела
-                    dept_data = {
-                        'id': department.id,
-                        'name': department.name,
-                        'employees': list(dept_employees)
-                    }
-
-                    sub_data['departments'].append(dept_data)
-
                 # Добавляем подразделение только если в нем есть сотрудники (учитывая поиск)
                 if search_query:
-                    if sub_employees.count() > 0 or any(len(dept['employees']) > 0 for dept in sub_data['departments']):
+                    if sub_data['employees'] or any(dept['employees'] for dept in sub_data['departments']):
                         org_data['subdivisions'].append(sub_data)
                 else:
                     org_data['subdivisions'].append(sub_data)
 
             # Добавляем организацию, если она не пустая в контексте поиска
-            if not search_query or org_employees.count() > 0 or any(
-                    len(sub['employees']) > 0 for sub in org_data['subdivisions']):
+            if not search_query or org_data['employees'] or any(
+                    sub['employees'] for sub in org_data['subdivisions']):
                 organizations.append(org_data)
 
         # 📄 Добавляем пагинацию организаций
@@ -280,6 +273,8 @@ class HomePageView(LoginRequiredMixin, TemplateView):
         context['organizations'] = organizations_page
         context['paginator'] = paginator
         context['is_paginated'] = paginator.num_pages > 1
+        context['employee_urls'] = employee_url_prefixes()
+        context['tree_cache_timeout'] = getattr(settings, 'HOME_TREE_CACHE_TIMEOUT', 3600)
 
         return context
 
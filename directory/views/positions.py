@@ -6,6 +6,7 @@ from directory.models import Position, Organization, StructuralSubdivision, Depa
 from directory.forms import PositionForm
 from directory.mixins import AccessControlMixin, AccessControlObjectMixin
 from directory.utils.permissions import AccessControlHelper
+from directory.utils.search import search_queryset
 
 class PositionListView(LoginRequiredMixin, AccessControlMixin, ListView):
     model = Position
@@ -30,7 +31,7 @@ class PositionListView(LoginRequiredMixin, AccessControlMixin, ListView):
         # Поиск по названию должности
         search = self.request.GET.get('search')
         if search:
-            queryset = queryset.filter(position_name__icontains=search)
+            queryset = search_queryset(queryset, search).order_by('search_rank', 'position_name')
 
         return queryset.select_related('organization', 'subdivision', 'department')
 
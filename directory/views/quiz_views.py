@@ -42,6 +42,23 @@ def _find_first_skipped_question(attempt: QuizAttempt) -> Optional[int]:
     return None
 
 
+def _get_question_ids(attempt: QuizAttempt, request=None):
+    """
+    Порядок вопросов попытки из QuizQuestionOrder.
+
+    Сессия используется только как fallback для старых попыток,
+    созданных до переноса порядка вопросов в БД.
+    """
+    question_ids = list(
+        QuizQuestionOrder.objects.filter(attempt=attempt)
+        .order_by('order')
+        .values_list('question_id', flat=True)
+    )
+    if not question_ids and request is not None:
+        question_ids = request.session.get(f'quiz_questions_{attempt.id}') or []
+    return question_ids
+
+
 def _finalize_attempt(attempt: QuizAttempt, request, failure_reason: str = QuizAttempt.FAILURE_NONE):
     """Фиксируем завершение попытки и очищаем сессию."""
     if attempt.status != QuizAttempt.STATUS_COMPLETED:
@@ -270,10 +287,6 @@ def quiz_start(request, quiz_id, category_id=None):
         for i, q in enumerate(questions)
     ])
 
-    # Также сохраняем в сессии для обратной совместимости (legacy)
-    request.session[f'quiz_questions_{attempt.id}'] = [q.id for q in questions]
-    request.session.modified = True
-
     # Увеличиваем счетчик попыток
     quiz.attempts_count += 1
     quiz.save(update_fields=['attempts_count'])
@@ -302,22 +315,15 @@ def quiz_question(request, attempt_id, question_number):
         messages.error(request, 'Время экзамена истекло.')
         return redirect('directory:quiz:quiz_result', attempt_id=attempt.id)
 
-    # Получаем порядок вопросов из БД (приоритет) или из сессии (fallback)
-    question_orders = QuizQuestionOrder.objects.filter(attempt=attempt).order_by('order')
-
-    if question_orders.exists():
-        # Загружаем из БД
-        question_ids = [qo.question_id for qo in question_orders]
-    else:
-        # Fallback на сессию (для старых попыток)
-        question_ids = request.session.get(f'quiz_questions_{attempt.id}')
-        if not question_ids:
-            messages.error(request, 'Не удалось загрузить вопросы. Начните экзамен заново.')
-            # В токен-режиме возвращаем на exam_home
-            token_mode = request.session.get('quiz_token_mode', False)
-            if token_mode:
-                return redirect('directory:quiz:exam_home')
-            return redirect('directory:quiz:quiz_list')
+    # Порядок вопросов хранится в БД (QuizQuestionOrder), сессия - только для старых попыток
+    question_ids = _get_question_ids(attempt, request)
+    if not question_ids:
+        messages.error(request, 'Не удалось загрузить вопросы. Начните экзамен заново.')
+        # В токен-режиме возвращаем на exam_home
+        token_mode = request.session.get('quiz_token_mode', False)
+        if token_mode:
+            return redirect('directory:quiz:exam_home')
+        return redirect('directory:quiz:quiz_list')
 
     # Проверяем номер вопроса
     if question_number < 1 or question_number > len(question_ids):
@@ -413,7 +419,7 @@ def quiz_answer(request, attempt_id, question_id):
 
     if existing_answer:
         # Уже отвечали на этот вопрос
-        question_ids = request.session.get(f'quiz_questions_{attempt.id}', [])
+        question_ids = _get_question_ids(attempt, request)
         current_index = question_ids.index(question_id)
         next_question = current_index + 2  # +1 для индекса, +1 для следующего
 
@@ -456,7 +462,7 @@ def quiz_answer(request, attempt_id, question_id):
                 'redirect': result_url
             })
 
-        question_ids = request.session.get(f'quiz_questions_{attempt.id}', [])
+        question_ids = _get_question_ids(attempt, request)
         current_index = question_ids.index(question_id)
         next_question = current_index + 2
         if next_question <= len(question_ids):
@@ -511,7 +517,7 @@ def quiz_answer(request, attempt_id, question_id):
     correct_answer = question.get_correct_answer()
 
     # Определяем, есть ли еще вопросы
-    question_ids = request.session.get(f'quiz_questions_{attempt.id}', [])
+    question_ids = _get_question_ids(attempt, request)
     current_index = question_ids.index(question_id)
     has_next = current_index < len(question_ids) - 1
 
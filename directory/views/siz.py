@@ -5,8 +5,7 @@ from django.http import JsonResponse, HttpResponse
 from django.urls import reverse_lazy
 from django.views.decorators.http import require_GET, require_POST
 from django.contrib.auth.decorators import login_required
-from django.db.models import Count, Q, Subquery, OuterRef, IntegerField
-from django.db.models.functions import Coalesce
+from django.db.models import Count, Q
 from directory.models import Employee, SIZIssued
 from directory.models.siz import SIZ, SIZNorm
 from directory.models.position import Position
@@ -14,6 +13,7 @@ from directory.models.subdivision import StructuralSubdivision
 from directory.forms.siz import SIZForm, SIZNormForm
 from directory.mixins import AccessControlMixin, AccessControlObjectMixin
 from directory.utils.permissions import AccessControlHelper
+from directory.services.siz_norms import SIZNormResolver
 import zipfile
 import io
 import re
@@ -252,35 +252,19 @@ class SIZMassGenerationView(LoginRequiredMixin, ListView):
             self.request.user, self.request
         )
 
-        # Subquery to get the count of employees with SIZ norms for each subdivision.
-        # We define a subquery that looks at the Employee model.
-        employees_with_norms = Employee.objects.filter(
-            # Then we apply the filter conditions to find employees with SIZ norms.
-            Q(position__siz_norms__isnull=False) |
-            Q(position__position_name__in=Position.objects.filter(
-                siz_norms__isnull=False
-            ).values_list('position_name', flat=True)),
-            # We link each employee to the outer StructuralSubdivision query via their position path.
-            position__department__subdivision=OuterRef('pk')
-        ).order_by().values(
-            # We need to tell the subquery to group by the subdivision to count per subdivision.
-            'position__department__subdivision'
-        ).annotate(
-            # We count the unique employees.
-            count=Count('id', distinct=True)
-        ).values('count')
+        # Нормы есть у сотрудника, если они заданы для его должности или для
+        # должности с тем же названием (эталонной) - т.е. по названию должности
+        position_names = SIZNormResolver().position_names_with_norms()
 
         queryset = StructuralSubdivision.objects.filter(
             organization__in=accessible_orgs
         ).annotate(
-            # Annotate the main queryset with the count from the subquery.
-            # Use Coalesce to handle cases where a subdivision has no such employees (results in NULL).
-            employees_with_norms_count=Coalesce(
-                Subquery(employees_with_norms, output_field=IntegerField()),
-                0
+            employees_with_norms_count=Count(
+                'departments__positions__employee',
+                filter=Q(departments__positions__position_name__in=position_names),
+                distinct=True,
             )
         ).filter(
-            # Now filter the main queryset to only include subdivisions with more than 0 such employees.
             employees_with_norms_count__gt=0
         ).select_related('organization').order_by('organization__full_name_ru', 'name')
 
@@ -324,33 +308,28 @@ def generate_siz_cards_bulk(request):
         generated_count = 0
         errors = []
 
-        for subdivision_id in subdivision_ids:
-            try:
-                subdivision = StructuralSubdivision.objects.get(pk=subdivision_id)
-
-                # Получаем всех сотрудников подразделения, у которых есть нормы СИЗ
-                employees = Employee.objects.filter(
-                    position__department__subdivision=subdivision
-                ).select_related('position', 'position__department')
-
-                for employee in employees:
-                    if not employee.position:
-                        continue
+        subdivisions = StructuralSubdivision.objects.in_bulk(
+            [pk for pk in subdivision_ids if str(pk).isdigit()]
+        )
+        employees_by_subdivision = {}
+        employees = Employee.objects.filter(
+            position__department__subdivision__in=subdivisions.values()
+        ).select_related('position', 'position__department')
+        for employee in employees:
+            employees_by_subdivision.setdefault(employee.position.department.subdivision_id, []).append(employee)
 
-                    # Проверяем, есть ли нормы для должности (прямо или через эталонную)
-                    has_norms = SIZNorm.objects.filter(position=employee.position).exists()
+        # Нормы СИЗ (собственные и эталонные) для всех должностей - одним запросом
+        norm_resolver = SIZNormResolver.for_positions(employee.position for employee in employees)
 
-                    if not has_norms:
-                        # Ищем эталонную должность
-                        reference_positions = Position.objects.filter(
-                            position_name=employee.position.position_name
-                        )
-                        has_norms = any(
-                            SIZNorm.objects.filter(position=pos).exists()
-                            for pos in reference_positions
-                        )
+        for subdivision_id in subdivision_ids:
+            try:
+                subdivision = subdivisions.get(int(subdivision_id)) if str(subdivision_id).isdigit() else None
+                if subdivision is None:
+                    raise StructuralSubdivision.DoesNotExist("Подразделение не найдено")
 
-                    if not has_norms:
+                for employee in employees_by_subdivision.get(subdivision.pk, []):
+                    # Пропускаем сотрудников без норм (ни собственных, ни эталонных)
+                    if not norm_resolver.has_norms(employee.position):
                         continue
 
                     # Генерируем карточку
@@ -360,6 +339,7 @@ def generate_siz_cards_bulk(request):
                             request.user,
                             custom_context,
                             raise_on_error=True,
+                            norm_resolver=norm_resolver,
                         )
                     except Exception as e:
                         errors.append(f"Ошибка генерации для {employee.full_name_nominative}: {e}")
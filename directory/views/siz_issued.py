@@ -1,4 +1,5 @@
 # 📁 directory/views/siz_issued.py
+import logging
 import re
 import random
 from django.views.generic import CreateView, DetailView, FormView, UpdateView
@@ -19,9 +20,12 @@ from django.contrib.auth.decorators import login_required
 from directory.models import Employee, SIZIssued
 from directory.forms.siz_issued import SIZIssueForm, SIZIssueMassForm, SIZIssueReturnForm
 from directory.mixins import AccessControlMixin, AccessControlObjectMixin
+from directory.services.siz_norms import SIZNormResolver
 from directory.utils.permissions import AccessControlHelper
 from directory.utils.siz_sizes import get_employee_sizes
 
+logger = logging.getLogger(__name__)
+
 
 def determine_gender_from_patronymic(full_name):
     """
@@ -268,68 +272,27 @@ class SIZPersonalCardView(LoginRequiredMixin, AccessControlObjectMixin, DetailVi
 
         context['issued_items'] = issued_items
 
-        # Получаем нормы СИЗ для должности сотрудника
+        # Нормы СИЗ должности (собственные или эталонной должности с тем же названием):
+        # индекс норм и сами нормы - два запроса, без повторных count()
         if self.object.position:
-            from directory.models.siz import SIZNorm
-            from directory.models.position import Position
-            import logging
-            logger = logging.getLogger(__name__)
-
-            logger.info(f"Получение норм СИЗ для сотрудника ID={self.object.id}: {self.object.full_name_nominative}")
-            logger.info(f"Должность: {self.object.position.position_name} (ID={self.object.position.id})")
-            logger.info(f"Организация: {self.object.position.organization}")
-
-            # Сначала пытаемся получить нормы для конкретной должности
-            norms = SIZNorm.objects.filter(
-                position=self.object.position
-            ).select_related('siz')
-
-            logger.info(f"Найдено норм СИЗ для должности: {norms.count()}")
-
-            # Если нормы не найдены, ищем эталонную должность с таким же названием
-            if norms.count() == 0:
-                logger.info("Нормы не найдены для конкретной должности, ищем эталонную должность...")
-
-                # Получаем все должности с таким же названием
-                positions_with_same_name = Position.objects.filter(
-                    position_name=self.object.position.position_name
-                ).order_by('organization__full_name_ru')
-
-                # Ищем первую должность с нормами (эталонную)
-                reference_position = None
-                for pos in positions_with_same_name:
-                    if SIZNorm.objects.filter(position=pos).exists():
-                        reference_position = pos
-                        break
-
-                if reference_position:
-                    logger.info(f"Найдена эталонная должность ID={reference_position.id} "
-                              f"в организации {reference_position.organization.short_name_ru}")
-                    norms = SIZNorm.objects.filter(
-                        position=reference_position
-                    ).select_related('siz')
-                    logger.info(f"Загружено норм СИЗ из эталонной должности: {norms.count()}")
-                else:
-                    logger.warning(f"Эталонная должность для '{self.object.position.position_name}' не найдена")
+            norms = SIZNormResolver.for_positions([self.object.position]).norms_for_position(self.object.position)
+            logger.info(
+                "Нормы СИЗ для сотрудника ID=%s (%s): %s",
+                self.object.id, self.object.position.position_name, len(norms)
+            )
 
             # Базовые нормы (без условий)
-            context['base_norms'] = norms.filter(condition='')
-            logger.info(f"Базовых норм (без условий): {context['base_norms'].count()}")
-
-            # Нормы по условиям
-            conditions = list(set(norm.condition for norm in norms if norm.condition))
-            condition_groups = []
-
-            for condition in conditions:
-                condition_norms = [norm for norm in norms if norm.condition == condition]
-                if condition_norms:
-                    condition_groups.append({
-                        'name': condition,
-                        'norms': condition_norms
-                    })
-
-            context['condition_groups'] = condition_groups
-            logger.info(f"Групп норм с условиями: {len(condition_groups)}")
+            context['base_norms'] = [norm for norm in norms if not norm.condition]
+
+            # Нормы по условиям (в порядке норм)
+            grouped = {}
+            for norm in norms:
+                if norm.condition:
+                    grouped.setdefault(norm.condition, []).append(norm)
+            context['condition_groups'] = [
+                {'name': condition, 'norms': condition_norms}
+                for condition, condition_norms in grouped.items()
+            ]
 
         # Определяем пол по отчеству и добавляем в контекст
         gender = determine_gender_from_patronymic(self.object.full_name_nominative)
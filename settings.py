@@ -67,6 +67,7 @@ INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 # 🛠️ Базовый middleware
 MIDDLEWARE = [
+    'directory.middleware.RequestMetricsMiddleware',     # Метрики времени и SQL по view 📈
     'django.middleware.security.SecurityMiddleware',     # Защита 🔒
     'whitenoise.middleware.WhiteNoiseMiddleware',        # WhiteNoise для статики 🎨
     'django.contrib.sessions.middleware.SessionMiddleware', # Сессии 🕑
@@ -86,6 +87,14 @@ if not TESTING and DEBUG:
     # Вставляем в начало, чтобы обрабатывать запросы раньше
     MIDDLEWARE.insert(0, 'debug_toolbar.middleware.DebugToolbarMiddleware')
 
+# 📈 Метрики производительности запросов (RequestMetricsMiddleware)
+REQUEST_METRICS_ENABLED = os.getenv('REQUEST_METRICS_ENABLED', 'True') == 'True'
+REQUEST_METRICS_SLOW_MS = int(os.getenv('REQUEST_METRICS_SLOW_MS', 1000)) # Порог медленного запроса (SQL пишется в лог)
+REQUEST_METRICS_RING_SIZE = int(os.getenv('REQUEST_METRICS_RING_SIZE', 500)) # Замеров на один view
+REQUEST_METRICS_FLUSH_EVERY = 20 # Сброс буфера процесса в кеш каждые N запросов
+REQUEST_METRICS_FLUSH_SECONDS = 10 # ...и не реже чем раз в N секунд
+REQUEST_METRICS_SQL_LIMIT = 50 # Максимум SQL-запросов в записи о медленном запросе
+
 # 🌐 URL-конфигурация
 ROOT_URLCONF = 'urls'
 
@@ -181,6 +190,7 @@ STATICFILES_FINDERS = [
 # 📸 Медиа файлы
 MEDIA_URL = os.getenv('MEDIA_URL', '/media/')
 MEDIA_ROOT = BASE_DIR / 'media' # Директория для загружаемых пользователем файлов
+PRIVATE_MEDIA_ROOT = Path(os.getenv('PRIVATE_MEDIA_ROOT', BASE_DIR / 'private_media')) # Закрытые файлы вне MEDIA_ROOT (не отдаются по MEDIA_URL): файлы импорта, кэш документов
 
 # 🔑 Тип первичного ключа
 DEFAULT_AUTO_FIELD = os.getenv('DEFAULT_AUTO_FIELD', 'django.db.models.BigAutoField')
@@ -200,7 +210,8 @@ LOGOUT_REDIRECT_URL = 'directory:auth:login'
 AUTH_USER_MODEL = 'auth.User' # Стандартная модель пользователя Django
 
 # 🍪 Настройки сессий
-SESSION_ENGINE = 'django.contrib.sessions.backends.db' # Хранение сессий в БД
+SESSION_ENGINE = os.getenv('SESSION_ENGINE', 'django.contrib.sessions.backends.db') # Хранение сессий в БД (cached_db - чтение из кэша, запись в БД)
+SESSION_CACHE_ALIAS = os.getenv('SESSION_CACHE_ALIAS', 'default') # Кэш для backends.cache / backends.cached_db
 SESSION_COOKIE_AGE = int(os.getenv('SESSION_COOKIE_AGE', 60 * 60 * 24 * 7)) # Время жизни сессии (по умолчанию 1 неделя)
 SESSION_COOKIE_NAME = 'sessionid'
 SESSION_COOKIE_SECURE = os.getenv('SESSION_COOKIE_SECURE', 'False') == 'True' # В production должно быть True (требует HTTPS)
@@ -218,7 +229,7 @@ CRISPY_TEMPLATE_PACK = 'bootstrap4'
 CRISPY_FAIL_SILENTLY = not DEBUG # Не показывать ошибки crispy в production
 
 # 💬 Настройки сообщений Django Messages Framework
-MESSAGE_STORAGE = 'django.contrib.messages.storage.session.SessionStorage' # Хранить сообщения в сессии
+MESSAGE_STORAGE = os.getenv('MESSAGE_STORAGE', 'django.contrib.messages.storage.fallback.FallbackStorage') # Сообщения в cookie, в сессию - только если не поместились
 MESSAGE_TAGS = {
     messages.DEBUG: 'alert-secondary',
     messages.INFO: 'alert-info',
@@ -295,6 +306,10 @@ if DEBUG and not TESTING:
     ]
 
 # 📝 Логирование
+LOG_ASYNC = os.getenv('LOG_ASYNC', 'False') == 'True' # Писать файл логов в фоновом потоке (QueueHandler/QueueListener)
+DIRECTORY_LOG_LEVEL = os.getenv('DIRECTORY_LOG_LEVEL', 'DEBUG') # Уровень логгера приложения directory
+LOG_SAMPLE_EVERY = int(os.getenv('LOG_SAMPLE_EVERY', 100)) # DEBUG в циклах генераторов: каждая N-я строка
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False, # Не отключать существующие логгеры Django
@@ -320,7 +335,7 @@ LOGGING = {
             'level': 'INFO', # Уровень для консоли (можно DEBUG)
         },
         'file': { # Запись в файл
-            'class': 'logging.FileHandler',
+            'class': 'directory.logging_utils.QueuedFileHandler' if LOG_ASYNC else 'logging.FileHandler',
             'filename': BASE_DIR / 'logs/django.log', # Путь к файлу логов
             'formatter': 'verbose',
             'level': 'DEBUG', # Уровень для файла (более детальный)
@@ -359,7 +374,7 @@ LOGGING = {
         },
         'directory': { # Логгер для вашего приложения 'directory'
             'handlers': ['file', 'console'],
-            'level': 'DEBUG', # Уровень для вашего приложения
+            'level': DIRECTORY_LOG_LEVEL, # Уровень для вашего приложения
             'propagate': True, # Передавать сообщения корневому логгеру
         },
         'exam_security': { # Логгер для безопасности exam поддомена
@@ -380,6 +395,9 @@ CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', # Кэш в памяти (простой, для разработки)
         'LOCATION': 'unique-snowflake', # Уникальное имя для кэша
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.getenv('CACHE_MAX_ENTRIES', 5000)), # По умолчанию 300 - мало для фрагментов дерева по отделам
+        },
         # Для production лучше использовать Redis или Memcached:
         # 'BACKEND': 'django_redis.cache.RedisCache',
         # 'LOCATION': 'redis://127.0.0.1:6379/1', # URL вашего Redis сервера
@@ -391,6 +409,41 @@ CACHES = {
         # 'LOCATION': '127.0.0.1:11211',
     }
 }
+DEADLINE_SUMMARY_CACHE_TIMEOUT = int(os.getenv('DEADLINE_SUMMARY_CACHE_TIMEOUT', 300)) # Сводка сроков по организации для дашборда (секунды)
+ORG_STRUCTURE_CACHE_TIMEOUT = int(os.getenv('ORG_STRUCTURE_CACHE_TIMEOUT', 3600)) # Подписанты, руководители стажировки и комиссии организации (секунды)
+EMAIL_RECIPIENTS_CACHE_TIMEOUT = int(os.getenv('EMAIL_RECIPIENTS_CACHE_TIMEOUT', 300)) # Получатели рассылок из EmailSettings организации (секунды)
+HOME_TREE_CACHE_TIMEOUT = int(os.getenv('HOME_TREE_CACHE_TIMEOUT', 3600)) # Фрагменты отделов в дереве главной страницы (секунды, 0 - без кэша)
+MENU_VISIBILITY_CACHE_TIMEOUT = int(os.getenv('MENU_VISIBILITY_CACHE_TIMEOUT', 3600)) # Видимые пользователю пункты меню (секунды)
+
+# 📤 Экспорт в Excel (потоковый, openpyxl write_only)
+EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', 2000)) # Строк за один запрос queryset.iterator()
+EXPORT_WIDTH_SAMPLE_ROWS = int(os.getenv('EXPORT_WIDTH_SAMPLE_ROWS', 500)) # Ширина колонок считается по первым N строкам
+IMPORT_BULK_BATCH_SIZE = int(os.getenv('IMPORT_BULK_BATCH_SIZE', 500)) # Размер пачки bulk_create/bulk_update при импорте справочников
+
+# 📥 Фоновый единый импорт (staging-таблица, задания ImportJob)
+IMPORT_JOBS_RUN_IN_THREAD = os.getenv('IMPORT_JOBS_RUN_IN_THREAD', 'True') == 'True' # False - задания выполняет только команда process_import_jobs
+IMPORT_STAGE_CHUNK_SIZE = int(os.getenv('IMPORT_STAGE_CHUNK_SIZE', 1000)) # Строк за пачку при разборе файла и проверке
+IMPORT_COMMIT_CHUNK_SIZE = int(os.getenv('IMPORT_COMMIT_CHUNK_SIZE', 2000)) # Строк в одной транзакции импорта
+IMPORT_JOB_STALE_SECONDS = int(os.getenv('IMPORT_JOB_STALE_SECONDS', 300)) # Через сколько секунд без активности задание считается остановленным
+IMPORT_PREVIEW_MAX_ERRORS = int(os.getenv('IMPORT_PREVIEW_MAX_ERRORS', 200)) # Ошибок на лист в предпросмотре
+IMPORT_JOB_EXPIRE_DAYS = int(os.getenv('IMPORT_JOB_EXPIRE_DAYS', 7)) # Через сколько дней неподтверждённое или остановленное с ошибкой задание отменяется (файл и staging удаляются, 0 - не отменять)
+
+# 🧹 Хранение логов рассылок и генерации документов (команда purge_send_logs)
+INSTRUCTION_SEND_LOG_TTL_DAYS = int(os.getenv('INSTRUCTION_SEND_LOG_TTL_DAYS', 365)) # Рассылки журналов инструктажей (дней, 0 - хранить бессрочно)
+EQUIPMENT_SEND_LOG_TTL_DAYS = int(os.getenv('EQUIPMENT_SEND_LOG_TTL_DAYS', 365)) # Рассылки журналов осмотра оборудования
+MEDICAL_SEND_LOG_TTL_DAYS = int(os.getenv('MEDICAL_SEND_LOG_TTL_DAYS', 365)) # Уведомления о медосмотрах
+KEY_DEADLINE_SEND_LOG_TTL_DAYS = int(os.getenv('KEY_DEADLINE_SEND_LOG_TTL_DAYS', 365)) # Уведомления о ключевых событиях
+DOCUMENT_GENERATION_LOG_TTL_DAYS = int(os.getenv('DOCUMENT_GENERATION_LOG_TTL_DAYS', 730)) # Логи генерации документов
+LOG_PURGE_BATCH_SIZE = int(os.getenv('LOG_PURGE_BATCH_SIZE', 500)) # Записей, удаляемых в одной короткой транзакции
+LOG_ADMIN_DEFAULT_DAYS = int(os.getenv('LOG_ADMIN_DEFAULT_DAYS', 90)) # Период списка логов в админке по умолчанию (дней)
+
+# 🔄 Пересчёт статусов медосмотров (команда update_medical_statuses)
+MEDICAL_STATUS_CHUNK_SIZE = int(os.getenv('MEDICAL_STATUS_CHUNK_SIZE', 500)) # Записей в одном UPDATE статуса
+
+# 🗄️ Кэш сгенерированных документов (DOCX) на диске
+DOCUMENT_CACHE_ENABLED = os.getenv('DOCUMENT_CACHE_ENABLED', 'True') == 'True'
+DOCUMENT_CACHE_DIR = os.getenv('DOCUMENT_CACHE_DIR', str(PRIVATE_MEDIA_ROOT / 'document_cache')) # Каталог кэша (вне MEDIA_ROOT: документы с персональными данными)
+DOCUMENT_CACHE_MAX_MB = int(os.getenv('DOCUMENT_CACHE_MAX_MB', 200)) # Лимит размера, сверх него удаляются давно не читавшиеся файлы
 
 # Конфигурация для wkhtmltopdf (если используется для генерации PDF)
 # Убедитесь, что путь правильный для вашей операционной системы
@@ -66,6 +66,15 @@ CACHES = {
     }
 }
 
+# Sessions: чтение из Redis, БД - только при изменении сессии
+SESSION_ENGINE = os.getenv('SESSION_ENGINE', 'django.contrib.sessions.backends.cached_db')
+
+# Logging for production
+# Файл логов пишется в фоновом потоке, directory - только INFO и выше
+if os.getenv('LOG_ASYNC', 'True') == 'True':
+    LOGGING['handlers']['file']['class'] = 'directory.logging_utils.QueuedFileHandler'
+LOGGING['loggers']['directory']['level'] = os.getenv('DIRECTORY_LOG_LEVEL', 'INFO')
+
 # Email settings for production
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 
@@ -14,10 +14,12 @@ import os
 from directory.admin.global_import_admin import register_global_import_export
 from directory.admin.registry_import_admin import register_registry_import
 from directory.admin.system_admin import register_system_tools
+from directory.admin.request_metrics_admin import register_request_metrics
 
 register_global_import_export(admin.site)
 register_registry_import(admin.site)
 register_system_tools(admin.site)
+register_request_metrics(admin.site)
 
 
 def serve_verification_file(request, filename):